@@ -6,9 +6,15 @@ from hpcrocket.cli import parse_cli_args
 from hpcrocket.core.application import Application
 from hpcrocket.core.executor import CommandExecutor
 from hpcrocket.core.filesystem import Filesystem, FilesystemFactory
+from hpcrocket.core.instrumentation import (
+    InstrumentedExecutor,
+    InstrumentedFilesystemFactory,
+)
 from hpcrocket.core.launchoptions import Options
+from hpcrocket.core.profiling import make_profiler
+from hpcrocket.core.runreport import RunReport
 from hpcrocket.pyfilesystem.factory import PyFilesystemFactory
-from hpcrocket.pyfilesystem.localfilesystem import localfilesystem
+from hpcrocket.pyfilesystem.localfilesystem import nativelocalfilesystem
 from hpcrocket.ssh.sshexecutor import SSHExecutor
 from hpcrocket.ui import UI, RichUI
 
@@ -48,7 +54,7 @@ class ProductionServiceRegistry:
     """
 
     def local_filesystem(self) -> Filesystem:
-        return localfilesystem(os.getcwd())
+        return nativelocalfilesystem(os.getcwd())
 
     def get_executor(self, options: Options) -> CommandExecutor:
         return SSHExecutor(options.connection, options.proxyjumps)
@@ -62,7 +68,23 @@ def create_application(
 ) -> Application:
     executor = service_registry.get_executor(options)
     filesystem_factory = service_registry.get_filesystem_factory(options)
-    return Application(executor, filesystem_factory, ui)
+    profiler = None
+    if options.profile_file is not None:
+        profiler = make_profiler(options.profile_mode)
+
+    if options.report_file is None and not options.print_stats:
+        return Application(executor, filesystem_factory, ui, profiler=profiler)
+
+    # Only a run that reports its timings pays for recording them
+    report = RunReport()
+    filesystem_factory.record_round_trips(report)
+    return Application(
+        InstrumentedExecutor(executor, report),
+        InstrumentedFilesystemFactory(filesystem_factory, report),
+        ui,
+        report,
+        profiler,
+    )
 
 
 class RuntimeContainer:
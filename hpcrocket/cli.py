@@ -4,14 +4,21 @@ from typing import Any, Dict, List, Optional, Union, cast
 
 import yaml
 
-from hpcrocket.core.progressive_file_operations import CopyInstruction
+from hpcrocket.core.progressive_file_operations import (
+    CopyInstruction,
+    RemoteCopyInstruction,
+)
 from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.core.workflows.journal import WorkflowJournal
 from hpcrocket.core.launchoptions import (
     LaunchOptions,
     Options,
     SimpleJobOptions,
     WatchOptions,
 )
+from hpcrocket.core.profiling import PROFILE_MODES
+from hpcrocket.pyfilesystem.factory import BACKENDS
+from hpcrocket.ssh.bandwidth import parse_rate
 from hpcrocket.ssh.connectiondata import ConnectionData
 
 
@@ -22,6 +29,9 @@ def parse_cli_args(args: List[str], filesystem: Filesystem) -> Options:
 
 
 def _create_options(config: argparse.Namespace, filesystem: Filesystem) -> Options:
+    if config.command == "resume":
+        config = _resumed_launch_config(config, filesystem)
+
     yaml_config = _parse_yaml(config.configfile, filesystem)
     option_builders = {"launch": _build_launch_options, "watch": _build_watch_options}
 
@@ -30,6 +40,27 @@ def _create_options(config: argparse.Namespace, filesystem: Filesystem) -> Optio
     return builder(config, yaml_config)
 
 
+def _resumed_launch_config(
+    config: argparse.Namespace, filesystem: Filesystem
+) -> argparse.Namespace:
+    with filesystem.openread(config.statefile) as file:
+        arguments = WorkflowJournal.read(file, config.statefile).arguments
+
+    return argparse.Namespace(
+        command="launch",
+        configfile=arguments["configfile"],
+        watch=bool(arguments.get("watch", False)),
+        tail=list(arguments.get("tail", [])),
+        dry_run=False,
+        state_file=config.statefile,
+        resume=True,
+        report=config.report,
+        stats=config.stats,
+        profile=config.profile,
+        profile_mode=config.profile_mode,
+    )
+
+
 def _build_launch_options(
     config: argparse.Namespace, yaml_config: Dict[str, Any]
 ) -> Options:
@@ -39,14 +70,36 @@ def _build_launch_options(
     return LaunchOptions(
         sbatch=os.path.expandvars(sbatch),
         watch=watch,
+        dry_run=cast(bool, config.dry_run),
+        tail_files=_tail_files(config, yaml_config),
+        configfile=cast(str, config.configfile),
+        state_file=cast(Optional[str], config.state_file),
+        resume=cast(bool, config.resume),
+        report_file=cast(Optional[str], config.report),
+        print_stats=cast(bool, config.stats),
+        profile_file=cast(Optional[str], config.profile),
+        profile_mode=cast(str, config.profile_mode),
         copy_files=_collect_copy_instructions(yaml_config.get("copy", [])),
+        remote_copy_files=_collect_remote_copy_instructions(
+            yaml_config.get("remote_copy", [])
+        ),
         clean_files=_clean_instructions(yaml_config.get("clean", [])),
         collect_files=_collect_copy_instructions(yaml_config.get("collect", [])),
         continue_if_job_fails=yaml_config.get("continue_if_job_fails", False),
+        collect_interval=yaml_config.get("collect_interval"),
+        transfer_streams=int(yaml_config.get("transfer_streams", 1)),
+        backend=_backend(yaml_config.get("backend", "pyfilesystem")),
+        **_transfer_host_dict(yaml_config.get("transfer_host")),
+        **_bandwidth_limit_dict(yaml_config.get("bandwidth_limit")),
         **_connection_dict(yaml_config)  # type: ignore
     )
 
 
+def _tail_files(config: argparse.Namespace, yaml_config: Dict[str, Any]) -> List[str]:
+    tail_files = (yaml_config.get("tail") or []) + (config.tail or [])
+    return [os.path.expandvars(path) for path in dict.fromkeys(tail_files)]
+
+
 def _collect_copy_instructions(
     copy_list: List[Dict[str, str]]
 ) -> List[CopyInstruction]:
@@ -55,6 +108,21 @@ def _collect_copy_instructions(
             os.path.expandvars(cp["from"]),
             os.path.expandvars(cp["to"]),
             bool(cp.get("overwrite", False)),
+            bool(cp.get("preserve_mode", True)),
+        )
+        for cp in copy_list
+    ]
+
+
+def _collect_remote_copy_instructions(
+    copy_list: List[Dict[str, str]]
+) -> List[RemoteCopyInstruction]:
+    return [
+        RemoteCopyInstruction(
+            os.path.expandvars(cp["from"]),
+            os.path.expandvars(cp["to"]),
+            bool(cp.get("overwrite", False)),
+            bool(cp.get("symlink", False)),
         )
         for cp in copy_list
     ]
@@ -73,6 +141,10 @@ def _build_simple_job_options(
     return SimpleJobOptions(
         jobid=jobid,
         action=SimpleJobOptions.Action[command],
+        report_file=cast(Optional[str], config.report),
+        print_stats=cast(bool, config.stats),
+        profile_file=cast(Optional[str], config.profile),
+        profile_mode=cast(str, config.profile_mode),
         **_connection_dict(yaml_config)  # type: ignore
     )
 
@@ -81,7 +153,15 @@ def _build_watch_options(
     config: argparse.Namespace, yaml_config: Dict[str, Any]
 ) -> Options:
     jobid = cast(str, config.jobid)
-    return WatchOptions(jobid=jobid, **_connection_dict(yaml_config))  # type: ignore
+    return WatchOptions(
+        jobid=jobid,
+        tail_files=_tail_files(config, yaml_config),
+        report_file=cast(Optional[str], config.report),
+        print_stats=cast(bool, config.stats),
+        profile_file=cast(Optional[str], config.profile),
+        profile_mode=cast(str, config.profile_mode),
+        **_connection_dict(yaml_config)  # type: ignore
+    )
 
 
 def _setup_parser() -> argparse.ArgumentParser:
@@ -92,6 +172,37 @@ def _setup_parser() -> argparse.ArgumentParser:
     _setup_status_parser(subparsers)
     _setup_watch_parser(subparsers)
     _setup_cancel_parser(subparsers)
+    _setup_resume_parser(subparsers)
+
+    for subparser in subparsers.choices.values():
+        subparser.add_argument(
+            "--report",
+            default=None,
+            dest="report",
+            metavar="FILE",
+            help="Write the time spent in every stage and operation as JSON report to FILE",
+        )
+        subparser.add_argument(
+            "--stats",
+            default=False,
+            dest="stats",
+            action="store_true",
+            help="Print the round trips to the remote machine and their latencies after the run",
+        )
+        subparser.add_argument(
+            "--profile",
+            default=None,
+            dest="profile",
+            metavar="FILE",
+            help="Profile every stage and write the profile to FILE",
+        )
+        subparser.add_argument(
+            "--profile-mode",
+            default="deterministic",
+            dest="profile_mode",
+            choices=PROFILE_MODES,
+            help="Record every call with cProfile (pstats files) or sample all threads (collapsed stacks)",
+        )
 
     return parser
 
@@ -102,6 +213,22 @@ def _setup_launch_parser(
     parser = subparsers.add_parser("launch", help="Launch a remote job")
     parser.add_argument("configfile", type=str)
     parser.add_argument("--watch", default=False, dest="watch", action="store_true")
+    parser.add_argument(
+        "--dry-run",
+        default=False,
+        dest="dry_run",
+        action="store_true",
+        help="Print the files that would be copied instead of launching the job",
+    )
+    parser.add_argument(
+        "--state-file",
+        default=None,
+        dest="state_file",
+        metavar="FILE",
+        help="Record the progress of the launch in FILE, so it can be continued with the resume command",
+    )
+    parser.set_defaults(resume=False)
+    _add_tail_argument(parser)
 
 
 def _setup_status_parser(
@@ -124,6 +251,17 @@ def _setup_cancel_parser(
     parser.add_argument("jobid", type=str, help="The ID of the job to be canceled")
 
 
+def _setup_resume_parser(
+    subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+) -> None:
+    parser = subparsers.add_parser(
+        "resume", help="Continue an interrupted launch from its state file"
+    )
+    parser.add_argument(
+        "statefile", type=str, help="The state file passed to launch with --state-file"
+    )
+
+
 def _setup_watch_parser(
     subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
 ) -> None:
@@ -132,6 +270,17 @@ def _setup_watch_parser(
         "configfile", type=str, help="A config file containing the connection data"
     )
     parser.add_argument("jobid", type=str, help="The ID of the job to be monitored")
+    _add_tail_argument(parser)
+
+
+def _add_tail_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--tail",
+        action="append",
+        dest="tail",
+        metavar="FILE",
+        help="Print the lines a job writes to FILE while watching it, %%j is replaced by the job ID",
+    )
 
 
 def _parse_yaml(path: str, filesystem: Filesystem) -> Dict[str, Any]:
@@ -148,6 +297,43 @@ def _connection_dict(
     }
 
 
+def _transfer_host_dict(
+    transfer_host: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    if not transfer_host:
+        return {}
+
+    return {
+        "transfer_connection": _connection_data_from_dict(transfer_host),
+        "transfer_proxyjumps": _collect_proxyjumps(
+            transfer_host.get("proxyjumps", [])
+        ),
+    }
+
+
+def _bandwidth_limit_dict(
+    bandwidth_limit: Union[None, str, int, Dict[str, Any]]
+) -> Dict[str, Any]:
+    if bandwidth_limit is None:
+        return {}
+
+    if not isinstance(bandwidth_limit, dict):
+        return {"bandwidth_limit": parse_rate(bandwidth_limit)}
+
+    limits = {
+        "bandwidth_limit": bandwidth_limit.get("total"),
+        "host_bandwidth_limit": bandwidth_limit.get("per_host"),
+    }
+    return {key: parse_rate(rate) for key, rate in limits.items() if rate is not None}
+
+
+def _backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    return backend
+
+
 def _connection_data_from_dict(config: Dict[str, str]) -> ConnectionData:
     return ConnectionData(
         hostname=cast(str, expand_or_none(config["host"])),
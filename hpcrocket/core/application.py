@@ -1,7 +1,11 @@
+from typing import Optional
+
 from hpcrocket.core.errors import get_error_message
 from hpcrocket.core.executor import CommandExecutor
 from hpcrocket.core.filesystem import FilesystemFactory
-from hpcrocket.core.launchoptions import Options
+from hpcrocket.core.launchoptions import LaunchOptions, Options
+from hpcrocket.core.profiling import Profiler
+from hpcrocket.core.runreport import RunReport
 from hpcrocket.core.slurmcontroller import SlurmController
 from hpcrocket.core.workflows.workflow import Workflow
 from hpcrocket.core.workflowfactory import make_workflow
@@ -10,11 +14,18 @@ from hpcrocket.ui import UI
 
 class Application:
     def __init__(
-        self, executor: CommandExecutor, filesystem_factory: FilesystemFactory, ui: UI
+        self,
+        executor: CommandExecutor,
+        filesystem_factory: FilesystemFactory,
+        ui: UI,
+        report: Optional[RunReport] = None,
+        profiler: Optional[Profiler] = None,
     ) -> None:
         self._executor = executor
         self.fs_factory = filesystem_factory
         self._ui = ui
+        self._report = report
+        self._profiler = profiler
         self._workflow = Workflow([])
 
     def run(self, options: Options) -> int:
@@ -23,16 +34,52 @@ class Application:
         except Exception as err:
             self._ui.error(get_error_message(err))
             return 1
+        finally:
+            self._print_stats(options)
+            self._write_report(options)
+            self._write_profile(options)
+
+    def _print_stats(self, options: Options) -> None:
+        if self._report is None or not options.print_stats:
+            return
+
+        for line in self._report.summary():
+            self._ui.info(line)
+
+    def _write_report(self, options: Options) -> None:
+        if self._report is None or options.report_file is None:
+            return
+
+        try:
+            self._report.write(options.report_file)
+        except OSError as err:
+            self._ui.error(get_error_message(err))
+
+    def _write_profile(self, options: Options) -> None:
+        if self._profiler is None or options.profile_file is None:
+            return
+
+        try:
+            self._profiler.write(options.profile_file)
+        except OSError as err:
+            self._ui.error(get_error_message(err))
 
     def _run_workflow(self, options: Options) -> int:
+        if isinstance(options, LaunchOptions) and options.dry_run:
+            # A dry run only inspects local files, so there is no need to connect
+            return self._run_stages(self._executor, options)
+
         with self._executor as executor:
-            self._workflow = self._get_workflow(executor, options)
-            success = self._workflow.run(self._ui)
-            return 0 if success else 1
+            return self._run_stages(executor, options)
+
+    def _run_stages(self, executor: CommandExecutor, options: Options) -> int:
+        self._workflow = self._get_workflow(executor, options)
+        success = self._workflow.run(self._ui, self._profiler)
+        return 0 if success else 1
 
     def _get_workflow(self, executor: CommandExecutor, options: Options) -> Workflow:
         controller = SlurmController(executor)
-        return make_workflow(self.fs_factory, controller, options)
+        return make_workflow(self.fs_factory, controller, options, self._report)
 
     def cancel(self) -> int:
         self._workflow.cancel(self._ui)
@@ -1,6 +1,15 @@
+import io
+import posixpath
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
 from io import TextIOWrapper
-from typing import List, Optional
+from typing import BinaryIO, Callable, Iterator, List, NamedTuple, Optional, Set, cast
+
+from hpcrocket.core.runreport import RunReport
+
+# Receives the number of bytes transferred since the previous call
+ProgressCallback = Callable[[int], None]
 
 
 class FilesystemFactory(ABC):
@@ -12,6 +21,28 @@ class FilesystemFactory(ABC):
     def create_ssh_filesystem(self) -> "Filesystem":
         pass
 
+    def record_round_trips(self, report: RunReport) -> None:
+        """
+        Makes the remote filesystems created from now on count their requests to the remote machine in the report.
+        Factories that cannot observe the requests of their filesystems ignore this.
+
+        Args:
+            report (RunReport): The report to record the round trips in
+        """
+
+
+class FileInfo(NamedTuple):
+    """
+    Metadata of a file or directory on a Filesystem.
+    `mode` holds the permission bits if the Filesystem reports them along with the other metadata.
+    """
+
+    path: str
+    is_dir: bool
+    size: int
+    modified: Optional[float] = None
+    mode: Optional[int] = None
+
 
 class Filesystem(ABC):
     """
@@ -37,6 +68,8 @@ class Filesystem(ABC):
         target: str,
         overwrite: bool = False,
         filesystem: Optional["Filesystem"] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
     ) -> None:
         """Copies the `source` file to the `target` location.
         Can transfer between filesystems if `filesystem` argument is specified.
@@ -44,7 +77,11 @@ class Filesystem(ABC):
         Args:
             source (str): The path to the file to be copied
             target (str): The path to the copy destination
+            overwrite (bool): Replaces an existing `target` file
             filesystem (Filesystem): An optional different filesystem to copy to
+            preserve_mode (bool): Gives the copy the permission bits of the `source` file
+                if the target filesystem supports it
+            progress (ProgressCallback): Called with the number of bytes transferred whenever a part of a file was copied
 
         Raises:
             FileNotFoundError: The `source` file does not exist
@@ -62,6 +99,62 @@ class Filesystem(ABC):
             FileNotFoundError: The file does not exist
         """
 
+    def delete_many(self, paths: List[str]) -> List[FileNotFoundError]:
+        """Deletes several files from the Filesystem.
+        Implementations may delete the files in bulk. Paths that do not exist do not stop the deletion of the others.
+
+        Args:
+            paths (list[str]): The paths to the files to be deleted. May contain glob patterns.
+
+        Returns:
+            list[FileNotFoundError]: An error for every path that does not exist
+        """
+        errors: List[FileNotFoundError] = []
+        for path in paths:
+            try:
+                self.delete(path)
+            except FileNotFoundError as err:
+                errors.append(err)
+
+        return errors
+
+    def makedirs_many(self, paths: List[str]) -> None:
+        """Creates several directories including their missing parents.
+        Copies create missing parent directories of their targets themselves, one lookup per file.
+        Implementations may instead create all parent directories of a batch of copies up front in bulk.
+        The default implementation leaves this to the copies.
+
+        Args:
+            paths (list[str]): The directories that need to exist
+        """
+
+    def duplicate(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        symlink: bool = False,
+    ) -> None:
+        """Copies a file or directory to another location on the same Filesystem.
+        Implementations on remote machines copy the data on the machine itself instead of transferring it.
+        The default implementation only supports copies and falls back to `copy`.
+
+        Args:
+            source (str): The path of the existing file or directory
+            target (str): The path of the copy, a file is placed inside if it is an existing directory
+            overwrite (bool): Replaces an existing target
+            symlink (bool): Creates a symbolic link to the source instead of a copy
+
+        Raises:
+            FileNotFoundError: The source does not exist
+            FileExistsError: The target exists and overwrite is not set
+            OSError: The copy failed or links are not supported
+        """
+        if symlink:
+            raise OSError(f"Cannot link {source}: links are not supported here")
+
+        self.copy(source, target, overwrite)
+
     @abstractmethod
     def exists(self, path: str) -> bool:
         """Checks if a file exists on the Filesystem
@@ -73,6 +166,92 @@ class Filesystem(ABC):
             bool: True if the file exists
         """
 
+    def stat(self, path: str) -> FileInfo:
+        """Returns the metadata of a file or directory.
+        The default implementation only reports the size and tells files from directories, which cannot be opened.
+        It reads files that cannot seek to their end up to the end.
+
+        Args:
+            path (str): The path to a file
+
+        Returns:
+            FileInfo: The size and modification time of the file
+
+        Raises:
+            FileNotFoundError: The file does not exist
+        """
+        if not self.exists(path):
+            raise FileNotFoundError(path)
+
+        try:
+            file = self.openread(path)
+        except FileNotFoundError:
+            return FileInfo(path, True, 0)
+
+        with file:
+            return FileInfo(path, False, _size(cast(BinaryIO, file.buffer)))
+
+    def stat_many(self, paths: List[str]) -> List[Optional[FileInfo]]:
+        """Returns the metadata of several files or directories.
+        Implementations may look them up in bulk instead of one round trip per path.
+
+        Args:
+            paths (list[str]): The paths to look up
+
+        Returns:
+            list[Optional[FileInfo]]: The metadata in the order of `paths`, None for paths that do not exist
+        """
+        infos: List[Optional[FileInfo]] = []
+        with self.batch():
+            for path in paths:
+                try:
+                    infos.append(self.stat(path))
+                except FileNotFoundError:
+                    infos.append(None)
+
+        return infos
+
+    def exists_many(self, paths: List[str]) -> List[bool]:
+        """Checks if several files exist on the Filesystem, see `stat_many`
+
+        Args:
+            paths (list[str]): The paths to check
+
+        Returns:
+            list[bool]: True for every path that exists, in the order of `paths`
+        """
+        return [info is not None for info in self.stat_many(paths)]
+
+    def walk(self, root: str) -> Iterator[FileInfo]:
+        """Yields the metadata of every file and directory below a directory, breadth first.
+        Implementations may read the whole tree with a single request, others yield entries while listing directories.
+
+        Args:
+            root (str): The path of the directory
+
+        Returns:
+            Iterator[FileInfo]: The entries below `root`, their paths start with `root`
+
+        Raises:
+            FileNotFoundError: The directory does not exist
+        """
+        with self.batch():
+            seen: Set[str] = set()
+            directories = deque([root])
+            while directories:
+                directory = directories.popleft()
+                # Some Filesystems match entries of subdirectories as well, these are only yielded once
+                for path in self.glob(posixpath.join(directory, "*")):
+                    path = path.rstrip("/")
+                    if path in seen:
+                        continue
+
+                    seen.add(path)
+                    info = self.stat(path)
+                    yield info
+                    if info.is_dir:
+                        directories.append(path)
+
     @abstractmethod
     def openread(self, path: str) -> TextIOWrapper:
         """Opens a file in read mode
@@ -83,3 +262,89 @@ class Filesystem(ABC):
         Returns:
             TextIOWrapper: A TextIOWrapper to the file
         """
+
+    def supports_streams(self) -> bool:
+        """Tells whether the Filesystem opens binary streams with `openbin` and `openwrite`.
+        Filesystems of different kinds can only copy files between each other if both of them do.
+        The default implementation opens none.
+
+        Returns:
+            bool: True if `openbin` and `openwrite` are implemented
+        """
+        return False
+
+    def openbin(self, path: str, offset: int = 0, length: Optional[int] = None) -> BinaryIO:
+        """Opens a file for reading binary data, optionally limited to a byte range.
+        Filesystems of different kinds copy files between each other through these binary streams.
+
+        Args:
+            path (str): The path to a file
+            offset (int): The position in the file the stream starts at
+            length (int): The number of bytes that can be read, up to the end of the file if not given
+
+        Returns:
+            BinaryIO: A buffered binary file object that supports `readinto` and `seek`.
+                Positions are relative to `offset`.
+
+        Raises:
+            FileNotFoundError: The file does not exist or is a directory
+            ValueError: offset or length are negative
+            io.UnsupportedOperation: The Filesystem does not support binary streams, see `supports_streams`
+        """
+        raise io.UnsupportedOperation(f"{type(self).__name__} does not support binary streams")
+
+    def openwrite(self, path: str, mode: Optional[int] = None) -> BinaryIO:
+        """Opens a file for writing binary data. An existing file is truncated, missing parent directories are created.
+
+        Args:
+            path (str): The path to a file
+            mode (int): The permission bits of the file, left to the Filesystem if not given
+
+        Returns:
+            BinaryIO: A binary file object
+
+        Raises:
+            io.UnsupportedOperation: The Filesystem does not support binary streams, see `supports_streams`
+        """
+        raise io.UnsupportedOperation(f"{type(self).__name__} does not support binary streams")
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Groups several operations on the Filesystem.
+        Implementations may cache file metadata within a batch to save round trips.
+        Changes made to the Filesystem by others during a batch might therefore go unnoticed.
+        Batches may be nested, the outermost batch determines the lifetime of the cache.
+
+        Returns:
+            ContextManager: A context manager that ends the batch on exit
+        """
+        yield
+
+    def close(self) -> None:
+        """
+        Releases the resources of the Filesystem, e.g. its connection to a remote machine.
+        The Filesystem must not be used afterwards.
+        """
+
+    def unwrap(self) -> "Filesystem":
+        """
+        Returns the Filesystem that performs the operations of this one.
+        Decorators return the Filesystem they delegate to, so Filesystems passed to `copy` recognize each other.
+
+        Returns:
+            Filesystem
+        """
+        return self
+
+
+def _size(file: BinaryIO) -> int:
+    if file.seekable():
+        return file.seek(0, io.SEEK_END)
+
+    size = 0
+    chunk = file.read(io.DEFAULT_BUFFER_SIZE)
+    while chunk:
+        size += len(chunk)
+        chunk = file.read(io.DEFAULT_BUFFER_SIZE)
+
+    return size
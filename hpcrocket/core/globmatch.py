@@ -0,0 +1,114 @@
+import re
+from typing import List, Optional, Pattern
+
+_RECURSIVE = "**"
+_CHARACTER_CLASS = re.compile(r"\[!?\]?[^\]]*\]")
+
+
+def _translate_class(character_class: str) -> str:
+    inner = character_class[1:-1].replace("\\", "\\\\")
+    if inner.startswith("!"):
+        inner = "^" + inner[1:]
+    elif inner.startswith("^"):
+        inner = "\\" + inner
+
+    return f"[{inner}]"
+
+
+def _translate_component(component: str) -> str:
+    regex = ""
+    index = 0
+    while index < len(component):
+        char = component[index]
+        class_match = _CHARACTER_CLASS.match(component, index)
+        if char == "[" and class_match is not None:
+            regex += _translate_class(class_match.group())
+            index = class_match.end()
+            continue
+
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "."
+        else:
+            regex += re.escape(char)
+
+        index += 1
+
+    return regex
+
+
+def _translate(components: List[str]) -> str:
+    return "".join(
+        ".*/?" if component == _RECURSIVE else "/" + _translate_component(component)
+        for component in components
+    )
+
+
+class GlobPattern:
+    """
+    A glob pattern that is compiled once and then matched against many paths.
+    Uses the same rules as PyFilesystem2's glob: `*` matches within a path component, `**` matches across directories
+    and a pattern ending with a slash only matches directories.
+
+    Paths are relative to the directory the pattern is relative to, directory paths end with a slash.
+    """
+
+    def __init__(self, pattern: str) -> None:
+        components = [part for part in pattern.split("/") if part and part != "."]
+        self._recursive = _RECURSIVE in components
+        self._levels = len(components)
+
+        suffix = "/" if pattern.endswith("/") else ""
+        self._regex = re.compile(_translate(components) + suffix, re.DOTALL)
+        self._prefixes = self._compile_prefixes(components)
+
+    def _compile_prefixes(self, components: List[str]) -> List[Pattern[str]]:
+        if self._recursive:
+            # The component in front of "**" also matches the start of deeper directory names
+            components = components[: max(components.index(_RECURSIVE) - 1, 0)]
+
+        return [
+            re.compile(_translate(components[: index + 1]), re.DOTALL)
+            for index in range(len(components))
+        ]
+
+    @property
+    def max_depth(self) -> Optional[int]:
+        """
+        The number of directory levels the pattern can match, None if it matches at any depth
+        """
+        return None if self._recursive else self._levels
+
+    def matches(self, path: str) -> bool:
+        """
+        Checks if a path matches the pattern
+
+        Args:
+            path (str): A relative path, ending with a slash if it is a directory
+
+        Returns:
+            bool
+        """
+        return self._regex.fullmatch("/" + path) is not None
+
+    def may_match_below(self, dir: str) -> bool:
+        """
+        Checks if paths inside a directory can match the pattern,
+        so directories that cannot contain matches need not be listed
+
+        Args:
+            dir (str): A relative directory path ending with a slash
+
+        Returns:
+            bool
+        """
+        depth = dir.count("/")
+        if not self._recursive and depth >= self._levels:
+            return False
+
+        if depth > len(self._prefixes):
+            return True
+
+        prefix = self._prefixes[depth - 1]
+        return prefix.fullmatch("/" + dir.rstrip("/")) is not None
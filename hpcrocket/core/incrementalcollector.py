@@ -0,0 +1,166 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from hpcrocket.core.errors import get_error_message
+from hpcrocket.core.filesystem import FileInfo, Filesystem
+from hpcrocket.core.progressive_file_operations import CopyInstruction, progressive_copy
+from hpcrocket.ui import UI
+
+_FileKey = Tuple[str, str]
+
+
+def _key(instruction: CopyInstruction) -> _FileKey:
+    return instruction.source, instruction.destination
+
+
+class IncrementalCollector:
+    """
+    Collects result files while a job is still running.
+    A file is collected as soon as its size and modification time did not change between two polls.
+    After the job has finished only files that were not collected yet or changed since have to be transferred.
+    """
+
+    def __init__(
+        self,
+        source_filesystem: Filesystem,
+        target_filesystem: Filesystem,
+        collect_instructions: List[CopyInstruction],
+        interval: float,
+    ) -> None:
+        self._source_fs = source_filesystem
+        self._target_fs = target_filesystem
+        self._instructions = collect_instructions
+        self._interval = interval
+
+        self._observed: Dict[_FileKey, FileInfo] = {}
+        self._attempted: Dict[_FileKey, FileInfo] = {}
+        self._collected: Dict[_FileKey, FileInfo] = {}
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, ui: UI) -> None:
+        """
+        Starts collecting files in the background
+
+        Args:
+            ui (UI): The UI to report collected files to
+        """
+        self._thread = threading.Thread(target=self._poll, args=(ui,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops collecting files, waits for the current poll to finish and closes the source filesystem
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+        self._source_fs.close()
+
+    def _poll(self, ui: UI) -> None:
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.collect_stable_files(ui)
+            except Exception as err:
+                # Anything missed here is transferred by the final collect
+                ui.error(get_error_message(err))
+
+    def collect_stable_files(self, ui: UI) -> None:
+        """
+        Copies all files that did not change since the last call and were not collected in their current state yet
+
+        Args:
+            ui (UI): The UI to report collected files to
+        """
+        for instruction in self._find_stable_files():
+            if self._stop_event.is_set():
+                return
+
+            self._collect(instruction, ui)
+
+    def _find_stable_files(self) -> List[CopyInstruction]:
+        observed: Dict[_FileKey, FileInfo] = {}
+        stable: List[CopyInstruction] = []
+        with self._source_fs.batch():
+            for instruction, info in self._file_states(self._source_fs):
+                if info is None or info.is_dir:
+                    continue
+
+                key = _key(instruction)
+                observed[key] = info
+                if self._observed.get(key) == info and self._attempted.get(key) != info:
+                    stable.append(instruction)
+
+        self._observed = observed
+        return stable
+
+    def _file_states(
+        self, source_fs: Filesystem
+    ) -> List[Tuple[CopyInstruction, Optional[FileInfo]]]:
+        # Instructions that could not be unglobbed have no state
+        candidates: List[Tuple[CopyInstruction, bool]] = []
+        for instruction in self._instructions:
+            try:
+                files = instruction.unglob(source_fs)
+            except FileNotFoundError:
+                candidates.append((instruction, False))
+                continue
+
+            candidates.extend((file, True) for file in files)
+
+        sources = [file.source for file, resolved in candidates if resolved]
+        infos = iter(source_fs.stat_many(sources))
+        return [
+            (file, next(infos) if resolved else None) for file, resolved in candidates
+        ]
+
+    def _collect(self, instruction: CopyInstruction, ui: UI) -> None:
+        key = _key(instruction)
+        info = self._observed[key]
+        self._attempted[key] = info
+
+        if key in self._collected:
+            instruction = instruction._replace(overwrite=True)
+
+        results = list(
+            progressive_copy(
+                self._source_fs,
+                self._target_fs,
+                [instruction],
+                abort_on_error=False,
+            )
+        )
+
+        # Failed copies are left to the final collect which reports their errors
+        if all(not result.errors for result in results):
+            self._collected[key] = info
+            ui.info(f"Collected {instruction.destination}")
+
+    def final_delta(
+        self, source_filesystem: Optional[Filesystem] = None
+    ) -> List[CopyInstruction]:
+        """
+        Returns the instructions that are still required to collect all files in their current state.
+        Instructions that cannot be resolved are returned unchanged so that copying them reports the error.
+
+        Args:
+            source_filesystem (Filesystem): The filesystem to look up the current state on,
+                defaults to the one the collector copied from
+
+        Returns:
+            list[CopyInstruction]: The remaining copy instructions
+        """
+        source_fs = source_filesystem or self._source_fs
+        delta: List[CopyInstruction] = []
+        with source_fs.batch():
+            for instruction, info in self._file_states(source_fs):
+                key = _key(instruction)
+                collected = self._collected.get(key)
+                if collected is None or info is None or info.is_dir:
+                    delta.append(instruction)
+                elif collected != info:
+                    delta.append(instruction._replace(overwrite=True))
+
+        return delta
@@ -0,0 +1,232 @@
+from contextlib import contextmanager
+from io import TextIOWrapper
+from typing import BinaryIO, ContextManager, Iterator, List, Optional
+
+from hpcrocket.core.executor import CommandExecutor, RunningCommand
+from hpcrocket.core.filesystem import (
+    FileInfo,
+    Filesystem,
+    FilesystemFactory,
+    ProgressCallback,
+)
+from hpcrocket.core.runreport import RunReport
+
+
+class InstrumentedRunningCommand(RunningCommand):
+    """
+    Records the time spent waiting for a command to exit and the latency of the command's round trip
+    """
+
+    def __init__(
+        self, command: RunningCommand, report: RunReport, name: str, started: float
+    ) -> None:
+        self._command = command
+        self._report = report
+        self._name = name
+        self._started: Optional[float] = started
+
+    def wait_until_exit(self) -> int:
+        with self._report.measure(f"{self._name}.wait_until_exit"):
+            exit_code = self._command.wait_until_exit()
+
+        if self._started is not None:
+            self._report.add_latency("exec", self._report.now() - self._started)
+            self._started = None
+
+        return exit_code
+
+    @property
+    def exit_status(self) -> int:
+        return self._command.exit_status
+
+    def stdout(self) -> List[str]:
+        return self._command.stdout()
+
+    def stderr(self) -> List[str]:
+        return self._command.stderr()
+
+
+class InstrumentedExecutor(CommandExecutor):
+    """
+    Records the time spent connecting and running commands in a RunReport.
+    Every command counts as an "exec" round trip that lasts until the command exited.
+    """
+
+    def __init__(
+        self, executor: CommandExecutor, report: RunReport, name: str = "executor"
+    ) -> None:
+        self._executor = executor
+        self._report = report
+        self._name = name
+
+    def exec_command(self, cmd: str) -> RunningCommand:
+        self._report.count(f"{self._name}.commands.{cmd.split(' ', 1)[0]}")
+        self._report.count_round_trip("exec")
+        started = self._report.now()
+        with self._report.measure(f"{self._name}.exec_command"):
+            command = self._executor.exec_command(cmd)
+
+        return InstrumentedRunningCommand(command, self._report, self._name, started)
+
+    def connect(self) -> None:
+        with self._report.measure(f"{self._name}.connect"):
+            self._executor.connect()
+
+    def close(self) -> None:
+        self._executor.close()
+
+
+class InstrumentedFilesystem(Filesystem):
+    """
+    Records the time spent in every operation of a Filesystem and the bytes and files it copied in a RunReport.
+    Timings are named after the operation, prefixed by the name of the filesystem, e.g. "remote.stat_many".
+    """
+
+    def __init__(self, filesystem: Filesystem, report: RunReport, name: str) -> None:
+        self.wrapped = filesystem
+        self._report = report
+        self._name = name
+
+    def _measure(self, operation: str) -> ContextManager[None]:
+        return self._report.measure(f"{self._name}.{operation}")
+
+    def glob(self, pattern: str) -> List[str]:
+        with self._measure("glob"):
+            return self.wrapped.glob(pattern)
+
+    def copy(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        filesystem: Optional[Filesystem] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        def counting_progress(byte_count: int) -> None:
+            self._report.count("bytes_transferred", byte_count)
+            if progress is not None:
+                progress(byte_count)
+
+        if filesystem is not None:
+            # The wrapped filesystems recognize each other to take their fast paths
+            filesystem = filesystem.unwrap()
+
+        with self._measure("copy"):
+            self.wrapped.copy(
+                source,
+                target,
+                overwrite,
+                filesystem,
+                preserve_mode,
+                counting_progress,
+            )
+
+        self._report.count("files_copied")
+
+    def delete(self, path: str) -> None:
+        with self._measure("delete"):
+            self.wrapped.delete(path)
+
+    def delete_many(self, paths: List[str]) -> List[FileNotFoundError]:
+        with self._measure("delete_many"):
+            return self.wrapped.delete_many(paths)
+
+    def makedirs_many(self, paths: List[str]) -> None:
+        with self._measure("makedirs_many"):
+            self.wrapped.makedirs_many(paths)
+
+    def duplicate(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        symlink: bool = False,
+    ) -> None:
+        with self._measure("duplicate"):
+            self.wrapped.duplicate(source, target, overwrite, symlink)
+
+    def exists(self, path: str) -> bool:
+        with self._measure("exists"):
+            return self.wrapped.exists(path)
+
+    def stat(self, path: str) -> FileInfo:
+        with self._measure("stat"):
+            return self.wrapped.stat(path)
+
+    def stat_many(self, paths: List[str]) -> List[Optional[FileInfo]]:
+        with self._measure("stat_many"):
+            return self.wrapped.stat_many(paths)
+
+    def exists_many(self, paths: List[str]) -> List[bool]:
+        with self._measure("exists_many"):
+            return self.wrapped.exists_many(paths)
+
+    def walk(self, root: str) -> Iterator[FileInfo]:
+        # Only the time spent inside the wrapped walk counts, not the time the caller spends on each entry
+        entries = self.wrapped.walk(root)
+        seconds = 0.0
+        try:
+            while True:
+                start = self._report.now()
+                try:
+                    entry = next(entries)
+                finally:
+                    seconds += self._report.now() - start
+
+                yield entry
+        except StopIteration:
+            return
+        finally:
+            self._report.add_timing(f"{self._name}.walk", seconds)
+
+    def openread(self, path: str) -> TextIOWrapper:
+        with self._measure("openread"):
+            return self.wrapped.openread(path)
+
+    def supports_streams(self) -> bool:
+        return self.wrapped.supports_streams()
+
+    def openbin(
+        self, path: str, offset: int = 0, length: Optional[int] = None
+    ) -> BinaryIO:
+        with self._measure("openbin"):
+            return self.wrapped.openbin(path, offset, length)
+
+    def openwrite(self, path: str, mode: Optional[int] = None) -> BinaryIO:
+        with self._measure("openwrite"):
+            return self.wrapped.openwrite(path, mode)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self.wrapped.batch():
+            yield
+
+    def close(self) -> None:
+        self.wrapped.close()
+
+    def unwrap(self) -> Filesystem:
+        return self.wrapped.unwrap()
+
+
+class InstrumentedFilesystemFactory(FilesystemFactory):
+    """
+    Creates instrumented filesystems and records the time it takes to connect to the remote filesystem
+    """
+
+    def __init__(self, factory: FilesystemFactory, report: RunReport) -> None:
+        self._factory = factory
+        self._report = report
+
+    def create_local_filesystem(self) -> Filesystem:
+        filesystem = self._factory.create_local_filesystem()
+        return InstrumentedFilesystem(filesystem, self._report, "local")
+
+    def record_round_trips(self, report: RunReport) -> None:
+        self._factory.record_round_trips(report)
+
+    def create_ssh_filesystem(self) -> Filesystem:
+        with self._report.measure("remote.connect"):
+            filesystem = self._factory.create_ssh_filesystem()
+
+        return InstrumentedFilesystem(filesystem, self._report, "remote")
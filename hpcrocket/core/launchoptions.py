@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Union
+from typing import List, Optional, Union
 
-from hpcrocket.core.progressive_file_operations import CopyInstruction
+from hpcrocket.core.progressive_file_operations import (
+    CopyInstruction,
+    RemoteCopyInstruction,
+)
 from hpcrocket.ssh.connectiondata import ConnectionData
 
 
@@ -20,6 +23,10 @@ class SimpleJobOptions:
     action: Action
     connection: ConnectionData
     proxyjumps: List[ConnectionData] = field(default_factory=lambda: [])
+    report_file: Optional[str] = None
+    print_stats: bool = False
+    profile_file: Optional[str] = None
+    profile_mode: str = "deterministic"
 
 
 @dataclass
@@ -28,11 +35,28 @@ class LaunchOptions:
     connection: ConnectionData
     proxyjumps: List[ConnectionData] = field(default_factory=lambda: [])
     copy_files: List[CopyInstruction] = field(default_factory=lambda: [])
+    remote_copy_files: List[RemoteCopyInstruction] = field(default_factory=lambda: [])
     clean_files: List[str] = field(default_factory=lambda: [])
     collect_files: List[CopyInstruction] = field(default_factory=lambda: [])
     poll_interval: int = 5
     watch: bool = False
     continue_if_job_fails: bool = False
+    collect_interval: Optional[int] = None
+    transfer_streams: int = 1
+    transfer_connection: Optional[ConnectionData] = None
+    transfer_proxyjumps: List[ConnectionData] = field(default_factory=lambda: [])
+    bandwidth_limit: Optional[int] = None
+    host_bandwidth_limit: Optional[int] = None
+    backend: str = "pyfilesystem"
+    dry_run: bool = False
+    tail_files: List[str] = field(default_factory=lambda: [])
+    configfile: Optional[str] = None
+    state_file: Optional[str] = None
+    resume: bool = False
+    report_file: Optional[str] = None
+    print_stats: bool = False
+    profile_file: Optional[str] = None
+    profile_mode: str = "deterministic"
 
 
 @dataclass
@@ -41,3 +65,8 @@ class WatchOptions:
     connection: ConnectionData
     proxyjumps: List[ConnectionData] = field(default_factory=lambda: [])
     poll_interval: int = 5
+    tail_files: List[str] = field(default_factory=lambda: [])
+    report_file: Optional[str] = None
+    print_stats: bool = False
+    profile_file: Optional[str] = None
+    profile_mode: str = "deterministic"
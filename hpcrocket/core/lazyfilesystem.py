@@ -0,0 +1,145 @@
+import threading
+from contextlib import ExitStack, contextmanager
+from io import TextIOWrapper
+from typing import BinaryIO, Callable, Iterator, List, Optional
+
+from hpcrocket.core.filesystem import FileInfo, Filesystem, ProgressCallback
+
+
+class LazyFilesystem(Filesystem):
+    """
+    Creates a Filesystem on first use, so a stage that never touches the remote machine never connects to it.
+    Neither a batch nor a bulk operation on an empty list of paths creates the Filesystem.
+    `close()` releases the created Filesystem, the next operation creates a new one.
+    """
+
+    def __init__(self, create: Callable[[], Filesystem]) -> None:
+        self._create = create
+        self._lock = threading.Lock()
+        self._created: Optional[Filesystem] = None
+        self._batch: Optional[ExitStack] = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether the Filesystem was created and not closed since
+        """
+        return self._created is not None
+
+    def _filesystem(self) -> Filesystem:
+        with self._lock:
+            if self._created is None:
+                self._created = self._create()
+                if self._batch is not None:
+                    # Created within a batch, which has to apply to the new Filesystem too
+                    self._batch.enter_context(self._created.batch())
+
+            return self._created
+
+    def glob(self, pattern: str) -> List[str]:
+        return self._filesystem().glob(pattern)
+
+    def copy(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        filesystem: Optional[Filesystem] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        if filesystem is not None:
+            filesystem = filesystem.unwrap()
+
+        self._filesystem().copy(
+            source, target, overwrite, filesystem, preserve_mode, progress
+        )
+
+    def delete(self, path: str) -> None:
+        self._filesystem().delete(path)
+
+    def delete_many(self, paths: List[str]) -> List[FileNotFoundError]:
+        if not paths:
+            return []
+
+        return self._filesystem().delete_many(paths)
+
+    def makedirs_many(self, paths: List[str]) -> None:
+        if paths:
+            self._filesystem().makedirs_many(paths)
+
+    def duplicate(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        symlink: bool = False,
+    ) -> None:
+        self._filesystem().duplicate(source, target, overwrite, symlink)
+
+    def exists(self, path: str) -> bool:
+        return self._filesystem().exists(path)
+
+    def stat(self, path: str) -> FileInfo:
+        return self._filesystem().stat(path)
+
+    def stat_many(self, paths: List[str]) -> List[Optional[FileInfo]]:
+        if not paths:
+            return []
+
+        return self._filesystem().stat_many(paths)
+
+    def exists_many(self, paths: List[str]) -> List[bool]:
+        if not paths:
+            return []
+
+        return self._filesystem().exists_many(paths)
+
+    def walk(self, root: str) -> Iterator[FileInfo]:
+        return self._filesystem().walk(root)
+
+    def openread(self, path: str) -> TextIOWrapper:
+        return self._filesystem().openread(path)
+
+    def supports_streams(self) -> bool:
+        return self._filesystem().supports_streams()
+
+    def openbin(
+        self, path: str, offset: int = 0, length: Optional[int] = None
+    ) -> BinaryIO:
+        return self._filesystem().openbin(path, offset, length)
+
+    def openwrite(self, path: str, mode: Optional[int] = None) -> BinaryIO:
+        return self._filesystem().openwrite(path, mode)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self._lock:
+            outermost = self._batch is None
+            if outermost:
+                self._batch = ExitStack()
+                if self._created is not None:
+                    self._batch.enter_context(self._created.batch())
+
+        try:
+            yield
+        finally:
+            if outermost:
+                self._end_batch()
+
+    def _end_batch(self) -> None:
+        with self._lock:
+            batch, self._batch = self._batch, None
+
+        if batch is not None:
+            batch.close()
+
+    def close(self) -> None:
+        with self._lock:
+            created, self._created = self._created, None
+
+        if created is not None:
+            created.close()
+
+    def unwrap(self) -> Filesystem:
+        return self._filesystem().unwrap()
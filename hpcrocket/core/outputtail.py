@@ -0,0 +1,143 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+from hpcrocket.core.errors import get_error_message
+from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.ui import UI, format_bytes
+
+JOB_ID_PLACEHOLDER = "%j"
+_MAX_CHUNK = 64 * 1024
+
+
+def _decode(line: bytes) -> str:
+    return line.decode(errors="replace").rstrip("\r")
+
+
+class OutputTail:
+    """
+    Follows the output files of a running job and forwards new lines to the UI, similar to `tail -F`.
+    Every poll reads only the bytes written since the last poll, at most `max_chunk` bytes per file.
+    If a file grew by more than that, the bytes in between are skipped so a job that writes a lot
+    cannot make the tail fall further and further behind.
+    The filesystem stays connected between polls and only the new bytes are requested from it.
+    """
+
+    def __init__(
+        self,
+        filesystem: Filesystem,
+        paths: List[str],
+        interval: float,
+        jobid: Callable[[], str],
+        max_chunk: int = _MAX_CHUNK,
+    ) -> None:
+        self._filesystem = filesystem
+        self._patterns = paths
+        self._interval = interval
+        self._jobid = jobid
+        self._max_chunk = max_chunk
+
+        self._paths: List[str] = []
+        self._offsets: Dict[str, int] = {}
+        self._partial_lines: Dict[str, bytes] = {}
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, ui: UI) -> None:
+        """
+        Starts following the output files in the background.
+        The placeholder `%j` in the paths is replaced by the ID of the job.
+
+        Args:
+            ui (UI): The UI to forward the output to
+        """
+        jobid = self._jobid()
+        self._paths = [
+            path.replace(JOB_ID_PLACEHOLDER, jobid) for path in self._patterns
+        ]
+        self._thread = threading.Thread(target=self._poll, args=(ui,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops following the output files, waits until the output written so far was forwarded
+        and closes the filesystem
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+        self._filesystem.close()
+
+    def _poll(self, ui: UI) -> None:
+        while not self._stop_event.wait(self._interval):
+            self._try_read_new_output(ui)
+
+        # Shows what the job printed right before it finished
+        self._try_read_new_output(ui)
+        self.flush(ui)
+
+    def _try_read_new_output(self, ui: UI) -> None:
+        try:
+            self.read_new_output(ui)
+        except Exception as err:
+            # The next poll continues at the same offset
+            ui.error(get_error_message(err))
+
+    def read_new_output(self, ui: UI) -> None:
+        """
+        Forwards all complete lines that were written to the output files since the last call.
+        Files that do not exist yet are skipped.
+
+        Args:
+            ui (UI): The UI to forward the output to
+        """
+        with self._filesystem.batch():
+            infos = self._filesystem.stat_many(self._paths)
+            for path, info in zip(self._paths, infos):
+                if info is not None and not info.is_dir:
+                    self._read(path, info.size, ui)
+
+    def _read(self, path: str, size: int, ui: UI) -> None:
+        offset = self._offsets.get(path, 0)
+        if size < offset:
+            # The file was truncated or replaced, e.g. by a requeued job
+            offset = 0
+            self._partial_lines.pop(path, None)
+
+        if size == offset:
+            return
+
+        start = max(offset, size - self._max_chunk)
+        if start > offset:
+            self._partial_lines.pop(path, None)
+            ui.output(path, f"[... skipped {format_bytes(start - offset)}]")
+
+        with self._filesystem.openbin(path, offset=start, length=size - start) as file:
+            data = file.read()
+
+        self._offsets[path] = start + len(data)
+        self._forward(path, self._partial_lines.pop(path, b"") + data, ui)
+
+    def _forward(self, path: str, data: bytes, ui: UI) -> None:
+        *lines, rest = data.split(b"\n")
+        for line in lines:
+            ui.output(path, _decode(line))
+
+        # Output without line breaks must not pile up
+        if len(rest) >= self._max_chunk:
+            ui.output(path, _decode(rest))
+        elif rest:
+            self._partial_lines[path] = rest
+
+    def flush(self, ui: UI) -> None:
+        """
+        Forwards the incomplete last lines of all output files
+
+        Args:
+            ui (UI): The UI to forward the output to
+        """
+        for path, rest in self._partial_lines.items():
+            ui.output(path, _decode(rest))
+
+        self._partial_lines.clear()
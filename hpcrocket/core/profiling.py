@@ -0,0 +1,163 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from types import FrameType
+from typing import ContextManager, Dict, Iterator, List, Optional, Tuple
+
+PROFILE_MODES = ("deterministic", "sampling")
+_SAMPLE_INTERVAL = 0.01
+
+
+class Profiler(ABC):
+    """
+    Profiles the stages of a workflow and writes the results to a file
+    """
+
+    @abstractmethod
+    def profile(self, stage: str) -> ContextManager[None]:
+        """
+        Profiles everything that runs inside the `with` block as part of the given stage
+
+        Args:
+            stage (str): The name of the stage
+        """
+        pass
+
+    @abstractmethod
+    def write(self, path: str) -> None:
+        """
+        Writes the profile of all stages
+
+        Args:
+            path (str): The path of the profile file
+        """
+        pass
+
+
+class DeterministicProfiler(Profiler):
+    """
+    Records every function call of each stage with cProfile.
+    All stages are written combined to the given path and each stage to its own file next to it,
+    e.g. `profile.LaunchStage.pstats` for `profile.pstats`. The files can be read with the `pstats` module.
+    Only the thread running the workflow is profiled, use the SamplingProfiler to see background threads.
+    """
+
+    def __init__(self) -> None:
+        self._profiles: List[Tuple[str, cProfile.Profile]] = []
+
+    @contextmanager
+    def profile(self, stage: str) -> Iterator[None]:
+        profile = cProfile.Profile()
+        self._profiles.append((stage, profile))
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def write(self, path: str) -> None:
+        if not self._profiles:
+            return
+
+        root, extension = os.path.splitext(path)
+        combined = pstats.Stats()
+        for stage, profile in self._profiles:
+            pstats.Stats(profile).dump_stats(f"{root}.{stage}{extension}")
+            combined.add(profile)
+
+        combined.dump_stats(path)
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+def _collapse(frame: Optional[FrameType]) -> List[str]:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+
+    names.reverse()
+    return names
+
+
+class SamplingProfiler(Profiler):
+    """
+    Takes a sample of the stacks of all threads at a fixed interval while a stage runs.
+    The overhead does not grow with the number of function calls, which makes it suitable for long watches.
+    The samples are written as collapsed stacks, one line per distinct stack starting with the stage and the thread,
+    followed by the number of samples. Flame graph tools read this format directly.
+    """
+
+    def __init__(self, interval: float = _SAMPLE_INTERVAL) -> None:
+        self._interval = interval
+        self._samples: Dict[str, int] = {}
+
+    @contextmanager
+    def profile(self, stage: str) -> Iterator[None]:
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample_until, args=(stage, stop), daemon=True
+        )
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+
+    def _sample_until(self, stage: str, stop: threading.Event) -> None:
+        while not stop.wait(self._interval):
+            self.sample(stage)
+
+    def sample(self, stage: str) -> None:
+        """
+        Takes a single sample of all threads except the calling one
+
+        Args:
+            stage (str): The stage the sample belongs to
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        sampler = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == sampler:
+                continue
+
+            stack = [stage, names.get(ident, str(ident))] + _collapse(frame)
+            key = ";".join(stack)
+            self._samples[key] = self._samples.get(key, 0) + 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as file:
+            for stack, count in sorted(self._samples.items()):
+                file.write(f"{stack} {count}\n")
+
+
+def make_profiler(mode: str) -> Profiler:
+    """
+    Creates the profiler for a profile mode
+
+    Args:
+        mode (str): One of PROFILE_MODES
+
+    Returns:
+        Profiler
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode == "deterministic":
+        return DeterministicProfiler()
+
+    if mode == "sampling":
+        return SamplingProfiler()
+
+    raise ValueError(f"Unknown profile mode {mode}")
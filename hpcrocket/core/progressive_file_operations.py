@@ -1,9 +1,12 @@
-import functools
 import os
 from dataclasses import dataclass, field
-from typing import Generator, List, NamedTuple, Optional
+from typing import TYPE_CHECKING, Generator, List, NamedTuple, Optional, Set
 
 from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.core.transferplan import PlannedCopy, TransferPlan, plan_transfer
+
+if TYPE_CHECKING:
+    from hpcrocket.core.transferprogress import ProgressTracker
 
 
 def _join_dest_and_src(src: str, dest: str) -> str:
@@ -18,6 +21,7 @@ class CopyInstruction(NamedTuple):
     source: str
     destination: str
     overwrite: bool = False
+    preserve_mode: bool = True
 
     def unglob(self, filesystem: Filesystem) -> List["CopyInstruction"]:
         if "*" in self.source:
@@ -28,10 +32,24 @@ class CopyInstruction(NamedTuple):
 
     def _unglobbed_sub_instruction(self, file: str) -> "CopyInstruction":
         return CopyInstruction(
-            file, _join_dest_and_src(file, self.destination), self.overwrite
+            file,
+            _join_dest_and_src(file, self.destination),
+            self.overwrite,
+            self.preserve_mode,
         )
 
 
+class RemoteCopyInstruction(NamedTuple):
+    """
+    Copy instruction for a file that is copied or linked on the remote machine itself.
+    """
+
+    source: str
+    destination: str
+    overwrite: bool = False
+    symlink: bool = False
+
+
 @dataclass
 class CopyResult:
     copied_files: List[str]
@@ -47,45 +65,114 @@ class _Copier:
         self,
         src_fs: Filesystem,
         target_fs: Filesystem,
-        *,
-        abort_on_error: bool = True,
+        progress: Optional["ProgressTracker"] = None,
     ) -> None:
         self._src_fs = src_fs
         self._target_fs = target_fs
-        self._abort_on_error = abort_on_error
+        self._progress = progress
+        self._existing: Set[str] = set()
+
+    def probe_targets(self, copies: List[PlannedCopy]) -> None:
+        """
+        Looks up all targets that must not be overwritten with a single bulk request,
+        instead of letting every copy probe its target on its own
+        """
+        destinations = [copy.destination for copy in copies if not copy.overwrite]
+        exists = self._target_fs.exists_many(destinations)
+        found = [path for path, path_exists in zip(destinations, exists) if path_exists]
+        if not found:
+            return
+
+        # Files are copied into existing directories
+        infos = self._target_fs.stat_many(found)
+        self._existing = {
+            path for path, info in zip(found, infos) if info and not info.is_dir
+        }
+
+    def create_target_dirs(
+        self, copies: List[PlannedCopy], abort_on_error: bool
+    ) -> None:
+        """
+        Creates the parent directories of all copies that are going to run in bulk,
+        instead of letting every copy look up and create its parents on its own.
+        Must be called after `probe_targets`, so rejected copies do not leave empty directories behind.
+        """
+        dirs: List[str] = []
+        for planned_copy in copies:
+            if self._rejects(planned_copy):
+                if abort_on_error:
+                    break
+
+                continue
+
+            dir = os.path.dirname(planned_copy.destination)
+            if dir:
+                dirs.append(dir)
+
+        self._target_fs.makedirs_many(dirs)
+
+    def _rejects(self, planned_copy: PlannedCopy) -> bool:
+        return planned_copy.destination in self._existing and not planned_copy.overwrite
+
+    def __call__(self, planned_copy: PlannedCopy) -> CopyResult:
+        if self._rejects(planned_copy):
+            return CopyResult.empty([FileExistsError(planned_copy.destination)])
 
-    def __call__(self, copy_instruction: CopyInstruction) -> CopyResult:
         try:
-            unpacked_instructions = copy_instruction.unglob(self._src_fs)
-            return functools.reduce(
-                self._accumulate_copy_result, unpacked_instructions, CopyResult([])
+            # Filesystems only recognize each other's concrete types to take their fast paths
+            self._src_fs.copy(
+                planned_copy.source,
+                planned_copy.destination,
+                planned_copy.overwrite,
+                filesystem=self._target_fs.unwrap(),
+                preserve_mode=planned_copy.preserve_mode,
+                progress=self._progress.transferred if self._progress else None,
             )
-        except FileNotFoundError as err:
+        except (FileNotFoundError, FileExistsError) as err:
             return CopyResult.empty([err])
 
-    def _accumulate_copy_result(
-        self, current_result: CopyResult, instruction: CopyInstruction
-    ) -> CopyResult:
-        if current_result.errors and self._abort_on_error:
-            return current_result
+        if self._progress is not None:
+            self._progress.file_done()
 
-        error = self._try_copy(instruction)
+        return CopyResult([planned_copy.destination])
 
-        errors = current_result.errors
-        if error is None:
-            current_result.copied_files.append(instruction.destination)
-        else:
-            errors.append(error)
 
-        return CopyResult(current_result.copied_files, errors)
+def execute_transfer_plan(
+    source_filesystem: Filesystem,
+    target_filesystem: Filesystem,
+    plan: TransferPlan,
+    *,
+    abort_on_error: bool = True,
+    progress: Optional["ProgressTracker"] = None,
+) -> Generator[CopyResult, None, None]:
+    """
+    Copies the files of a transfer plan to the target filesystem.
+    Sources missing from the plan are reported before anything is copied.
+
+    Args:
+        source_filesystem (Filesystem): The filesystem to copy FROM
+        target_filesystem (Filesystem): The filesystem to copy TO
+        plan (TransferPlan): The plan created by `plan_transfer` on the source filesystem
+        abort_on_error (bool): Stops copying after the first error
+        progress (ProgressTracker): An optional tracker that is informed about transferred bytes and files
 
-    def _try_copy(self, instruction: CopyInstruction) -> Optional[Exception]:
-        try:
-            self._src_fs.copy(*instruction, filesystem=self._target_fs)
-        except (FileNotFoundError, FileExistsError) as err:
-            return err
+    Returns:
+        Generator[CopyResult]: A generator yielding a result for the missing sources and every planned copy
+    """
+    if plan.missing:
+        yield CopyResult.empty(plan.errors)
+        if abort_on_error:
+            return
 
-        return None
+    copier = _Copier(source_filesystem, target_filesystem, progress)
+    with source_filesystem.batch(), target_filesystem.batch():
+        copier.probe_targets(plan.copies)
+        copier.create_target_dirs(plan.copies, abort_on_error)
+        for planned_copy in plan.copies:
+            tmp_result = copier(planned_copy)
+            yield tmp_result
+            if tmp_result.errors and abort_on_error:
+                break
 
 
 def progressive_copy(
@@ -94,26 +181,66 @@ def progressive_copy(
     files: List[CopyInstruction],
     *,
     abort_on_error: bool = True,
+    progress: Optional["ProgressTracker"] = None,
 ) -> Generator[CopyResult, None, None]:
     """
     Copies the files to the target filesystem.
+    The instructions are resolved into a transfer plan first, see `plan_transfer`.
 
     Args:
         source_filesystem (Filesystem): The filesystem to copy FROM
         target_filesystem (Filesystem): The filesystem to copy TO
         files (list[CopyInstruction]): A list of CopyInstructions
+        abort_on_error (bool): Stops copying after the first error
+        progress (ProgressTracker): An optional tracker that is informed about transferred bytes and files
 
     Returns:
         Generator[CopyResult]: A generator yielding individual copy results
     """
-    copier = _Copier(
-        source_filesystem, target_filesystem, abort_on_error=abort_on_error
-    )
-    for copy_instruction in files:
-        tmp_result = copier(copy_instruction)
-        yield tmp_result
-        if tmp_result.errors and abort_on_error:
-            break
+    with source_filesystem.batch(), target_filesystem.batch():
+        plan = plan_transfer(source_filesystem, files)
+        yield from execute_transfer_plan(
+            source_filesystem,
+            target_filesystem,
+            plan,
+            abort_on_error=abort_on_error,
+            progress=progress,
+        )
+
+
+def progressive_remote_copy(
+    filesystem: Filesystem,
+    files: List[RemoteCopyInstruction],
+    *,
+    abort_on_error: bool = True,
+) -> Generator[CopyResult, None, None]:
+    """
+    Copies or links files within the filesystem without transferring their content, see `Filesystem.duplicate`.
+
+    Args:
+        filesystem (Filesystem): The filesystem the files are copied on
+        files (list[RemoteCopyInstruction]): A list of RemoteCopyInstructions
+        abort_on_error (bool): Stops copying after the first error
+
+    Returns:
+        Generator[CopyResult]: A generator yielding a result for every instruction
+    """
+    for instruction in files:
+        try:
+            filesystem.duplicate(
+                instruction.source,
+                instruction.destination,
+                instruction.overwrite,
+                instruction.symlink,
+            )
+        except OSError as err:
+            yield CopyResult.empty([err])
+            if abort_on_error:
+                return
+
+            continue
+
+        yield CopyResult([instruction.destination])
 
 
 def progressive_clean(
@@ -129,8 +256,4 @@ def progressive_clean(
     Returns:
         Generator[Exception]: A generator yielding exceptions that occured during cleaning
     """
-    for file in files:
-        try:
-            filesystem.delete(file)
-        except FileNotFoundError as err:
-            yield err
+    yield from filesystem.delete_many(files)
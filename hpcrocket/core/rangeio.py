@@ -0,0 +1,112 @@
+import io
+from typing import TYPE_CHECKING, BinaryIO, Optional, cast
+
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
+
+class RangeReader(io.RawIOBase):
+    """
+    Exposes a byte range of a binary file opened for reading as a file of its own.
+    Positions are relative to the start of the range, reads end at the end of the range.
+    """
+
+    def __init__(self, file: BinaryIO, offset: int, length: Optional[int]) -> None:
+        super().__init__()
+        self._file = file
+        self._offset = offset
+        self._length = length
+        self._position = 0
+        file.seek(offset)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: "WriteableBuffer") -> int:
+        view = memoryview(buffer).cast("B")
+        size = len(view)
+        if self._length is not None:
+            size = min(size, self._length - self._position)
+
+        if size <= 0:
+            return 0
+
+        data = self._file.read(size)
+        count = len(data)
+        view[:count] = data
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._end() + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+
+        self._file.seek(self._offset + position)
+        self._position = position
+        return position
+
+    def _end(self) -> int:
+        file_end = self._file.seek(0, io.SEEK_END)
+        end = max(file_end - self._offset, 0)
+        return end if self._length is None else min(end, self._length)
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+
+        super().close()
+
+
+def check_range(offset: int, length: Optional[int]) -> None:
+    """
+    Checks a byte range before a file is opened to read it
+
+    Args:
+        offset (int): The position the range starts at
+        length (int): The length of the range, it ends at the end of the file if not given
+
+    Raises:
+        ValueError: If offset or length are negative
+    """
+    if offset < 0 or (length is not None and length < 0):
+        raise ValueError(f"Invalid byte range: offset {offset}, length {length}")
+
+
+def open_range(
+    file: BinaryIO, offset: int = 0, length: Optional[int] = None
+) -> BinaryIO:
+    """
+    Limits a binary file opened for reading to a byte range and buffers the reads.
+    The file is returned unchanged if the range covers the whole file.
+
+    Args:
+        file (BinaryIO): A seekable binary file opened for reading
+        offset (int): The position the range starts at
+        length (int): The length of the range, it ends at the end of the file if not given
+
+    Returns:
+        BinaryIO: A buffered binary file that supports `readinto` and `seek` within the range
+
+    Raises:
+        ValueError: If offset or length are negative
+    """
+    check_range(offset, length)
+    if offset == 0 and length is None:
+        return file
+
+    return cast(BinaryIO, io.BufferedReader(RangeReader(file, offset, length)))
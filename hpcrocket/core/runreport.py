@@ -0,0 +1,240 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class _Timing:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float, calls: int) -> None:
+        self.calls += calls
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+        }
+
+
+# Upper bounds of the latency histogram buckets in milliseconds
+_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+_LATENCY_LABELS = [f"<={bound}ms" for bound in _LATENCY_BUCKETS_MS] + [
+    f">{_LATENCY_BUCKETS_MS[-1]}ms"
+]
+
+
+class _RoundTrips:
+    def __init__(self) -> None:
+        self.count = 0
+        self.latency = _Timing()
+        self.buckets = [0] * len(_LATENCY_LABELS)
+
+    def add_latency(self, seconds: float) -> None:
+        self.latency.add(seconds, 1)
+        self.buckets[bisect.bisect_left(_LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+
+    def histogram(self) -> Dict[str, int]:
+        return {
+            label: count
+            for label, count in zip(_LATENCY_LABELS, self.buckets)
+            if count > 0
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "latency": self.latency.to_dict(),
+            "histogram": self.histogram(),
+        }
+
+    def summary(self, operation: str) -> str:
+        line = f"  {operation:<10}{self.count:>8}"
+        if self.latency.calls == 0:
+            return line
+
+        average = self.latency.seconds / self.latency.calls * 1000
+        maximum = self.latency.max_seconds * 1000
+        histogram = ", ".join(f"{label}: {n}" for label, n in self.histogram().items())
+        return f"{line}  avg {average:8.1f} ms  max {maximum:8.1f} ms  {histogram}"
+
+
+class RunReport:
+    """
+    Collects timings and counters of a single run of hpc-rocket and converts them into a JSON report.
+    All durations are taken with a monotonic clock.
+    Recording is thread-safe, as background tasks of the WatchStage record concurrently.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._stages: List[Dict[str, Any]] = []
+        self._timings: Dict[str, _Timing] = {}
+        self._counters: Dict[str, int] = {}
+        self._values: Dict[str, Any] = {}
+        self._round_trips: Dict[str, _RoundTrips] = {}
+
+    def now(self) -> float:
+        """
+        Returns the current time of the report's monotonic clock
+        """
+        return self._clock()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """
+        Adds the time spent in the `with` block to the timing with the given name, even if the block raises
+
+        Args:
+            name (str): The name of the timing, e.g. "remote.stat_many"
+        """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add_timing(name, self._clock() - start)
+
+    def add_timing(self, name: str, seconds: float, calls: int = 1) -> None:
+        """
+        Adds a duration to a timing
+
+        Args:
+            name (str): The name of the timing
+            seconds (float): The duration
+            calls (int): The number of calls the duration covers
+        """
+        with self._lock:
+            self._timings.setdefault(name, _Timing()).add(seconds, calls)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Increases a counter
+
+        Args:
+            name (str): The name of the counter, e.g. "bytes_transferred"
+            amount (int): The amount to add
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def count_round_trip(self, operation: str) -> None:
+        """
+        Counts a request that was sent to the remote machine and has to wait for its response
+
+        Args:
+            operation (str): The kind of request, e.g. "exec" or "stat"
+        """
+        with self._lock:
+            self._round_trips.setdefault(operation, _RoundTrips()).count += 1
+
+    def add_latency(self, operation: str, seconds: float) -> None:
+        """
+        Adds the time between sending a request and receiving its response to the latency histogram of the operation.
+        Pipelined requests overlap, so their latencies add up to more than the time spent.
+
+        Args:
+            operation (str): The kind of request
+            seconds (float): The latency of the request
+        """
+        with self._lock:
+            self._round_trips.setdefault(operation, _RoundTrips()).add_latency(seconds)
+
+    def round_trips(self) -> Dict[str, int]:
+        """
+        Returns the number of round trips by operation
+
+        Returns:
+            dict[str, int]
+        """
+        with self._lock:
+            return {
+                operation: round_trips.count
+                for operation, round_trips in sorted(self._round_trips.items())
+            }
+
+    def set(self, name: str, value: Any) -> None:
+        """
+        Records a single JSON serializable value, e.g. the ID of the job
+
+        Args:
+            name (str): The name of the value
+            value (Any): The value
+        """
+        with self._lock:
+            self._values[name] = value
+
+    def stage_finished(self, stage: str, seconds: float, success: bool) -> None:
+        """
+        Records a stage of the workflow that ran
+
+        Args:
+            stage (str): The name of the stage
+            seconds (float): The time the stage took
+            success (bool): Whether the stage completed successfully
+        """
+        with self._lock:
+            self._stages.append(
+                {"stage": stage, "seconds": round(seconds, 6), "success": success}
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the recorded data into a JSON serializable dictionary
+
+        Returns:
+            dict[str, Any]
+        """
+        with self._lock:
+            return {
+                "total_seconds": round(self._clock() - self._started, 6),
+                "stages": list(self._stages),
+                "timings": {
+                    name: timing.to_dict()
+                    for name, timing in sorted(self._timings.items())
+                },
+                "counters": dict(sorted(self._counters.items())),
+                "values": dict(sorted(self._values.items())),
+                "round_trips": {
+                    operation: round_trips.to_dict()
+                    for operation, round_trips in sorted(self._round_trips.items())
+                },
+            }
+
+    def summary(self) -> List[str]:
+        """
+        Summarizes the stages and the round trips to the remote machine in human readable lines
+
+        Returns:
+            list[str]
+        """
+        with self._lock:
+            total = sum(round_trips.count for round_trips in self._round_trips.values())
+            lines = [
+                f"{stage['stage']}: {stage['seconds']:.3f} s" for stage in self._stages
+            ]
+            lines.append(f"Round trips: {total}")
+            lines.extend(
+                round_trips.summary(operation)
+                for operation, round_trips in sorted(self._round_trips.items())
+            )
+            return lines
+
+    def write(self, path: str) -> None:
+        """
+        Writes the report as JSON file
+
+        Args:
+            path (str): The path of the report file
+        """
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
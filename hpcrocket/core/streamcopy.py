@@ -0,0 +1,202 @@
+import errno
+import os
+import posixpath
+import stat
+import sys
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from hpcrocket.core.filesystem import Filesystem, ProgressCallback
+
+_CHUNK_SIZE = 1024 * 1024
+_KERNEL_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Errors the kernel reports before copying anything if it cannot copy between the two files
+_KERNEL_COPY_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+}
+
+KernelCopy = Callable[[int, int, int], int]
+
+ModeLookup = Callable[[str], Optional[int]]
+
+
+def _is_glob(path: str) -> bool:
+    return "*" in path
+
+
+def _glob_root(pattern: str) -> str:
+    """
+    Returns the part of a glob pattern up to the last separator before the first wildcard
+    """
+    end = pattern.rfind("/", 0, pattern.find("*")) + 1
+    return pattern[:end]
+
+
+def _is_dir(filesystem: Filesystem, path: str) -> bool:
+    return bool(filesystem.exists(path)) and filesystem.stat(path).is_dir
+
+
+def _files_below(
+    filesystem: Filesystem, pattern: str, root: str, target: str
+) -> Iterator[Tuple[str, str]]:
+    for match in filesystem.glob(pattern):
+        if filesystem.stat(match).is_dir:
+            continue
+
+        start = len(root)
+        relative = match[start:].lstrip("/")
+        yield match, posixpath.join(target, relative)
+
+
+def _file_pairs(
+    source_fs: Filesystem, source: str, target_fs: Filesystem, target: str
+) -> Iterator[Tuple[str, str]]:
+    if _is_glob(source):
+        yield from _files_below(source_fs, source, _glob_root(source), target)
+        return
+
+    if source_fs.stat(source).is_dir:
+        root = source.rstrip("/") + "/"
+        # A trailing wildcard matches everything below the directory
+        yield from _files_below(source_fs, root + "*", root, target)
+        return
+
+    if target.endswith("/") or _is_dir(target_fs, target):
+        target = posixpath.join(target, posixpath.basename(source))
+
+    yield source, target
+
+
+def _regular_file_descriptor(file: BinaryIO) -> Optional[int]:
+    try:
+        descriptor = file.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    return descriptor if stat.S_ISREG(os.fstat(descriptor).st_mode) else None
+
+
+def _copy_file_range(source: int, target: int, count: int) -> int:
+    return os.copy_file_range(source, target, count)
+
+
+def _sendfile(source: int, target: int, count: int) -> int:
+    return os.sendfile(target, source, None, count)
+
+
+def _kernel_copies() -> List[KernelCopy]:
+    copies: List[KernelCopy] = []
+    if hasattr(os, "copy_file_range"):
+        copies.append(_copy_file_range)
+
+    # Only Linux can send a file to another regular file
+    if sys.platform.startswith("linux"):
+        copies.append(_sendfile)
+
+    return copies
+
+
+def _kernel_copy(
+    source: int, target: int, progress: Optional[ProgressCallback]
+) -> bool:
+    """
+    Copies the rest of a file inside the kernel, without passing the data through Python.
+    Returns False if the kernel cannot copy between the files, in which case nothing was copied.
+    """
+    for kernel_copy in _kernel_copies():
+        try:
+            copied = kernel_copy(source, target, _KERNEL_CHUNK_SIZE)
+        except OSError as error:
+            if error.errno in _KERNEL_COPY_UNSUPPORTED:
+                continue
+
+            raise
+
+        while copied:
+            if progress is not None:
+                progress(copied)
+
+            copied = kernel_copy(source, target, _KERNEL_CHUNK_SIZE)
+
+        return True
+
+    return False
+
+
+def _copy_stream(
+    source_file: BinaryIO, target_file: BinaryIO, progress: Optional[ProgressCallback]
+) -> None:
+    while True:
+        chunk = source_file.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        target_file.write(chunk)
+        if progress is not None:
+            progress(len(chunk))
+
+
+def _transfer(
+    source_fs: Filesystem,
+    source: str,
+    target_fs: Filesystem,
+    target: str,
+    mode: Optional[int],
+    progress: Optional[ProgressCallback],
+) -> None:
+    with source_fs.openbin(source) as source_file:
+        with target_fs.openwrite(target, mode) as target_file:
+            source_descriptor = _regular_file_descriptor(source_file)
+            target_descriptor = _regular_file_descriptor(target_file)
+            # Both files were just opened, so nothing is buffered yet and the descriptors can be used directly
+            if source_descriptor is not None and target_descriptor is not None:
+                if _kernel_copy(source_descriptor, target_descriptor, progress):
+                    return
+
+            _copy_stream(source_file, target_file, progress)
+
+
+def copy_between(
+    source_fs: Filesystem,
+    source: str,
+    target_fs: Filesystem,
+    target: str,
+    overwrite: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    mode_of: Optional[ModeLookup] = None,
+) -> None:
+    """
+    Copies files between Filesystems of different kinds by streaming them through `openbin` and `openwrite`.
+    Files that are both regular files on the local machine are copied inside the kernel with `copy_file_range` or `sendfile`.
+    Follows the rules of `Filesystem.copy`: glob patterns and directories are copied file by file into `target`,
+    a single file is placed inside `target` if it is a directory or ends with a slash.
+
+    Args:
+        source_fs (Filesystem): The filesystem to copy from
+        source (str): The path of a file or directory or a glob pattern, with the home directory already expanded
+        target_fs (Filesystem): The filesystem to copy to
+        target (str): The path of the copy
+        overwrite (bool): Replaces existing files
+        progress (ProgressCallback): Called with the number of bytes copied after every chunk
+        mode_of (Callable[[str], Optional[int]]): Looks up the permission bits of a source file to give them to the copy
+
+    Raises:
+        FileNotFoundError: The source does not exist
+        FileExistsError: A target file already exists and overwrite is False
+        RuntimeError: One of the filesystems does not support binary streams
+    """
+    for filesystem in (source_fs, target_fs):
+        if not filesystem.supports_streams():
+            raise RuntimeError(f"{type(filesystem).__name__} does not support binary streams")
+
+    for source_file, target_file in _file_pairs(source_fs, source, target_fs, target):
+        if not overwrite and target_fs.exists(target_file):
+            raise FileExistsError(target_file)
+
+        mode = mode_of(source_file) if mode_of is not None else None
+        _transfer(source_fs, source_file, target_fs, target_file, mode, progress)
@@ -0,0 +1,154 @@
+import os
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, NamedTuple, Tuple
+
+from hpcrocket.core.filesystem import Filesystem
+
+if TYPE_CHECKING:
+    from hpcrocket.core.progressive_file_operations import CopyInstruction
+
+
+class PlannedCopy(NamedTuple):
+    """
+    A copy operation of a single file or directory without glob patterns
+    """
+
+    source: str
+    destination: str
+    size: int
+    overwrite: bool = False
+    preserve_mode: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PlannedCopy":
+        return cls(
+            str(data["source"]),
+            str(data["destination"]),
+            int(data["size"]),
+            bool(data.get("overwrite", False)),
+            bool(data.get("preserve_mode", True)),
+        )
+
+
+@dataclass
+class TransferPlan:
+    """
+    The copy operations resulting from a list of CopyInstructions, largest files first.
+    Sources that could not be resolved are kept in `missing`.
+    """
+
+    copies: List[PlannedCopy] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(copy.size for copy in self.copies)
+
+    @property
+    def errors(self) -> List[Exception]:
+        return [FileNotFoundError(path) for path in self.missing]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the plan into a JSON serializable dictionary
+
+        Returns:
+            dict[str, Any]
+        """
+        return {
+            "copies": [copy._asdict() for copy in self.copies],
+            "missing": list(self.missing),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "TransferPlan":
+        """
+        Restores a plan created by `to_dict`
+
+        Args:
+            data (Mapping[str, Any]): The dictionary returned by `to_dict`
+
+        Returns:
+            TransferPlan
+
+        Raises:
+            KeyError: If a copy lacks a required field
+        """
+        return cls(
+            [PlannedCopy.from_dict(copy) for copy in data.get("copies", [])],
+            [str(path) for path in data.get("missing", [])],
+        )
+
+
+def _missing_path(error: FileNotFoundError) -> str:
+    return str(error.args[0]) if error.args else str(error)
+
+
+def _key(instruction: "CopyInstruction") -> Tuple[str, str]:
+    return os.path.normpath(instruction.source), os.path.normpath(
+        instruction.destination
+    )
+
+
+def _expand(
+    filesystem: Filesystem, instructions: List["CopyInstruction"], missing: List[str]
+) -> Dict[Tuple[str, str], "CopyInstruction"]:
+    unique: Dict[Tuple[str, str], "CopyInstruction"] = {}
+    for instruction in instructions:
+        try:
+            files = instruction.unglob(filesystem)
+        except FileNotFoundError as err:
+            missing.append(_missing_path(err))
+            continue
+
+        for file in files:
+            key = _key(file)
+            duplicate = unique.get(key)
+            if duplicate is not None:
+                # Copying the same file twice would fail with FileExistsError unless overwrite is set
+                file = duplicate._replace(
+                    overwrite=duplicate.overwrite or file.overwrite
+                )
+
+            unique[key] = file
+
+    return unique
+
+
+def plan_transfer(
+    filesystem: Filesystem, instructions: List["CopyInstruction"]
+) -> TransferPlan:
+    """
+    Expands glob patterns, drops duplicate source/destination pairs and orders the copies largest first,
+    so that a large file does not end up being transferred last.
+    Every source is globbed once and all sources are stat'ed in a single bulk lookup (see `Filesystem.stat_many`),
+    the resulting plan only contains concrete paths.
+
+    Args:
+        filesystem (Filesystem): The filesystem the files are copied from
+        instructions (list[CopyInstruction]): The copy instructions, may contain glob patterns
+
+    Returns:
+        TransferPlan: The planned copies and every source that does not exist
+    """
+    plan = TransferPlan()
+    with filesystem.batch():
+        files = list(_expand(filesystem, instructions, plan.missing).values())
+        infos = filesystem.stat_many([file.source for file in files])
+        for file, info in zip(files, infos):
+            if info is None:
+                plan.missing.append(file.source)
+                continue
+
+            plan.copies.append(
+                PlannedCopy(
+                    file.source,
+                    file.destination,
+                    info.size,
+                    file.overwrite,
+                    file.preserve_mode,
+                )
+            )
+
+    plan.copies.sort(key=lambda copy: copy.size, reverse=True)
+    return plan
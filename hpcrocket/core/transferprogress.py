@@ -0,0 +1,100 @@
+import time
+from collections import deque
+from typing import Callable, Deque, NamedTuple, Optional, Tuple
+
+# Throughput is averaged over this many seconds, so stalls show up quickly
+_THROUGHPUT_WINDOW = 5.0
+
+
+class TransferProgress(NamedTuple):
+    """
+    The state of a running file transfer
+    """
+
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    throughput: float
+    eta: Optional[float]
+
+    @property
+    def finished(self) -> bool:
+        return self.files_done >= self.files_total
+
+
+ProgressListener = Callable[[TransferProgress], None]
+
+
+class ProgressTracker:
+    """
+    Accumulates the bytes and files transferred by the copy engine and reports the progress to a listener
+    """
+
+    def __init__(
+        self,
+        listener: ProgressListener,
+        files_total: int,
+        bytes_total: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._listener = listener
+        self._files_total = files_total
+        self._bytes_total = bytes_total
+        self._clock = clock
+        self._files_done = 0
+        self._bytes_done = 0
+        self._samples: Deque[Tuple[float, int]] = deque([(clock(), 0)])
+
+    def transferred(self, byte_count: int) -> None:
+        """
+        Records transferred bytes. Can be used as progress callback of Filesystem.copy
+
+        Args:
+            byte_count (int): The number of bytes transferred since the last call
+        """
+        self._bytes_done += byte_count
+        self._add_sample()
+        self._listener(self.progress())
+
+    def file_done(self) -> None:
+        """
+        Records a completely transferred file
+        """
+        self._files_done += 1
+        self._listener(self.progress())
+
+    def progress(self) -> TransferProgress:
+        """
+        Returns the current progress
+
+        Returns:
+            TransferProgress
+        """
+        throughput = self._throughput()
+        remaining = max(self._bytes_total - self._bytes_done, 0)
+        eta = remaining / throughput if throughput > 0 else None
+        return TransferProgress(
+            self._files_done,
+            max(self._files_total, self._files_done),
+            self._bytes_done,
+            max(self._bytes_total, self._bytes_done),
+            throughput,
+            eta,
+        )
+
+    def _add_sample(self) -> None:
+        now = self._clock()
+        self._samples.append((now, self._bytes_done))
+        while (
+            len(self._samples) > 2 and now - self._samples[1][0] >= _THROUGHPUT_WINDOW
+        ):
+            self._samples.popleft()
+
+    def _throughput(self) -> float:
+        oldest_time, oldest_bytes = self._samples[0]
+        elapsed = self._clock() - oldest_time
+        if elapsed <= 0:
+            return 0.0
+
+        return (self._bytes_done - oldest_bytes) / elapsed
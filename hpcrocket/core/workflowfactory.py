@@ -1,4 +1,4 @@
-from typing import Any, Callable, Dict, Type
+from typing import Any, Callable, Dict, Optional, Type
 
 import hpcrocket.core.workflows as workflows
 from hpcrocket.core.filesystem import FilesystemFactory
@@ -9,25 +9,27 @@ from hpcrocket.core.launchoptions import (
     SimpleJobOptions,
     WatchOptions,
 )
+from hpcrocket.core.runreport import RunReport
 from hpcrocket.core.slurmcontroller import SlurmController
 from hpcrocket.core.workflows.workflow import Workflow
 
 
 def _simple_option_workflow_builder(
-    controller: SlurmController, simple_options: SimpleJobOptions
+    controller: SlurmController,
+    simple_options: SimpleJobOptions,
+    report: Optional[RunReport],
 ) -> Workflow:
     if simple_options.action == SimpleJobOptions.Action.status:
-        return workflows.statusworkflow(controller, simple_options)
+        return workflows.statusworkflow(controller, simple_options, report)
 
-    return workflows.cancelworkflow(controller, simple_options)
+    return workflows.cancelworkflow(controller, simple_options, report)
 
 
-_SimpleWorkflowBuilder = Callable[[SlurmController, Any], Workflow]
+_SimpleWorkflowBuilder = Callable[[SlurmController, Any, Optional[RunReport]], Workflow]
 _SimpleWorkFlowRegistry = Dict[Type[JobBasedOptions], _SimpleWorkflowBuilder]
 
 _SimpleWorkflows: _SimpleWorkFlowRegistry = {
     SimpleJobOptions: _simple_option_workflow_builder,
-    WatchOptions: workflows.watchworkflow,
 }
 
 
@@ -35,10 +37,14 @@ def make_workflow(
     filesystem_factory: FilesystemFactory,
     controller: SlurmController,
     options: Options,
+    report: Optional[RunReport] = None,
 ) -> Workflow:
     if isinstance(options, LaunchOptions):
-        return workflows.launchworkflow(filesystem_factory, controller, options)
+        return workflows.launchworkflow(filesystem_factory, controller, options, report)
+
+    if isinstance(options, WatchOptions):
+        return workflows.watchworkflow(filesystem_factory, controller, options, report)
 
     option_type = type(options)
     monitoring_workflow_builder = _SimpleWorkflows[option_type]
-    return monitoring_workflow_builder(controller, options)
+    return monitoring_workflow_builder(controller, options, report)
@@ -1,12 +1,17 @@
-from typing import List
+from typing import List, Optional
 
 from hpcrocket.core.filesystem import FilesystemFactory
+from hpcrocket.core.lazyfilesystem import LazyFilesystem
 from hpcrocket.core.launchoptions import SimpleJobOptions, LaunchOptions, WatchOptions
+from hpcrocket.core.outputtail import OutputTail
+from hpcrocket.core.runreport import RunReport
 from hpcrocket.core.slurmbatchjob import SlurmBatchJob
 from hpcrocket.core.slurmcontroller import SlurmController
+from hpcrocket.core.workflows.journal import WorkflowJournal
 from hpcrocket.core.workflows.workflow import Stage, Workflow
 from hpcrocket.core.workflows.stages import (
     CancelStage,
+    DryRunStage,
     FinalizeStage,
     PrepareStage,
     LaunchStage,
@@ -20,37 +25,104 @@ def launchworkflow(
     filesystem_factory: FilesystemFactory,
     controller: SlurmController,
     options: LaunchOptions,
+    report: Optional[RunReport] = None,
 ) -> Workflow:
-    launch_stage = LaunchStage(controller, options.sbatch)
+    if options.dry_run:
+        return Workflow(
+            [DryRunStage(filesystem_factory, options.copy_files)], report=report
+        )
+
+    journal = _open_journal(options)
+    launch_stage = LaunchStage(
+        controller, options.sbatch, journal.checkpoint("launch")
+    )
     stages: List[Stage] = [
-        PrepareStage(filesystem_factory, options.copy_files),
+        PrepareStage(
+            filesystem_factory,
+            options.copy_files,
+            options.remote_copy_files,
+            journal.checkpoint("prepare"),
+        ),
         launch_stage,
     ]
 
     if options.watch:
-        stages.append(
-            WatchStage(
-                launch_stage, options.poll_interval, options.continue_if_job_fails
-            )
+        finalize_stage = FinalizeStage(
+            filesystem_factory,
+            options.collect_files,
+            options.clean_files,
+            journal.checkpoint("finalize"),
         )
+
+        background_tasks: List[WatchStage.BackgroundTask] = []
+        if options.collect_interval is not None:
+            background_tasks.append(
+                finalize_stage.incremental_collector(options.collect_interval)
+            )
+
+        if options.tail_files:
+            background_tasks.append(
+                OutputTail(
+                    LazyFilesystem(filesystem_factory.create_ssh_filesystem),
+                    options.tail_files,
+                    options.poll_interval,
+                    lambda: launch_stage.get_batch_job().jobid,
+                )
+            )
+
         stages.append(
-            FinalizeStage(
-                filesystem_factory, options.collect_files, options.clean_files
+            WatchStage(
+                launch_stage,
+                options.poll_interval,
+                options.continue_if_job_fails,
+                background_tasks,
+                report,
             )
         )
+        stages.append(finalize_stage)
 
-    return Workflow(stages)
+    return Workflow(stages, journal, report)
 
 
-def statusworkflow(controller: SlurmController, options: SimpleJobOptions) -> Workflow:
-    return Workflow([StatusStage(controller, options.jobid)])
+def _open_journal(options: LaunchOptions) -> WorkflowJournal:
+    if options.state_file is None:
+        return WorkflowJournal()
 
+    if options.resume:
+        return WorkflowJournal.load(options.state_file)
 
-def cancelworkflow(controller: SlurmController, options: SimpleJobOptions) -> Workflow:
-    return Workflow([CancelStage(controller, options.jobid)])
+    arguments = {
+        "configfile": options.configfile,
+        "watch": options.watch,
+        "tail": options.tail_files,
+    }
+    journal = WorkflowJournal(options.state_file, {"arguments": arguments})
+    journal.save()
+    return journal
 
 
-def watchworkflow(controller: SlurmController, options: WatchOptions) -> Workflow:
+def statusworkflow(
+    controller: SlurmController,
+    options: SimpleJobOptions,
+    report: Optional[RunReport] = None,
+) -> Workflow:
+    return Workflow([StatusStage(controller, options.jobid)], report=report)
+
+
+def cancelworkflow(
+    controller: SlurmController,
+    options: SimpleJobOptions,
+    report: Optional[RunReport] = None,
+) -> Workflow:
+    return Workflow([CancelStage(controller, options.jobid)], report=report)
+
+
+def watchworkflow(
+    filesystem_factory: FilesystemFactory,
+    controller: SlurmController,
+    options: WatchOptions,
+    report: Optional[RunReport] = None,
+) -> Workflow:
     class SimpleBatchJobProvider:
         def get_batch_job(self) -> SlurmBatchJob:
             return SlurmBatchJob(controller, options.jobid)
@@ -58,4 +130,25 @@ def watchworkflow(controller: SlurmController, options: WatchOptions) -> Workflo
         def cancel(self, ui: UI) -> None:
             pass
 
-    return Workflow([WatchStage(SimpleBatchJobProvider(), options.poll_interval)])
+    background_tasks: List[WatchStage.BackgroundTask] = []
+    if options.tail_files:
+        background_tasks.append(
+            OutputTail(
+                LazyFilesystem(filesystem_factory.create_ssh_filesystem),
+                options.tail_files,
+                options.poll_interval,
+                lambda: options.jobid,
+            )
+        )
+
+    return Workflow(
+        [
+            WatchStage(
+                SimpleBatchJobProvider(),
+                options.poll_interval,
+                background_tasks=background_tasks,
+                report=report,
+            )
+        ],
+        report=report,
+    )
@@ -0,0 +1,186 @@
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+_VERSION = 1
+
+
+def _no_save() -> None:
+    pass
+
+
+class Checkpoint:
+    """
+    The progress a single stage records in a workflow's journal.
+    Every recorded value is saved right away, so it survives if the process is killed afterwards.
+    """
+
+    def __init__(
+        self,
+        state: Optional[Dict[str, Any]] = None,
+        save: Callable[[], None] = _no_save,
+    ) -> None:
+        self._state: Dict[str, Any] = {} if state is None else state
+        self._save = save
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns a value recorded by an earlier run
+
+        Args:
+            key (str): The name of the value
+            default (Any): The value returned if nothing was recorded
+
+        Returns:
+            Any
+        """
+        return self._state.get(key, default)
+
+    def record(self, **values: Any) -> None:
+        """
+        Records JSON serializable values and saves the journal
+
+        Args:
+            values (Any): The values by name
+        """
+        self._state.update(values)
+        self._save()
+
+
+class WorkflowJournal:
+    """
+    Keeps track of the finished stages of a workflow and the progress of its stages in a JSON state file.
+    A workflow that was interrupted can be resumed from the journal, finished stages are skipped then.
+    Without a path the journal is only kept in memory.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, state: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._path = path
+        self._state: Dict[str, Any] = state or {}
+        self._state.setdefault("version", _VERSION)
+        self._state.setdefault("arguments", {})
+        self._state.setdefault("finished_stages", [])
+        self._state.setdefault("stages", {})
+
+    @classmethod
+    def read(cls, file: TextIO, path: str) -> "WorkflowJournal":
+        """
+        Reads a journal that was saved before
+
+        Args:
+            file (TextIO): The opened state file
+            path (str): The path new progress is saved to
+
+        Returns:
+            WorkflowJournal
+
+        Raises:
+            ValueError: If the file is not a state file of a supported version
+        """
+        state = json.load(file)
+        if not isinstance(state, dict) or state.get("version") != _VERSION:
+            raise ValueError(f"{path} is not a valid hpc-rocket state file")
+
+        return cls(path, state)
+
+    @classmethod
+    def load(cls, path: str) -> "WorkflowJournal":
+        """
+        Loads a journal from a state file
+
+        Args:
+            path (str): The path to the state file
+
+        Returns:
+            WorkflowJournal
+
+        Raises:
+            FileNotFoundError: If the state file does not exist
+            ValueError: If the file is not a state file of a supported version
+        """
+        with open(path) as file:
+            return cls.read(file, path)
+
+    @property
+    def arguments(self) -> Dict[str, Any]:
+        """
+        The arguments needed to create the workflow again when it is resumed
+        """
+        return dict(self._state["arguments"])
+
+    @property
+    def finished_stages(self) -> List[str]:
+        """
+        The names of the stages that finished, in the order they ran
+        """
+        return list(self._state["finished_stages"])
+
+    def checkpoint(self, stage: str) -> Checkpoint:
+        """
+        Returns the part of the journal a stage records its progress in
+
+        Args:
+            stage (str): The name of the stage
+
+        Returns:
+            Checkpoint
+        """
+        state = self._state["stages"].setdefault(stage, {})
+        return Checkpoint(state, self.save)
+
+    def is_finished(self, index: int, stage: str) -> bool:
+        """
+        Checks if a stage finished in an earlier run
+
+        Args:
+            index (int): The position of the stage in the workflow
+            stage (str): The name of the stage
+
+        Returns:
+            bool
+
+        Raises:
+            ValueError: If a different stage finished at this position, i.e. the journal belongs to another workflow
+        """
+        finished = self._state["finished_stages"]
+        if index >= len(finished):
+            return False
+
+        if finished[index] != stage:
+            raise ValueError(
+                f"The state file does not match the workflow: expected {finished[index]}, got {stage}"
+            )
+
+        return True
+
+    def finish_stage(self, stage: str) -> None:
+        """
+        Records that the next stage of the workflow finished and saves the journal
+
+        Args:
+            stage (str): The name of the stage
+        """
+        self._state["finished_stages"].append(stage)
+        self.save()
+
+    def save(self) -> None:
+        """
+        Writes the journal to its state file.
+        The file is replaced at once, so it never contains a partially written journal.
+        """
+        if self._path is None:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(self._state, file, indent=2)
+
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -1,16 +1,25 @@
-from typing import List, Optional, Tuple, cast
+import time
+from typing import List, Optional, Sequence, Set, Tuple, cast
 
 from hpcrocket.core.progressive_file_operations import (
     CopyInstruction,
-    progressive_copy,
+    RemoteCopyInstruction,
+    execute_transfer_plan,
     progressive_clean,
+    progressive_remote_copy,
 )
 from hpcrocket.core.errors import get_error_message
 from hpcrocket.core.filesystem import FilesystemFactory
+from hpcrocket.core.incrementalcollector import IncrementalCollector
+from hpcrocket.core.lazyfilesystem import LazyFilesystem
+from hpcrocket.core.runreport import RunReport
 from hpcrocket.core.slurmbatchjob import SlurmBatchJob, SlurmJobStatus
 from hpcrocket.core.slurmcontroller import SlurmController
+from hpcrocket.core.transferplan import TransferPlan, plan_transfer
+from hpcrocket.core.transferprogress import ProgressTracker
+from hpcrocket.core.workflows.journal import Checkpoint
 from hpcrocket.typesafety import get_or_raise
-from hpcrocket.ui import UI
+from hpcrocket.ui import UI, format_bytes
 from hpcrocket.watcher.jobwatcher import (
     JobWatcher,
     NotWatchingError,
@@ -23,6 +32,9 @@ except ImportError:  # pragma: no cover
     from typing_extensions import Protocol  # type: ignore
 
 
+_RECORD_INTERVAL = 1.0
+
+
 class NoJobLaunchedError(Exception):
     pass
 
@@ -32,22 +44,53 @@ def _log_errors(errors: List[Exception], ui: UI) -> None:
         ui.error(get_error_message(error))
 
 
+def _progress_tracker(plan: TransferPlan, ui: UI) -> ProgressTracker:
+    return ProgressTracker(ui.progress, len(plan.copies), plan.total_bytes)
+
+
+def _resumed_plan(plan: TransferPlan, copied: Set[str], new: Set[str]) -> TransferPlan:
+    # A new file that was not recorded as copied may have been partially written by the interrupted run
+    copies = [
+        copy._replace(overwrite=copy.overwrite or copy.destination in new)
+        for copy in plan.copies
+        if copy.destination not in copied
+    ]
+
+    return TransferPlan(copies, plan.missing)
+
+
 class LaunchStage:
     """
     Launches a batch job.
     Implements the BatchJobProvider protocol to work with WatchStage.
     """
 
-    def __init__(self, controller: SlurmController, batch_script: str) -> None:
+    def __init__(
+        self,
+        controller: SlurmController,
+        batch_script: str,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> None:
         self._controller = controller
         self._batch_script = batch_script
+        self._checkpoint = checkpoint or Checkpoint()
         self._batch_job: Optional[SlurmBatchJob] = None
 
+        jobid = self._checkpoint.get("jobid")
+        if jobid is not None:
+            self._batch_job = SlurmBatchJob(controller, jobid)
+
     def allowed_to_fail(self) -> bool:
         return False
 
     def __call__(self, ui: UI) -> bool:
+        if self._batch_job is not None:
+            # The job was submitted before the workflow was interrupted
+            ui.info(f"Resuming job {self._batch_job.jobid}")
+            return True
+
         self._batch_job = self._controller.submit(self._batch_script)
+        self._checkpoint.record(jobid=self._batch_job.jobid)
         ui.launch(f"Launched job {self._batch_job.jobid}")
 
         return True
@@ -90,16 +133,37 @@ class WatchStage:
             """
             ...
 
+    class BackgroundTask(Protocol):
+        def start(self, ui: UI) -> None:
+            """
+            Starts the task when the WatchStage begins watching
+
+            Args:
+                ui (UI): The UI instance WatchStage was called with
+            """
+            ...
+
+        def stop(self) -> None:
+            """
+            Stops the task and waits for it to finish
+            """
+            ...
+
     def __init__(
         self,
         batch_job_provider: BatchJobProvider,
         poll_interval: int,
         allowed_to_fail: bool = False,
+        background_tasks: Sequence[BackgroundTask] = (),
+        report: Optional[RunReport] = None,
     ) -> None:
         self._poll_interval = poll_interval
         self._provider = batch_job_provider
+        self._background_tasks = background_tasks
+        self._report = report
         self._watcher: Optional[JobWatcher] = None
         self._job_status: Optional[SlurmJobStatus] = None
+        self._started_running: Optional[float] = None
 
         self._allowed_to_fail = allowed_to_fail
 
@@ -109,43 +173,95 @@ class WatchStage:
     def __call__(self, ui: UI) -> bool:
         batch_job = self._provider.get_batch_job()
         self._watcher = batch_job.get_watcher()
-        self._watcher.watch(self._get_callback(ui), self._poll_interval)
-        self._watcher.wait_until_done()
+        for task in self._background_tasks:
+            task.start(ui)
+
+        try:
+            self._watcher.watch(self._get_callback(ui), self._poll_interval)
+            self._watcher.wait_until_done()
+        finally:
+            self._stop_background_tasks()
+            self._report_job(batch_job)
 
         return self._job_status is not None and self._job_status.success
 
     def _get_callback(self, ui: UI) -> SlurmJobStatusCallback:
+        watch_started = self._report.now() if self._report else 0.0
+
         def callback(new_status: SlurmJobStatus) -> None:
             self._job_status = new_status
+            if (
+                self._report
+                and self._started_running is None
+                and not new_status.is_pending
+            ):
+                # The job left the queue
+                self._started_running = self._report.now()
+                self._report.set(
+                    "job.queue_seconds", self._started_running - watch_started
+                )
+
             ui.update(new_status)
 
         return callback
 
+    def _report_job(self, batch_job: SlurmBatchJob) -> None:
+        if self._report is None:
+            return
+
+        self._report.set("job.id", batch_job.jobid)
+        if self._job_status is not None:
+            self._report.set("job.state", self._job_status.state)
+
+        if self._started_running is not None:
+            self._report.set(
+                "job.run_seconds", self._report.now() - self._started_running
+            )
+
     def cancel(self, ui: UI) -> None:
         get_or_raise(self._watcher, NotWatchingError).stop()
+        self._stop_background_tasks()
         self._provider.cancel(ui)
 
+    def _stop_background_tasks(self) -> None:
+        for task in self._background_tasks:
+            task.stop()
+
 
 class PrepareStage:
     """
     Copies the given files to the target filesystem.
+    Remote copy instructions are executed on the target filesystem afterwards.
+    Copied files are recorded in the checkpoint, so a resumed stage only copies the remaining files.
+    The remote filesystem is connected on first use and closed when the stage is done.
     """
 
     def __init__(
         self,
         filesystem_factory: FilesystemFactory,
         copy_instructions: List[CopyInstruction],
+        remote_copy_instructions: Sequence[RemoteCopyInstruction] = (),
+        checkpoint: Optional[Checkpoint] = None,
     ) -> None:
         self._local_fs = filesystem_factory.create_local_filesystem()
-        self._remote_fs = filesystem_factory.create_ssh_filesystem()
+        self._remote_fs = LazyFilesystem(filesystem_factory.create_ssh_filesystem)
         self._files = copy_instructions
+        self._remote_copy_instructions = list(remote_copy_instructions)
+        self._checkpoint = checkpoint or Checkpoint()
+        self._last_record = 0.0
 
     def allowed_to_fail(self) -> bool:
         return False
 
     def __call__(self, ui: UI) -> bool:
+        try:
+            return self._copy_files(ui)
+        finally:
+            self._remote_fs.close()
+
+    def _copy_files(self, ui: UI) -> bool:
         ui.info("Copying files...")
-        copied_files, errors = self._try_copy_files()
+        copied_files, errors = self._try_copy_files(ui)
 
         if errors:
             _log_errors(errors, ui)
@@ -158,20 +274,90 @@ class PrepareStage:
     def cancel(self, ui: UI) -> None:
         pass
 
-    def _try_copy_files(self) -> Tuple[List[str], List[Exception]]:
-        copied_files: List[str] = []
+    def _try_copy_files(self, ui: UI) -> Tuple[List[str], List[Exception]]:
+        copied_files: List[str] = list(self._checkpoint.get("copied_files", []))
         errors: List[Exception] = []
-        for cr in progressive_copy(self._local_fs, self._remote_fs, self._files):
-            copied_files.extend(cr.copied_files)
-            if cr.errors:
+        with self._local_fs.batch(), self._remote_fs.batch():
+            plan, remote_copies = self._remaining_copies(set(copied_files))
+            for cr in execute_transfer_plan(
+                self._local_fs,
+                self._remote_fs,
+                plan,
+                progress=_progress_tracker(plan, ui),
+            ):
+                copied_files.extend(cr.copied_files)
                 errors.extend(cr.errors)
-                break
+                self._record_copied_files(copied_files)
+
+        self._record_copied_files(copied_files, force=True)
+        if errors:
+            return copied_files, errors
+
+        for cr in progressive_remote_copy(self._remote_fs, remote_copies):
+            copied_files.extend(cr.copied_files)
+            errors.extend(cr.errors)
+            self._record_copied_files(copied_files, force=True)
 
         return copied_files, errors
 
+    def _remaining_copies(
+        self, copied: Set[str]
+    ) -> Tuple[TransferPlan, List[RemoteCopyInstruction]]:
+        plan = plan_transfer(self._local_fs, self._files)
+        remote_copies = self._remote_copy_instructions
+        if self._checkpoint.get("planned_files"):
+            new = set(self._checkpoint.get("new_files", []))
+            plan = _resumed_plan(plan, copied, new)
+            remote_copies = [
+                instruction._replace(
+                    overwrite=instruction.overwrite or instruction.destination in new
+                )
+                for instruction in remote_copies
+                if instruction.destination not in copied
+            ]
+        else:
+            destinations = [copy.destination for copy in plan.copies]
+            destinations.extend(
+                instruction.destination for instruction in remote_copies
+            )
+            self._checkpoint.record(
+                planned_files=destinations,
+                new_files=self._new_destinations(plan, remote_copies),
+            )
+
+        return plan, remote_copies
+
+    def _new_destinations(
+        self, plan: TransferPlan, remote_copies: List[RemoteCopyInstruction]
+    ) -> List[str]:
+        # Only files that did not exist before may be overwritten when the run is resumed.
+        # Destinations that are overwritten anyway need not be looked up.
+        destinations = [copy.destination for copy in plan.copies if not copy.overwrite]
+        destinations.extend(
+            instruction.destination
+            for instruction in remote_copies
+            if not instruction.overwrite
+        )
+        exists = self._remote_fs.exists_many(destinations)
+        return [
+            destination
+            for destination, destination_exists in zip(destinations, exists)
+            if not destination_exists
+        ]
+
+    def _record_copied_files(
+        self, copied_files: List[str], force: bool = False
+    ) -> None:
+        # Saving the journal after every small file would take longer than copying it
+        now = time.monotonic()
+        if force or now - self._last_record >= _RECORD_INTERVAL:
+            self._checkpoint.record(copied_files=copied_files)
+            self._last_record = now
+
     def _do_rollback(self, files: List[str], ui: UI) -> None:
         ui.info("Performing rollback")
         errors = list(progressive_clean(self._remote_fs, files))
+        self._checkpoint.record(copied_files=[], planned_files=[], new_files=[])
         _log_errors(errors, ui)
         ui.success("Done")
 
@@ -179,6 +365,9 @@ class PrepareStage:
 class FinalizeStage:
     """
     Collects result files from the remote filesystem and cleans it according to the given instructions.
+    The remote filesystem is connected on first use, which is usually when the job has finished,
+    and closed when the stage is done.
+    An incremental collector uses a connection of its own while the job runs and closes it when it is stopped.
     """
 
     def __init__(
@@ -186,27 +375,68 @@ class FinalizeStage:
         filesystem_factory: FilesystemFactory,
         collect_instructions: List[CopyInstruction],
         clean_instructions: List[str],
+        checkpoint: Optional[Checkpoint] = None,
     ) -> None:
         self._local_fs = filesystem_factory.create_local_filesystem()
-        self._remote_fs = filesystem_factory.create_ssh_filesystem()
+        self._create_remote_fs = filesystem_factory.create_ssh_filesystem
+        self._remote_fs = LazyFilesystem(self._create_remote_fs)
         self._files = collect_instructions
         self._clean = clean_instructions
+        self._checkpoint = checkpoint or Checkpoint()
+        self._collector: Optional[IncrementalCollector] = None
+
+    def incremental_collector(self, interval: float) -> IncrementalCollector:
+        """
+        Creates a collector that transfers finished result files while the job is still running.
+        Once a collector was created, this stage only collects the files the collector missed.
+
+        Args:
+            interval (float): The time in seconds between two polls of the result files
+
+        Returns:
+            IncrementalCollector: The collector, usually run as a background task of the WatchStage
+        """
+        self._collector = IncrementalCollector(
+            LazyFilesystem(self._create_remote_fs),
+            self._local_fs,
+            self._files,
+            interval,
+        )
+
+        return self._collector
 
     def allowed_to_fail(self) -> bool:
         return False
 
     def __call__(self, ui: UI) -> bool:
-        self._collect_files(ui)
-        self._clean_files(ui)
+        try:
+            # Files were collected before the workflow was interrupted while cleaning
+            if not self._checkpoint.get("collected", False):
+                self._collect_files(ui)
+                self._checkpoint.record(collected=True)
+
+            self._clean_files(ui)
+        finally:
+            self._remote_fs.close()
 
         return True
 
     def _collect_files(self, ui: UI) -> None:
         ui.info("Collecting files...")
-        for cr in progressive_copy(
-            self._remote_fs, self._local_fs, self._files, abort_on_error=False
-        ):
-            _log_errors(cr.errors, ui)
+        files = self._files
+        if self._collector is not None:
+            files = self._collector.final_delta(self._remote_fs)
+
+        with self._remote_fs.batch(), self._local_fs.batch():
+            plan = plan_transfer(self._remote_fs, files)
+            for cr in execute_transfer_plan(
+                self._remote_fs,
+                self._local_fs,
+                plan,
+                abort_on_error=False,
+                progress=_progress_tracker(plan, ui),
+            ):
+                _log_errors(cr.errors, ui)
 
         ui.success("Done")
 
@@ -220,6 +450,38 @@ class FinalizeStage:
         pass
 
 
+class DryRunStage:
+    """
+    Prints the files a launch would copy to the remote machine without copying them.
+    """
+
+    def __init__(
+        self,
+        filesystem_factory: FilesystemFactory,
+        copy_instructions: List[CopyInstruction],
+    ) -> None:
+        self._local_fs = filesystem_factory.create_local_filesystem()
+        self._files = copy_instructions
+
+    def allowed_to_fail(self) -> bool:
+        return False
+
+    def __call__(self, ui: UI) -> bool:
+        plan = plan_transfer(self._local_fs, self._files)
+        for copy in plan.copies:
+            ui.info(
+                f"{format_bytes(copy.size):>10}  {copy.source} -> {copy.destination}"
+            )
+
+        ui.info(f"{len(plan.copies)} files, {format_bytes(plan.total_bytes)} in total")
+        _log_errors(plan.errors, ui)
+
+        return not plan.errors
+
+    def cancel(self, ui: UI) -> None:
+        pass
+
+
 class StatusStage:
     """
     Checks a job's status.
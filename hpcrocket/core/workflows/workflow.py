@@ -1,5 +1,8 @@
 from typing import List, Optional
 
+from hpcrocket.core.profiling import Profiler
+from hpcrocket.core.runreport import RunReport
+from hpcrocket.core.workflows.journal import WorkflowJournal
 from hpcrocket.typesafety import get_or_raise
 from hpcrocket.ui import UI
 
@@ -44,36 +47,74 @@ class Stage(Protocol):
 
 class Workflow:
     """
-    Represents a series of isolated steps that are executed in order
+    Represents a series of isolated steps that are executed in order.
+    Finished stages are recorded in the journal, stages that finished in an earlier run are skipped.
     """
 
-    def __init__(self, stages: List[Stage]) -> None:
+    def __init__(
+        self,
+        stages: List[Stage],
+        journal: Optional[WorkflowJournal] = None,
+        report: Optional[RunReport] = None,
+    ) -> None:
         self._stages = stages
+        self._journal = journal or WorkflowJournal()
+        self._report = report
         self._active_stage: Optional[Stage] = None
         self._canceled = False
 
-    def run(self, ui: UI) -> bool:
+    def run(self, ui: UI, profiler: Optional[Profiler] = None) -> bool:
         """
         Runs the workflow. Returns true if all stages completed successfully.
 
         Args:
             ui (UI): The ui to send output to.
+            profiler (Profiler): Profiles each stage that runs.
 
         Returns:
             bool
         """
-        for stage in self._stages:
+        for index, stage in enumerate(self._stages):
             self._active_stage = stage
 
             if self._canceled:
                 break
 
-            result = stage(ui)
+            name = type(stage).__name__
+            if self._journal.is_finished(index, name):
+                continue
+
+            result = self._run_profiled_stage(stage, name, ui, profiler)
             if self._workflow_failed(stage, result):
                 return False
 
+            # A canceled stage has to run again when the workflow is resumed
+            if not self._canceled:
+                self._journal.finish_stage(name)
+
         return True
 
+    def _run_profiled_stage(
+        self, stage: Stage, name: str, ui: UI, profiler: Optional[Profiler]
+    ) -> bool:
+        if profiler is None:
+            return self._run_stage(stage, name, ui)
+
+        with profiler.profile(name):
+            return self._run_stage(stage, name, ui)
+
+    def _run_stage(self, stage: Stage, name: str, ui: UI) -> bool:
+        if self._report is None:
+            return stage(ui)
+
+        start = self._report.now()
+        result = False
+        try:
+            result = stage(ui)
+            return result
+        finally:
+            self._report.stage_finished(name, self._report.now() - start, result)
+
     def _workflow_failed(self, stage: Stage, result: bool) -> bool:
         return not (result or stage.allowed_to_fail())
 
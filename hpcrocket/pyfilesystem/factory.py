@@ -1,18 +1,55 @@
 import os
+from typing import Optional
+
 from hpcrocket.core.filesystem import Filesystem, FilesystemFactory
-from hpcrocket.core.launchoptions import Options
-from hpcrocket.pyfilesystem.localfilesystem import localfilesystem
+from hpcrocket.core.launchoptions import LaunchOptions, Options
+from hpcrocket.core.runreport import RunReport
+from hpcrocket.pyfilesystem.localfilesystem import nativelocalfilesystem
 from hpcrocket.pyfilesystem.sshfilesystem import sshfilesystem
+from hpcrocket.ssh.bandwidth import shared_limiter
+from hpcrocket.ssh.roundtrips import RoundTripRecorder
+from hpcrocket.ssh.sftpfilesystem import sftpfilesystem
+
+# "pyfilesystem" goes through PyFilesystem2 and fs.sshfs, "native" works on paramiko's SFTP client directly
+BACKENDS = ("pyfilesystem", "native")
 
 
 class PyFilesystemFactory(FilesystemFactory):
     def __init__(self, options: Options) -> None:
         self._options = options
+        self._round_trips: Optional[RoundTripRecorder] = None
+
+    def record_round_trips(self, report: RunReport) -> None:
+        self._round_trips = RoundTripRecorder(report)
 
     def create_local_filesystem(self) -> Filesystem:
-        return localfilesystem(os.getcwd())
+        return nativelocalfilesystem(os.getcwd())
 
     def create_ssh_filesystem(self) -> Filesystem:
-        connection = self._options.connection
-        proxyjumps = self._options.proxyjumps
-        return sshfilesystem(connection, proxyjumps)
+        if not isinstance(self._options, LaunchOptions):
+            return sshfilesystem(
+                self._options.connection,
+                self._options.proxyjumps,
+                round_trips=self._round_trips,
+            )
+
+        options = self._options
+        connection, proxyjumps = options.connection, options.proxyjumps
+        if options.transfer_connection is not None:
+            # File transfers may have to go through a dedicated data transfer node instead of the login node
+            connection = options.transfer_connection
+            proxyjumps = options.transfer_proxyjumps
+
+        if options.backend == "native":
+            return sftpfilesystem(connection, proxyjumps, round_trips=self._round_trips)
+
+        limiter = shared_limiter(
+            connection.hostname, options.bandwidth_limit, options.host_bandwidth_limit
+        )
+        return sshfilesystem(
+            connection,
+            proxyjumps,
+            streams=options.transfer_streams,
+            limiter=limiter,
+            round_trips=self._round_trips,
+        )
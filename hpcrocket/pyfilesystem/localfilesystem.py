@@ -1,9 +1,212 @@
+import os
+import shutil
+import stat
+from collections import deque
+from io import TextIOWrapper
+from typing import BinaryIO, Deque, FrozenSet, Iterator, List, Optional, Tuple
+
 import fs.base
 import fs.osfs
 
+from hpcrocket.core.filesystem import FileInfo, Filesystem, ProgressCallback
+from hpcrocket.core.globmatch import GlobPattern
+from hpcrocket.core.rangeio import open_range
+from hpcrocket.core.streamcopy import copy_between
 from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
 
 
+def _is_glob(path: str) -> bool:
+    return "*" in path
+
+
+def _split_glob_pattern(pattern: str) -> Tuple[str, str]:
+    """
+    Splits a pattern into the directory before the first wildcard and the pattern relative to it.
+    A trailing wildcard matches everything below the directory, just like in PyFilesystemBased.
+    """
+    end = pattern.rfind("/", 0, pattern.find("*")) + 1
+    dir, pattern = pattern[:end], pattern[end:]
+    if pattern.endswith("*"):
+        pattern += "*"
+
+    return dir, pattern
+
+
+def _entry_stat(entry: "os.DirEntry[str]") -> os.stat_result:
+    try:
+        return entry.stat()
+    except FileNotFoundError:
+        # A broken link
+        return entry.stat(follow_symlinks=False)
+
+
+# The device and inode number of a directory
+_Identity = Tuple[int, int]
+
+
+def _identity(result: os.stat_result) -> _Identity:
+    return result.st_dev, result.st_ino
+
+
+def _file_info(path: str, result: os.stat_result) -> FileInfo:
+    return FileInfo(
+        path,
+        stat.S_ISDIR(result.st_mode),
+        result.st_size,
+        result.st_mtime,
+        stat.S_IMODE(result.st_mode),
+    )
+
+
+class LocalFilesystem(PyFilesystemBased):
+    """
+    A Filesystem on the computer's local filesystem that works with `os.scandir` and plain file objects.
+    Copies between local files run inside the kernel (see `copy_between`).
+    It is based on PyFilesystem2 only to hand files to other PyFilesystem2 based filesystems,
+    which upload them with their own options, e.g. over several SFTP channels.
+    """
+
+    def __init__(self, dir: str, home: str) -> None:
+        super().__init__(fs.osfs.OSFS("/"), dir, home)
+
+    def _abspath(self, path: str) -> str:
+        return os.path.join(str(self.current_dir), self._expandhome(path, self))
+
+    def glob(self, pattern: str) -> List[str]:
+        dir, pattern = _split_glob_pattern(self._expandhome(pattern, self))
+        matches = self._walk(self._abspath(dir), GlobPattern(pattern))
+        return [os.path.join(dir, match) for match in matches]
+
+    def _glob(self, fs: fs.base.FS, pattern: str) -> List[str]:
+        return self.glob(pattern)
+
+    def _walk(self, root: str, pattern: GlobPattern) -> List[str]:
+        matches: List[str] = []
+        # Every pending directory carries the identities of the directories above it
+        pending: Deque[Tuple[str, FrozenSet[_Identity]]] = deque(
+            [("", frozenset([_identity(os.stat(root))]))]
+        )
+        while pending:
+            relative_dir, ancestors = pending.popleft()
+            with os.scandir(os.path.join(root, relative_dir)) as entries:
+                for entry in entries:
+                    is_dir = entry.is_dir()
+                    path = relative_dir + entry.name + ("/" if is_dir else "")
+                    if pattern.matches(path):
+                        matches.append(path)
+
+                    if not is_dir or not pattern.may_match_below(path):
+                        continue
+
+                    # Links to directories are followed like PyFilesystem2 does,
+                    # unless they lead back to a directory above them
+                    identity = _identity(entry.stat())
+                    if identity not in ancestors:
+                        pending.append((path, ancestors | {identity}))
+
+        return matches
+
+    def walk(self, root: str) -> Iterator[FileInfo]:
+        root = self._expandhome(root, self)
+        full_root = self._abspath(root)
+        pending: Deque[str] = deque([""])
+        while pending:
+            relative_dir = pending.popleft()
+            with os.scandir(os.path.join(full_root, relative_dir)) as entries:
+                for entry in entries:
+                    path = os.path.join(relative_dir, entry.name)
+                    yield _file_info(os.path.join(root, path), _entry_stat(entry))
+                    if entry.is_dir() and not entry.is_symlink():
+                        pending.append(path)
+
+    def copy(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        filesystem: Optional[Filesystem] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        if isinstance(filesystem, PyFilesystemBased) and not isinstance(
+            filesystem, LocalFilesystem
+        ):
+            super().copy(source, target, overwrite, filesystem, preserve_mode, progress)
+            return
+
+        target_fs = filesystem or self
+        mode_of = self._mode if preserve_mode else None
+        with target_fs.batch():
+            copy_between(
+                self,
+                self._expandhome(source, self),
+                target_fs,
+                target,
+                overwrite,
+                progress,
+                mode_of,
+            )
+
+    def _mode(self, path: str) -> Optional[int]:
+        return stat.S_IMODE(os.stat(self._abspath(path)).st_mode)
+
+    def delete(self, path: str) -> None:
+        if not _is_glob(path):
+            self._remove(path)
+            return
+
+        for match in self.glob(path):
+            # Matches below a directory that was deleted before are already gone
+            if os.path.lexists(self._abspath(match)):
+                self._remove(match)
+
+    def _remove(self, path: str) -> None:
+        full_path = self._abspath(path)
+        try:
+            mode = os.lstat(full_path).st_mode
+        except FileNotFoundError:
+            raise FileNotFoundError(path)
+
+        if stat.S_ISDIR(mode):
+            shutil.rmtree(full_path)
+        else:
+            os.remove(full_path)
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(self._abspath(path))
+
+    def stat(self, path: str) -> FileInfo:
+        try:
+            result = os.stat(self._abspath(path))
+        except FileNotFoundError:
+            raise FileNotFoundError(path)
+
+        return _file_info(path, result)
+
+    def openread(self, path: str) -> TextIOWrapper:
+        full_path = self._abspath(path)
+        try:
+            return open(full_path, "r")
+        except IsADirectoryError:
+            raise FileNotFoundError(full_path)
+
+    def openbin(self, path: str, offset: int = 0, length: Optional[int] = None) -> BinaryIO:
+        full_path = self._abspath(path)
+        try:
+            return open_range(open(full_path, "rb"), offset, length)
+        except IsADirectoryError:
+            raise FileNotFoundError(full_path)
+
+    def openwrite(self, path: str, mode: Optional[int] = None) -> BinaryIO:
+        full_path = self._abspath(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        file = open(full_path, "wb")
+        if mode is not None:
+            os.chmod(full_path, mode)
+
+        return file
+
+
 def localfilesystem(workdir: str) -> PyFilesystemBased:
     """
     A PyFilesystem2 based filesystem that uses the computer's local filesystem
@@ -13,3 +216,15 @@ def localfilesystem(workdir: str) -> PyFilesystemBased:
     """
 
     return PyFilesystemBased(fs.osfs.OSFS("/"), workdir)
+
+
+def nativelocalfilesystem(workdir: str) -> LocalFilesystem:
+    """
+    A filesystem that uses the computer's local filesystem directly, without going through PyFilesystem2.
+    The home directory is the home directory of the current user.
+
+    Args:
+        workdir (str): The path the filesystem should be opened in
+    """
+
+    return LocalFilesystem(workdir, os.path.expanduser("~"))
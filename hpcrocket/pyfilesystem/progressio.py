@@ -0,0 +1,41 @@
+from typing import BinaryIO, Optional
+
+from hpcrocket.core.filesystem import ProgressCallback
+
+
+class ProgressReader:
+    """
+    Wraps a binary file opened for reading and reports the number of bytes read from it
+    """
+
+    def __init__(self, file: BinaryIO, progress: ProgressCallback) -> None:
+        self._file = file
+        self._progress = progress
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        data = self._file.read(-1 if size is None else size)
+        if data:
+            self._progress(len(data))
+
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+
+class ProgressWriter:
+    """
+    Wraps a binary file opened for writing and reports the number of bytes written to it
+    """
+
+    def __init__(self, file: BinaryIO, progress: ProgressCallback) -> None:
+        self._file = file
+        self._progress = progress
+
+    def write(self, data: bytes) -> int:
+        written = self._file.write(data)
+        self._progress(len(data))
+        return written
+
+    def writable(self) -> bool:
+        return True
@@ -1,13 +1,42 @@
 import os
+from contextlib import contextmanager
 from io import TextIOWrapper
 from pathlib import PurePath
-from typing import Callable, Generator, List, Optional, Tuple, cast
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 import fs.base
 import fs.copy as fscp
 import fs.errors
 import fs.glob
-from hpcrocket.core.filesystem import Filesystem
+import fs.path
+from fs.enums import ResourceType
+from fs.info import Info
+from fs.permissions import Permissions
+from hpcrocket.core.executor import CommandExecutor
+from hpcrocket.core.filesystem import FileInfo, Filesystem, ProgressCallback
+from hpcrocket.core.rangeio import check_range, open_range
+from hpcrocket.core.streamcopy import copy_between
+from hpcrocket.pyfilesystem.remotecopy import raise_for_outcome, remote_duplicate
+from hpcrocket.pyfilesystem.remotedelete import RemoteDeletion, remote_delete
+from hpcrocket.pyfilesystem.remotedirs import leaf_directories, remote_makedirs
+from hpcrocket.pyfilesystem.remoteglob import FindEntry, remote_glob, remote_stat
+from hpcrocket.pyfilesystem.remoteshell import RemoteShell
+from hpcrocket.pyfilesystem.progressio import ProgressReader, ProgressWriter
+from hpcrocket.pyfilesystem.statcache import StatCachingFS, directory_info
+
+UPLOAD_OPTIONS_META_NAMESPACE = "hpcrocket.upload"
+OPEN_OPTIONS_META_NAMESPACE = "hpcrocket.openbin"
 
 
 def _is_glob(path: str) -> bool:
@@ -36,17 +65,110 @@ def _removeprefix(string: str, prefix: str) -> str:
     return removeprefix(prefix)
 
 
+def _path_inside_working_dir(path: str) -> Optional[str]:
+    """
+    Resolves a path the same way the working directory's SubFS does.
+
+    Args:
+        path (str): A path relative to the working directory. Absolute paths are treated as relative paths.
+
+    Returns:
+        str: The normalized relative path or None if the path leaves the working directory or is the working directory itself
+    """
+    try:
+        relative = fs.path.relpath(fs.path.normpath(path))
+    except fs.errors.IllegalBackReference:
+        return None
+
+    return relative or None
+
+
+def _upload_options(target_fs: fs.base.FS, **options: Any) -> Dict[str, Any]:
+    """
+    Selects the upload options the target filesystem understands.
+    Filesystems announce supported options in the meta namespace `UPLOAD_OPTIONS_META_NAMESPACE`.
+    Options set to None are left out.
+
+    Args:
+        target_fs (fs.base.FS): The filesystem files are uploaded to
+        **options (Any): The desired upload options
+
+    Returns:
+        dict[str, Any]: The supported subset of the options
+    """
+    supported = target_fs.getmeta(UPLOAD_OPTIONS_META_NAMESPACE)
+    return {
+        name: value
+        for name, value in options.items()
+        if value is not None and supported.get(name)
+    }
+
+
+def _open_options(source_fs: fs.base.FS, **options: Any) -> Dict[str, Any]:
+    """
+    Selects the options for opening a file for reading the source filesystem understands.
+    Filesystems announce supported options in the meta namespace `OPEN_OPTIONS_META_NAMESPACE`.
+    Options set to None are left out.
+
+    Args:
+        source_fs (fs.base.FS): The filesystem files are read from
+        **options (Any): The desired options
+
+    Returns:
+        dict[str, Any]: The supported subset of the options
+    """
+    supported = source_fs.getmeta(OPEN_OPTIONS_META_NAMESPACE)
+    return {
+        name: value
+        for name, value in options.items()
+        if value is not None and supported.get(name)
+    }
+
+
+def _file_info(path: str, info: Info) -> FileInfo:
+    modified = cast(Optional[float], info.get("details", "modified"))
+    mode = None
+    if info.has_namespace("access") and info.permissions is not None:
+        mode = info.permissions.mode
+
+    return FileInfo(path, info.is_dir, info.size, modified, mode)
+
+
+def _find_entry_info(entry: FindEntry) -> Info:
+    resource_type = ResourceType.directory if entry.is_dir else ResourceType.file
+    name = os.path.basename(entry.path.rstrip("/"))
+    return Info(
+        {
+            "basic": {"name": name, "is_dir": entry.is_dir},
+            "details": {
+                "type": int(resource_type),
+                "size": entry.size,
+                "modified": entry.mtime,
+            },
+        }
+    )
+
+
 class PyFilesystemBased(Filesystem):
     """
-    A Filesystem based on PyFilesystem2
+    A Filesystem based on PyFilesystem2.
+    If an executor is given, bulk operations like globbing are run as remote commands
+    and fall back to PyFilesystem2 when the remote machine does not provide shell access.
+    File metadata is cached for the duration of a batch (see `batch()`), every copy runs in its own batch.
     """
 
     def __init__(
-        self, internal_fs: fs.base.FS, dir: str = "/", home: str = "/"
+        self,
+        internal_fs: fs.base.FS,
+        dir: str = "/",
+        home: str = "/",
+        executor: Optional[CommandExecutor] = None,
     ) -> None:
         self._internal_fs = internal_fs
         self._curdir = PurePath(dir)
         self._homedir = PurePath(home)
+        self._shell = RemoteShell(executor)
+        self._cache: Optional[StatCachingFS] = None
 
     @property
     def current_dir(self) -> PurePath:
@@ -65,10 +187,31 @@ class PyFilesystemBased(Filesystem):
         """
         return self._internal_fs
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        if self._cache is not None:
+            yield
+            return
+
+        self._cache = StatCachingFS(self.internal_fs)
+        try:
+            yield
+        finally:
+            self._cache = None
+
+    def close(self) -> None:
+        self._internal_fs.close()
+
+    def _operation_fs(self) -> fs.base.FS:
+        if self._cache is not None:
+            return self._cache
+
+        return self.internal_fs
+
     def glob(self, pattern: str) -> List[str]:
         pattern = self._expandhome(pattern, self)
         sub_fs = self._open_fs(self, pattern)
-        return list(self._glob_with_pyfs(sub_fs, pattern))
+        return self._glob(sub_fs, pattern)
 
     def _expandhome(self, path: str, filesystem: "PyFilesystemBased") -> str:
         return path.replace("~", str(filesystem.home))
@@ -83,31 +226,121 @@ class PyFilesystemBased(Filesystem):
         except fs.errors.FileExpected:
             raise FileNotFoundError(path)
 
+    def supports_streams(self) -> bool:
+        return True
+
+    def openbin(self, path: str, offset: int = 0, length: Optional[int] = None) -> BinaryIO:
+        path = self._expandhome(path, self)
+        path = str(self._curdir.joinpath(path))
+        check_range(offset, length)
+        operation_fs = self._operation_fs()
+        # Filesystems that know the range only read ahead within it
+        options = _open_options(operation_fs, offset=offset, length=length)
+        try:
+            return open_range(operation_fs.openbin(path, **options), offset, length)
+        except fs.errors.ResourceNotFound:
+            raise FileNotFoundError(path)
+        except fs.errors.FileExpected:
+            raise FileNotFoundError(path)
+
+    def openwrite(self, path: str, mode: Optional[int] = None) -> BinaryIO:
+        path = self._expandhome(path, self)
+        path = str(self._curdir.joinpath(path))
+        operation_fs = self._operation_fs()
+        operation_fs.makedirs(fs.path.dirname(path), recreate=True)
+        file = operation_fs.openbin(path, "w")
+        if mode is not None:
+            permissions = Permissions(mode=mode).dump()
+            operation_fs.setinfo(path, {"access": {"permissions": permissions}})
+
+        return file
+
     def copy(
         self,
         source: str,
         target: str,
         overwrite: bool = False,
         filesystem: Optional["Filesystem"] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        if filesystem is not None and not isinstance(filesystem, PyFilesystemBased):
+            self._copy_streamed(
+                source, target, overwrite, filesystem, preserve_mode, progress
+            )
+            return
+
+        other_pyfs_based = filesystem or self
+        with self.batch(), other_pyfs_based.batch():
+            self._copy(
+                source, target, overwrite, other_pyfs_based, preserve_mode, progress
+            )
+
+    def _copy_streamed(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool,
+        filesystem: Filesystem,
+        preserve_mode: bool,
+        progress: Optional[ProgressCallback],
+    ) -> None:
+        # Filesystems that are not based on PyFilesystem2 receive the files as binary streams
+        mode_of = self._mode if preserve_mode else None
+        source = self._expandhome(source, self)
+        with self.batch(), filesystem.batch():
+            copy_between(self, source, filesystem, target, overwrite, progress, mode_of)
+
+    def _mode(self, path: str) -> Optional[int]:
+        full_path = str(self._curdir.joinpath(path))
+        info = self.internal_fs.getinfo(full_path, namespaces=["access"])
+        if not info.has_namespace("access") or info.permissions is None:
+            return None
+
+        return info.permissions.mode
+
+    def _copy(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool,
+        other_pyfs_based: "PyFilesystemBased",
+        preserve_mode: bool,
+        progress: Optional[ProgressCallback],
     ) -> None:
-        self._raise_if_no_pyfilesystem(filesystem)
-        other_pyfs_based = cast(PyFilesystemBased, filesystem) or self
         source = self._expandhome(source, self)
         target = self._expandhome(target, other_pyfs_based)
         source_fs = self._open_fs(self, source)
         target_fs = self._open_fs(other_pyfs_based, target)
+        upload_options = _upload_options(
+            target_fs, preserve_mode=preserve_mode, progress=progress
+        )
+        # Targets that cannot report progress themselves get the transferred data counted while streaming
+        counting = None if "progress" in upload_options else progress
 
         if _is_glob(source):
-            self._copy_glob(source_fs, source, target_fs, target, overwrite)
+            self._copy_glob(
+                source_fs,
+                source,
+                target_fs,
+                target,
+                overwrite,
+                other_pyfs_based,
+                upload_options,
+                counting,
+            )
             return
 
-        self._copy_single_file(source_fs, source, target_fs, target, overwrite)
+        self._copy_single_file(
+            source_fs, source, target_fs, target, overwrite, upload_options, counting
+        )
 
     def _open_fs(self, fs: "PyFilesystemBased", path: str) -> fs.base.FS:
+        operation_fs = fs._operation_fs()
         if os.path.isabs(path):
-            return fs.internal_fs
+            return operation_fs
 
-        return fs.internal_fs.opendir(str(fs.current_dir))
+        return operation_fs.opendir(str(fs.current_dir))
 
     def _first_wildcard(self, pattern: str) -> int:
         first_star = pattern.find("*")
@@ -120,14 +353,48 @@ class PyFilesystemBased(Filesystem):
         first_wildcard = self._first_wildcard(pattern)
         return pattern[:first_wildcard], pattern[first_wildcard:]
 
-    def _glob_with_pyfs(
-        self, fs: fs.base.FS, pattern: str
-    ) -> Generator[str, None, None]:
+    def _split_glob_pattern(self, pattern: str) -> Tuple[str, str]:
         dir, pattern = self._split_at_first_wildcard(pattern)
 
         if pattern.endswith("*"):
             pattern += "*"
 
+        return dir, pattern
+
+    def _glob(self, fs: fs.base.FS, pattern: str) -> List[str]:
+        matches = self._glob_with_shell(pattern)
+        if matches is None:
+            matches = list(self._glob_with_pyfs(fs, pattern))
+
+        return matches
+
+    def _glob_with_shell(self, pattern: str) -> Optional[List[str]]:
+        if not self._shell.available:
+            return None
+
+        dir, pattern = self._split_glob_pattern(pattern)
+        root = str(self._curdir.joinpath(dir))
+        entries = remote_glob(self._shell, root, pattern)
+        if entries is None:
+            return None
+
+        self._seed_cache(root, entries)
+        return [os.path.join(dir, entry.path) for entry in entries]
+
+    def _seed_cache(self, root: str, entries: List[FindEntry]) -> None:
+        if self._cache is None:
+            return
+
+        self._cache.seed(root, directory_info(root))
+        for entry in entries:
+            if not entry.is_link:
+                self._cache.seed(os.path.join(root, entry.path), _find_entry_info(entry))
+
+    def _glob_with_pyfs(
+        self, fs: fs.base.FS, pattern: str
+    ) -> Generator[str, None, None]:
+        dir, pattern = self._split_glob_pattern(pattern)
+
         self._raise_if_does_not_exist(dir, fs)
 
         fs = fs.opendir(dir)
@@ -142,17 +409,70 @@ class PyFilesystemBased(Filesystem):
         target_fs: fs.base.FS,
         target: str,
         overwrite: bool,
+        target_pyfs: "PyFilesystemBased",
+        upload_options: Dict[str, Any],
+        counting: Optional[ProgressCallback],
     ) -> None:
-        glob = self._glob_with_pyfs(source_fs, source)
+        glob = self._glob(source_fs, source)
         dir, _ = self._split_at_first_wildcard(source)
+        file_targets: List[Tuple[str, str]] = []
         for match in glob:
             if source_fs.isdir(match):
                 continue
 
             filename = _removeprefix(match, dir)
             filename = _removeprefix(filename, os.path.sep)
-            target_path = os.path.join(target, filename)
-            self._copy_single_file(source_fs, match, target_fs, target_path, overwrite)
+            file_targets.append((match, os.path.join(target, filename)))
+
+        target_paths = [target_path for _, target_path in file_targets]
+        if not overwrite:
+            target_pyfs._raise_if_any_file_exists(target, target_paths)
+
+        target_dirs = [os.path.dirname(target_path) for target_path in target_paths]
+        target_pyfs._makedirs(target_fs, target_dirs)
+        for match, target_path in file_targets:
+            self._copy_single_file(
+                source_fs,
+                match,
+                target_fs,
+                target_path,
+                overwrite,
+                upload_options,
+                counting,
+            )
+
+    def _raise_if_any_file_exists(self, root: str, paths: List[str]) -> None:
+        # A single bulk lookup that runs before any directory is created, so a rejected copy leaves nothing behind.
+        # Within a batch the lookup also answers the existence check of every single copy.
+        # Nothing below a missing target directory can exist, e.g. when results are collected for the first time.
+        if not self.exists(root):
+            return
+
+        for path, info in zip(paths, self.stat_many(paths)):
+            if info is not None and not info.is_dir:
+                raise FileExistsError(path)
+
+    def makedirs_many(self, paths: List[str]) -> None:
+        full_paths = [self._full_path(path) for path in paths]
+        self._makedirs(self._operation_fs(), full_paths)
+
+    def _makedirs(self, fs: fs.base.FS, dirs: List[str]) -> None:
+        leaves = leaf_directories(dirs)
+        absolute_leaves = [str(self._curdir.joinpath(dir)) for dir in leaves]
+        if leaves and remote_makedirs(self._shell, absolute_leaves):
+            self._seed_directories(absolute_leaves)
+            return
+
+        for dir in leaves:
+            fs.makedirs(dir, recreate=True)
+
+    def _seed_directories(self, dirs: List[str]) -> None:
+        if self._cache is None:
+            return
+
+        for dir in dirs:
+            for path in fs.path.recursepath(dir):
+                self._cache.seed(path, directory_info(path))
 
     def _copy_single_file(
         self,
@@ -161,25 +481,104 @@ class PyFilesystemBased(Filesystem):
         target_fs: fs.base.FS,
         target: str,
         overwrite: bool = False,
+        upload_options: Optional[Dict[str, Any]] = None,
+        counting: Optional[ProgressCallback] = None,
     ) -> None:
         self._raise_if_does_not_exist(source, source_fs)
         self._raise_if_target_exists(target, overwrite, target_fs)
         self._create_missing_target_dirs(target, target_fs)
-        self._try_copy_to_filesystem(source_fs, source, target_fs, target)
+        self._try_copy_to_filesystem(
+            source_fs, source, target_fs, target, upload_options or {}, counting
+        )
 
     def _create_missing_target_dirs(self, target: str, target_fs: fs.base.FS) -> None:
         target_parent_dir = os.path.dirname(target)
         if not target_fs.exists(target_parent_dir):
             target_fs.makedirs(target_parent_dir, recreate=True)
 
+    def duplicate(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        symlink: bool = False,
+    ) -> None:
+        source_path = str(self._curdir.joinpath(self._expandhome(source, self)))
+        target_path = str(self._curdir.joinpath(self._expandhome(target, self)))
+        outcome = remote_duplicate(
+            self._shell, source_path, target_path, overwrite, symlink
+        )
+        self._forget_cached_metadata()
+        if outcome is None:
+            super().duplicate(source, target, overwrite, symlink)
+            return
+
+        raise_for_outcome(outcome, source, target)
+
     def delete(self, path: str) -> None:
-        fs = self.internal_fs.opendir(str(self.current_dir))
+        fs = self._operation_fs().opendir(str(self.current_dir))
         if _is_glob(path):
             self._delete_glob(path, fs)
             return
 
         self._delete_path(path, fs)
 
+    def delete_many(self, paths: List[str]) -> List[FileNotFoundError]:
+        if not self._shell.available or not self._allows_remote_delete():
+            return super().delete_many(paths)
+
+        targets: Dict[str, str] = {}
+        fallback_paths: List[str] = []
+        for path in paths:
+            resolved = self._resolve_delete_targets(path)
+            if resolved is None:
+                fallback_paths.append(path)
+                continue
+
+            for target in resolved:
+                targets.setdefault(target, path)
+
+        deletion = remote_delete(self._shell, list(targets))
+        self._forget_cached_metadata()
+        missing, retry = self._check_remaining(deletion, targets)
+        errors = [FileNotFoundError(targets[path]) for path in missing]
+        return errors + super().delete_many(fallback_paths + retry)
+
+    def _check_remaining(
+        self, deletion: RemoteDeletion, targets: Dict[str, str]
+    ) -> Tuple[List[str], List[str]]:
+        # Only paths with targets left are deleted again, a glob then just matches what is left of it.
+        # Retrying every path would report the targets a partly run deletion already removed as missing.
+        exists = self.exists_many(deletion.remaining)
+        missing = deletion.missing + [
+            path for path, found in zip(deletion.remaining, exists) if not found
+        ]
+        retry = {targets[path] for path, found in zip(deletion.remaining, exists) if found}
+        return missing, [path for path in dict.fromkeys(targets.values()) if path in retry]
+
+    def _allows_remote_delete(self) -> bool:
+        return self._curdir.is_absolute() and self._curdir != PurePath("/")
+
+    def _resolve_delete_targets(self, path: str) -> Optional[List[str]]:
+        relative = _path_inside_working_dir(path)
+        if relative is None:
+            return None
+
+        if not _is_glob(relative):
+            return [str(self._curdir.joinpath(relative))]
+
+        dir, pattern = self._split_glob_pattern(relative)
+        root = str(self._curdir.joinpath(dir))
+        entries = remote_glob(self._shell, root, pattern)
+        if entries is None:
+            return None
+
+        return [os.path.join(root, entry.path.rstrip("/")) for entry in entries]
+
+    def _forget_cached_metadata(self) -> None:
+        if self._cache is not None:
+            self._cache = StatCachingFS(self.internal_fs)
+
     def _delete_glob(self, path: str, fs: fs.base.FS) -> None:
         glob = fs.glob(path)
         for match in glob:
@@ -198,17 +597,108 @@ class PyFilesystemBased(Filesystem):
     def exists(self, path: str) -> bool:
         path = self._expandhome(path, self)
         path = str(self.current_dir.joinpath(path))
-        return self.internal_fs.exists(path)
+        return self._operation_fs().exists(path)
+
+    def stat(self, path: str) -> FileInfo:
+        path = self._expandhome(path, self)
+        full_path = str(self.current_dir.joinpath(path))
+        try:
+            info = self._operation_fs().getinfo(full_path, namespaces=["details"])
+        except fs.errors.ResourceNotFound:
+            raise FileNotFoundError(path)
+
+        return _file_info(path, info)
+
+    def stat_many(self, paths: List[str]) -> List[Optional[FileInfo]]:
+        full_paths = [self._full_path(path) for path in paths]
+        entries = None
+        if self._shell.available and all(os.path.isabs(p) for p in full_paths):
+            entries = remote_stat(self._shell, full_paths)
+
+        if entries is None:
+            return super().stat_many(paths)
+
+        infos: List[Optional[FileInfo]] = []
+        for path, full_path in zip(paths, full_paths):
+            entry = entries.get(full_path)
+            self._seed_stat(full_path, entry)
+            infos.append(entry.file_info(path) if entry is not None else None)
+
+        return infos
+
+    def _full_path(self, path: str) -> str:
+        return str(self._curdir.joinpath(self._expandhome(path, self)))
+
+    def _seed_stat(self, path: str, entry: Optional[FindEntry]) -> None:
+        if self._cache is not None:
+            self._cache.seed(path, _find_entry_info(entry) if entry else None)
+
+    def walk(self, root: str) -> Iterator[FileInfo]:
+        root = self._expandhome(root, self)
+        full_root = str(self._curdir.joinpath(root))
+        entries = None
+        if self._shell.available and os.path.isabs(full_root):
+            entries = remote_glob(self._shell, full_root, "**")
+
+        if entries is None:
+            yield from self._walk_with_pyfs(root, full_root)
+            return
+
+        self._seed_cache(full_root, entries)
+        for entry in entries:
+            yield entry.file_info(os.path.join(root, entry.path.rstrip("/")))
+
+    def _walk_with_pyfs(self, root: str, full_root: str) -> Iterator[FileInfo]:
+        walker = self._operation_fs().walk.info(
+            full_root, namespaces=["details", "access"]
+        )
+        try:
+            for path, info in walker:
+                relative = os.path.relpath(path, full_root)
+                yield _file_info(os.path.join(root, relative), info)
+        except fs.errors.ResourceNotFound:
+            raise FileNotFoundError(root)
 
     def _try_copy_to_filesystem(
-        self, source_fs: fs.base.FS, source: str, target_fs: fs.base.FS, target: str
+        self,
+        source_fs: fs.base.FS,
+        source: str,
+        target_fs: fs.base.FS,
+        target: str,
+        upload_options: Dict[str, Any],
+        counting: Optional[ProgressCallback],
     ) -> None:
         if source_fs.isdir(source):
             fscp.copy_dir(source_fs, source, target_fs, target)
             return
 
         target = self._append_filename_if_target_is_dir(target_fs, source, target)
-        fscp.copy_file(source_fs, source, target_fs, target)
+        if not upload_options:
+            self._download(source_fs, source, target_fs, target, counting)
+            return
+
+        with source_fs.openbin(source) as source_file:
+            if counting is not None:
+                source_file = cast(BinaryIO, ProgressReader(source_file, counting))
+
+            target_fs.upload(target, source_file, **upload_options)
+
+    def _download(
+        self,
+        source_fs: fs.base.FS,
+        source: str,
+        target_fs: fs.base.FS,
+        target: str,
+        progress: Optional[ProgressCallback],
+    ) -> None:
+        if progress is None:
+            fscp.copy_file(source_fs, source, target_fs, target)
+            return
+
+        # Downloading lets the source filesystem use its fastest read path, e.g. prefetching over SFTP
+        with target_fs.openbin(target, "w") as target_file:
+            writer = cast(BinaryIO, ProgressWriter(target_file, progress))
+            source_fs.download(source, writer)
 
     def _append_filename_if_target_is_dir(
         self, fs: fs.base.FS, source: str, target: str
@@ -230,9 +720,3 @@ class PyFilesystemBased(Filesystem):
 
         if target_fs.exists(target) and not target_fs.isdir(target):
             raise FileExistsError(target)
-
-    def _raise_if_no_pyfilesystem(self, filesystem: Optional[Filesystem]) -> None:
-        if filesystem and not isinstance(filesystem, PyFilesystemBased):
-            raise RuntimeError(
-                f"{str(type(self))} currently only works with PyFilesystem2 based Filesystems"
-            )
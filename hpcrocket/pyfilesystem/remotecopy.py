@@ -0,0 +1,82 @@
+from typing import Optional
+
+from hpcrocket.pyfilesystem.remoteshell import RemoteShell
+
+# Reports the outcome on stdout, so that expected failures can be told apart from a missing shell.
+# Arguments: source, target, "overwrite" or "", "symlink" or ""
+_DUPLICATE_SCRIPT = """
+src=$1 dst=$2
+if [ ! -e "$src" ]; then echo missing; exit 0; fi
+if [ -d "$dst" ] && [ ! -L "$dst" ]; then dst=$dst/$(basename -- "$src"); fi
+if [ -e "$dst" ] || [ -L "$dst" ]; then
+    if [ "$3" != overwrite ]; then echo exists; exit 0; fi
+    rm -rf -- "$dst" || { echo failed; exit 0; }
+fi
+mkdir -p -- "$(dirname -- "$dst")" || { echo failed; exit 0; }
+if [ "$4" = symlink ]; then
+    ln -s -- "$src" "$dst"
+else
+    cp -R --reflink=auto -- "$src" "$dst" 2>/dev/null || cp -R -- "$src" "$dst"
+fi || { echo failed; exit 0; }
+echo copied
+"""
+
+
+def remote_duplicate(
+    shell: RemoteShell, source: str, target: str, overwrite: bool, symlink: bool
+) -> Optional[str]:
+    """
+    Copies a file or directory on the remote machine with `cp --reflink=auto` or links it with `ln -s`.
+    Copy-on-write filesystems share the data blocks of the copy with the source.
+
+    Args:
+        shell (RemoteShell): The shell to run the copy in
+        source (str): The absolute path of the source
+        target (str): The absolute path of the copy
+        overwrite (bool): Replaces an existing target
+        symlink (bool): Creates a symbolic link instead of a copy
+
+    Returns:
+        str: One of "copied", "missing", "exists" or "failed", None if no remote shell is available
+    """
+    command = shell.run(
+        [
+            "sh",
+            "-c",
+            _DUPLICATE_SCRIPT,
+            "sh",
+            source,
+            target,
+            "overwrite" if overwrite else "",
+            "symlink" if symlink else "",
+        ]
+    )
+    if command is None:
+        return None
+
+    output = "".join(command.stdout()).split()
+    return output[-1] if output else None
+
+
+def raise_for_outcome(outcome: str, source: str, target: str) -> None:
+    """
+    Raises the error that matches the outcome of `remote_duplicate`
+
+    Args:
+        outcome (str): The outcome reported by `remote_duplicate`
+        source (str): The source path as given by the caller
+        target (str): The target path as given by the caller
+
+    Raises:
+        FileNotFoundError: The source does not exist
+        FileExistsError: The target exists and overwrite was not set
+        OSError: The copy failed
+    """
+    if outcome == "missing":
+        raise FileNotFoundError(source)
+
+    if outcome == "exists":
+        raise FileExistsError(target)
+
+    if outcome != "copied":
+        raise OSError(f"Could not copy {source} to {target} on the remote machine")
@@ -0,0 +1,51 @@
+from typing import List, NamedTuple
+
+from hpcrocket.pyfilesystem.remoteshell import RemoteShell, chunk_arguments
+
+# Reports every argument that does not exist as a NUL terminated path prefixed with M, removes all arguments at once
+# and reports every argument rm could not remove prefixed with R. The script itself always succeeds,
+# so the report of a partly failed rm is not lost.
+_DELETE_SCRIPT = (
+    'for p do [ -e "$p" ] || [ -L "$p" ] || printf \'M%s\\0\' "$p"; done; '
+    'rm -rf -- "$@"; '
+    'for p do if [ -e "$p" ] || [ -L "$p" ]; then printf \'R%s\\0\' "$p"; fi; done'
+)
+
+
+class RemoteDeletion(NamedTuple):
+    """
+    The outcome of a remote deletion. `missing` holds the paths that did not exist,
+    `remaining` the paths that were not deleted, either because rm failed or because the command could not be run.
+    """
+
+    missing: List[str]
+    remaining: List[str]
+
+
+def remote_delete(shell: RemoteShell, paths: List[str]) -> RemoteDeletion:
+    """
+    Removes files and directories recursively with as few remote `rm -rf` commands as possible.
+    The paths are passed to rm as they are, callers must make sure they are safe to delete.
+
+    Args:
+        shell (RemoteShell): The shell to run rm in
+        paths (list[str]): Absolute paths of the files and directories to delete
+
+    Returns:
+        RemoteDeletion: The paths that did not exist and the paths that are left to be deleted otherwise
+    """
+    missing: List[str] = []
+    remaining: List[str] = []
+    for chunk in chunk_arguments(paths):
+        command = shell.run(["sh", "-c", _DELETE_SCRIPT, "sh", *chunk])
+        if command is None:
+            remaining.extend(chunk)
+            continue
+
+        for record in "".join(command.stdout()).split("\0"):
+            if record.startswith("M"):
+                missing.append(record[1:])
+            elif record.startswith("R"):
+                remaining.append(record[1:])
+
+    return RemoteDeletion(missing, remaining)
@@ -0,0 +1,53 @@
+from typing import Iterable, List, Set
+
+import fs.path
+
+from hpcrocket.pyfilesystem.remoteshell import RemoteShell, chunk_arguments
+
+
+def leaf_directories(dirs: Iterable[str]) -> List[str]:
+    """
+    Reduces a collection of directories to the smallest set that creates all of them with `makedirs`,
+    i.e. drops every directory that is an ancestor of another one.
+
+    Args:
+        dirs (Iterable[str]): The directories that need to exist
+
+    Returns:
+        list[str]: The normalized leaf directories in sorted order
+    """
+    normalized = {fs.path.normpath(dir) for dir in dirs}
+    normalized -= {"", ".", "/"}
+
+    leaves: List[str] = []
+    ancestors: Set[str] = set()
+    # Descendants sort after their ancestors, so in reverse order every leaf is seen before its ancestors
+    for dir in sorted(normalized, reverse=True):
+        if dir in ancestors:
+            continue
+
+        leaves.append(dir)
+        parent = fs.path.dirname(dir)
+        while parent not in ("", "/") and parent not in ancestors:
+            ancestors.add(parent)
+            parent = fs.path.dirname(parent)
+
+    return sorted(leaves)
+
+
+def remote_makedirs(shell: RemoteShell, dirs: List[str]) -> bool:
+    """
+    Creates directories including their missing parents with as few remote `mkdir -p` commands as possible.
+
+    Args:
+        shell (RemoteShell): The shell to run mkdir in
+        dirs (list[str]): Absolute paths of the directories to create
+
+    Returns:
+        bool: True if all directories were created remotely
+    """
+    for chunk in chunk_arguments(dirs):
+        if shell.run(["mkdir", "-p", "--", *chunk]) is None:
+            return False
+
+    return True
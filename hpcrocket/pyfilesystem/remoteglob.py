@@ -0,0 +1,150 @@
+import shlex
+from typing import Dict, List, NamedTuple, Optional
+
+from hpcrocket.core.executor import RunningCommand
+from hpcrocket.core.filesystem import FileInfo
+from hpcrocket.core.globmatch import GlobPattern
+from hpcrocket.pyfilesystem.remoteshell import RemoteShell, chunk_arguments
+
+_FIND_FORMAT = "%y\\t%s\\t%T@\\t%m\\t%P\\0"
+_STAT_FORMAT = "%y\\t%s\\t%T@\\t%m\\t%p\\0"
+# BSD and BusyBox find do not know -printf, they exit with 1 just like GNU find does for missing paths
+_FIND_PRINTF = "find -printf"
+_FIND_PRINTF_PROBE = ["find", "/", "-maxdepth", "0", "-printf", ""]
+# find exits with 1 if some of the paths do not exist, which is an expected outcome here
+_STAT_SCRIPT = (
+    f"{' '.join(map(shlex.quote, _FIND_PRINTF_PROBE))} || exit 2; "
+    f'find -L "$@" -maxdepth 0 -printf {shlex.quote(_STAT_FORMAT)}; test $? -le 1'
+)
+
+
+class FindEntry(NamedTuple):
+    """
+    A file system entry reported by the remote find command.
+    Directory paths end with a trailing slash, just like PyFilesystem2 glob matches do.
+    """
+
+    path: str
+    is_dir: bool
+    size: int
+    mtime: float
+    mode: int
+    is_link: bool = False
+
+    @property
+    def depth(self) -> int:
+        return self.path.rstrip("/").count("/")
+
+    def file_info(self, path: str) -> FileInfo:
+        """
+        Converts the entry into the FileInfo of the given path
+        """
+        return FileInfo(path, self.is_dir, self.size, self.mtime, self.mode)
+
+
+def remote_glob(
+    shell: RemoteShell, root: str, pattern: str
+) -> Optional[List[FindEntry]]:
+    """
+    Matches a glob pattern against the directory tree below `root` with a single remote find command.
+    Uses the same matching rules as PyFilesystem2's glob and returns the matches in breadth first order.
+
+    Args:
+        shell (RemoteShell): The shell to run find in
+        root (str): The absolute path of the directory to search
+        pattern (str): A glob pattern relative to `root`
+
+    Returns:
+        list[FindEntry]: The matching entries with paths relative to `root`
+            or None if the search could not be run remotely
+    """
+    command = _run_find(shell, _find_command(root, pattern))
+    if command is None:
+        return None
+
+    entries = _parse_find_output("".join(command.stdout()))
+    return match_entries(entries, pattern)
+
+
+def remote_stat(shell: RemoteShell, paths: List[str]) -> Optional[Dict[str, FindEntry]]:
+    """
+    Looks up the metadata of many paths with as few remote find commands as possible.
+    Links are followed like stat does, broken links count as missing.
+
+    Args:
+        shell (RemoteShell): The shell to run find in
+        paths (list[str]): Absolute, normalized paths
+
+    Returns:
+        dict[str, FindEntry]: The entries of the existing paths by path
+            or None if the lookup could not be run remotely
+    """
+    entries: Dict[str, FindEntry] = {}
+    for chunk in chunk_arguments(paths):
+        command = _run_find(shell, ["sh", "-c", _STAT_SCRIPT, "sh", *chunk])
+        if command is None:
+            return None
+
+        for entry in _parse_find_output("".join(command.stdout())):
+            if not entry.is_link:
+                entries[entry.path.rstrip("/") or "/"] = entry
+
+    return entries
+
+
+def match_entries(entries: List[FindEntry], pattern: str) -> List[FindEntry]:
+    """
+    Selects the entries matching a glob pattern with the same rules as PyFilesystem2's glob
+
+    Args:
+        entries (list[FindEntry]): Entries with paths relative to the directory the pattern is relative to
+        pattern (str): The glob pattern
+
+    Returns:
+        list[FindEntry]: The matching entries in breadth first order
+    """
+    glob_pattern = GlobPattern(pattern)
+    matches = [entry for entry in entries if glob_pattern.matches(entry.path)]
+    return sorted(matches, key=lambda entry: entry.depth)
+
+
+def pattern_depth(pattern: str) -> Optional[int]:
+    """
+    Returns how many directory levels a glob pattern can match, None if it matches at any depth
+    """
+    return GlobPattern(pattern).max_depth
+
+
+def _run_find(shell: RemoteShell, args: List[str]) -> Optional[RunningCommand]:
+    if not shell.supports(_FIND_PRINTF):
+        return None
+
+    command = shell.run(args, discard_stderr=True)
+    if command is None:
+        shell.check_support(_FIND_PRINTF, _FIND_PRINTF_PROBE)
+
+    return command
+
+
+def _find_command(root: str, pattern: str) -> List[str]:
+    command = ["find", root.rstrip("/") + "/", "-mindepth", "1"]
+    levels = pattern_depth(pattern)
+    if levels is not None:
+        command += ["-maxdepth", str(levels)]
+
+    return command + ["-printf", _FIND_FORMAT]
+
+
+def _parse_find_output(output: str) -> List[FindEntry]:
+    return [_parse_record(record) for record in output.split("\0") if record]
+
+
+def _parse_record(record: str) -> FindEntry:
+    file_type, size, mtime, mode, path = record.split("\t", 4)
+    is_dir = file_type == "d"
+    if is_dir:
+        path += "/"
+
+    return FindEntry(
+        path, is_dir, int(size), float(mtime), int(mode, 8), is_link=file_type == "l"
+    )
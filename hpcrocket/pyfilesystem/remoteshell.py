@@ -0,0 +1,118 @@
+import shlex
+from typing import Iterator, List, Optional, Set
+
+from paramiko import SSHException
+
+from hpcrocket.core.executor import CommandExecutor, RunningCommand
+
+_COMMAND_NOT_EXECUTABLE = 126
+_COMMAND_NOT_FOUND = 127
+
+# Stay well below the argument size limits of the remote shell and the SSH server
+_MAX_ARGUMENTS_LENGTH = 64 * 1024
+
+
+def chunk_arguments(args: List[str]) -> Iterator[List[str]]:
+    """
+    Splits a long list of command arguments into chunks that can safely be passed to a single remote command.
+
+    Args:
+        args (list[str]): The arguments to split
+
+    Returns:
+        Iterator[list[str]]: Consecutive chunks of the arguments
+    """
+    chunk: List[str] = []
+    chunk_length = 0
+    for arg in args:
+        if chunk and chunk_length + len(arg) > _MAX_ARGUMENTS_LENGTH:
+            yield chunk
+            chunk, chunk_length = [], 0
+
+        chunk.append(arg)
+        chunk_length += len(arg) + 1
+
+    if chunk:
+        yield chunk
+
+
+class RemoteShell:
+    """
+    Runs helper commands on the machine a Filesystem lives on, so that bulk operations
+    can be done in a single command instead of one SFTP round trip per file.
+    Once the remote machine refuses to run commands the shell marks itself as unavailable
+    and callers are expected to fall back to SFTP.
+    The same applies to single features commands rely on, e.g. options only some versions of a tool understand.
+    """
+
+    def __init__(self, executor: Optional[CommandExecutor] = None) -> None:
+        self._executor = executor
+        self._available = executor is not None
+        self._probed: Set[str] = set()
+        self._unsupported: Set[str] = set()
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    def supports(self, feature: str) -> bool:
+        """
+        Checks whether commands relying on a feature may be run
+
+        Args:
+            feature (str): The name of the feature
+
+        Returns:
+            bool: False if no shell is available or the feature is known to be unsupported
+        """
+        return self._available and feature not in self._unsupported
+
+    def check_support(self, feature: str, probe: List[str]) -> None:
+        """
+        Runs a probe command after a command relying on a feature failed.
+        If the probe fails as well, the feature is disabled for the rest of the session,
+        so callers fall back to SFTP right away instead of running a failing command every time.
+        The probe runs at most once per feature.
+
+        Args:
+            feature (str): The name of the feature
+            probe (list[str]): A command that succeeds if and only if the feature is supported
+        """
+        if feature in self._probed:
+            return
+
+        self._probed.add(feature)
+        if self.run(probe, discard_stderr=True) is None:
+            self._unsupported.add(feature)
+
+    def run(
+        self, args: List[str], discard_stderr: bool = False
+    ) -> Optional[RunningCommand]:
+        """
+        Runs a command on the remote machine. Every argument is quoted for the remote shell.
+
+        Args:
+            args (list[str]): The command and its arguments
+            discard_stderr (bool): Redirects the error output of the command to /dev/null
+
+        Returns:
+            RunningCommand: The finished command or None if the command failed or no shell is available
+        """
+        if not self._executor or not self._available:
+            return None
+
+        command_line = " ".join(shlex.quote(arg) for arg in args)
+        if discard_stderr:
+            command_line += " 2>/dev/null"
+
+        try:
+            command = self._executor.exec_command(command_line)
+            exit_code = command.wait_until_exit()
+        except (SSHException, OSError, EOFError):
+            self._available = False
+            return None
+
+        if exit_code in (_COMMAND_NOT_EXECUTABLE, _COMMAND_NOT_FOUND):
+            self._available = False
+
+        return command if exit_code == 0 else None
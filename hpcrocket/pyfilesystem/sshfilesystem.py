@@ -4,8 +4,10 @@ import hpcrocket.ssh.chmodsshfs as sshfs
 from fs.errors import CreateFailed
 from hpcrocket.core.filesystem import Filesystem
 from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
+from hpcrocket.ssh.bandwidth import BandwidthLimiter
 from hpcrocket.ssh.connectiondata import ConnectionData
 from hpcrocket.ssh.errors import SSHError
+from hpcrocket.ssh.roundtrips import RoundTripRecorder
 from hpcrocket.ssh.sshexecutor import build_channel_with_proxyjumps
 
 
@@ -13,6 +15,9 @@ def sshfilesystem(
     connection_data: ConnectionData,
     proxyjumps: Optional[List[ConnectionData]] = None,
     dir: Optional[str] = None,
+    streams: int = 1,
+    limiter: Optional[BandwidthLimiter] = None,
+    round_trips: Optional[RoundTripRecorder] = None,
 ) -> Filesystem:
     """
     A PyFilesystem2 based Filesystem that connects to a remote machine via SSH
@@ -22,6 +27,9 @@ def sshfilesystem(
         host (str): The address of the remote machine
         password (str): The user's password on the remote machine. Alternative to `private_key`.
         private_key (str): The user's private SSH key. Alternative to `password`.
+        streams (int): The number of concurrent SFTP channels a single large file is uploaded with
+        limiter (BandwidthLimiter): Limits the rate of uploads and downloads
+        round_trips (RoundTripRecorder): Records the requests sent over the connection
     """
     try:
         channel = build_channel_with_proxyjumps(connection_data, proxyjumps or [])
@@ -32,9 +40,12 @@ def sshfilesystem(
             pkey=connection_data.key or connection_data.keyfile,
             port=connection_data.port,
             sock=channel,
+            streams=streams,
+            limiter=limiter,
+            round_trips=round_trips,
         )
 
         dir = dir or fs.homedir()
-        return PyFilesystemBased(fs, dir, fs.homedir())
+        return PyFilesystemBased(fs, dir, fs.homedir(), executor=fs.executor())
     except CreateFailed as err:
         raise SSHError(f"Could not connect to {connection_data.hostname}") from err
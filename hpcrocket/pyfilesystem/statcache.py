@@ -0,0 +1,366 @@
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Text,
+    Tuple,
+)
+
+import fs.errors
+from fs.base import FS
+from fs.enums import ResourceType
+from fs.info import Info
+from fs.path import abspath, basename, dirname, join, normpath
+from fs.permissions import Permissions
+from fs.subfs import SubFS
+from fs.wrapfs import WrapFS
+
+_CACHED_NAMESPACES = {"basic", "details"}
+_MISSES_BEFORE_LISTING = 2
+
+
+def _cache_key(path: str) -> str:
+    return abspath(normpath(path))
+
+
+def directory_info(path: str) -> Info:
+    """
+    Creates the Info of an empty directory as it would be reported right after its creation
+
+    Args:
+        path (str): The path of the directory
+    """
+    return Info(
+        {
+            "basic": {"name": basename(path), "is_dir": True},
+            "details": {"type": int(ResourceType.directory), "size": 0},
+        }
+    )
+
+
+class StatCachingFS(WrapFS[FS]):
+    """
+    A PyFilesystem2 wrapper that caches file metadata to save round trips to the wrapped filesystem.
+    The cache is filled from directory listings and invalidated by every write through this wrapper.
+    Changes made by others are not noticed, so instances should only live as long as a single batch of operations.
+    """
+
+    wrap_name = "stat-cache"
+
+    def __init__(self, wrap_fs: FS) -> None:
+        super().__init__(wrap_fs)
+        self._infos: Dict[str, Optional[Info]] = {}
+        self._listed_dirs: Set[str] = set()
+        self._stale: Set[str] = set()
+        self._misses: Dict[str, int] = {}
+
+    def seed(self, path: str, info: Optional[Info]) -> None:
+        """
+        Stores metadata that was obtained elsewhere, e.g. from a remote find command
+
+        Args:
+            path (str): The path of the resource
+            info (Info): The resource's info with the details namespace, None if the resource does not exist
+        """
+        key = _cache_key(path)
+        self._infos[key] = info
+        self._stale.discard(key)
+
+    def getinfo(
+        self, path: Text, namespaces: Optional[Collection[Text]] = None
+    ) -> Info:
+        if not set(namespaces or ()) <= _CACHED_NAMESPACES:
+            return super().getinfo(path, namespaces=namespaces)
+
+        info = self._lookup(_cache_key(path))
+        if info is None:
+            raise fs.errors.ResourceNotFound(path)
+
+        return info
+
+    def exists(self, path: Text) -> bool:
+        return self._lookup(_cache_key(path)) is not None
+
+    def isdir(self, path: Text) -> bool:
+        info = self._lookup(_cache_key(path))
+        return info is not None and info.is_dir
+
+    def isfile(self, path: Text) -> bool:
+        info = self._lookup(_cache_key(path))
+        return info is not None and not info.is_dir
+
+    def scandir(
+        self,
+        path: Text,
+        namespaces: Optional[Collection[Text]] = None,
+        page: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[Info]:
+        key = _cache_key(path)
+        namespaces = list(set(namespaces or ()) | {"details"})
+        for info in super().scandir(path, namespaces=namespaces, page=page):
+            self._infos[join(key, info.name)] = info
+            yield info
+
+        if page is None:
+            self._listed_dirs.add(key)
+            self._stale = {k for k in self._stale if dirname(k) != key}
+
+    def _lookup(self, key: str) -> Optional[Info]:
+        known, info = self._cached(key)
+        if known:
+            return info
+
+        parent = dirname(key)
+        if key != parent and key not in self._stale and self._should_list(parent):
+            self._list(parent)
+            return self._infos.get(key)
+
+        return self._fetch(key)
+
+    def _cached(self, key: str) -> Tuple[bool, Optional[Info]]:
+        if key in self._infos:
+            return True, self._infos[key]
+
+        if key in self._stale or key == "/":
+            return False, None
+
+        parent = dirname(key)
+        if parent in self._listed_dirs:
+            return True, None
+
+        parent_known, parent_info = self._cached(parent)
+        parent_missing = parent_known and (
+            parent_info is None or not parent_info.is_dir
+        )
+        return parent_missing, None
+
+    def _should_list(self, parent: str) -> bool:
+        misses = self._misses.get(parent, 0) + 1
+        self._misses[parent] = misses
+        return misses >= _MISSES_BEFORE_LISTING
+
+    def _list(self, dir: str) -> None:
+        try:
+            for _ in self.scandir(dir):
+                pass
+        except fs.errors.ResourceNotFound:
+            self._infos[dir] = None
+        except fs.errors.DirectoryExpected:
+            self._listed_dirs.add(dir)
+
+    def _fetch(self, key: str) -> Optional[Info]:
+        try:
+            info: Optional[Info] = super().getinfo(key, namespaces=["details"])
+        except fs.errors.ResourceNotFound:
+            info = None
+
+        self._infos[key] = info
+        self._stale.discard(key)
+        return info
+
+    def _invalidate(self, path: str) -> None:
+        key = _cache_key(path)
+        self._infos.pop(key, None)
+        self._stale.add(key)
+
+    def _invalidate_tree(self, path: str) -> None:
+        key = _cache_key(path)
+        prefix = key.rstrip("/") + "/"
+        self._infos = {k: v for k, v in self._infos.items() if not k.startswith(prefix)}
+        self._stale = {k for k in self._stale if not k.startswith(prefix)}
+        self._listed_dirs = {d for d in self._listed_dirs if not d.startswith(prefix)}
+        self._listed_dirs.discard(key)
+        self._invalidate(key)
+
+    def _mark_removed(self, path: str) -> None:
+        key = _cache_key(path)
+        self._infos[key] = None
+        self._stale.discard(key)
+
+    def openbin(
+        self, path: Text, mode: Text = "r", buffering: int = -1, **options: Any
+    ) -> BinaryIO:
+        if mode.strip("rbt"):
+            self._invalidate(path)
+
+        return super().openbin(path, mode=mode, buffering=buffering, **options)
+
+    def open(
+        self,
+        path: Text,
+        mode: Text = "r",
+        buffering: int = -1,
+        encoding: Optional[Text] = None,
+        errors: Optional[Text] = None,
+        newline: Text = "",
+        line_buffering: bool = False,
+        **options: Any
+    ) -> IO[Any]:
+        if mode.strip("rbt"):
+            self._invalidate(path)
+
+        return super().open(
+            path,
+            mode=mode,
+            buffering=buffering,
+            encoding=encoding,
+            errors=errors,
+            newline=newline,
+            line_buffering=line_buffering,
+            **options
+        )
+
+    def upload(
+        self,
+        path: Text,
+        file: BinaryIO,
+        chunk_size: Optional[int] = None,
+        **options: Any
+    ) -> None:
+        self._invalidate(path)
+        super().upload(path, file, chunk_size=chunk_size, **options)
+
+    def writebytes(self, path: Text, contents: bytes) -> None:
+        self._invalidate(path)
+        super().writebytes(path, contents)
+
+    def writefile(
+        self,
+        path: Text,
+        file: IO[Any],
+        encoding: Optional[Text] = None,
+        errors: Optional[Text] = None,
+        newline: Text = "",
+    ) -> None:
+        self._invalidate(path)
+        super().writefile(path, file, encoding=encoding, errors=errors, newline=newline)
+
+    def appendbytes(self, path: Text, data: bytes) -> None:
+        self._invalidate(path)
+        super().appendbytes(path, data)
+
+    def appendtext(
+        self,
+        path: Text,
+        text: Text,
+        encoding: Text = "utf-8",
+        errors: Optional[Text] = None,
+        newline: Text = "",
+    ) -> None:
+        self._invalidate(path)
+        super().appendtext(
+            path, text, encoding=encoding, errors=errors, newline=newline
+        )
+
+    def touch(self, path: Text) -> None:
+        self._invalidate(path)
+        super().touch(path)
+
+    def settimes(self, path: Text, accessed: Any = None, modified: Any = None) -> None:
+        self._invalidate(path)
+        super().settimes(path, accessed=accessed, modified=modified)
+
+    def create(self, path: Text, wipe: bool = False) -> bool:
+        self._invalidate(path)
+        return super().create(path, wipe=wipe)
+
+    def setinfo(self, path: Text, info: Mapping[str, Mapping[str, object]]) -> None:
+        self._invalidate(path)
+        super().setinfo(path, info)
+
+    def makedir(
+        self,
+        path: Text,
+        permissions: Optional[Permissions] = None,
+        recreate: bool = False,
+    ) -> SubFS[FS]:
+        key = _cache_key(path)
+        known, info = self._cached(key)
+        self._invalidate(key)
+        sub_fs = super().makedir(path, permissions=permissions, recreate=recreate)
+        if known and info is None:
+            self._infos[key] = directory_info(key)
+            self._stale.discard(key)
+            self._listed_dirs.add(key)
+
+        return sub_fs
+
+    def makedirs(
+        self,
+        path: Text,
+        permissions: Optional[Permissions] = None,
+        recreate: bool = False,
+    ) -> SubFS[FS]:
+        # The generic implementation creates every directory through makedir and thus keeps the cache up to date
+        return FS.makedirs(self, path, permissions=permissions, recreate=recreate)
+
+    def remove(self, path: Text) -> None:
+        self._invalidate(path)
+        super().remove(path)
+        self._mark_removed(path)
+
+    def removedir(self, path: Text) -> None:
+        self._invalidate_tree(path)
+        super().removedir(path)
+        self._mark_removed(path)
+
+    def removetree(self, dir_path: Text) -> None:
+        self._invalidate_tree(dir_path)
+        super().removetree(dir_path)
+        self._mark_removed(dir_path)
+
+    def move(
+        self,
+        src_path: Text,
+        dst_path: Text,
+        overwrite: bool = False,
+        preserve_time: bool = False,
+    ) -> None:
+        self._invalidate_tree(src_path)
+        self._invalidate_tree(dst_path)
+        super().move(
+            src_path, dst_path, overwrite=overwrite, preserve_time=preserve_time
+        )
+
+    def movedir(
+        self,
+        src_path: Text,
+        dst_path: Text,
+        create: bool = False,
+        preserve_time: bool = False,
+    ) -> None:
+        self._invalidate_tree(src_path)
+        self._invalidate_tree(dst_path)
+        super().movedir(src_path, dst_path, create=create, preserve_time=preserve_time)
+
+    def copydir(
+        self,
+        src_path: Text,
+        dst_path: Text,
+        create: bool = False,
+        preserve_time: bool = False,
+    ) -> None:
+        self._invalidate_tree(dst_path)
+        super().copydir(src_path, dst_path, create=create, preserve_time=preserve_time)
+
+    def copy(
+        self,
+        src_path: Text,
+        dst_path: Text,
+        overwrite: bool = False,
+        preserve_time: bool = False,
+    ) -> None:
+        self._invalidate(dst_path)
+        super().copy(
+            src_path, dst_path, overwrite=overwrite, preserve_time=preserve_time
+        )
+
+    def listdir(self, path: Text) -> List[Text]:
+        return [info.name for info in self.scandir(path)]
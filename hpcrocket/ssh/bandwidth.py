@@ -0,0 +1,146 @@
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+# Transfers may run ahead of the configured rate by this many seconds worth of data
+_BURST_SECONDS = 0.5
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+_RATE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:i?B)?(?:/s)?\s*$", re.I)
+
+
+def parse_rate(value: Union[int, float, str]) -> int:
+    """
+    Parses a transfer rate in bytes per second. Strings may use the binary suffixes K, M and G, e.g. `50M` or `1.5GiB/s`.
+
+    Args:
+        value (int | float | str): The rate
+
+    Returns:
+        int: The rate in bytes per second
+
+    Raises:
+        ValueError: If the value is not a positive rate
+    """
+    if isinstance(value, (int, float)):
+        rate = int(value)
+    else:
+        match = _RATE_PATTERN.match(value)
+        if match is None:
+            raise ValueError(f"Invalid transfer rate: {value}")
+
+        number, unit = match.groups()
+        rate = int(float(number) * _UNITS[unit.upper()])
+
+    if rate <= 0:
+        raise ValueError(f"Invalid transfer rate: {value}")
+
+    return rate
+
+
+class TokenBucket:
+    """
+    Limits the number of bytes transferred per second.
+    Requests are served in the order they arrive, so transfers sharing a bucket get equal shares of the rate
+    as long as they request similar amounts at a time. A single transfer can use the full rate.
+    """
+
+    def __init__(self, rate: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self._rate = rate
+        self._clock = clock
+        self._lock = threading.Lock()
+        # The time at which all bytes handed out so far are paid for
+        self._paid_until = clock()
+
+    @property
+    def rate(self) -> int:
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: int) -> None:
+        with self._lock:
+            self._rate = rate
+
+    def reserve(self, byte_count: int) -> float:
+        """
+        Takes tokens for the given number of bytes from the bucket
+
+        Args:
+            byte_count (int): The number of bytes about to be transferred
+
+        Returns:
+            float: The number of seconds the caller has to wait before transferring the bytes
+        """
+        with self._lock:
+            now = self._clock()
+            self._paid_until = max(self._paid_until, now) + byte_count / self._rate
+            return max(0.0, self._paid_until - _BURST_SECONDS - now)
+
+
+class BandwidthLimiter:
+    """
+    Throttles a transfer to the rates of one or more shared TokenBuckets, e.g. one for all transfers and one per host.
+    """
+
+    def __init__(
+        self,
+        buckets: List[TokenBucket],
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._buckets = buckets
+        self._sleep = sleep
+
+    def acquire(self, byte_count: int) -> None:
+        """
+        Blocks until the given number of bytes may be transferred
+
+        Args:
+            byte_count (int): The number of bytes about to be transferred
+        """
+        delay = max(bucket.reserve(byte_count) for bucket in self._buckets)
+        if delay > 0:
+            self._sleep(delay)
+
+
+_TOTAL = "*"
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _shared_bucket(key: str, rate: int) -> TokenBucket:
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate)
+        else:
+            bucket.rate = rate
+
+        return bucket
+
+
+def shared_limiter(
+    host: str,
+    total_rate: Optional[int] = None,
+    host_rate: Optional[int] = None,
+) -> Optional[BandwidthLimiter]:
+    """
+    Creates a limiter that shares its buckets with all other limiters of this process.
+    Concurrent transfers, even from different workflows, split the configured rates between them.
+
+    Args:
+        host (str): The host the transfers go to
+        total_rate (int): The maximum rate of all transfers in bytes per second
+        host_rate (int): The maximum rate of all transfers to this host in bytes per second
+
+    Returns:
+        Optional[BandwidthLimiter]: The limiter or None if no rate is given
+    """
+    buckets: List[TokenBucket] = []
+    if total_rate:
+        buckets.append(_shared_bucket(_TOTAL, total_rate))
+
+    if host_rate:
+        buckets.append(_shared_bucket(host, host_rate))
+
+    return BandwidthLimiter(buckets) if buckets else None
@@ -1,9 +1,19 @@
+import inspect
+import io
+import mmap
+import os
+import shutil
 import stat
+import time
+from contextlib import closing, contextmanager
 from typing import (
     TYPE_CHECKING,
     Any,
     BinaryIO,
+    Callable,
     Collection,
+    ContextManager,
+    Generator,
     Iterator,
     List,
     Mapping,
@@ -13,48 +23,358 @@ from typing import (
     cast,
 )
 
+import fs.errors
 import fs.sshfs.sshfs as sshfs
+from fs.sshfs.error_tools import convert_sshfs_errors
+from fs.sshfs.file import SSHFile
 from fs.base import FS
 from fs.info import Info
+from fs.mode import Mode
 from fs.permissions import Permissions
 from fs.subfs import SubFS
+from paramiko import SFTPAttributes, SFTPClient, SFTPFile
+
+from hpcrocket.core.executor import CommandExecutor
+from hpcrocket.core.filesystem import ProgressCallback
+from hpcrocket.core.rangeio import check_range
+from hpcrocket.pyfilesystem.pyfilesystembased import (
+    OPEN_OPTIONS_META_NAMESPACE,
+    UPLOAD_OPTIONS_META_NAMESPACE,
+)
+from hpcrocket.pyfilesystem.remoteshell import RemoteShell
+from hpcrocket.ssh.bandwidth import BandwidthLimiter
+from hpcrocket.ssh.errors import SSHError
+from hpcrocket.ssh.multistream import (
+    MIN_RANGE_SIZE,
+    ChecksumMismatchError,
+    remote_sha256_digest,
+    sha256_digest,
+    split_ranges,
+    write_ranges,
+)
+from hpcrocket.ssh.pipelinedattributes import set_attributes_pipelined
+from hpcrocket.ssh.pipelinedtransfers import read_pipelined, write_pipelined
+from hpcrocket.ssh.roundtrips import RoundTripRecorder
+from hpcrocket.ssh.sshexecutor import SharedClientExecutor
+from hpcrocket.ssh.transfertuning import TransferSettingsStore, TransferTuning
+from hpcrocket.typesafety import get_or_raise
 
 if TYPE_CHECKING:
     from fs.base import _OpendirFactory
 
+_CHUNK_SIZE = 1024 * 1024
+# Mapping small files costs more than copying them
+_MMAP_THRESHOLD = 4 * _CHUNK_SIZE
+# Files are only split when there is more than one range of the minimum size
+_MULTISTREAM_THRESHOLD = 2 * MIN_RANGE_SIZE
+# Throughput measured over less data is dominated by latency
+_MIN_TUNING_WINDOW = 4 * 1024 * 1024
+
+# paramiko < 3.3 always prefetches the whole file at once
+_PREFETCH_DEPTH_SUPPORTED = (
+    "max_concurrent_requests" in inspect.signature(SFTPFile.prefetch).parameters
+)
+
+
+def _local_attributes(
+    file: BinaryIO, preserve_mode: bool, preserve_time: bool
+) -> Optional[SFTPAttributes]:
+    if not preserve_mode and not preserve_time:
+        return None
+
+    try:
+        local_stat = os.fstat(file.fileno())
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    attributes = SFTPAttributes()
+    if preserve_mode:
+        attributes.st_mode = stat.S_IMODE(local_stat.st_mode)
+
+    if preserve_time:
+        attributes.st_atime = int(local_stat.st_atime)
+        attributes.st_mtime = int(local_stat.st_mtime)
+
+    return attributes
+
+
+def _memory_map(
+    file: BinaryIO, threshold: int = _MMAP_THRESHOLD
+) -> Optional[mmap.mmap]:
+    try:
+        size = os.fstat(file.fileno()).st_size
+        if size - file.tell() < threshold:
+            return None
+
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+
+
+def _read_chunks(file: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def _mapped_chunks(
+    mapped: mmap.mmap, offset: int, chunk_size: int
+) -> Generator[memoryview, None, None]:
+    # paramiko packs memoryview slices into its write requests without an intermediate bytes copy
+    with memoryview(mapped) as view:
+        start = offset
+        while start < len(view):
+            end = start + chunk_size
+            with view[start:end] as chunk:
+                yield chunk
+
+            start = end
+
+
+def _write_chunks(
+    chunks: Iterator[Any],
+    remote_file: SFTPFile,
+    tuning: TransferTuning,
+    progress: Optional[ProgressCallback],
+    limiter: Optional[BandwidthLimiter] = None,
+) -> None:
+    window_bytes = 0
+    window_start = time.perf_counter()
+    for chunk in chunks:
+        if limiter is not None:
+            limiter.acquire(len(chunk))
+
+        write_pipelined(remote_file, chunk, tuning.write_depth)
+        if progress is not None:
+            progress(len(chunk))
+
+        # Throttled transfers would only teach the tuning the configured rate
+        if limiter is not None or not tuning.tuning_uploads:
+            continue
+
+        window_bytes += len(chunk)
+        if window_bytes >= max(_MIN_TUNING_WINDOW, 4 * len(chunk)):
+            now = time.perf_counter()
+            tuning.record_upload(window_bytes, now - window_start)
+            window_bytes, window_start = 0, now
+
+
+def _copy_to_remote(
+    file: BinaryIO,
+    remote_file: SFTPFile,
+    chunk_size: int,
+    memory_map: bool,
+    tuning: TransferTuning,
+    progress: Optional[ProgressCallback],
+    limiter: Optional[BandwidthLimiter] = None,
+) -> None:
+    mapped = _memory_map(file) if memory_map else None
+    if mapped is None:
+        read_chunks = _read_chunks(file, chunk_size)
+        _write_chunks(read_chunks, remote_file, tuning, progress, limiter)
+        return
+
+    with mapped, closing(_mapped_chunks(mapped, file.tell(), chunk_size)) as chunks:
+        _write_chunks(chunks, remote_file, tuning, progress, limiter)
+
+
+def _copy_throttled(
+    remote_file: SFTPFile, file: BinaryIO, chunk_size: int, limiter: BandwidthLimiter
+) -> None:
+    # The SSH channel window stops the server from sending while the reader waits, so this throttles the network too
+    while True:
+        data = remote_file.read(chunk_size)
+        if not data:
+            break
+
+        limiter.acquire(len(data))
+        file.write(data)
+
+
+def _closed() -> SSHError:
+    return SSHError("The SSH connection was closed")
+
 
 class PermissionChangingSSHFSDecorator(FS):
     """
-    A subclass of SSHFS that changes the permissions of the remote file after upload.
+    A decorator for SSHFS that applies the local file's permissions to the remote file during upload.
+    Transfers adapt the number of write and read requests in flight to the measured throughput
+    and remember them for the host.
+    With more than one stream, large files are uploaded in byte ranges over several SFTP channels at once.
+    With a RoundTripRecorder, every SFTP request and remote command of the filesystem is recorded.
     """
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        *args: Any,
+        settings_store: Optional[TransferSettingsStore] = None,
+        streams: int = 1,
+        limiter: Optional[BandwidthLimiter] = None,
+        round_trips: Optional[RoundTripRecorder] = None,
+        **kwargs: Any
+    ) -> None:
         super().__init__()
         self._internal_fs: FS = sshfs.SSHFS(*args, **kwargs)  # type: ignore
+        self._round_trips = round_trips
+        if round_trips is not None:
+            round_trips.attach(self._internal_fs._sftp)
+
+        host = f"{kwargs.get('user')}@{kwargs.get('host')}:{kwargs.get('port', 22)}"
+        self._tuning = TransferTuning(host, settings_store or TransferSettingsStore())
+        self._streams = streams
+        self._limiter = limiter
+        self._shell = RemoteShell(self.executor())
+
+    def close(self) -> None:
+        self._internal_fs.close()
+        super().close()
 
     def homedir(self) -> Text:
         internal_sshfs = cast(sshfs.SSHFS, self._internal_fs)
         return internal_sshfs._sftp.normalize(".")
 
+    def executor(self) -> CommandExecutor:
+        """
+        Returns a CommandExecutor that runs commands over the SSH connection of this filesystem
+        """
+        internal_sshfs = cast(sshfs.SSHFS, self._internal_fs)
+        executor = SharedClientExecutor(internal_sshfs._client)
+        if self._round_trips is None:
+            return executor
+
+        return self._round_trips.executor(executor)
+
     def upload(
         self,
         path: str,
         file: BinaryIO,
         chunk_size: Optional[int] = None,
+        preserve_mode: bool = True,
+        preserve_time: bool = False,
+        memory_map: bool = True,
+        progress: Optional[ProgressCallback] = None,
         **options: Any
     ) -> None:
-        self._internal_fs.upload(path, file, **options)
+        """
+        Uploads a file and applies the local file's permission bits (and optionally its modification time)
+        to the remote copy. The attributes are sent pipelined with the file data and cost no extra round trip.
+        Large local files are memory mapped and written without copying each chunk into a new bytes object.
+        If the filesystem was created with several streams, large memory mapped files are split into byte ranges
+        that are written concurrently and verified with a SHA-256 checksum afterwards.
+
+        Args:
+            path (str): The remote path
+            file (BinaryIO): A local file opened for reading in binary mode
+            chunk_size (int): The size of the chunks read from the local file
+            preserve_mode (bool): Applies the local file's permission bits to the remote file
+            preserve_time (bool): Applies the local file's access and modification times to the remote file
+            memory_map (bool): Memory maps large local files instead of reading them chunk by chunk
+            progress (ProgressCallback): Called with the number of bytes sent after every chunk
+
+        Raises:
+            ChecksumMismatchError: If a file uploaded over several streams differs from the local file
+        """
+        internal_sshfs = cast(sshfs.SSHFS, self._internal_fs)
+        attributes = _local_attributes(file, preserve_mode, preserve_time)
+        _path = internal_sshfs.validatepath(path)
+        mapped = None
+        if memory_map and self._streams > 1:
+            mapped = _memory_map(file, _MULTISTREAM_THRESHOLD)
+
+        error_conversion = convert_sshfs_errors("upload", path)  # type: ignore
+        with internal_sshfs._lock, error_conversion:
+            if mapped is not None:
+                offset = file.tell()
+                with mapped, memoryview(mapped) as view, view[offset:] as data:
+                    self._upload_multistream(
+                        _path, data, chunk_size, attributes, progress
+                    )
+                return
+
+            # Unbuffered, so writes are not copied into paramiko's write buffer first
+            with internal_sshfs._sftp.open(_path, "wb", bufsize=0) as remote_file:
+                remote_file.set_pipelined(True)
+                _copy_to_remote(
+                    file,
+                    remote_file,
+                    chunk_size or _CHUNK_SIZE,
+                    memory_map,
+                    self._tuning,
+                    progress,
+                    self._limiter,
+                )
+                if attributes is not None:
+                    set_attributes_pipelined(remote_file, attributes)
+
+    def _upload_multistream(
+        self,
+        path: str,
+        data: memoryview,
+        chunk_size: Optional[int],
+        attributes: Optional[SFTPAttributes],
+        progress: Optional[ProgressCallback],
+    ) -> None:
+        internal_sshfs = cast(sshfs.SSHFS, self._internal_fs)
+        chunk_size = chunk_size or _CHUNK_SIZE
+        ranges = split_ranges(len(data), self._streams, chunk_size)
+        with internal_sshfs._sftp.open(path, "wb", bufsize=0) as remote_file:
+            remote_file.set_pipelined(True)
+            write_ranges(
+                data,
+                ranges,
+                self._range_writer_factory(path),
+                chunk_size,
+                progress,
+                self._limiter.acquire if self._limiter else None,
+            )
+            if attributes is not None:
+                set_attributes_pipelined(remote_file, attributes)
+
+        self._verify_upload(path, data)
+
+    @contextmanager
+    def _open_range_writer(self, path: str) -> Iterator[SFTPFile]:
+        internal_sshfs = cast(sshfs.SSHFS, self._internal_fs)
+        # Every range gets its own channel, so the channel windows do not limit the combined throughput
+        transport = get_or_raise(internal_sshfs._client.get_transport(), _closed())
+        channel_sftp = get_or_raise(SFTPClient.from_transport(transport), _closed())
+        if self._round_trips is not None:
+            self._round_trips.attach(channel_sftp)
+
+        with channel_sftp as sftp:
+            with sftp.open(path, "r+b", bufsize=0) as remote_file:
+                remote_file.set_pipelined(True)
+                yield remote_file
+
+    def _range_writer_factory(
+        self, path: str
+    ) -> Callable[[], ContextManager[SFTPFile]]:
+        return lambda: self._open_range_writer(path)
+
+    def _verify_upload(self, path: str, data: memoryview) -> None:
         internal_sshfs = cast(sshfs.SSHFS, self._internal_fs)
-        internal_sshfs._sftp.chmod(
-            path,
-            stat.ST_MODE
-            | stat.S_IRUSR
-            | stat.S_IWUSR
-            | stat.S_IXUSR
-            | stat.S_IREAD
-            | stat.S_IWRITE
-            | stat.S_IEXEC,
-        )
+        remote_digest = remote_sha256_digest(self._shell, path)
+        if remote_digest is None:
+            # Without a remote shell only the size can be checked
+            verified = internal_sshfs._sftp.stat(path).st_size == len(data)
+        else:
+            verified = remote_digest == sha256_digest(data)
+
+        if not verified:
+            internal_sshfs._sftp.remove(path)
+            raise ChecksumMismatchError(path)
+
+    def getmeta(self, namespace: Text = "standard") -> Mapping[Text, object]:
+        if namespace == UPLOAD_OPTIONS_META_NAMESPACE:
+            return {"preserve_mode": True, "preserve_time": True, "progress": True}
+
+        if namespace == OPEN_OPTIONS_META_NAMESPACE:
+            return {"offset": True, "length": True}
+
+        return super().getmeta(namespace)
 
     def download(
         self,
@@ -63,7 +383,52 @@ class PermissionChangingSSHFSDecorator(FS):
         chunk_size: Optional[int] = None,
         **options: Any
     ) -> None:
-        self._internal_fs.download(path, file, chunk_size, **options)
+        internal_sshfs = cast(sshfs.SSHFS, self._internal_fs)
+        _path = internal_sshfs.validatepath(path)
+        error_conversion = convert_sshfs_errors("download", path)  # type: ignore
+        with internal_sshfs._lock, error_conversion:
+            attributes = internal_sshfs._sftp.stat(_path)
+            if stat.S_ISDIR(attributes.st_mode or 0):
+                raise fs.errors.FileExpected(path)
+
+            size = attributes.st_size or 0
+            with internal_sshfs._sftp.open(_path, "rb") as remote_file:
+                if self._limiter is not None:
+                    # Not tuned, the measured rate would be the configured one
+                    self._prefetch(remote_file, size)
+                    _copy_throttled(
+                        remote_file, file, chunk_size or _CHUNK_SIZE, self._limiter
+                    )
+                    return
+
+                self._download_pipelined(remote_file, file, size)
+                # A file that grew since it was looked up is read to its end
+                shutil.copyfileobj(remote_file, file, chunk_size or _CHUNK_SIZE)
+
+    def _download_pipelined(
+        self, remote_file: SFTPFile, file: BinaryIO, size: int
+    ) -> None:
+        position = 0
+        while position < size:
+            # The beginning of a file is read in windows while the prefetch depth is tuned,
+            # every window with the depth to measure next
+            tuning = (
+                self._tuning.tuning_downloads
+                and size - position >= _MIN_TUNING_WINDOW
+            )
+            length = _MIN_TUNING_WINDOW if tuning else size - position
+            start = time.perf_counter()
+            read_pipelined(remote_file, file, length, self._tuning.prefetch_depth)
+            if tuning:
+                self._tuning.record_download(length, time.perf_counter() - start)
+
+            position += length
+
+    def _prefetch(self, remote_file: SFTPFile, size: int) -> None:
+        if _PREFETCH_DEPTH_SUPPORTED:
+            remote_file.prefetch(size, self._tuning.prefetch_depth)
+        else:  # pragma: no cover
+            remote_file.prefetch(size)
 
     def listdir(self, path: Text) -> List[Text]:
         return self._internal_fs.listdir(path)
@@ -71,8 +436,37 @@ class PermissionChangingSSHFSDecorator(FS):
     def openbin(
         self, path: Text, mode: Text = "r", buffering: int = -1, **options: Any
     ) -> BinaryIO:
+        if "offset" in options:
+            return self._openbin_range(
+                path, mode, buffering, options["offset"], options.get("length")
+            )
+
         return self._internal_fs.openbin(path, mode, buffering, **options)
 
+    def _openbin_range(
+        self, path: Text, mode: Text, buffering: int, offset: int, length: Optional[int]
+    ) -> BinaryIO:
+        # fs.sshfs opens every file on a new SFTP session and prefetches it from its first byte
+        if Mode(mode).writing:
+            raise ValueError(f"Byte ranges can only be read, not opened with mode {mode}")
+
+        check_range(offset, length)
+        internal_sshfs = cast(sshfs.SSHFS, self._internal_fs)
+        _path = internal_sshfs.validatepath(path)
+        with internal_sshfs._lock, convert_sshfs_errors("openbin", path):  # type: ignore
+            attributes = internal_sshfs._sftp.stat(_path)
+            if stat.S_ISDIR(attributes.st_mode or 0):
+                raise fs.errors.FileExpected(path)
+
+            size = attributes.st_size or 0
+            end = size if length is None else min(offset + length, size)
+            remote_file = internal_sshfs._sftp.open(_path, "rb", bufsize=buffering)
+            remote_file.seek(offset)
+            if offset < end:
+                self._prefetch(remote_file, end)
+
+        return cast(BinaryIO, SSHFile(remote_file, "rb"))  # type: ignore
+
     def opendir(
         self, path: Text, factory: Optional["_OpendirFactory[FS]"] = None
     ) -> SubFS[FS]:
@@ -0,0 +1,154 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ContextManager, List, NamedTuple, Optional
+
+from hpcrocket.core.filesystem import ProgressCallback
+from hpcrocket.pyfilesystem.remoteshell import RemoteShell
+
+# Opening an SFTP channel per range costs more than it gains for smaller ranges
+MIN_RANGE_SIZE = 16 * 1024 * 1024
+
+
+class ByteRange(NamedTuple):
+    """
+    A contiguous part of a file
+    """
+
+    offset: int
+    length: int
+
+
+class ChecksumMismatchError(Exception):
+    """
+    Raised when a file transferred over several streams differs from the original.
+    """
+
+
+def split_ranges(size: int, streams: int, alignment: int) -> List[ByteRange]:
+    """
+    Splits a file into at most `streams` ranges of nearly equal size.
+    Every range is at least `MIN_RANGE_SIZE` bytes long and all but the last one start and end at multiples of `alignment`.
+
+    Args:
+        size (int): The size of the file
+        streams (int): The maximum number of ranges
+        alignment (int): The chunk size the ranges are written with
+
+    Returns:
+        list[ByteRange]: The ranges in file order, a single range if splitting does not pay off
+    """
+    count = max(1, min(streams, size // MIN_RANGE_SIZE))
+    aligned_chunks = -(-size // alignment)
+    chunks_per_range = -(-aligned_chunks // count)
+    range_size = chunks_per_range * alignment
+
+    ranges: List[ByteRange] = []
+    offset = 0
+    while offset < size or not ranges:
+        length = min(range_size, size - offset)
+        ranges.append(ByteRange(offset, length))
+        offset += length
+
+    return ranges
+
+
+class _SynchronizedProgress:
+    def __init__(self, progress: ProgressCallback) -> None:
+        self._progress = progress
+        self._lock = threading.Lock()
+
+    def __call__(self, byte_count: int) -> None:
+        with self._lock:
+            self._progress(byte_count)
+
+
+def _write_range(
+    data: memoryview,
+    byte_range: ByteRange,
+    open_remote: Callable[[], ContextManager[Any]],
+    chunk_size: int,
+    progress: Optional[ProgressCallback],
+    throttle: Optional[Callable[[int], None]],
+) -> None:
+    with open_remote() as remote_file:
+        remote_file.seek(byte_range.offset)
+        end = byte_range.offset + byte_range.length
+        for start in range(byte_range.offset, end, chunk_size):
+            stop = min(start + chunk_size, end)
+            with data[start:stop] as chunk:
+                if throttle is not None:
+                    throttle(len(chunk))
+
+                remote_file.write(chunk)
+                if progress is not None:
+                    progress(len(chunk))
+
+
+def write_ranges(
+    data: memoryview,
+    ranges: List[ByteRange],
+    open_remote: Callable[[], ContextManager[Any]],
+    chunk_size: int,
+    progress: Optional[ProgressCallback] = None,
+    throttle: Optional[Callable[[int], None]] = None,
+) -> None:
+    """
+    Writes the ranges of the data concurrently, every range through its own remote file handle.
+    The remote file must already exist, each handle seeks to its range and writes it in place.
+
+    Args:
+        data (memoryview): The complete file content
+        ranges (list[ByteRange]): The ranges to write, usually created by `split_ranges`
+        open_remote (Callable[[], ContextManager]): Opens a new handle of the remote file for writing without truncating it
+        chunk_size (int): The size of a single write
+        progress (ProgressCallback): Called with the number of bytes sent after every chunk, from several threads
+        throttle (Callable[[int], None]): Called with the size of every chunk before it is written,
+            may block to limit the rate
+
+    Raises:
+        Exception: The first error raised while writing a range
+    """
+    synchronized = _SynchronizedProgress(progress) if progress else None
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [
+            pool.submit(
+                _write_range,
+                data,
+                byte_range,
+                open_remote,
+                chunk_size,
+                synchronized,
+                throttle,
+            )
+            for byte_range in ranges
+        ]
+
+        for future in futures:
+            future.result()
+
+
+def sha256_digest(data: memoryview) -> str:
+    """
+    Returns the hex encoded SHA-256 digest of the data
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def remote_sha256_digest(shell: RemoteShell, path: str) -> Optional[str]:
+    """
+    Computes the SHA-256 digest of a remote file with `sha256sum`
+
+    Args:
+        shell (RemoteShell): The shell to run sha256sum in
+        path (str): The absolute path of the remote file
+
+    Returns:
+        str: The hex encoded digest or None if it could not be computed remotely
+    """
+    command = shell.run(["sha256sum", "--", path], discard_stderr=True)
+    if command is None:
+        return None
+
+    output = "".join(command.stdout()).split()
+    return output[0].lower() if output else None
@@ -0,0 +1,20 @@
+from paramiko import SFTPAttributes, SFTPFile
+from paramiko.sftp import CMD_FSETSTAT
+
+
+def set_attributes_pipelined(remote_file: SFTPFile, attributes: SFTPAttributes) -> None:
+    """
+    Sets the attributes of an open remote file without waiting for the server's response
+
+    Args:
+        remote_file (SFTPFile): The open file
+        attributes (SFTPAttributes): The attributes to set, e.g. the permissions and modification time
+    """
+    # Data still buffered locally would be written after the attributes and change the modification time again
+    remote_file.flush()
+    # Answered to the file like its pipelined writes, so a failure is raised by the next write
+    # that waits for its responses or at the latest when the file is closed
+    request = remote_file.sftp._async_request(  # type: ignore
+        remote_file, CMD_FSETSTAT, remote_file.handle, attributes
+    )
+    remote_file._reqs.append(request)  # type: ignore
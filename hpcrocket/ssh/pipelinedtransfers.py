@@ -0,0 +1,127 @@
+from collections import deque
+from typing import Any, BinaryIO, Deque, Dict, Tuple
+
+from paramiko import SFTPClient, SFTPFile
+from paramiko.message import Message
+from paramiko.sftp import CMD_DATA, CMD_READ, CMD_STATUS, CMD_WRITE, SFTPError, int64
+
+# Paramiko's pipelined writes only wait once a hundred requests are outstanding and its prefetching limits
+# the requests in flight from a thread that polls. Both functions here keep a fixed number of requests in flight,
+# which sets the data in flight and with it the throughput over links with a high latency.
+
+
+def write_pipelined(remote_file: SFTPFile, data: Any, depth: int) -> None:
+    """
+    Writes data at the current position of an open remote file in requests of the largest size SFTP servers accept.
+    Further requests are sent without waiting as long as fewer than `depth` requests await their response.
+
+    Args:
+        remote_file (SFTPFile): The open file, the responses that are still outstanding are collected when it is closed
+        data (bytes-like): The data to write
+        depth (int): The maximum number of write requests awaiting their response
+
+    Raises:
+        IOError: A request of the file failed
+    """
+    sftp = remote_file.sftp
+    requests = remote_file._reqs  # type: ignore
+    position = remote_file.tell()
+    request_size = remote_file.MAX_REQUEST_SIZE
+    with memoryview(data) as view:
+        for start in range(0, len(view), request_size):
+            while len(requests) >= depth:
+                sftp._read_response(requests.popleft())  # type: ignore
+                # Responses to other requests of the file that arrived meanwhile
+                remote_file._check_exception()  # type: ignore
+
+            end = start + request_size
+            with view[start:end] as chunk:
+                requests.append(
+                    sftp._async_request(  # type: ignore
+                        remote_file,
+                        CMD_WRITE,
+                        remote_file.handle,
+                        int64(position + start),
+                        chunk,
+                    )
+                )
+
+        remote_file.seek(position + len(view))
+
+
+class _Responses:
+    """
+    Keeps the responses to read requests that arrived while the response to another request was awaited
+    """
+
+    def __init__(self) -> None:
+        self._responses: Dict[int, Tuple[int, Message]] = {}
+
+    def _async_response(self, t: int, msg: Message, num: int) -> None:
+        # Called by paramiko for every response to a request sent on behalf of this object
+        self._responses[num] = (t, msg)
+
+    def wait(self, sftp: SFTPClient, request: int) -> bytes:
+        if request in self._responses:
+            t, msg = self._responses.pop(request)
+            if t == CMD_STATUS:
+                sftp._convert_status(msg)  # type: ignore
+        else:
+            t, msg = sftp._read_response(request)  # type: ignore
+
+        if t != CMD_DATA:
+            raise SFTPError("Expected data")
+
+        return msg.get_string()
+
+
+def read_pipelined(
+    remote_file: SFTPFile, file: BinaryIO, length: int, depth: int
+) -> None:
+    """
+    Reads a part of an open remote file, starting at its current position, into a local file.
+    The part is requested in requests of the largest size SFTP servers accept, `depth` of which are kept in flight.
+
+    Args:
+        remote_file (SFTPFile): The open file
+        file (BinaryIO): The local file to write the data to
+        length (int): The number of bytes to read
+        depth (int): The number of read requests awaiting their response
+
+    Raises:
+        EOFError: The remote file ends before `length` bytes were read
+        IOError: A request of the file failed
+    """
+    sftp = remote_file.sftp
+    responses = _Responses()
+    pending: Deque[Tuple[int, int, int]] = deque()
+    offset = remote_file.tell()
+    end = offset + length
+    while pending or offset < end:
+        while offset < end and len(pending) < depth:
+            size = min(remote_file.MAX_REQUEST_SIZE, end - offset)
+            request = sftp._async_request(  # type: ignore
+                responses, CMD_READ, remote_file.handle, int64(offset), size
+            )
+            pending.append((request, offset, size))
+            offset += size
+
+        request, start, size = pending.popleft()
+        data = responses.wait(sftp, request)
+        file.write(data)
+        if len(data) < size:
+            # Servers may answer with less data than requested, the rest is read without pipelining
+            remote_file.seek(start + len(data))
+            _read_exactly(remote_file, file, size - len(data))
+
+    remote_file.seek(end)
+
+
+def _read_exactly(remote_file: SFTPFile, file: BinaryIO, length: int) -> None:
+    while length > 0:
+        data = remote_file.read(length)
+        if not data:
+            raise EOFError("The remote file ended unexpectedly")
+
+        file.write(data)
+        length -= len(data)
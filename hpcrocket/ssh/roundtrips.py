@@ -0,0 +1,130 @@
+import struct
+import threading
+from typing import Any, Dict, Tuple
+
+from paramiko import SFTPClient
+from paramiko.sftp import (
+    CMD_CLOSE,
+    CMD_FSETSTAT,
+    CMD_FSTAT,
+    CMD_LSTAT,
+    CMD_MKDIR,
+    CMD_OPEN,
+    CMD_OPENDIR,
+    CMD_READ,
+    CMD_READDIR,
+    CMD_READLINK,
+    CMD_REALPATH,
+    CMD_REMOVE,
+    CMD_RENAME,
+    CMD_RMDIR,
+    CMD_SETSTAT,
+    CMD_STAT,
+    CMD_SYMLINK,
+    CMD_WRITE,
+)
+
+from hpcrocket.core.executor import CommandExecutor
+from hpcrocket.core.instrumentation import InstrumentedExecutor
+from hpcrocket.core.runreport import RunReport
+
+_OPERATIONS = {
+    CMD_OPEN: "open",
+    CMD_CLOSE: "close",
+    CMD_READ: "read",
+    CMD_WRITE: "write",
+    CMD_STAT: "stat",
+    CMD_LSTAT: "stat",
+    CMD_FSTAT: "stat",
+    # SFTP changes permissions and times with the same requests
+    CMD_SETSTAT: "chmod",
+    CMD_FSETSTAT: "chmod",
+    CMD_OPENDIR: "listdir",
+    CMD_READDIR: "listdir",
+    CMD_REMOVE: "delete",
+    CMD_RMDIR: "delete",
+    CMD_MKDIR: "mkdir",
+    CMD_RENAME: "rename",
+    CMD_REALPATH: "realpath",
+    CMD_READLINK: "readlink",
+    CMD_SYMLINK: "symlink",
+}
+
+_REQUEST_NUMBER = struct.Struct(">I")
+
+
+def _operation(request_type: int) -> str:
+    return _OPERATIONS.get(request_type, "other")
+
+
+class RoundTripRecorder:
+    """
+    Counts every request an SFTPClient sends by operation and records the latency until its response arrives.
+    Commands run over the connection of a filesystem count as "exec" round trips.
+    """
+
+    def __init__(self, report: RunReport) -> None:
+        self._report = report
+
+    def attach(self, client: SFTPClient) -> SFTPClient:
+        """
+        Records the requests of an SFTP client from now on.
+        The client's request methods are replaced, because every operation, including prefetched reads
+        and pipelined writes, is sent through them.
+
+        Args:
+            client (SFTPClient): The client to record
+
+        Returns:
+            SFTPClient: The same client
+        """
+        send = getattr(client, "_async_request")
+        read_packet = getattr(client, "_read_packet")
+        # Responses may be read by another thread than the one that sent the request
+        lock = threading.Lock()
+        pending: Dict[int, Tuple[str, float]] = {}
+
+        def async_request(fileobj: Any, request_type: int, *args: Any) -> int:
+            operation = _operation(request_type)
+            self._report.count_round_trip(operation)
+            started = self._report.now()
+            number: int = send(fileobj, request_type, *args)
+            with lock:
+                pending[number] = (operation, started)
+
+            return number
+
+        def read_response_packet() -> Tuple[int, bytes]:
+            response_type, data = read_packet()
+            if len(data) >= _REQUEST_NUMBER.size:
+                (number,) = _REQUEST_NUMBER.unpack_from(data)
+                self._record_response(pending, lock, number)
+
+            return response_type, data
+
+        setattr(client, "_async_request", async_request)
+        setattr(client, "_read_packet", read_response_packet)
+        return client
+
+    def _record_response(
+        self, pending: Dict[int, Tuple[str, float]], lock: threading.Lock, number: int
+    ) -> None:
+        with lock:
+            request = pending.pop(number, None)
+
+        # A response may arrive before its request was registered, it is counted without latency then
+        if request is not None:
+            operation, started = request
+            self._report.add_latency(operation, self._report.now() - started)
+
+    def executor(self, executor: CommandExecutor) -> CommandExecutor:
+        """
+        Records the commands run with an executor of a filesystem
+
+        Args:
+            executor (CommandExecutor): The executor to record
+
+        Returns:
+            CommandExecutor
+        """
+        return InstrumentedExecutor(executor, self._report, "remote.executor")
@@ -0,0 +1,517 @@
+import posixpath
+import stat
+from collections import deque
+from contextlib import contextmanager
+from io import TextIOWrapper
+from typing import (
+    BinaryIO,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+
+from paramiko import SFTPAttributes, SFTPClient, SFTPFile, SSHException
+
+from hpcrocket.core.executor import CommandExecutor
+from hpcrocket.core.filesystem import FileInfo, Filesystem, ProgressCallback
+from hpcrocket.core.rangeio import open_range
+from hpcrocket.core.streamcopy import copy_between
+from hpcrocket.pyfilesystem.remotecopy import raise_for_outcome, remote_duplicate
+from hpcrocket.pyfilesystem.remotedelete import remote_delete
+from hpcrocket.pyfilesystem.remotedirs import leaf_directories, remote_makedirs
+from hpcrocket.pyfilesystem.remoteglob import (
+    FindEntry,
+    match_entries,
+    pattern_depth,
+    remote_glob,
+    remote_stat,
+)
+from hpcrocket.pyfilesystem.remoteshell import RemoteShell
+from hpcrocket.ssh.connectiondata import ConnectionData
+from hpcrocket.ssh.errors import SSHError
+from hpcrocket.ssh.pipelinedattributes import set_attributes_pipelined
+from hpcrocket.ssh.roundtrips import RoundTripRecorder
+from hpcrocket.ssh.sshexecutor import SSHExecutor
+
+_MISSES_BEFORE_LISTING = 2
+_WRITE_BUFFER_SIZE = SFTPFile.MAX_REQUEST_SIZE
+
+
+def _is_glob(path: str) -> bool:
+    return "*" in path
+
+
+def _split_glob_pattern(pattern: str) -> Tuple[str, str]:
+    """
+    Splits a pattern into the directory before the first wildcard and the pattern relative to it.
+    A trailing wildcard matches everything below the directory, just like in PyFilesystemBased.
+    """
+    end = pattern.rfind("/", 0, pattern.find("*")) + 1
+    dir, pattern = pattern[:end], pattern[end:]
+    if pattern.endswith("*"):
+        pattern += "*"
+
+    return dir, pattern
+
+
+def _is_dir(attributes: SFTPAttributes) -> bool:
+    return stat.S_ISDIR(attributes.st_mode or 0)
+
+
+def _find_entry(path: str, attributes: SFTPAttributes) -> FindEntry:
+    is_dir = _is_dir(attributes)
+    return FindEntry(
+        path + "/" if is_dir else path,
+        is_dir,
+        attributes.st_size or 0,
+        float(attributes.st_mtime or 0),
+        stat.S_IMODE(attributes.st_mode or 0),
+        is_link=stat.S_ISLNK(attributes.st_mode or 0),
+    )
+
+
+def _entry_attributes(entry: FindEntry) -> SFTPAttributes:
+    attributes = SFTPAttributes()
+    attributes.st_mode = (stat.S_IFDIR if entry.is_dir else stat.S_IFREG) | entry.mode
+    attributes.st_size = entry.size
+    attributes.st_mtime = int(entry.mtime)
+    return attributes
+
+
+def _directory_attributes() -> SFTPAttributes:
+    attributes = SFTPAttributes()
+    attributes.st_mode = stat.S_IFDIR | 0o755
+    attributes.st_size = 0
+    return attributes
+
+
+def _mode_attributes(mode: int) -> SFTPAttributes:
+    attributes = SFTPAttributes()
+    attributes.st_mode = mode
+    return attributes
+
+
+class _AttributeCache:
+    """
+    The attributes of remote paths known within a batch, None for paths that do not exist.
+    Once enough paths in a directory were looked up, the directory is listed,
+    so that further lookups in it need no round trip, even for paths that do not exist.
+    """
+
+    def __init__(self) -> None:
+        self._attributes: Dict[str, Optional[SFTPAttributes]] = {}
+        self._listed_dirs: Set[str] = set()
+        # Links and files changed after their directory was listed
+        self._unknown: Set[str] = set()
+        self._misses: Dict[str, int] = {}
+
+    def lookup(self, path: str) -> Tuple[bool, Optional[SFTPAttributes]]:
+        if path in self._attributes:
+            return True, self._attributes[path]
+
+        listed = posixpath.dirname(path) in self._listed_dirs
+        return listed and path not in self._unknown, None
+
+    def should_list(self, dir: str) -> bool:
+        misses = self._misses.get(dir, 0) + 1
+        self._misses[dir] = misses
+        return misses >= _MISSES_BEFORE_LISTING and dir not in self._listed_dirs
+
+    def store(self, path: str, attributes: Optional[SFTPAttributes]) -> None:
+        self._attributes[path] = attributes
+        self._unknown.discard(path)
+
+    def store_listing(self, dir: str, entries: List[SFTPAttributes]) -> None:
+        for entry in entries:
+            path = posixpath.join(dir, entry.filename)
+            # Listings report links themselves, the cache holds the attributes of their targets
+            if stat.S_ISLNK(entry.st_mode or 0):
+                self._unknown.add(path)
+            else:
+                self.store(path, entry)
+
+        self._listed_dirs.add(dir)
+
+    def forget(self, path: str) -> None:
+        self._attributes.pop(path, None)
+        self._unknown.add(path)
+
+
+class SFTPFilesystem(Filesystem):
+    """
+    A Filesystem that uses a paramiko SFTPClient directly instead of going through PyFilesystem2.
+    Directory listings are read with their attributes, so globbing needs no stat call per file,
+    and file metadata is cached for the duration of a batch (see `batch()`).
+    Reads are prefetched and writes are pipelined.
+    If an executor is given, globbing, deleting directories and copying on the remote machine are run as remote commands
+    and fall back to SFTP when the remote machine does not provide shell access.
+    Files are copied to other kinds of Filesystems through binary streams.
+    """
+
+    def __init__(
+        self,
+        client: SFTPClient,
+        dir: str,
+        home: str,
+        executor: Optional[CommandExecutor] = None,
+    ) -> None:
+        self._client = client
+        self._curdir = posixpath.normpath(dir)
+        self._homedir = posixpath.normpath(home)
+        self._executor = executor
+        self._shell = RemoteShell(executor)
+        self._cache: Optional[_AttributeCache] = None
+
+    @property
+    def client(self) -> SFTPClient:
+        return self._client
+
+    @property
+    def current_dir(self) -> str:
+        return self._curdir
+
+    @property
+    def home(self) -> str:
+        return self._homedir
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        if self._cache is not None:
+            yield
+            return
+
+        self._cache = _AttributeCache()
+        try:
+            yield
+        finally:
+            self._cache = None
+
+    def _expandhome(self, path: str) -> str:
+        return path.replace("~", self._homedir)
+
+    def _abspath(self, path: str) -> str:
+        path = self._expandhome(path)
+        return posixpath.normpath(posixpath.join(self._curdir, path))
+
+    def _remember(self, path: str, attributes: Optional[SFTPAttributes]) -> None:
+        if self._cache is not None:
+            self._cache.store(path, attributes)
+
+    def _forget_cached_metadata(self) -> None:
+        if self._cache is not None:
+            self._cache = _AttributeCache()
+
+    def _attributes(self, path: str) -> Optional[SFTPAttributes]:
+        if self._cache is None:
+            return self._stat(path)
+
+        known, attributes = self._cache.lookup(path)
+        if known:
+            return attributes
+
+        parent = posixpath.dirname(path)
+        if parent != path and self._cache.should_list(parent):
+            self._try_listdir(parent)
+            known, attributes = self._cache.lookup(path)
+            if known:
+                return attributes
+
+        attributes = self._stat(path)
+        self._cache.store(path, attributes)
+        return attributes
+
+    def _stat(self, path: str) -> Optional[SFTPAttributes]:
+        try:
+            return self._client.stat(path)
+        except FileNotFoundError:
+            return None
+
+    def _try_listdir(self, path: str) -> None:
+        try:
+            self._listdir(path)
+        except OSError:
+            # Missing directories and other files are looked up with stat like any other path
+            pass
+
+    def _listdir(self, path: str) -> List[SFTPAttributes]:
+        entries = self._client.listdir_attr(path)
+        if self._cache is not None:
+            self._cache.store_listing(path, entries)
+
+        return entries
+
+    def glob(self, pattern: str) -> List[str]:
+        dir, pattern = _split_glob_pattern(self._expandhome(pattern))
+        root = self._abspath(dir)
+        entries = remote_glob(self._shell, root, pattern)
+        if entries is None:
+            walked = list(self._walk(root, pattern_depth(pattern)))
+            entries = match_entries(walked, pattern)
+        else:
+            self._seed_cache(root, entries)
+
+        return [posixpath.join(dir, entry.path) for entry in entries]
+
+    def _walk(self, root: str, max_depth: Optional[int]) -> Iterator[FindEntry]:
+        pending: Deque[Tuple[str, int]] = deque([("", 1)])
+        while pending:
+            relative_dir, depth = pending.popleft()
+            for attributes in self._listdir(posixpath.join(root, relative_dir)):
+                entry = _find_entry(
+                    posixpath.join(relative_dir, attributes.filename), attributes
+                )
+                yield entry
+                if entry.is_dir and (max_depth is None or depth < max_depth):
+                    pending.append((entry.path, depth + 1))
+
+    def walk(self, root: str) -> Iterator[FileInfo]:
+        root = self._expandhome(root)
+        full_root = self._abspath(root)
+        entries = remote_glob(self._shell, full_root, "**")
+        if entries is not None:
+            self._seed_cache(full_root, entries)
+
+        walked = entries if entries is not None else self._walk(full_root, None)
+        for entry in walked:
+            yield entry.file_info(posixpath.join(root, entry.path.rstrip("/")))
+
+    def stat_many(self, paths: List[str]) -> List[Optional[FileInfo]]:
+        full_paths = [self._abspath(path) for path in paths]
+        entries = (
+            remote_stat(self._shell, full_paths) if self._shell.available else None
+        )
+        if entries is None:
+            return super().stat_many(paths)
+
+        infos: List[Optional[FileInfo]] = []
+        for path, full_path in zip(paths, full_paths):
+            entry = entries.get(full_path)
+            self._remember(full_path, _entry_attributes(entry) if entry else None)
+            infos.append(entry.file_info(path) if entry is not None else None)
+
+        return infos
+
+    def _seed_cache(self, root: str, entries: List[FindEntry]) -> None:
+        self._remember(root, _directory_attributes())
+        for entry in entries:
+            if not entry.is_link:
+                path = posixpath.join(root, entry.path.rstrip("/"))
+                self._remember(path, _entry_attributes(entry))
+
+    def copy(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        filesystem: Optional[Filesystem] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        target_fs = filesystem or self
+        mode_of = self._mode if preserve_mode else None
+        with self.batch(), target_fs.batch():
+            copy_between(
+                self,
+                self._expandhome(source),
+                target_fs,
+                target,
+                overwrite,
+                progress,
+                mode_of,
+            )
+
+    def _mode(self, path: str) -> Optional[int]:
+        attributes = self._attributes(self._abspath(path))
+        if attributes is None or attributes.st_mode is None:
+            return None
+
+        return stat.S_IMODE(attributes.st_mode)
+
+    def duplicate(
+        self,
+        source: str,
+        target: str,
+        overwrite: bool = False,
+        symlink: bool = False,
+    ) -> None:
+        outcome = remote_duplicate(
+            self._shell,
+            self._abspath(source),
+            self._abspath(target),
+            overwrite,
+            symlink,
+        )
+        self._forget_cached_metadata()
+        if outcome is None:
+            super().duplicate(source, target, overwrite, symlink)
+            return
+
+        raise_for_outcome(outcome, source, target)
+
+    def delete(self, path: str) -> None:
+        if not _is_glob(path):
+            self._delete_path(path)
+            return
+
+        for match in self.glob(path):
+            # Matches below a directory that was deleted before are already gone
+            if self.exists(match):
+                self._delete_path(match)
+
+    def _delete_path(self, path: str) -> None:
+        full_path = self._abspath(path)
+        try:
+            attributes = self._client.lstat(full_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(path)
+
+        if _is_dir(attributes):
+            self._delete_tree(full_path)
+        else:
+            self._client.remove(full_path)
+
+        self._forget_cached_metadata()
+        self._remember(full_path, None)
+
+    def _delete_tree(self, path: str) -> None:
+        if not remote_delete(self._shell, [path]).remaining:
+            return
+
+        for entry in self._client.listdir_attr(path):
+            child = posixpath.join(path, entry.filename)
+            if _is_dir(entry):
+                self._delete_tree(child)
+            else:
+                self._client.remove(child)
+
+        self._client.rmdir(path)
+
+    def exists(self, path: str) -> bool:
+        return self._attributes(self._abspath(path)) is not None
+
+    def stat(self, path: str) -> FileInfo:
+        attributes = self._attributes(self._abspath(path))
+        if attributes is None:
+            raise FileNotFoundError(path)
+
+        modified = attributes.st_mtime
+        return FileInfo(
+            path,
+            _is_dir(attributes),
+            attributes.st_size or 0,
+            float(modified) if modified is not None else None,
+            stat.S_IMODE(attributes.st_mode) if attributes.st_mode else None,
+        )
+
+    def openread(self, path: str) -> TextIOWrapper:
+        return TextIOWrapper(self.openbin(path))
+
+    def supports_streams(self) -> bool:
+        return True
+
+    def openbin(self, path: str, offset: int = 0, length: Optional[int] = None) -> BinaryIO:
+        full_path = self._abspath(path)
+        attributes = self._attributes(full_path)
+        if attributes is None or _is_dir(attributes):
+            raise FileNotFoundError(full_path)
+
+        size = attributes.st_size or 0
+        end = size if length is None else min(size, offset + length)
+        remote_file = self._client.open(full_path, "rb")
+        # Requests all blocks of the range at once instead of waiting for every read's response
+        remote_file.seek(offset)
+        remote_file.prefetch(end)
+        return open_range(cast(BinaryIO, remote_file), offset, length)
+
+    def openwrite(self, path: str, mode: Optional[int] = None) -> BinaryIO:
+        full_path = self._abspath(path)
+        self._makedirs(posixpath.dirname(full_path))
+        # Small writes are collected into requests of the largest size SFTP servers accept
+        remote_file = self._client.open(full_path, "wb", bufsize=_WRITE_BUFFER_SIZE)
+        # Writes do not wait for the server's response, errors are raised at the latest when the file is closed
+        remote_file.set_pipelined(True)
+        if mode is not None:
+            set_attributes_pipelined(remote_file, _mode_attributes(mode))
+
+        if self._cache is not None:
+            # The size changes with every write, so the file is looked up again when needed
+            self._cache.forget(full_path)
+
+        return cast(BinaryIO, remote_file)
+
+    def makedirs_many(self, paths: List[str]) -> None:
+        leaves = leaf_directories(self._abspath(path) for path in paths)
+        if leaves and remote_makedirs(self._shell, leaves):
+            for leaf in leaves:
+                self._remember_directory_and_parents(leaf)
+
+            return
+
+        # Shared parents are only looked up and created once within a batch
+        for leaf in leaves:
+            self._makedirs(leaf)
+
+    def _remember_directory_and_parents(self, path: str) -> None:
+        while path not in ("/", ""):
+            self._remember(path, _directory_attributes())
+            path = posixpath.dirname(path)
+
+    def _makedirs(self, path: str) -> None:
+        attributes = self._attributes(path)
+        if attributes is not None:
+            return
+
+        parent = posixpath.dirname(path)
+        if parent != path:
+            self._makedirs(parent)
+
+        self._client.mkdir(path)
+        self._remember(path, _directory_attributes())
+
+    def close(self) -> None:
+        """
+        Closes the SFTP session and the executor
+        """
+        self._client.close()
+        if self._executor is not None:
+            self._executor.close()
+
+
+def sftpfilesystem(
+    connection_data: ConnectionData,
+    proxyjumps: Optional[List[ConnectionData]] = None,
+    dir: Optional[str] = None,
+    round_trips: Optional[RoundTripRecorder] = None,
+) -> SFTPFilesystem:
+    """
+    A Filesystem that connects to a remote machine via SSH and uses SFTP without PyFilesystem2
+
+    Args:
+        connection_data (ConnectionData): The connection to the remote machine
+        proxyjumps (list[ConnectionData]): The hosts to jump through on the way to the remote machine
+        dir (str): The working directory, defaults to the user's home directory
+        round_trips (RoundTripRecorder): Records the requests sent over the connection
+
+    Raises:
+        SSHError: If the connection could not be established
+    """
+    ssh_executor = SSHExecutor(connection_data, proxyjumps)
+    ssh_executor.connect()
+    try:
+        client = ssh_executor.client.open_sftp()
+        home = client.normalize(".")
+    except (SSHException, OSError) as err:
+        ssh_executor.close()
+        raise SSHError(f"Could not connect to {connection_data.hostname}") from err
+
+    executor: CommandExecutor = ssh_executor
+    if round_trips is not None:
+        round_trips.attach(client)
+        executor = round_trips.executor(ssh_executor)
+
+    return SFTPFilesystem(client, dir or home, home, executor=executor)
@@ -1,3 +1,4 @@
+import threading
 from socket import socket
 from typing import List, Optional, cast
 
@@ -22,14 +23,22 @@ class RemoteCommand(RunningCommand):
         self._stderr_lines: List[str] = []
 
     def wait_until_exit(self) -> int:
+        # Output has to be read before waiting for the exit status.
+        # Otherwise commands with large outputs block once the channel window is full.
+        # Both streams share the window, so stderr is read at the same time as stdout.
+        stderr_reader = threading.Thread(target=self._read_stderr, daemon=True)
+        stderr_reader.start()
+        self._stdout_lines = self._stdout.readlines()
+        stderr_reader.join()
+
         while not self._stdout.channel.exit_status_ready():
             continue
 
-        self._stdout_lines = self._stdout.readlines()
-        self._stderr_lines = self._stderr.readlines()
-
         return self._stdout.channel.exit_status
 
+    def _read_stderr(self) -> None:
+        self._stderr_lines = self._stderr.readlines()
+
     @property
     def exit_status(self) -> int:
         return self._stdout.channel.exit_status
@@ -80,6 +89,26 @@ class SSHExecutor(CommandExecutor):
         return self._client
 
 
+class SharedClientExecutor(CommandExecutor):
+    """
+    Executes commands with an already connected SSHClient that is owned by someone else,
+    e.g. the client of an SFTP connection. Connecting and closing is left to the owner.
+    """
+
+    def __init__(self, client: pm.SSHClient) -> None:
+        self._client = client
+
+    def connect(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def exec_command(self, cmd: str) -> RunningCommand:
+        stdin, stdout, stderr = self._client.exec_command(cmd)
+        return RemoteCommand(stdin, stdout, stderr)
+
+
 def build_channel_with_proxyjumps(
     connection: ConnectionData, proxyjumps: List[ConnectionData]
 ) -> Optional[pm.Channel]:
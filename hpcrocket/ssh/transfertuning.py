@@ -0,0 +1,227 @@
+import json
+import os
+import threading
+from typing import Dict, NamedTuple, Optional
+
+_MIN_WRITE_DEPTH = 16
+_MAX_WRITE_DEPTH = 1024
+_DEFAULT_WRITE_DEPTH = 64
+
+_MIN_PREFETCH_DEPTH = 16
+_MAX_PREFETCH_DEPTH = 1024
+_DEFAULT_PREFETCH_DEPTH = 64
+
+# Throughput has to improve by this factor to count as an improvement, smaller differences are noise
+_IMPROVEMENT = 1.05
+
+
+class TransferSettings(NamedTuple):
+    """
+    Transfer parameters for a single host.
+    Both are numbers of SFTP requests that are sent before the response of the first one arrived.
+    """
+
+    write_depth: int = _DEFAULT_WRITE_DEPTH
+    prefetch_depth: int = _DEFAULT_PREFETCH_DEPTH
+
+
+class HillClimbingTuner:
+    """
+    Tunes a numeric parameter by doubling or halving it as long as the measured throughput improves.
+    The tuner settles once neither direction improves the throughput any further.
+    """
+
+    def __init__(self, value: int, minimum: int, maximum: int) -> None:
+        self._value = min(max(value, minimum), maximum)
+        self._minimum = minimum
+        self._maximum = maximum
+        self._best_value = self._value
+        self._best_throughput = 0.0
+        self._growing = True
+        self._reversals = 0
+
+    @property
+    def value(self) -> int:
+        """
+        The value to use for the next measurement or the best value once settled
+        """
+        return self._value
+
+    @property
+    def best_value(self) -> int:
+        """
+        The value with the highest throughput measured so far
+        """
+        return self._best_value
+
+    @property
+    def settled(self) -> bool:
+        return self._reversals >= 2
+
+    def record(self, transferred_bytes: int, seconds: float) -> None:
+        """
+        Records the throughput achieved with the current value and picks the next value to try
+
+        Args:
+            transferred_bytes (int): The number of bytes transferred with the current value
+            seconds (float): The time the transfer took
+        """
+        if self.settled or seconds <= 0:
+            return
+
+        throughput = transferred_bytes / seconds
+        if throughput > self._best_throughput * _IMPROVEMENT:
+            self._best_value = self._value
+            self._best_throughput = throughput
+        else:
+            self._reverse()
+
+        self._value = self._next_value()
+
+    def _reverse(self) -> None:
+        self._growing = not self._growing
+        self._reversals += 1
+
+    def _next_value(self) -> int:
+        if self.settled:
+            return self._best_value
+
+        step = self._best_value * 2 if self._growing else self._best_value // 2
+        if self._minimum <= step <= self._maximum:
+            return step
+
+        self._reverse()
+        return self._next_value()
+
+
+class TransferTuning:
+    """
+    Adapts the number of write and read requests in flight of a connection to the measured throughput.
+    The settings are loaded from and saved to a TransferSettingsStore, so later connections start with them.
+    """
+
+    def __init__(self, host: str, store: "TransferSettingsStore") -> None:
+        self._host = host
+        self._store = store
+        settings = store.load(host) or TransferSettings()
+        self._write_depth = HillClimbingTuner(
+            settings.write_depth, _MIN_WRITE_DEPTH, _MAX_WRITE_DEPTH
+        )
+        self._prefetch_depth = HillClimbingTuner(
+            settings.prefetch_depth, _MIN_PREFETCH_DEPTH, _MAX_PREFETCH_DEPTH
+        )
+
+    @property
+    def write_depth(self) -> int:
+        return self._write_depth.value
+
+    @property
+    def prefetch_depth(self) -> int:
+        return self._prefetch_depth.value
+
+    @property
+    def tuning_uploads(self) -> bool:
+        return not self._write_depth.settled
+
+    @property
+    def tuning_downloads(self) -> bool:
+        return not self._prefetch_depth.settled
+
+    def record_upload(self, transferred_bytes: int, seconds: float) -> None:
+        """
+        Records the throughput of an upload window that used the current write depth
+
+        Args:
+            transferred_bytes (int): The number of bytes uploaded
+            seconds (float): The time the upload took
+        """
+        self._record(self._write_depth, transferred_bytes, seconds)
+
+    def record_download(self, transferred_bytes: int, seconds: float) -> None:
+        """
+        Records the throughput of a download window that used the current prefetch depth
+
+        Args:
+            transferred_bytes (int): The number of bytes downloaded
+            seconds (float): The time the download took
+        """
+        self._record(self._prefetch_depth, transferred_bytes, seconds)
+
+    def _record(
+        self, tuner: HillClimbingTuner, transferred_bytes: int, seconds: float
+    ) -> None:
+        was_settled = tuner.settled
+        tuner.record(transferred_bytes, seconds)
+        if tuner.settled and not was_settled:
+            settings = TransferSettings(
+                self._write_depth.best_value, self._prefetch_depth.best_value
+            )
+            self._store.save(self._host, settings)
+
+
+def default_settings_path() -> str:
+    """
+    Returns the path of the file transfer settings are stored in by default
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_dir, "hpc-rocket", "transfer-settings.json")
+
+
+class TransferSettingsStore:
+    """
+    Stores TransferSettings per host in a JSON file.
+    The settings are only an optimization, so a missing or unreadable file is treated like an empty one.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path or default_settings_path()
+
+    def load(self, host: str) -> Optional[TransferSettings]:
+        """
+        Returns the settings stored for the host
+
+        Args:
+            host (str): The host identifier
+
+        Returns:
+            Optional[TransferSettings]: The stored settings or None if there are none
+        """
+        entry = self._read().get(host)
+        if not isinstance(entry, dict):
+            return None
+
+        try:
+            return TransferSettings(
+                int(entry["write_depth"]), int(entry["prefetch_depth"])
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def save(self, host: str, settings: TransferSettings) -> None:
+        """
+        Stores the settings for the host, replacing previously stored ones
+
+        Args:
+            host (str): The host identifier
+            settings (TransferSettings): The settings to store
+        """
+        with self._lock:
+            content = self._read()
+            content[host] = settings._asdict()
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                with open(self._path, "w") as file:
+                    json.dump(content, file, indent=2)
+            except OSError:
+                pass
+
+    def _read(self) -> Dict[str, object]:
+        try:
+            with open(self._path) as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        return content if isinstance(content, dict) else {}
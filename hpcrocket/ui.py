@@ -1,12 +1,16 @@
-from typing import Any
+import datetime
+import time
+from typing import Any, Callable, Optional
 
 from rich import box
-from rich.console import RenderableType
+from rich.console import Group, RenderableType
 from rich.live import Live
+from rich.progress_bar import ProgressBar
 from rich.spinner import Spinner
 from rich.table import Table
 
 from hpcrocket.core.slurmbatchjob import SlurmJobStatus
+from hpcrocket.core.transferprogress import TransferProgress
 
 try:
     from typing import Protocol
@@ -55,6 +59,90 @@ class UI(Protocol):  # pragma: no cover
             text (str): The message
         """
 
+    def progress(self, progress: TransferProgress) -> None:
+        """
+        Displays the progress of a running file transfer
+
+        Args:
+            progress (TransferProgress): The transferred files and bytes, throughput and estimated time left
+        """
+
+    def output(self, source: str, line: str) -> None:
+        """
+        Displays a line a running job wrote to one of its output files
+
+        Args:
+            source (str): The path of the output file
+            line (str): The line without line break
+        """
+
+
+def format_bytes(size: float) -> str:
+    """
+    Formats a number of bytes with the largest binary unit that keeps the value above one
+
+    Args:
+        size (float): The number of bytes
+
+    Returns:
+        str: e.g. "1.5 MiB"
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+
+        size /= 1024
+
+    return f"{size:.1f} TiB"
+
+
+def format_progress(progress: TransferProgress) -> str:
+    """
+    Formats the progress of a file transfer as a single line
+
+    Args:
+        progress (TransferProgress): The progress
+
+    Returns:
+        str: e.g. "3/10 files, 1.5 MiB/12.0 MiB, 512.0 KiB/s, ETA 0:00:21"
+    """
+    eta = "unknown"
+    if progress.eta is not None:
+        eta = str(datetime.timedelta(seconds=round(progress.eta)))
+
+    return (
+        f"{progress.files_done}/{progress.files_total} files, "
+        f"{format_bytes(progress.bytes_done)}/{format_bytes(progress.bytes_total)}, "
+        f"{format_bytes(progress.throughput)}/s, ETA {eta}"
+    )
+
+
+class LineProgressRenderer:
+    """
+    Renders transfer progress as plain lines for logs that cannot display progress bars, e.g. in CI.
+    A line is printed at most every `interval` seconds and when the transfer has finished.
+    """
+
+    def __init__(
+        self,
+        print_line: Callable[[str], None],
+        interval: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._print_line = print_line
+        self._interval = interval
+        self._clock = clock
+        self._last_print: Optional[float] = None
+
+    def __call__(self, progress: TransferProgress) -> None:
+        now = self._clock()
+        due = self._last_print is None or now - self._last_print >= self._interval
+        if not (due or progress.finished):
+            return
+
+        self._print_line(format_progress(progress))
+        self._last_print = None if progress.finished else now
+
 
 class NullUI(UI):  # pragma: no cover
     """
@@ -76,14 +164,22 @@ class NullUI(UI):  # pragma: no cover
     def launch(self, text: str) -> None:  # pragma: no cover
         pass
 
+    def progress(self, progress: TransferProgress) -> None:  # pragma: no cover
+        pass
+
+    def output(self, source: str, line: str) -> None:  # pragma: no cover
+        pass
+
 
 class RichUI(UI):
     """
-    A UI that uses the rich terminal library
+    A UI that uses the rich terminal library.
+    Transfer progress is shown as progress bar on terminals and as plain lines otherwise.
     """
 
     def __init__(self) -> None:
         self._rich_live: Live
+        self._line_renderer = LineProgressRenderer(self.info)
 
     def __enter__(self) -> "RichUI":
         self._rich_live = Live(Spinner("bouncingBar", ""), refresh_per_second=16)
@@ -117,6 +213,21 @@ class RichUI(UI):
             ":rocket: ", text, style="bold yellow", emoji=True
         )
 
+    def progress(self, progress: TransferProgress) -> None:
+        if not self._rich_live.console.is_terminal:
+            self._line_renderer(progress)
+            return
+
+        bar = ProgressBar(
+            total=max(progress.bytes_total, 1), completed=progress.bytes_done
+        )
+        self._rich_live.update(Group(bar, format_progress(progress)))
+
+    def output(self, source: str, line: str) -> None:
+        self._rich_live.console.print(
+            f"{source}:", line, style="dim", markup=False, highlight=False
+        )
+
     def _make_table(self, job: SlurmJobStatus) -> Table:
         table = Table(style="bold", box=box.MINIMAL)
         table.add_column("ID")
@@ -5,7 +5,12 @@ from typing import Any, List, Optional
 from unittest.mock import Mock
 
 from hpcrocket.core.executor import RunningCommand
-from hpcrocket.core.filesystem import Filesystem, FilesystemFactory
+from hpcrocket.core.filesystem import (
+    FileInfo,
+    Filesystem,
+    FilesystemFactory,
+    ProgressCallback,
+)
 
 
 class CallOrderVerification(SlurmJobExecutorSpy, Filesystem):
@@ -40,6 +45,8 @@ class CallOrderVerification(SlurmJobExecutorSpy, Filesystem):
         target: str,
         overwrite: bool = False,
         filesystem: Optional["Filesystem"] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
     ) -> None:
         self.log.append(f"copy {source} {target}")
 
@@ -49,6 +56,12 @@ class CallOrderVerification(SlurmJobExecutorSpy, Filesystem):
     def exists(self, path: str) -> bool:
         return False
 
+    def exists_many(self, paths: List[str]) -> List[bool]:
+        return [False] * len(paths)
+
+    def stat(self, path: str) -> FileInfo:
+        return FileInfo(path, False, 0)
+
     def __call__(self) -> None:
         assert self.log == self.expected
 
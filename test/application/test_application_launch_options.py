@@ -1,4 +1,6 @@
+import json
 import os
+from pathlib import Path
 from typing import List, Tuple, cast
 import unittest
 from hpcrocket.core.launchoptions import LaunchOptions
@@ -8,7 +10,7 @@ from test.application.executor_filesystem_callorder import (
     VerifierReturningFilesystemFactory,
 )
 from test.application.launchoptions import launch_options, main_connection
-from test.slurmoutput import completed_slurm_job
+from test.slurmoutput import DEFAULT_JOB_ID, completed_slurm_job
 from test.testdoubles.executor import (
     failed_slurm_job_command_stub,
     LoggingCommandExecutorSpy,
@@ -24,6 +26,13 @@ from unittest.mock import Mock
 from hpcrocket.core.application import Application
 from hpcrocket.core.progressive_file_operations import CopyInstruction
 from hpcrocket.core.executor import RunningCommand
+from hpcrocket.core.instrumentation import (
+    InstrumentedExecutor,
+    InstrumentedFilesystemFactory,
+)
+from hpcrocket.core.profiling import DeterministicProfiler
+from hpcrocket.core.runreport import RunReport
+from hpcrocket.core.workflows.journal import WorkflowJournal
 from hpcrocket.ssh.errors import SSHError
 
 LOCAL_FILE = "myfile.txt"
@@ -154,6 +163,20 @@ class Application_With_Launch_Options(unittest.TestCase):
         self.assert_error_logged(f"SSHError: {main_connection().hostname}")
         self.assert_exited_without_running_commands(actual)
 
+    def test__given_dry_run__when_running__should_neither_connect_nor_launch(
+        self,
+    ) -> None:
+        executor = ConnectionFailingCommandExecutor()
+        self.sut = make_application(executor, ui=self.ui_spy)
+        options = launch_options(watch=True)
+        options.dry_run = True
+
+        actual = self.sut.run(options)
+
+        assert actual == 0
+        assert executor.command_log == []
+        self.ui_spy.error.assert_not_called()
+
     def assert_error_logged(self, expected_message: str) -> None:
         self.ui_spy.error.assert_called_once_with(expected_message)
 
@@ -344,3 +367,122 @@ class Application_With_Options_To_Copy_Collect_Clean(unittest.TestCase):
 
         assert_exists_locally(self.fs_factory, "mycollect.txt")
         assert_does_not_exist_on_remote(self.fs_factory, "mycopy.txt")
+
+
+def test__given_state_file_of_interrupted_launch__when_resuming__should_watch_job_without_submitting_again(
+    tmp_path: Path,
+) -> None:
+    state_file = str(tmp_path / "state.json")
+    journal = WorkflowJournal(state_file)
+    journal.checkpoint("launch").record(jobid=DEFAULT_JOB_ID)
+    journal.finish_stage("PrepareStage")
+    journal.finish_stage("LaunchStage")
+
+    executor = SlurmJobExecutorSpy()
+    fs_factory = MemoryFilesystemFactoryStub()
+    fs_factory.create_remote_files(REMOTE_FILE)
+    options = launch_options_with_collect()
+    options.state_file = state_file
+    options.resume = True
+    sut = make_application(executor=executor, filesystem_factory=fs_factory)
+
+    actual = sut.run(options)
+
+    assert actual == 0
+    assert not any(str(cmd).startswith("sbatch") for cmd in executor.command_log)
+    assert_exists_locally(fs_factory, COLLECTED_FILE)
+    assert WorkflowJournal.load(state_file).finished_stages == [
+        "PrepareStage",
+        "LaunchStage",
+        "WatchStage",
+        "FinalizeStage",
+    ]
+
+
+def test__given_state_file__when_launching__should_record_arguments_and_job_id(
+    tmp_path: Path,
+) -> None:
+    state_file = str(tmp_path / "state.json")
+    options = launch_options_with_copy()
+    options.configfile = "config.yml"
+    options.state_file = state_file
+    fs_factory = MemoryFilesystemFactoryStub()
+    fs_factory.create_local_files(LOCAL_FILE)
+    sut = make_application(filesystem_factory=fs_factory)
+
+    sut.run(options)
+
+    journal = WorkflowJournal.load(state_file)
+    assert journal.arguments == {"configfile": "config.yml", "watch": False, "tail": []}
+    assert journal.checkpoint("prepare").get("copied_files") == [REMOTE_FILE]
+    assert journal.checkpoint("launch").get("jobid") == DEFAULT_JOB_ID
+
+
+def test__given_report_file__when_launching__should_write_stages_and_transfers_to_report(
+    tmp_path: Path,
+) -> None:
+    report_file = tmp_path / "report.json"
+    options = launch_options_with_copy()
+    options.watch = True
+    options.report_file = str(report_file)
+    fs_factory = MemoryFilesystemFactoryStub()
+    fs_factory.create_local_files(LOCAL_FILE)
+    report = RunReport()
+    sut = Application(
+        InstrumentedExecutor(SlurmJobExecutorSpy(), report),
+        InstrumentedFilesystemFactory(fs_factory, report),
+        Mock(),
+        report,
+    )
+
+    sut.run(options)
+
+    actual = json.loads(report_file.read_text())
+    assert [stage["stage"] for stage in actual["stages"]] == [
+        "PrepareStage",
+        "LaunchStage",
+        "WatchStage",
+        "FinalizeStage",
+    ]
+    assert actual["counters"]["files_copied"] == 1
+    assert actual["counters"]["executor.commands.sbatch"] == 1
+    assert actual["values"]["job.id"] == DEFAULT_JOB_ID
+
+
+def test__given_print_stats__when_launching__should_print_round_trips() -> None:
+    options = launch_options()
+    options.print_stats = True
+    ui = Mock()
+    report = RunReport()
+    sut = Application(
+        InstrumentedExecutor(SlurmJobExecutorSpy(), report),
+        MemoryFilesystemFactoryStub(),
+        ui,
+        report,
+    )
+
+    sut.run(options)
+
+    printed = [args[0] for _, args, _ in ui.info.mock_calls]
+    assert "Round trips: 1" in printed
+
+
+def test__given_profile_file__when_launching__should_write_profile_of_each_stage(
+    tmp_path: Path,
+) -> None:
+    options = launch_options()
+    options.profile_file = str(tmp_path / "profile.pstats")
+    sut = Application(
+        SlurmJobExecutorSpy(),
+        MemoryFilesystemFactoryStub(),
+        Mock(),
+        profiler=DeterministicProfiler(),
+    )
+
+    sut.run(options)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "profile.LaunchStage.pstats",
+        "profile.PrepareStage.pstats",
+        "profile.pstats",
+    ]
@@ -1,12 +1,18 @@
+import dataclasses
 from test.application import make_application
 from test.application.launchoptions import watch_options_with_proxy
 from test.slurm_assertions import assert_job_polled
-from test.slurmoutput import completed_slurm_job, running_slurm_job
+from test.slurmoutput import (
+    DEFAULT_JOB_ID,
+    completed_slurm_job,
+    running_slurm_job,
+)
 from test.testdoubles.executor import (
     failed_slurm_job_command_stub,
     LongRunningSlurmJobExecutorSpy,
     SlurmJobExecutorSpy,
 )
+from test.testdoubles.filesystem import MemoryFilesystemFactoryStub
 from unittest.mock import Mock, call
 
 from hpcrocket.ui import UI
@@ -51,3 +57,24 @@ def test__given_watch_options__when_running_with_failing_job__should_exit_with_1
     actual = sut.run(watch_options_with_proxy())
 
     assert actual == 1
+
+
+def test__given_watch_options_with_tail__when_running__should_show_job_output() -> None:
+    executor = SlurmJobExecutorSpy()
+    factory = MemoryFilesystemFactoryStub()
+    factory.ssh_filesystem.create_file_stub(
+        f"slurm-{DEFAULT_JOB_ID}.out", "starting\ndone\n"
+    )
+
+    ui = Mock(spec=UI)
+    sut = make_application(executor, factory, ui)
+
+    options = dataclasses.replace(
+        watch_options_with_proxy(), tail_files=["slurm-%j.out"]
+    )
+    sut.run(options)
+
+    assert ui.output.mock_calls == [
+        call(f"slurm-{DEFAULT_JOB_ID}.out", "starting"),
+        call(f"slurm-{DEFAULT_JOB_ID}.out", "done"),
+    ]
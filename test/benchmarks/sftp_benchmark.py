@@ -0,0 +1,93 @@
+"""
+Compares the native SFTP Filesystem with the PyFilesystem2 based one on many small files.
+
+Runs against the SSH test server used by the integration tests unless other connection data is given:
+
+    python -m test.benchmarks.sftp_benchmark --files 500
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.pyfilesystem.localfilesystem import nativelocalfilesystem
+from hpcrocket.pyfilesystem.sshfilesystem import sshfilesystem
+from hpcrocket.ssh.connectiondata import ConnectionData
+from hpcrocket.ssh.sftpfilesystem import sftpfilesystem
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=2222)
+    parser.add_argument("--user", default="myuser")
+    parser.add_argument("--password", default="1234")
+    parser.add_argument("--remote-dir", default="/testdir")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--file-size", type=int, default=4096)
+    return parser.parse_args()
+
+
+def _create_files(dir: str, count: int, size: int) -> None:
+    for index in range(count):
+        sub_dir = os.path.join(dir, f"dir{index % 10}")
+        os.makedirs(sub_dir, exist_ok=True)
+        with open(os.path.join(sub_dir, f"file{index}.bin"), "wb") as file:
+            file.write(os.urandom(size))
+
+
+def _stat_all(remote: Filesystem) -> None:
+    with remote.batch():
+        for path in remote.glob("bench/**/*.bin"):
+            remote.stat(path)
+
+
+def _measure(remote: Filesystem, local_dir: str, download_dir: str) -> Dict[str, float]:
+    local = nativelocalfilesystem(local_dir)
+    steps: Dict[str, Callable[[], object]] = {
+        "upload": lambda: local.copy("*", "bench/", filesystem=remote),
+        "glob+stat": lambda: _stat_all(remote),
+        "download": lambda: remote.copy(
+            "bench", "downloaded", filesystem=nativelocalfilesystem(download_dir)
+        ),
+        "delete": lambda: remote.delete("bench"),
+    }
+
+    timings: Dict[str, float] = {}
+    for name, step in steps.items():
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+
+    return timings
+
+
+def main() -> None:
+    args = _parse_args()
+    connection = ConnectionData(
+        hostname=args.host,
+        username=args.user,
+        password=args.password,
+        port=args.port,
+    )
+
+    with tempfile.TemporaryDirectory() as local_dir:
+        _create_files(local_dir, args.files, args.file_size)
+        backends: Dict[str, Callable[[], Filesystem]] = {
+            "pyfilesystem2": lambda: sshfilesystem(connection, dir=args.remote_dir),
+            "native sftp": lambda: sftpfilesystem(connection, dir=args.remote_dir),
+        }
+
+        for name, create in backends.items():
+            with tempfile.TemporaryDirectory() as download_dir:
+                timings = _measure(create(), local_dir, download_dir)
+
+            columns: List[str] = [f"{step} {sec:.2f}s" for step, sec in timings.items()]
+            print(f"{name:>14}: " + ", ".join(columns))
+
+
+if __name__ == "__main__":
+    main()
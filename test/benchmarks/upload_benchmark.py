@@ -0,0 +1,99 @@
+"""
+Compares memory mapped uploads with chunked reads.
+
+Runs against the SSH test server used by the integration tests unless other connection data is given:
+
+    python -m test.benchmarks.upload_benchmark --size-mb 256
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from hpcrocket.ssh.chmodsshfs import PermissionChangingSSHFSDecorator
+
+
+class _ChunkCountingFile(io.FileIO):
+    """
+    Counts the chunks read from the file, each of them is a newly allocated bytes object
+    """
+
+    chunks = 0
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        data = super().read(size)
+        if data:
+            self.chunks += 1
+
+        return data
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=2222)
+    parser.add_argument("--user", default="myuser")
+    parser.add_argument("--password", default="1234")
+    parser.add_argument("--remote-dir", default="/testdir")
+    parser.add_argument("--size-mb", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def _create_file(size: int) -> str:
+    fd, path = tempfile.mkstemp()
+    with os.fdopen(fd, "wb") as file:
+        for _ in range(size // (1024 * 1024)):
+            file.write(os.urandom(1024 * 1024))
+
+    return path
+
+
+def _measure_upload(
+    sshfs: PermissionChangingSSHFSDecorator, local: str, remote: str, memory_map: bool
+) -> Tuple[float, int, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    with _ChunkCountingFile(local, "rb") as file:
+        sshfs.upload(remote, file, memory_map=memory_map)
+
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak, file.chunks
+
+
+def main() -> None:
+    args = _parse_args()
+    size = args.size_mb * 1024 * 1024
+    local = _create_file(size)
+    remote = f"{args.remote_dir}/upload_benchmark.bin"
+    sshfs = PermissionChangingSSHFSDecorator(
+        host=args.host, port=args.port, user=args.user, passwd=args.password
+    )
+
+    try:
+        for memory_map in (True, False):
+            results: List[Tuple[float, int, int]] = [
+                _measure_upload(sshfs, local, remote, memory_map)
+                for _ in range(args.repeat)
+            ]
+
+            duration, peak, allocations = min(results)
+            print(
+                f"memory_map={memory_map}: {size / duration / 1024**2:.1f} MiB/s, "
+                f"peak traced memory {peak / 1024:.0f} KiB, "
+                f"{allocations} chunks allocated by reads"
+            )
+    finally:
+        sshfs.remove(remote)
+        sshfs.close()
+        os.remove(local)
+
+
+if __name__ == "__main__":
+    main()
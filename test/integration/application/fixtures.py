@@ -1,5 +1,5 @@
 import os
-from test.testdoubles.pyfilesystem import ArbitraryArgsMemoryFS, OnlySubFSMemoryFS
+from test.testdoubles.pyfilesystem import OnlySubFSMemoryFS
 from unittest.mock import Mock, patch
 
 import pytest
@@ -26,13 +26,9 @@ def sshclient_type_mock():
 
 
 @pytest.fixture(autouse=True)
-def osfs_type_mock():
-    patcher = patch("fs.osfs.OSFS")
-    osfs_type_mock = patcher.start()
-    osfs_type_mock.return_value = Mock(spec=MemoryFS, wraps=ArbitraryArgsMemoryFS())
-    yield osfs_type_mock
-
-    patcher.stop()
+def local_dir(tmp_path):
+    with patch("os.getcwd", lambda: str(tmp_path)):
+        yield tmp_path
 
 
 @pytest.fixture(autouse=True)
@@ -44,6 +40,9 @@ def sshfs_type_mock():
     mem_fs.makedirs(HOME_DIR)
     sshfs_type_mock.return_value = Mock(spec=MemoryFS, wraps=mem_fs)
     sshfs_type_mock.return_value.homedir = lambda: HOME_DIR
+    sshfs_type_mock.return_value.executor = lambda: None
+    # Keep the files inspectable after the stages released the connection
+    sshfs_type_mock.return_value.close = Mock()
 
     yield sshfs_type_mock
 
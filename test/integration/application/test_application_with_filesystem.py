@@ -21,11 +21,14 @@ from hpcrocket.ssh.connectiondata import ConnectionData
 from hpcrocket.ssh.errors import SSHError
 
 
-@pytest.fixture(autouse=True)
-def patch_cwd():
-    getcwd = lambda: "/"
-    with patch("os.getcwd", getcwd) as patched:
-        yield patched
+def touch(local_dir, name):
+    (local_dir / name).touch()
+
+
+def copying_a_file(local_dir):
+    # The remote filesystem is only connected to when it is used
+    touch(local_dir, "myfile.txt")
+    return [CopyInstruction("myfile.txt", "mycopy.txt")]
 
 
 def make_sut(options, ui=None):
@@ -35,24 +38,43 @@ def make_sut(options, ui=None):
 
 
 def test__given_valid_config__when_running__should_login_to_sshfs_with_correct_credentials(
-    sshfs_type_mock,
+    local_dir, sshfs_type_mock
 ):
-    sut = make_sut(launch_options())
+    options = launch_options(copy=copying_a_file(local_dir))
+    sut = make_sut(options)
 
-    sut.run(launch_options())
+    sut.run(options)
 
     assert_sshfs_connected_with_connection_data(sshfs_type_mock, main_connection())
 
 
+def test__given_transfer_host__when_running__should_login_to_sshfs_on_transfer_host(
+    local_dir, sshfs_type_mock
+):
+    transfer_host = ConnectionData(
+        hostname="dtn.example.com", username="dtn-user", password="dtn-pass"
+    )
+    options = replace(
+        launch_options(copy=copying_a_file(local_dir)),
+        transfer_connection=transfer_host,
+    )
+    sut = make_sut(options)
+
+    sut.run(options)
+
+    assert_sshfs_connected_with_connection_data(sshfs_type_mock, transfer_host)
+
+
 def test__given_ssh_connection_not_available_for_sshfs__when_running__should_log_error_and_exit(
-    sshfs_type_mock,
+    local_dir, sshfs_type_mock
 ):
     sshfs_type_mock.side_effect = SSHError(main_connection().hostname)
 
     ui_spy = Mock()
-    sut = make_sut(launch_options(), ui_spy)
+    options = launch_options(copy=copying_a_file(local_dir))
+    sut = make_sut(options, ui_spy)
 
-    sut.run(launch_options())
+    sut.run(options)
 
     ui_spy.error.assert_called_once_with(f"SSHError: {main_connection().hostname}")
 
@@ -61,7 +83,7 @@ def test__given_ssh_connection_not_available_for_sshfs__when_running__should_log
     ["input_keyfile", "expected_keyfile"], INPUT_AND_EXPECTED_KEYFILE_PATHS
 )
 def test__given_config_with_only_private_keyfile__when_running__should_login_to_sshfs_with_correct_credentials(
-    sshfs_type_mock, input_keyfile, expected_keyfile
+    local_dir, sshfs_type_mock, input_keyfile, expected_keyfile
 ):
 
     os.environ["HOME"] = HOME_DIR
@@ -71,6 +93,7 @@ def test__given_config_with_only_private_keyfile__when_running__should_login_to_
         ),
         sbatch="test.job",
         poll_interval=0,
+        copy_files=copying_a_file(local_dir),
     )
 
     sut = make_sut(valid_options)
@@ -86,7 +109,7 @@ def test__given_config_with_only_private_keyfile__when_running__should_login_to_
 
 
 def test__given_config_with_only_password__when_running__should_login_to_sshfs_with_correct_credentials(
-    sshfs_type_mock,
+    local_dir, sshfs_type_mock
 ):
     valid_options = LaunchOptions(
         connection=ConnectionData(
@@ -94,6 +117,7 @@ def test__given_config_with_only_password__when_running__should_login_to_sshfs_w
         ),
         sbatch="test.job",
         poll_interval=0,
+        copy_files=copying_a_file(local_dir),
     )
 
     sut = make_sut(valid_options)
@@ -106,7 +130,7 @@ def test__given_config_with_only_password__when_running__should_login_to_sshfs_w
 
 
 def test__given_config_with_proxy__when_running__should_login_to_sshfs_over_proxy(
-    sshclient_type_mock,
+    local_dir, sshclient_type_mock
 ):
     # NOTE: We're using only password authentication here, because SSHFS combines key and keyfile into a single option
     #       so we cannot compare against connection data with keyfile AND key as SSHFS will only be called with one of them.
@@ -116,16 +140,20 @@ def test__given_config_with_proxy__when_running__should_login_to_sshfs_over_prox
     )
     sshclient_type_mock.return_value = mock
 
+    options = replace(
+        launch_options_with_proxy_only_password(),
+        copy_files=copying_a_file(local_dir),
+    )
     with sshfs_with_connection_fake(sshclient_type_mock.return_value):
-        sut = make_sut(launch_options_with_proxy_only_password())
+        sut = make_sut(options)
 
-        sut.run(launch_options_with_proxy_only_password())
+        sut.run(options)
 
         mock.verify()
 
 
 def test__given_config_with_files_to_copy__when_running__should_copy_files_to_remote_filesystem(
-    osfs_type_mock, sshfs_type_mock
+    local_dir, sshfs_type_mock
 ):
     opts = launch_options(
         copy=[
@@ -134,19 +162,19 @@ def test__given_config_with_files_to_copy__when_running__should_copy_files_to_re
         ]
     )
 
-    osfs_type_mock.create("myfile.txt")
-    osfs_type_mock.create("otherfile.gif")
+    touch(local_dir, "myfile.txt")
+    touch(local_dir, "otherfile.gif")
 
     sut = make_sut(opts)
 
     sut.run(opts)
 
-    assert sshfs_type_mock.exists(f"{HOME_DIR}/mycopy.txt")
-    assert sshfs_type_mock.exists(f"{HOME_DIR}/copy.gif")
+    assert sshfs_type_mock.return_value.exists(f"{HOME_DIR}/mycopy.txt")
+    assert sshfs_type_mock.return_value.exists(f"{HOME_DIR}/copy.gif")
 
 
 def test__given_config_with_files_to_clean__when_running__should_remove_files_from_remote_filesystem(
-    osfs_type_mock, sshfs_type_mock
+    local_dir, sshfs_type_mock
 ):
     opts = launch_options(
         watch=True,
@@ -154,7 +182,7 @@ def test__given_config_with_files_to_clean__when_running__should_remove_files_fr
         clean=["mycopy.txt"],
     )
 
-    osfs_type_mock.return_value.create("myfile.txt")
+    touch(local_dir, "myfile.txt")
 
     sut = make_sut(opts)
 
@@ -164,7 +192,7 @@ def test__given_config_with_files_to_clean__when_running__should_remove_files_fr
 
 
 def test__given_config_with_files_to_collect__when_running__should_collect_files_from_remote_filesystem_after_completing_job_and_before_cleaning(
-    osfs_type_mock, sshfs_type_mock
+    local_dir, sshfs_type_mock
 ):
     opts = launch_options(
         watch=True,
@@ -173,21 +201,20 @@ def test__given_config_with_files_to_collect__when_running__should_collect_files
         collect=[CopyInstruction("mycopy.txt", "mycopy.txt")],
     )
 
-    local_fs = osfs_type_mock.return_value
-    local_fs.create("myfile.txt")
+    touch(local_dir, "myfile.txt")
 
     sut = make_sut(opts)
 
     sut.run(opts)
 
     sshfs = sshfs_type_mock.return_value
-    assert local_fs.exists("mycopy.txt")
+    assert (local_dir / "mycopy.txt").exists()
     assert not sshfs.exists("mycopy.txt")
 
 
 @pytest.mark.usefixtures("sshclient_type_mock")
 def test__given_config_with_non_existing_file_to_copy__when_running__should_perform_rollback_and_exit(
-    osfs_type_mock, sshfs_type_mock
+    local_dir, sshfs_type_mock
 ):
     opts = launch_options(
         watch=True,
@@ -197,7 +224,7 @@ def test__given_config_with_non_existing_file_to_copy__when_running__should_perf
         ],
     )
 
-    osfs_type_mock.return_value.create("myfile.txt")
+    touch(local_dir, "myfile.txt")
 
     sut = make_sut(opts)
 
@@ -210,7 +237,7 @@ def test__given_config_with_non_existing_file_to_copy__when_running__should_perf
 
 @pytest.mark.usefixtures("sshclient_type_mock", "sshfs_type_mock")
 def test__given_config_with_non_existing_file_to_copy__when_running__should_print_to_ui(
-    osfs_type_mock,
+    local_dir,
 ):
 
     opts = launch_options(
@@ -220,7 +247,7 @@ def test__given_config_with_non_existing_file_to_copy__when_running__should_prin
         ]
     )
 
-    osfs_type_mock.return_value.create("myfile.txt")
+    touch(local_dir, "myfile.txt")
 
     ui_spy = Mock()
     sut = make_sut(opts, ui_spy)
@@ -232,7 +259,7 @@ def test__given_config_with_non_existing_file_to_copy__when_running__should_prin
 
 @pytest.mark.usefixtures("sshclient_type_mock")
 def test__given_config_with_already_existing_file_to_copy__when_running__should_perform_rollback_and_exit(
-    osfs_type_mock, sshfs_type_mock
+    local_dir, sshfs_type_mock
 ):
     opts = launch_options(
         copy=[
@@ -241,8 +268,8 @@ def test__given_config_with_already_existing_file_to_copy__when_running__should_
         ]
     )
 
-    osfs_type_mock.return_value.create("myfile.txt")
-    osfs_type_mock.return_value.create("otherfile.gif")
+    touch(local_dir, "myfile.txt")
+    touch(local_dir, "otherfile.gif")
 
     sshfs_type_mock.return_value.create(f"{HOME_DIR}/copy.gif")
 
@@ -253,3 +280,24 @@ def test__given_config_with_already_existing_file_to_copy__when_running__should_
     assert not sshfs_type_mock.return_value.exists(f"{HOME_DIR}/mycopy.txt")
     assert sshfs_type_mock.return_value.exists(f"{HOME_DIR}/copy.gif")
     assert exit_code == 1
+
+
+def test__given_config_without_files_to_copy_and_without_watching__when_running__should_not_connect_to_sshfs(
+    sshfs_type_mock,
+):
+    sut = make_sut(launch_options())
+
+    sut.run(launch_options())
+
+    sshfs_type_mock.assert_not_called()
+
+
+def test__given_config_with_files_to_copy__when_running__should_close_sshfs_after_copying(
+    local_dir, sshfs_type_mock
+):
+    opts = launch_options(copy=copying_a_file(local_dir))
+    sut = make_sut(opts)
+
+    sut.run(opts)
+
+    sshfs_type_mock.return_value.close.assert_called_once()
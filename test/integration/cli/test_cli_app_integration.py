@@ -13,6 +13,7 @@ from typing import Dict, List, Optional, cast
 import fs.base
 import pytest
 from fs.memoryfs import MemoryFS
+from fs.wrapfs import WrapFS
 from hpcrocket import RuntimeContainer, ServiceRegistry
 from hpcrocket.core.executor import CommandExecutor, RunningCommand
 from hpcrocket.core.filesystem import Filesystem, FilesystemFactory
@@ -53,7 +54,8 @@ class MemoryPyFilesystemFactory(FilesystemFactory):
         return self.local
 
     def create_ssh_filesystem(self) -> "Filesystem":
-        return self.remote
+        # Like a new connection, closing it leaves the remote files in place
+        return PyFilesystemBased(WrapFS(self.remote.internal_fs))
 
 
 def prepare_local_filesystem(
@@ -1,3 +1,4 @@
+import threading
 from test.testdoubles.paramiko_sshclient_mockutil import (
     get_blocking_channel_exit_status_ready_func,
 )
@@ -48,3 +49,27 @@ def test__given_waited_until_exit__when_getting_stdout_and_stderr__should_return
 
     assert sut.stdout() == ["first stdout line", "second stdout line"]
     assert sut.stderr() == ["first stderr line", "second stderr line"]
+
+
+def test__given_stdout_blocked_until_stderr_is_read__when_waiting_until_exit__should_read_both_streams(
+    stdout, stderr
+):
+    stderr_read = threading.Event()
+
+    def read_stderr():
+        stderr_read.set()
+        return ["stderr line"]
+
+    def read_stdout():
+        # The channel window is full of stderr output, stdout cannot make progress until it is read
+        assert stderr_read.wait(timeout=5)
+        return ["stdout line"]
+
+    stdout.configure_mock(readlines=read_stdout)
+    stderr.configure_mock(readlines=read_stderr)
+    sut = RemoteCommand(MagicMock("paramiko.channel.ChannelStdinFile"), stdout, stderr)
+
+    sut.wait_until_exit()
+
+    assert sut.stdout() == ["stdout line"]
+    assert sut.stderr() == ["stderr line"]
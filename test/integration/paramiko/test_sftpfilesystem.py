@@ -0,0 +1,134 @@
+import os
+import posixpath
+import subprocess
+import tempfile
+import time
+import unittest
+from test.test_filesystem_abc import FilesystemTest
+from typing import cast
+
+import pytest
+from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.pyfilesystem.localfilesystem import localfilesystem
+from hpcrocket.ssh.connectiondata import ConnectionData
+from hpcrocket.ssh.sftpfilesystem import SFTPFilesystem, sftpfilesystem
+
+
+@pytest.mark.integration
+class TestSFTPFilesystem(FilesystemTest, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        docker_args = [
+            "docker",
+            "run",
+            "-d",
+            "--name=openssh-server",
+            "-e",
+            "PASSWORD_ACCESS=true",
+            "-e",
+            "USER_PASSWORD=1234",
+            "-e",
+            "USER_NAME=myuser",
+            "--publish=2222:2222",
+            "hpc-rocket/openssh-test-server",
+        ]
+
+        if "USE_SUDO" in os.environ:
+            docker_args.insert(0, "sudo")
+
+        exit_code = subprocess.call(docker_args)
+
+        time.sleep(1)
+        assert exit_code == 0
+
+    def tearDown(self) -> None:
+        exit_code = subprocess.call(
+            ["docker", "exec", "openssh-server", "/bin/bash", "-c", "rm -rf /testdir/*"]
+        )
+        assert exit_code == 0
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        subprocess.call(["docker", "stop", "openssh-server"])
+        subprocess.call(["docker", "rm", "openssh-server"])
+
+    def create_filesystem(self, dir: str = "/testdir") -> Filesystem:
+        conn = ConnectionData(
+            hostname="localhost", username="myuser", password="1234", port=2222
+        )
+        sftp = sftpfilesystem(conn, dir=dir)
+        self.addCleanup(sftp.close)
+        return sftp
+
+    def create_file(self, filesystem: Filesystem, path: str, content: str = "") -> None:
+        with filesystem.openwrite(path) as file:
+            file.write(content.encode())
+
+    def create_dir(self, filesystem: Filesystem, directory: str) -> None:
+        sftp = cast(SFTPFilesystem, filesystem)
+        sftp.client.mkdir(posixpath.join(sftp.current_dir, directory))
+
+    def get_file_content(self, filesystem: Filesystem, path: str) -> str:
+        with filesystem.openread(path) as file:
+            return file.read()
+
+    def working_dir_abs(self) -> str:
+        return "/testdir"
+
+    def home_dir_abs(self) -> str:
+        return "/testdir"
+
+    def test__when_uploading_executable__should_keep_permissions(self) -> None:
+        sut = cast(SFTPFilesystem, self.create_filesystem())
+        with tempfile.TemporaryDirectory() as local_dir:
+            local_file = os.path.join(local_dir, "run.sh")
+            with open(local_file, "w") as file:
+                file.write("#!/bin/sh")
+            os.chmod(local_file, 0o750)
+
+            localfilesystem(local_dir).copy("run.sh", "run.sh", filesystem=sut)
+
+        mode = sut.client.stat("/testdir/run.sh").st_mode or 0
+        assert mode & 0o777 == 0o750
+
+    def test__when_downloading_directory__should_copy_all_files(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, "results/a.txt", "a")
+        self.create_file(sut, "results/sub/b.txt", "b")
+        with tempfile.TemporaryDirectory() as local_dir:
+            sut.copy("results", "collected", filesystem=localfilesystem(local_dir))
+
+            with open(os.path.join(local_dir, "collected/sub/b.txt")) as file:
+                assert file.read() == "b"
+
+    def test__given_no_remote_shell__when_globbing__should_list_with_sftp(self) -> None:
+        connected = cast(SFTPFilesystem, self.create_filesystem())
+        sut = SFTPFilesystem(connected.client, "/testdir", "/testdir")
+        self.create_file(sut, "sub/match.txt")
+        self.create_file(sut, "sub/dir/match.txt")
+        self.create_file(sut, "sub/nomatch.gif")
+
+        actual = sut.glob("**/*.txt")
+
+        assert sorted(actual) == ["sub/dir/match.txt", "sub/match.txt"]
+
+    def test__when_creating_many_dirs__should_create_them_with_parents(self) -> None:
+        sut = cast(SFTPFilesystem, self.create_filesystem())
+
+        sut.makedirs_many(["results/a/b", "results/a", "results/c"])
+
+        assert sorted(sut.client.listdir("/testdir/results")) == ["a", "c"]
+        assert sut.client.listdir("/testdir/results/a") == ["b"]
+
+    def test__given_no_remote_shell__when_creating_many_dirs__should_create_them_with_sftp(
+        self,
+    ) -> None:
+        connected = cast(SFTPFilesystem, self.create_filesystem())
+        sut = SFTPFilesystem(connected.client, "/testdir", "/testdir")
+
+        with sut.batch():
+            sut.makedirs_many(["results/a/b", "results/c"])
+            self.create_file(sut, "results/a/b/data.h5", "content")
+
+        assert self.get_file_content(sut, "results/a/b/data.h5") == "content"
+        assert sut.client.listdir("/testdir/results/c") == []
@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import Dict, Optional
+
+import fs.osfs
+import pytest
+
+from hpcrocket.core.executor import CommandExecutor
+from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
+
+
+@pytest.fixture
+def workdir(tmp_path: Path, workdir_files: Dict[str, str]) -> str:
+    """
+    A directory containing the files of the `workdir_files` fixture, which maps paths to contents
+    """
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    for file, content in workdir_files.items():
+        path = workdir / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    return str(workdir)
+
+
+def make_filesystem(
+    workdir: str, executor: Optional[CommandExecutor] = None
+) -> PyFilesystemBased:
+    """
+    A local filesystem standing in for the remote one, running its shell commands with the given executor
+    """
+    return PyFilesystemBased(fs.osfs.OSFS("/"), workdir, executor=executor)
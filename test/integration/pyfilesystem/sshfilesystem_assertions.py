@@ -11,6 +11,9 @@ def assert_sshfs_connected_with_connection_data(
         pkey=connection_data.key,
         port=connection_data.port,
         sock=channel,
+        streams=1,
+        limiter=None,
+        round_trips=None,
     )
 
 
@@ -24,6 +27,9 @@ def assert_sshfs_connected_with_password_from_connection_data(
         pkey=None,
         port=connection_data.port,
         sock=None,
+        streams=1,
+        limiter=None,
+        round_trips=None,
     )
 
 
@@ -37,6 +43,9 @@ def assert_sshfs_connected_with_private_key_from_connection_data(
         pkey=connection_data.key,
         port=connection_data.port,
         sock=None,
+        streams=1,
+        limiter=None,
+        round_trips=None,
     )
 
 
@@ -50,4 +59,7 @@ def assert_sshfs_connected_with_keyfile_from_connection_data(
         pkey=connection_data.keyfile,
         port=connection_data.port,
         sock=None,
+        streams=1,
+        limiter=None,
+        round_trips=None,
     )
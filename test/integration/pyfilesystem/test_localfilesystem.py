@@ -0,0 +1,95 @@
+import os
+import stat
+import tempfile
+import unittest
+from test.test_filesystem_abc import FilesystemTest
+from test.testdoubles.pyfilesystem import UploadOptionsRecordingMemoryFS
+from typing import List
+
+from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.pyfilesystem.localfilesystem import LocalFilesystem
+from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
+
+
+class LocalFilesystemTest(FilesystemTest, unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = temp_dir.name
+
+    def working_dir_abs(self) -> str:
+        return self.root
+
+    def home_dir_abs(self) -> str:
+        return os.path.join(self.root, "home")
+
+    def create_filesystem(self, dir: str = "") -> Filesystem:
+        return LocalFilesystem(dir or self.root, self.home_dir_abs())
+
+    def _path(self, filesystem: Filesystem, path: str) -> str:
+        local = filesystem
+        assert isinstance(local, LocalFilesystem)
+        return os.path.join(str(local.current_dir), path)
+
+    def create_file(self, filesystem: Filesystem, path: str, content: str = "") -> None:
+        full_path = self._path(filesystem, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as file:
+            file.write(content)
+
+    def create_dir(self, filesystem: Filesystem, directory: str) -> None:
+        os.makedirs(self._path(filesystem, directory))
+
+    def get_file_content(self, filesystem: Filesystem, path: str) -> str:
+        with open(self._path(filesystem, path)) as file:
+            return file.read()
+
+    def test__when_copying_executable__should_keep_permission_bits(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, "run.sh", "#!/bin/sh")
+        os.chmod(self._path(sut, "run.sh"), 0o750)
+
+        sut.copy("run.sh", "copy.sh")
+
+        mode = os.stat(self._path(sut, "copy.sh")).st_mode
+        assert stat.S_IMODE(mode) == 0o750
+
+    def test__when_copying_to_pyfilesystem__should_upload_with_its_options(
+        self,
+    ) -> None:
+        target_fs = UploadOptionsRecordingMemoryFS()
+        sut = self.create_filesystem()
+        self.create_file(sut, "dir/file.txt", "content")
+        transferred: List[int] = []
+
+        sut.copy(
+            "dir/*.txt",
+            "out/",
+            filesystem=PyFilesystemBased(target_fs),
+            progress=transferred.append,
+        )
+
+        assert target_fs.upload_options == [{"preserve_mode": True}]
+        assert target_fs.readtext("out/file.txt") == "content"
+        assert sum(transferred) == len("content")
+
+    def test__when_globbing__should_follow_links_to_directories(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, "data/file.txt")
+        self.create_dir(sut, "dir")
+        os.symlink(self._path(sut, "data"), self._path(sut, "dir/link"))
+
+        actual = sut.glob("**/*.txt")
+
+        assert sorted(actual) == ["data/file.txt", "dir/link/file.txt"]
+
+    def test__when_globbing__should_not_follow_links_back_to_parent_directories(
+        self,
+    ) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, "dir/file.txt")
+        os.symlink(self._path(sut, "dir"), self._path(sut, "dir/loop"))
+
+        actual = sut.glob("**/*.txt")
+
+        assert actual == ["dir/file.txt"]
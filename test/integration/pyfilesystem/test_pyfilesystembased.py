@@ -6,11 +6,12 @@ from unittest.mock import MagicMock
 
 import pytest
 from test.test_filesystem_abc import FilesystemTest
+from test.testdoubles.pyfilesystem import UploadOptionsRecordingMemoryFS
 
 import fs.base
 from fs.memoryfs import MemoryFS
 
-from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.core.filesystem import FileInfo, Filesystem, ProgressCallback
 from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
 
 
@@ -33,6 +34,8 @@ class NonPyFilesystemBasedFilesystem(Filesystem):
         target: str,
         overwrite: bool = False,
         filesystem: Optional["Filesystem"] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
     ) -> None:
         pass
 
@@ -42,6 +45,9 @@ class NonPyFilesystemBasedFilesystem(Filesystem):
     def exists(self, path: str) -> bool:
         pass
 
+    def stat(self, path: str) -> FileInfo:
+        pass
+
     def openread(self, path: str) -> TextIOWrapper:
         pass
 
@@ -106,3 +112,65 @@ class PyFilesystemBasedTest(FilesystemTest, unittest.TestCase):
 
         with pytest.raises(RuntimeError):
             sut.copy(self.SOURCE, self.TARGET, filesystem=target_fs)
+
+    def test__given_target_supporting_upload_options__when_copying__should_preserve_mode(
+        self,
+    ) -> None:
+        target_fs = UploadOptionsRecordingMemoryFS()
+        sut = self.create_filesystem()
+        self.create_file(sut, self.SOURCE, "content")
+
+        sut.copy(self.SOURCE, self.TARGET, filesystem=_TestFilesystemImpl(target_fs))
+
+        assert target_fs.upload_options == [{"preserve_mode": True}]
+        assert target_fs.readtext(self.TARGET) == "content"
+
+    def test__given_progress_callback__when_copying_to_other_fs__reports_all_bytes(
+        self,
+    ) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, self.SOURCE, "content")
+        transferred: List[int] = []
+
+        sut.copy(
+            self.SOURCE,
+            self.TARGET,
+            filesystem=_TestFilesystemImpl(MemoryFS()),
+            progress=transferred.append,
+        )
+
+        assert sum(transferred) == len("content")
+
+    def test__given_progress_callback__when_uploading_with_options__reports_all_bytes(
+        self,
+    ) -> None:
+        target_fs = UploadOptionsRecordingMemoryFS()
+        sut = self.create_filesystem()
+        self.create_file(sut, self.SOURCE, "content")
+        transferred: List[int] = []
+
+        sut.copy(
+            self.SOURCE,
+            self.TARGET,
+            filesystem=_TestFilesystemImpl(target_fs),
+            progress=transferred.append,
+        )
+
+        assert sum(transferred) == len("content")
+        assert target_fs.readtext(self.TARGET) == "content"
+
+    def test__given_target_supporting_upload_options__when_copying_without_preserving_mode__should_tell_target(
+        self,
+    ) -> None:
+        target_fs = UploadOptionsRecordingMemoryFS()
+        sut = self.create_filesystem()
+        self.create_file(sut, self.SOURCE, "content")
+
+        sut.copy(
+            self.SOURCE,
+            self.TARGET,
+            filesystem=_TestFilesystemImpl(target_fs),
+            preserve_mode=False,
+        )
+
+        assert target_fs.upload_options == [{"preserve_mode": False}]
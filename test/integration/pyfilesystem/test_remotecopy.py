@@ -0,0 +1,89 @@
+import os
+from test.integration.pyfilesystem.fixtures import make_filesystem, workdir
+from test.testdoubles.executor import LocalShellExecutor
+from typing import Dict
+
+import pytest
+
+
+@pytest.fixture
+def workdir_files() -> Dict[str, str]:
+    return {"reference/genome.fa": "ACGT", "job/existing.fa": "old"}
+
+
+def read(workdir: str, path: str) -> str:
+    with open(os.path.join(workdir, path)) as file:
+        return file.read()
+
+
+def test__given_shell_access__when_duplicating__copies_on_remote_machine(
+    workdir: str,
+) -> None:
+    executor = LocalShellExecutor()
+    sut = make_filesystem(workdir, executor)
+
+    sut.duplicate("reference/genome.fa", "job/inputs/genome.fa")
+
+    assert read(workdir, "job/inputs/genome.fa") == "ACGT"
+    assert len(executor.command_log) == 1
+
+
+def test__given_shell_access__when_duplicating_as_symlink__creates_link(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    sut.duplicate("reference/genome.fa", "job/genome.fa", symlink=True)
+
+    assert os.path.islink(os.path.join(workdir, "job/genome.fa"))
+    assert read(workdir, "job/genome.fa") == "ACGT"
+
+
+def test__given_existing_dir_as_target__when_duplicating__copies_into_dir(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    sut.duplicate("reference/genome.fa", "job")
+
+    assert read(workdir, "job/genome.fa") == "ACGT"
+
+
+def test__given_existing_target__when_duplicating__raises_file_exists_error(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    with pytest.raises(FileExistsError):
+        sut.duplicate("reference/genome.fa", "job/existing.fa")
+
+    assert read(workdir, "job/existing.fa") == "old"
+
+
+def test__given_existing_target_and_overwrite__when_duplicating__replaces_it(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    sut.duplicate("reference/genome.fa", "job/existing.fa", overwrite=True)
+
+    assert read(workdir, "job/existing.fa") == "ACGT"
+
+
+def test__given_missing_source__when_duplicating__raises_file_not_found_error(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    with pytest.raises(FileNotFoundError):
+        sut.duplicate("reference/missing.fa", "job/missing.fa")
+
+
+def test__without_shell_access__when_duplicating__falls_back_to_copy(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir)
+
+    sut.duplicate("reference/genome.fa", "job/genome.fa")
+
+    assert read(workdir, "job/genome.fa") == "ACGT"
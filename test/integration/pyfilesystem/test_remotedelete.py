@@ -0,0 +1,189 @@
+import os
+from pathlib import Path
+from test.integration.pyfilesystem.fixtures import make_filesystem, workdir
+from test.testdoubles.executor import (
+    CommandExecutorStub,
+    LocalShellExecutor,
+    RunningCommandStub,
+)
+from typing import Dict
+
+import fs.errors
+import pytest
+
+from hpcrocket.core.executor import RunningCommand
+from hpcrocket.pyfilesystem import remoteshell
+
+FILES = [
+    "results/run.log",
+    "results/a/data.h5",
+    "results/a/b/data.h5",
+    "top.h5",
+    "top.txt",
+    "keep.txt",
+]
+
+
+@pytest.fixture
+def workdir_files() -> Dict[str, str]:
+    return {file: "content" for file in FILES}
+
+
+@pytest.fixture(autouse=True)
+def outside_file(tmp_path: Path) -> None:
+    (tmp_path / "outside.txt").write_text("content")
+
+
+def exists(workdir: str, path: str) -> bool:
+    return os.path.lexists(os.path.join(workdir, path))
+
+
+def test__given_shell_access__when_deleting_many__deletes_files_dirs_and_globs(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    errors = sut.delete_many(["results", "*.h5", "top.txt"])
+
+    assert errors == []
+    assert not exists(workdir, "results")
+    assert not exists(workdir, "top.h5")
+    assert not exists(workdir, "top.txt")
+    assert exists(workdir, "keep.txt")
+
+
+def test__given_shell_access__when_deleting_many__runs_single_rm_command(
+    workdir: str,
+) -> None:
+    executor = LocalShellExecutor()
+    sut = make_filesystem(workdir, executor)
+
+    sut.delete_many(["results", "top.h5", "top.txt"])
+
+    assert len(executor.command_log) == 1
+    assert "rm -rf --" in executor.command_log[0]
+
+
+def test__given_shell_access__when_deleting_missing_paths__returns_error_per_path(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    errors = sut.delete_many(["missing.txt", "top.txt", "nodir/file.txt"])
+
+    assert [str(err) for err in errors] == ["missing.txt", "nodir/file.txt"]
+    assert not exists(workdir, "top.txt")
+
+
+def test__given_shell_access__when_deleting_glob_in_missing_dir__returns_no_error(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    errors = sut.delete_many(["nodir/*.txt"])
+
+    assert errors == []
+
+
+def test__given_shell_access__when_deleting_path_leaving_working_dir__does_not_pass_it_to_rm(
+    workdir: str,
+) -> None:
+    executor = LocalShellExecutor()
+    sut = make_filesystem(workdir, executor)
+    outside = os.path.join(os.path.dirname(workdir), "outside.txt")
+
+    with pytest.raises(fs.errors.IllegalBackReference):
+        sut.delete_many(["../outside.txt"])
+
+    assert os.path.exists(outside)
+    assert executor.command_log == []
+
+
+def test__given_shell_access__when_deleting_absolute_path__resolves_it_inside_working_dir(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+    outside = os.path.join(os.path.dirname(workdir), "outside.txt")
+
+    errors = sut.delete_many([outside])
+
+    assert [type(err) for err in errors] == [FileNotFoundError]
+    assert os.path.exists(outside)
+
+
+def test__given_shell_access__when_deleting_working_dir__does_not_pass_it_to_rm(
+    workdir: str,
+) -> None:
+    executor = LocalShellExecutor()
+    sut = make_filesystem(workdir, executor)
+
+    sut.delete_many([".", "keep.txt"])
+
+    assert all(f"{workdir}'" not in cmd for cmd in executor.command_log)
+    assert all(f"{workdir} " not in cmd for cmd in executor.command_log)
+
+
+def test__given_symlink_to_outside__when_deleting_it__keeps_link_target(
+    workdir: str,
+) -> None:
+    outside = os.path.join(os.path.dirname(workdir), "outside.txt")
+    os.symlink(outside, os.path.join(workdir, "link.txt"))
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    errors = sut.delete_many(["link.txt"])
+
+    assert errors == []
+    assert not exists(workdir, "link.txt")
+    assert os.path.exists(outside)
+
+
+def test__given_no_shell_access__when_deleting_many__falls_back_to_pyfilesystem(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(
+        workdir, CommandExecutorStub(RunningCommandStub(exit_code=127))
+    )
+
+    errors = sut.delete_many(["results", "missing.txt"])
+
+    assert [type(err) for err in errors] == [FileNotFoundError]
+    assert not exists(workdir, "results")
+
+
+class ShellLostAfterFirstCommandExecutor(LocalShellExecutor):
+    def exec_command(self, cmd: str) -> RunningCommand:
+        if self.command_log:
+            self.command_log.append(cmd)
+            return RunningCommandStub(exit_code=127)
+
+        return super().exec_command(cmd)
+
+
+def test__given_shell_lost_during_deletion__when_deleting_many__reports_only_missing_paths(
+    workdir: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Every path is deleted by its own command
+    monkeypatch.setattr(remoteshell, "_MAX_ARGUMENTS_LENGTH", 1)
+    sut = make_filesystem(workdir, ShellLostAfterFirstCommandExecutor())
+
+    errors = sut.delete_many(["top.h5", "missing.txt", "top.txt"])
+
+    assert [str(err) for err in errors] == ["missing.txt"]
+    assert not exists(workdir, "top.h5")
+    assert not exists(workdir, "top.txt")
+
+
+def test__given_failing_rm__when_deleting_many__deletes_remaining_paths_with_pyfilesystem(
+    workdir: str, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    bin_dir = tmp_path_factory.mktemp("bin")
+    (bin_dir / "rm").write_text("#!/bin/sh\nexit 1\n")
+    (bin_dir / "rm").chmod(0o755)
+    path = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+    sut = make_filesystem(workdir, LocalShellExecutor(env={**os.environ, "PATH": path}))
+
+    errors = sut.delete_many(["results", "missing.txt", "*.h5"])
+
+    assert [str(err) for err in errors] == ["missing.txt"]
+    assert not exists(workdir, "results")
+    assert not exists(workdir, "top.h5")
@@ -0,0 +1,157 @@
+import os
+from pathlib import Path
+from test.testdoubles.executor import LocalShellExecutor
+from test.testdoubles.pyfilesystem import MetadataCallCountingFS
+
+import fs.osfs
+import pytest
+from fs.memoryfs import MemoryFS
+
+from hpcrocket.core.progressive_file_operations import (
+    CopyInstruction,
+    execute_transfer_plan,
+    progressive_copy,
+)
+from hpcrocket.core.transferplan import PlannedCopy, TransferPlan
+from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
+from hpcrocket.pyfilesystem.remotedirs import leaf_directories
+
+FILES = [
+    "results/run.log",
+    "results/a/data.h5",
+    "results/a/b/data.h5",
+    "results/a/b/c/more.h5",
+    "results/d/more.h5",
+]
+
+
+def make_source() -> PyFilesystemBased:
+    mem_fs = MemoryFS()
+    for file in FILES:
+        mem_fs.makedirs(
+            os.path.join("/home/user", os.path.dirname(file)), recreate=True
+        )
+        mem_fs.writetext(os.path.join("/home/user", file), "content")
+
+    return PyFilesystemBased(mem_fs, "/home/user")
+
+
+def test__given_nested_dirs__when_getting_leaf_directories__drops_ancestors() -> None:
+    dirs = ["a/b/c", "a/b", "a", "a-b", "x/y/", "./x/y", "", "/abs", "/abs/p"]
+
+    actual = leaf_directories(dirs)
+
+    assert actual == ["/abs/p", "a-b", "a/b/c", "x/y"]
+
+
+def test__given_shell_access__when_copying_glob__creates_target_dirs_with_single_mkdir(
+    tmp_path: Path,
+) -> None:
+    executor = LocalShellExecutor()
+    target = PyFilesystemBased(fs.osfs.OSFS("/"), str(tmp_path), executor=executor)
+
+    make_source().copy("results/**/*", "collected", filesystem=target)
+
+    mkdir_commands = [cmd for cmd in executor.command_log if cmd.startswith("mkdir")]
+    assert len(mkdir_commands) == 1
+    assert (tmp_path / "collected/a/b/c/more.h5").exists()
+    assert (tmp_path / "collected/d/more.h5").exists()
+
+
+def test__given_no_shell_access__when_copying_glob__creates_every_target_dir_once() -> (
+    None
+):
+    target_fs = MetadataCallCountingFS(MemoryFS())
+    target_fs.makedirs("/work")
+    target = PyFilesystemBased(target_fs, "/work")
+
+    make_source().copy("results/**/*", "collected", filesystem=target)
+
+    assert sorted(target_fs.created_dirs) == sorted(
+        [
+            "/work/collected",
+            "/work/collected/a",
+            "/work/collected/a/b",
+            "/work/collected/a/b/c",
+            "/work/collected/d",
+        ]
+    )
+    assert target_fs.readtext("/work/collected/a/b/c/more.h5") == "content"
+
+
+@pytest.mark.parametrize("file_count", [10, 100])
+def test__when_copying_glob_into_nested_dirs__metadata_round_trips_do_not_grow(
+    file_count: int,
+) -> None:
+    def round_trips(count: int) -> int:
+        source_fs = MemoryFS()
+        for i in range(count):
+            source_fs.makedirs(f"/home/user/results/run{i}", recreate=True)
+            source_fs.writetext(f"/home/user/results/run{i}/out.txt", "content")
+
+        target_fs = MetadataCallCountingFS(MemoryFS())
+        target_fs.makedirs("/work")
+        target_fs.metadata_calls = 0
+        source = PyFilesystemBased(source_fs, "/home/user")
+        source.copy(
+            "results/**/*.txt",
+            "collected",
+            filesystem=PyFilesystemBased(target_fs, "/work"),
+        )
+        return target_fs.metadata_calls
+
+    assert round_trips(file_count) == round_trips(2)
+
+
+def test__given_existing_target_file__when_copying_glob__creates_no_target_dirs() -> (
+    None
+):
+    target_fs = MetadataCallCountingFS(MemoryFS())
+    target_fs.makedirs("/work/collected")
+    target_fs.writetext("/work/collected/run.log", "old")
+    target_fs.created_dirs.clear()
+    target = PyFilesystemBased(target_fs, "/work")
+
+    with pytest.raises(FileExistsError):
+        make_source().copy("results/**/*", "collected", filesystem=target)
+
+    assert target_fs.created_dirs == []
+    assert target_fs.listdir("/work/collected") == ["run.log"]
+
+
+def test__given_shell_access__when_executing_plan__creates_target_dirs_with_single_mkdir(
+    tmp_path: Path,
+) -> None:
+    executor = LocalShellExecutor()
+    target = PyFilesystemBased(fs.osfs.OSFS("/"), str(tmp_path), executor=executor)
+    instructions = [
+        CopyInstruction(file, os.path.join("collected", file)) for file in FILES
+    ]
+
+    results = list(progressive_copy(make_source(), target, instructions))
+
+    mkdir_commands = [cmd for cmd in executor.command_log if cmd.startswith("mkdir")]
+    assert len(mkdir_commands) == 1
+    assert all(not result.errors for result in results)
+    assert (tmp_path / "collected/results/a/b/c/more.h5").exists()
+
+
+def test__given_rejected_copy__when_executing_plan__creates_no_dirs_for_copies_after_it() -> (
+    None
+):
+    target_fs = MetadataCallCountingFS(MemoryFS())
+    target_fs.makedirs("/work/collected")
+    target_fs.writetext("/work/collected/existing.h5", "old")
+    target_fs.created_dirs.clear()
+    target = PyFilesystemBased(target_fs, "/work")
+    plan = TransferPlan(
+        [
+            PlannedCopy("results/a/b/c/more.h5", "collected/existing.h5", 20),
+            PlannedCopy("results/d/more.h5", "collected/d/more.h5", 10),
+        ]
+    )
+
+    results = list(execute_transfer_plan(make_source(), target, plan))
+
+    assert [type(error) for error in results[0].errors] == [FileExistsError]
+    assert target_fs.created_dirs == []
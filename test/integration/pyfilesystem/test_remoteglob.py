@@ -0,0 +1,246 @@
+import os
+import shutil
+from test.integration.pyfilesystem.fixtures import make_filesystem, workdir
+from test.testdoubles.executor import (
+    CommandExecutorStub,
+    LocalShellExecutor,
+    RunningCommandStub,
+)
+from typing import Dict, List
+
+import pytest
+
+FILES = [
+    "results/run.log",
+    "results/a/data.h5",
+    "results/a/b/data.h5",
+    "results/a/b/c/more.h5",
+    "results/a/b/c/notes.txt",
+    "top.h5",
+    "top.txt",
+]
+
+PATTERNS = [
+    "*.txt",
+    "*",
+    "results/*",
+    "results/*.log",
+    "results/**/*.h5",
+    "results/a/*/*.h5",
+    "results/a/b/c/*",
+]
+
+
+@pytest.fixture
+def workdir_files() -> Dict[str, str]:
+    return {file: "content" for file in FILES}
+
+
+def sftp_glob(workdir: str, pattern: str) -> List[str]:
+    return make_filesystem(workdir).glob(pattern)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test__given_shell_access__when_globbing__returns_same_matches_as_pyfilesystem(
+    workdir: str, pattern: str
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    actual = sut.glob(pattern)
+
+    assert sorted(actual) == sorted(sftp_glob(workdir, pattern))
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test__given_shell_access__when_globbing_absolute_pattern__returns_same_matches_as_pyfilesystem(
+    workdir: str, pattern: str
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+    absolute_pattern = os.path.join(workdir, pattern)
+
+    actual = sut.glob(absolute_pattern)
+
+    assert sorted(actual) == sorted(sftp_glob(workdir, absolute_pattern))
+
+
+def test__given_shell_access__when_globbing__runs_single_remote_command(
+    workdir: str,
+) -> None:
+    executor = LocalShellExecutor()
+    sut = make_filesystem(workdir, executor)
+
+    sut.glob("results/**/*.h5")
+
+    assert len(executor.command_log) == 1
+    assert executor.command_log[0].startswith("find ")
+
+
+def test__given_shell_access__when_globbing__returns_matches_in_breadth_first_order(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    actual = sut.glob("results/**/*.h5")
+
+    assert actual == [
+        "results/a/data.h5",
+        "results/a/b/data.h5",
+        "results/a/b/c/more.h5",
+    ]
+
+
+def test__given_shell_access__when_globbing_non_existing_dir__raises_file_not_found_error(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    with pytest.raises(FileNotFoundError):
+        sut.glob("nodir/*.h5")
+
+
+def test__given_shell_access__when_copying_glob__copies_matching_files(
+    workdir: str, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    target_dir = str(tmp_path_factory.mktemp("target"))
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    sut.copy("results/**/*.h5", "collected", filesystem=make_filesystem(target_dir))
+
+    assert os.path.exists(os.path.join(target_dir, "collected/a/b/c/more.h5"))
+
+
+def test__given_shell_access__when_getting_info_of_many_paths__runs_single_remote_command(
+    workdir: str,
+) -> None:
+    executor = LocalShellExecutor()
+    sut = make_filesystem(workdir, executor)
+
+    infos = sut.stat_many(["top.h5", "missing.h5", "results/a"])
+
+    assert [(info.path, info.is_dir) if info else None for info in infos] == [
+        ("top.h5", False),
+        None,
+        ("results/a", True),
+    ]
+    assert len(executor.command_log) == 1
+
+
+def test__given_shell_access__when_walking__returns_same_entries_as_pyfilesystem(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(workdir, LocalShellExecutor())
+
+    actual = [(info.path, info.is_dir, info.size) for info in sut.walk("results")]
+
+    expected = [
+        (i.path, i.is_dir, i.size) for i in make_filesystem(workdir).walk("results")
+    ]
+    assert sorted(actual) == sorted(expected)
+
+
+def test__given_no_shell_access__when_globbing__falls_back_to_pyfilesystem(
+    workdir: str,
+) -> None:
+    sut = make_filesystem(
+        workdir, CommandExecutorStub(RunningCommandStub(exit_code=127))
+    )
+
+    actual = sut.glob("results/**/*.h5")
+
+    assert sorted(actual) == sorted(sftp_glob(workdir, "results/**/*.h5"))
+
+
+def test__given_no_shell_access__when_globbing_twice__does_not_try_shell_again(
+    workdir: str,
+) -> None:
+    executor = LoggingShellRefusingExecutor()
+    sut = make_filesystem(workdir, executor)
+
+    sut.glob("*.txt")
+    sut.glob("*.h5")
+
+    assert executor.calls == 1
+
+
+class LoggingShellRefusingExecutor(CommandExecutorStub):
+    def __init__(self) -> None:
+        super().__init__(RunningCommandStub(exit_code=127))
+        self.calls = 0
+
+    def exec_command(self, cmd: str) -> RunningCommandStub:
+        self.calls += 1
+        return RunningCommandStub(exit_code=127)
+
+
+FIND_WITHOUT_PRINTF = """#!/bin/sh
+for arg in "$@"; do
+    if [ "$arg" = "-printf" ]; then
+        echo "find: unrecognized: -printf" >&2
+        exit 1
+    fi
+done
+exec {find} "$@"
+"""
+
+
+@pytest.fixture
+def find_without_printf_executor(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> LocalShellExecutor:
+    bin_dir = tmp_path_factory.mktemp("bin")
+    find = bin_dir / "find"
+    find.write_text(FIND_WITHOUT_PRINTF.format(find=shutil.which("find")))
+    find.chmod(0o755)
+
+    path = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+    return LocalShellExecutor(env={**os.environ, "PATH": path})
+
+
+def test__given_find_without_printf__when_globbing__falls_back_to_pyfilesystem(
+    workdir: str, find_without_printf_executor: LocalShellExecutor
+) -> None:
+    sut = make_filesystem(workdir, find_without_printf_executor)
+
+    actual = sut.glob("results/**/*.h5")
+
+    assert sorted(actual) == sorted(sftp_glob(workdir, "results/**/*.h5"))
+
+
+def test__given_find_without_printf__when_globbing_twice__does_not_run_find_again(
+    workdir: str, find_without_printf_executor: LocalShellExecutor
+) -> None:
+    sut = make_filesystem(workdir, find_without_printf_executor)
+    sut.glob("*.txt")
+    commands_of_first_glob = len(find_without_printf_executor.command_log)
+
+    sut.glob("*.h5")
+    sut.stat_many(["top.h5"])
+
+    assert len(find_without_printf_executor.command_log) == commands_of_first_glob
+
+
+def test__given_find_without_printf__when_getting_info_of_many_paths__falls_back_to_pyfilesystem(
+    workdir: str, find_without_printf_executor: LocalShellExecutor
+) -> None:
+    sut = make_filesystem(workdir, find_without_printf_executor)
+
+    infos = sut.stat_many(["top.h5", "missing.h5", "results/a"])
+
+    assert [(info.path, info.is_dir) if info else None for info in infos] == [
+        ("top.h5", False),
+        None,
+        ("results/a", True),
+    ]
+
+
+def test__given_missing_directory__when_globbing_twice__keeps_using_find(
+    workdir: str,
+) -> None:
+    executor = LocalShellExecutor()
+    sut = make_filesystem(workdir, executor)
+    with pytest.raises(FileNotFoundError):
+        sut.glob("nodir/*.h5")
+
+    sut.glob("*.txt")
+
+    assert executor.command_log[-1].startswith("find ")
@@ -1,11 +1,15 @@
 import os
 import subprocess
+import tempfile
 import time
 import unittest
 from test.integration.pyfilesystem.test_pyfilesystembased import PyFilesystemBasedTest
+from typing import cast
 
 import pytest
 from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.pyfilesystem.localfilesystem import localfilesystem
+from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
 from hpcrocket.pyfilesystem.sshfilesystem import sshfilesystem
 from hpcrocket.ssh.connectiondata import ConnectionData
 
@@ -59,3 +63,30 @@ class TestSSHFilesystem(PyFilesystemBasedTest, unittest.TestCase):  # type: igno
 
     def home_dir_abs(self) -> str:
         return "/testdir"
+
+    def test__when_uploading_executable__should_keep_permissions(self) -> None:
+        sut = self.create_filesystem()
+        with tempfile.TemporaryDirectory() as local_dir:
+            local_file = os.path.join(local_dir, "run.sh")
+            with open(local_file, "w") as file:
+                file.write("#!/bin/sh")
+            os.chmod(local_file, 0o750)
+
+            localfilesystem(local_dir).copy("run.sh", "run.sh", filesystem=sut)
+
+        internal_fs = cast(PyFilesystemBased, sut).internal_fs
+        info = internal_fs.getinfo("/testdir/run.sh", namespaces=["access"])
+        assert info.permissions is not None
+        assert info.permissions.mode == 0o750
+
+    def test__when_uploading_large_file__should_copy_entire_content(self) -> None:
+        sut = self.create_filesystem()
+        content = os.urandom(5 * 1024 * 1024 + 17)
+        with tempfile.TemporaryDirectory() as local_dir:
+            with open(os.path.join(local_dir, "large.bin"), "wb") as file:
+                file.write(content)
+
+            localfilesystem(local_dir).copy("large.bin", "large.bin", filesystem=sut)
+
+        internal_fs = cast(PyFilesystemBased, sut).internal_fs
+        assert internal_fs.readbytes("/testdir/large.bin") == content
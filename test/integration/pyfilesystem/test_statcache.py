@@ -0,0 +1,173 @@
+from test.testdoubles.pyfilesystem import MetadataCallCountingFS
+from typing import List
+
+import pytest
+from fs.memoryfs import MemoryFS
+
+from hpcrocket.core.progressive_file_operations import CopyInstruction, progressive_copy
+from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
+from hpcrocket.pyfilesystem.statcache import StatCachingFS
+
+SOURCE_DIR = "/home/user"
+TARGET_DIR = "/work"
+
+
+def make_source(file_count: int) -> MetadataCallCountingFS:
+    source = MetadataCallCountingFS(MemoryFS())
+    source.makedirs(f"{SOURCE_DIR}/results")
+    for i in range(file_count):
+        source.writetext(f"{SOURCE_DIR}/results/file{i}.txt", "content")
+
+    source.metadata_calls = 0
+    return source
+
+
+def make_target() -> MetadataCallCountingFS:
+    target = MetadataCallCountingFS(MemoryFS())
+    target.makedirs(TARGET_DIR)
+    target.metadata_calls = 0
+    return target
+
+
+def round_trips_for_copying(
+    file_count: int, instructions: List[CopyInstruction]
+) -> int:
+    source = make_source(file_count)
+    target = make_target()
+
+    results = progressive_copy(
+        PyFilesystemBased(source, SOURCE_DIR),
+        PyFilesystemBased(target, TARGET_DIR),
+        instructions,
+    )
+
+    assert all(not result.errors for result in results)
+    return source.metadata_calls + target.metadata_calls
+
+
+def single_file_instructions(file_count: int) -> List[CopyInstruction]:
+    return [
+        CopyInstruction(f"results/file{i}.txt", f"collected/file{i}.txt")
+        for i in range(file_count)
+    ]
+
+
+@pytest.mark.parametrize("file_count", [10, 100])
+def test__when_copying_glob__round_trips_do_not_grow_with_number_of_files(
+    file_count: int,
+) -> None:
+    instruction = [CopyInstruction("results/*.txt", "collected")]
+
+    few_files = round_trips_for_copying(2, instruction)
+    many_files = round_trips_for_copying(file_count, instruction)
+
+    assert many_files == few_files
+
+
+@pytest.mark.parametrize("file_count", [10, 100])
+def test__when_copying_many_single_files__needs_less_than_one_round_trip_per_file(
+    file_count: int,
+) -> None:
+    round_trips = round_trips_for_copying(
+        file_count, single_file_instructions(file_count)
+    )
+
+    assert round_trips / file_count < 1
+
+
+def test__when_copying_single_file__needs_at_most_one_round_trip_per_check() -> None:
+    round_trips = round_trips_for_copying(1, single_file_instructions(1))
+
+    # source exists, target exists, target parent exists, source isdir and target isdir
+    assert round_trips <= 5
+
+
+def test__given_no_batch__when_checking_existence_twice__asks_twice() -> None:
+    target = make_target()
+    sut = PyFilesystemBased(target, TARGET_DIR)
+
+    sut.exists("file.txt")
+    sut.exists("file.txt")
+
+    assert target.metadata_calls == 2
+
+
+def test__given_batch__when_checking_existence_twice__asks_once() -> None:
+    target = make_target()
+    sut = PyFilesystemBased(target, TARGET_DIR)
+
+    with sut.batch():
+        sut.exists("file.txt")
+        sut.exists("file.txt")
+
+    assert target.metadata_calls == 1
+
+
+def test__given_missing_file__when_writing_it__exists_afterwards() -> None:
+    sut = StatCachingFS(MemoryFS())
+    assert not sut.exists("/file.txt")
+
+    sut.writetext("/file.txt", "content")
+
+    assert sut.exists("/file.txt")
+
+
+def test__given_existing_file__when_removing_it__does_not_exist_afterwards() -> None:
+    sut = StatCachingFS(MemoryFS())
+    sut.writetext("/file.txt", "content")
+    assert sut.exists("/file.txt")
+
+    sut.remove("/file.txt")
+
+    assert not sut.exists("/file.txt")
+
+
+def test__given_listed_directory__when_removing_tree__forgets_its_contents() -> None:
+    sut = StatCachingFS(MemoryFS())
+    sut.makedirs("/dir/sub")
+    sut.writetext("/dir/sub/file.txt", "content")
+    sut.listdir("/dir/sub")
+
+    sut.removetree("/dir")
+
+    assert not sut.exists("/dir/sub/file.txt")
+    assert not sut.exists("/dir")
+
+
+def test__given_listed_dir__when_looking_up_entries__does_not_ask_wrapped_fs() -> None:
+    wrapped = MetadataCallCountingFS(MemoryFS())
+    wrapped.makedirs("/dir/sub")
+    wrapped.writetext("/dir/file.txt", "content")
+    sut = StatCachingFS(wrapped)
+    sut.listdir("/dir")
+    wrapped.metadata_calls = 0
+
+    assert sut.isfile("/dir/file.txt")
+    assert sut.isdir("/dir/sub")
+    assert not sut.exists("/dir/missing.txt")
+    assert not sut.exists("/dir/missing/file.txt")
+    assert wrapped.metadata_calls == 0
+
+
+def test__given_created_dir__when_looking_up_entries__does_not_ask_wrapped_fs() -> None:
+    wrapped = MetadataCallCountingFS(MemoryFS())
+    sut = StatCachingFS(wrapped)
+    sut.makedirs("/new/dir")
+    wrapped.metadata_calls = 0
+
+    assert sut.isdir("/new/dir")
+    assert not sut.exists("/new/dir/file.txt")
+    assert wrapped.metadata_calls == 0
+
+
+def test__given_listed_dir__when_overwriting_file__returns_current_size() -> None:
+    sut = StatCachingFS(MemoryFS())
+    sut.makedir("/dir")
+    sut.writetext("/dir/file.txt", "a")
+    sut.listdir("/dir")
+
+    sut.writetext("/dir/file.txt", "longer content")
+
+    assert sut.getinfo("/dir/file.txt", namespaces=["details"]).size == len(
+        "longer content"
+    )
@@ -0,0 +1,99 @@
+from typing import List
+
+import pytest
+
+from hpcrocket.ssh.bandwidth import (
+    BandwidthLimiter,
+    TokenBucket,
+    parse_rate,
+    shared_limiter,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    ["value", "expected"],
+    [
+        (1000, 1000),
+        ("512", 512),
+        ("50M", 50 * 1024**2),
+        ("1.5GiB/s", int(1.5 * 1024**3)),
+        ("64 kb", 64 * 1024),
+    ],
+)
+def test__given_rate__should_parse_bytes_per_second(value: str, expected: int) -> None:
+    assert parse_rate(value) == expected
+
+
+@pytest.mark.parametrize("value", ["fast", "10T", "0", -5])
+def test__given_invalid_rate__should_raise_value_error(value: str) -> None:
+    with pytest.raises(ValueError):
+        parse_rate(value)
+
+
+def test__given_burst_allowance__first_reservation_should_not_wait() -> None:
+    sut = TokenBucket(1000, clock=FakeClock())
+
+    assert sut.reserve(500) == 0.0
+
+
+def test__when_exceeding_rate__should_wait_for_excess_bytes() -> None:
+    sut = TokenBucket(1000, clock=FakeClock())
+
+    sut.reserve(500)
+    delay = sut.reserve(1000)
+
+    assert delay == pytest.approx(1.0)
+
+
+def test__when_time_has_passed__should_refill_bucket() -> None:
+    clock = FakeClock()
+    sut = TokenBucket(1000, clock=clock)
+    sut.reserve(1500)
+
+    clock.now = 1.5
+
+    assert sut.reserve(500) == 0.0
+
+
+def test__given_two_transfers__should_serve_them_in_turn() -> None:
+    sut = TokenBucket(1000, clock=FakeClock())
+    sut.reserve(500)
+
+    first = sut.reserve(1000)
+    second = sut.reserve(1000)
+
+    assert second - first == pytest.approx(1.0)
+
+
+def test__given_several_buckets__limiter_should_wait_for_slowest() -> None:
+    clock = FakeClock()
+    delays: List[float] = []
+    fast = TokenBucket(10_000, clock=clock)
+    slow = TokenBucket(1000, clock=clock)
+    sut = BandwidthLimiter([fast, slow], sleep=delays.append)
+
+    sut.acquire(500)
+    sut.acquire(1000)
+
+    assert delays == [pytest.approx(1.0)]
+
+
+def test__given_no_rate__should_not_create_limiter() -> None:
+    assert shared_limiter("example.com") is None
+
+
+def test__given_same_host__limiters_should_share_bucket() -> None:
+    first = shared_limiter("shared.example.com", host_rate=1000)
+    second = shared_limiter("shared.example.com", host_rate=2000)
+    assert first is not None and second is not None
+
+    assert first._buckets == second._buckets
+    assert first._buckets[0].rate == 2000
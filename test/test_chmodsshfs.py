@@ -0,0 +1,33 @@
+from pathlib import Path
+from test.testdoubles.sftpserver import SFTPServerStub, make_sshfs
+
+from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
+from paramiko.sftp import CMD_OPEN
+
+CONTENT = bytes(range(256)) * 1024
+
+
+def test__when_opening_byte_range__should_only_read_from_offset(tmp_path: Path) -> None:
+    sftp = SFTPServerStub(files=True)
+    sftp.content[:] = CONTENT
+    sut = PyFilesystemBased(make_sshfs(sftp, str(tmp_path / "settings.json")))
+    offset = 200 * 1024
+
+    with sut.openbin("file.bin", offset=offset, length=1000) as file:
+        assert file.read(1000) == CONTENT[offset : offset + 1000]
+
+    assert sftp.read_offsets
+    assert min(sftp.read_offsets) >= offset
+
+
+def test__when_opening_byte_ranges__should_reuse_sftp_session(tmp_path: Path) -> None:
+    sftp = SFTPServerStub(files=True)
+    sftp.content[:] = CONTENT
+    sut = make_sshfs(sftp, str(tmp_path / "settings.json"))
+
+    for offset in (0, 1000, 2000):
+        with sut.openbin("file.bin", offset=offset, length=1000) as file:
+            file.read(1000)
+
+    assert sftp.requests.count(CMD_OPEN) == 3
+    sut._internal_fs._client.open_sftp.assert_not_called()  # type: ignore
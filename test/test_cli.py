@@ -1,16 +1,21 @@
 import os
+from pathlib import Path
 from typing import Dict, Generator, List
 from unittest.mock import patch
 
 import pytest
 from hpcrocket.cli import parse_cli_args
-from hpcrocket.core.progressive_file_operations import CopyInstruction
+from hpcrocket.core.progressive_file_operations import (
+    CopyInstruction,
+    RemoteCopyInstruction,
+)
 from hpcrocket.core.launchoptions import (
     LaunchOptions,
     Options,
     SimpleJobOptions,
     WatchOptions,
 )
+from hpcrocket.core.workflows.journal import WorkflowJournal
 from hpcrocket.pyfilesystem.localfilesystem import localfilesystem
 from hpcrocket.ssh.connectiondata import ConnectionData
 
@@ -93,12 +98,95 @@ def test__given_valid_launch_args__should_return_matching_config() -> None:
             CopyInstruction("myfile.txt", "mycopy.txt"),
             CopyInstruction(LOCAL_SLURM_SCRIPT_PATH, REMOTE_SLURM_SCRIPT_PATH, True),
         ],
+        remote_copy_files=[
+            RemoteCopyInstruction(
+                "/scratch/shared/reference.fa", "reference.fa", symlink=True
+            ),
+            RemoteCopyInstruction(
+                REMOTE_RESULT_FILEPATH, "previous_result.txt", overwrite=True
+            ),
+        ],
         clean_files=["mycopy.txt", REMOTE_SLURM_SCRIPT_PATH],
         collect_files=[CopyInstruction(REMOTE_RESULT_FILEPATH, "result.txt", True)],
         continue_if_job_fails=True,
+        collect_interval=30,
+        transfer_streams=4,
+        bandwidth_limit=100 * 1024**2,
+        host_bandwidth_limit=40 * 1024**2,
         watch=True,
+        tail_files=["slurm-%j.out"],
+        configfile="test/testconfig/config.yml",
+    )
+
+
+def test__given_dry_run_launch_args__should_return_dry_run_config() -> None:
+    config = run_parser(
+        [
+            "launch",
+            "--dry-run",
+            "test/testconfig/config.yml",
+        ]
     )
 
+    assert isinstance(config, LaunchOptions)
+    assert config.dry_run is True
+    assert config.watch is False
+
+
+def test__given_config_with_transfer_host__should_return_transfer_connection() -> None:
+    config = run_parser(["launch", "test/testconfig/config_transfer_host.yml"])
+
+    assert isinstance(config, LaunchOptions)
+    assert config.proxyjumps == []
+    assert config.transfer_connection == ConnectionData(
+        hostname="dtn.example.com",
+        username=REMOTE_USER,
+        keyfile="/home/user/.ssh/dtn_keyfile",
+        password="dtn-pass",
+    )
+    assert config.transfer_proxyjumps == [PROXYJUMPS[0]]
+
+
+def test__given_copy_with_preserve_mode_disabled__should_not_preserve_mode_of_copy() -> None:
+    config = run_parser(["launch", "test/testconfig/config_preserve_mode.yml"])
+
+    assert isinstance(config, LaunchOptions)
+    assert config.copy_files == [
+        CopyInstruction("myfile.txt", "mycopy.txt", preserve_mode=False),
+        CopyInstruction("run.sh", "run.sh"),
+    ]
+
+
+def test__given_state_file_arg__when_parsing__should_return_config_with_state_file() -> None:
+    config = run_parser(
+        ["launch", "--state-file", "state.json", "test/testconfig/config.yml"]
+    )
+
+    assert isinstance(config, LaunchOptions)
+    assert config.state_file == "state.json"
+    assert config.resume is False
+
+
+def test__given_resume_args__when_parsing__should_return_launch_config_of_state_file(
+    tmp_path: Path,
+) -> None:
+    state_file = str(tmp_path / "state.json")
+    arguments = {
+        "configfile": "test/testconfig/config.yml",
+        "watch": True,
+        "tail": ["slurm-%j.out", "solver.log"],
+    }
+    WorkflowJournal(state_file, {"arguments": arguments}).save()
+
+    config = run_parser(["resume", state_file])
+
+    assert isinstance(config, LaunchOptions)
+    assert config.sbatch == REMOTE_SLURM_SCRIPT_PATH
+    assert config.watch is True
+    assert config.tail_files == ["slurm-%j.out", "solver.log"]
+    assert config.state_file == state_file
+    assert config.resume is True
+
 
 def test__given_status_args__when_parsing__should_return_matching_config() -> None:
     config = run_parser(
@@ -130,8 +218,87 @@ def test__given_watch_args__when_parsing__should_return_matching_config() -> Non
         jobid="1234",
         connection=CONNECTION_DATA,
         proxyjumps=PROXYJUMPS,
+        tail_files=["slurm-%j.out"],
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["launch", "test/testconfig/config.yml"],
+        ["watch", "test/testconfig/config.yml", "1234"],
+        ["status", "test/testconfig/config.yml", "1234"],
+    ],
+)
+def test__given_report_arg__when_parsing__should_return_config_with_report_file(
+    args: List[str],
+) -> None:
+    command, *rest = args
+    config = run_parser([command, "--report", "report.json", *rest])
+
+    assert config.report_file == "report.json"
+
+
+def test__given_stats_arg__when_parsing__should_return_config_printing_stats() -> None:
+    config = run_parser(["watch", "--stats", "test/testconfig/config.yml", "1234"])
+
+    assert config.print_stats is True
+
+
+def test__given_profile_args__when_parsing__should_return_config_with_profile() -> None:
+    config = run_parser(
+        [
+            "launch",
+            "--profile",
+            "profile.txt",
+            "--profile-mode",
+            "sampling",
+            "test/testconfig/config.yml",
+        ]
     )
 
+    assert config.profile_file == "profile.txt"
+    assert config.profile_mode == "sampling"
+
+
+def test__given_tail_args__when_parsing__should_add_files_to_tail_of_config() -> None:
+    config = run_parser(
+        [
+            "watch",
+            "--tail",
+            "$REMOTE_RESULT_FILEPATH",
+            "--tail",
+            "slurm-%j.out",
+            "test/testconfig/config.yml",
+            "1234",
+        ]
+    )
+
+    assert isinstance(config, WatchOptions)
+    assert config.tail_files == ["slurm-%j.out", REMOTE_RESULT_FILEPATH]
+
+
+def test__given_empty_tail_in_config__when_watching__should_tail_files_of_args() -> None:
+    config = run_parser(
+        [
+            "watch",
+            "--tail",
+            "slurm-%j.out",
+            "test/testconfig/config_empty_tail.yml",
+            "1234",
+        ]
+    )
+
+    assert isinstance(config, WatchOptions)
+    assert config.tail_files == ["slurm-%j.out"]
+
+
+def test__given_empty_tail_in_config__when_launching__should_tail_nothing() -> None:
+    config = run_parser(["launch", "test/testconfig/config_empty_tail.yml"])
+
+    assert isinstance(config, LaunchOptions)
+    assert config.tail_files == []
+
 
 def test__given_cancel_args__when_parsing__should_return_matching_config() -> None:
     config = run_parser(
@@ -148,3 +315,27 @@ def test__given_cancel_args__when_parsing__should_return_matching_config() -> No
         connection=CONNECTION_DATA,
         proxyjumps=PROXYJUMPS,
     )
+
+
+def test__given_config_with_native_backend__should_return_native_backend() -> None:
+    config = run_parser(["launch", "test/testconfig/config_native_backend.yml"])
+
+    assert isinstance(config, LaunchOptions)
+    assert config.backend == "native"
+
+
+def test__given_config_without_backend__should_return_pyfilesystem_backend() -> None:
+    config = run_parser(["launch", "test/testconfig/config.yml"])
+
+    assert isinstance(config, LaunchOptions)
+    assert config.backend == "pyfilesystem"
+
+
+def test__given_config_with_unknown_backend__when_parsing__should_raise(
+    tmp_path: Path,
+) -> None:
+    configfile = tmp_path / "config.yml"
+    configfile.write_text("host: host\nuser: user\nbackend: ftp\nsbatch: job.sh\n")
+
+    with pytest.raises(ValueError):
+        run_parser(["launch", str(configfile)])
@@ -236,6 +236,19 @@ class FilesystemTest(ABC):
         with pytest.raises(FileNotFoundError):
             sut.delete(self.SOURCE)
 
+    def test__when_deleting_many_paths__should_delete_existing_and_return_errors_for_missing(
+        self,
+    ) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, self.SOURCE)
+        self.create_file(sut, "mydir/other.txt")
+
+        errors = sut.delete_many([self.SOURCE, "missing.txt", "mydir"])
+
+        assert not sut.exists(self.SOURCE)
+        assert not sut.exists("mydir")
+        assert [type(err) for err in errors] == [FileNotFoundError]
+
     def test__when_copying_files_with_glob_pattern__it_copies_matching_files(
         self,
     ) -> None:
@@ -340,6 +353,65 @@ class FilesystemTest(ABC):
             ],
         )
 
+    def test__when_getting_file_info__returns_size_of_file(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, self.SOURCE, "content")
+
+        info = sut.stat(self.SOURCE)
+
+        assert info.size == len("content")
+        assert info.is_dir is False
+
+    def test__when_getting_info_of_nonexisting_file__raises_file_not_found(
+        self,
+    ) -> None:
+        sut = self.create_filesystem()
+
+        with pytest.raises(FileNotFoundError):
+            sut.stat("missing.txt")
+
+    def test__when_getting_info_of_many_paths__returns_none_for_missing(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, self.SOURCE, "content")
+        self.create_dir(sut, "mydir")
+
+        infos = sut.stat_many([self.SOURCE, "missing.txt", "mydir"])
+
+        assert [info.is_dir if info else None for info in infos] == [False, None, True]
+        assert infos[0] is not None and infos[0].size == len("content")
+
+    def test__when_checking_many_paths__returns_existence_in_order(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, self.SOURCE)
+        self.create_file(sut, "sub/other.txt")
+
+        actual = sut.exists_many(["sub/other.txt", "missing.txt", self.SOURCE])
+
+        assert actual == [True, False, True]
+
+    def test__when_walking_dir__yields_all_entries_below_it(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, "dir/file.txt", "content")
+        self.create_file(sut, "dir/sub/nested.txt", "nested")
+        self.create_file(sut, "outside.txt")
+
+        entries = list(sut.walk("dir"))
+
+        actual = {(info.path, info.is_dir) for info in entries}
+        assert actual == {
+            ("dir/file.txt", False),
+            ("dir/sub", True),
+            ("dir/sub/nested.txt", False),
+        }
+        sizes = {info.path: info.size for info in entries if not info.is_dir}
+        assert sizes == {"dir/file.txt": 7, "dir/sub/nested.txt": 6}
+
+    def test__when_walking_missing_dir__raises_file_not_found(self) -> None:
+        sut = self.create_filesystem()
+
+        with pytest.raises(FileNotFoundError):
+            list(sut.walk("missing"))
+
     def test__when_reading_file__returns_text_io_wrapper(self) -> None:
         file_content = "the content"
 
@@ -348,6 +420,26 @@ class FilesystemTest(ABC):
         with sut.openread("myfile.txt") as file:
             assert file.read() == file_content
 
+    def test__when_reading_byte_range__returns_only_bytes_in_range(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, "myfile.txt", "0123456789")
+
+        with sut.openbin("myfile.txt", offset=2, length=5) as file:
+            assert file.read() == b"23456"
+
+    def test__when_reading_byte_range_into_buffer__positions_are_relative_to_offset(
+        self,
+    ) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, "myfile.txt", "0123456789")
+        buffer = bytearray(3)
+
+        with sut.openbin("myfile.txt", offset=4) as file:
+            file.seek(2)
+            count = file.readinto(buffer)  # type: ignore[attr-defined]
+
+            assert (count, bytes(buffer), file.tell()) == (3, b"678", 5)
+
     def test__when_reading_nonexisting_file__raises_file_not_found(self) -> None:
         sut = self.create_filesystem()
 
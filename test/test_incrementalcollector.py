@@ -0,0 +1,160 @@
+import time
+from test.testdoubles.filesystem import MemoryFilesystemFake
+from typing import Callable, List
+from unittest.mock import Mock
+
+from hpcrocket.core.incrementalcollector import IncrementalCollector
+from hpcrocket.core.progressive_file_operations import CopyInstruction
+
+
+def make_sut(
+    remote_fs: MemoryFilesystemFake,
+    local_fs: MemoryFilesystemFake,
+    instructions: List[CopyInstruction],
+) -> IncrementalCollector:
+    return IncrementalCollector(remote_fs, local_fs, instructions, interval=0)
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test__given_file_seen_once__when_collecting__should_not_copy_it() -> None:
+    remote_fs = MemoryFilesystemFake(files=["result.txt"])
+    local_fs = MemoryFilesystemFake()
+    sut = make_sut(remote_fs, local_fs, [CopyInstruction("result.txt", "copy.txt")])
+
+    sut.collect_stable_files(Mock())
+
+    assert local_fs.exists("copy.txt") is False
+
+
+def test__given_unchanged_file__when_collecting_twice__should_copy_it() -> None:
+    remote_fs = MemoryFilesystemFake(files=["result.txt"])
+    local_fs = MemoryFilesystemFake()
+    sut = make_sut(remote_fs, local_fs, [CopyInstruction("result.txt", "copy.txt")])
+
+    sut.collect_stable_files(Mock())
+    sut.collect_stable_files(Mock())
+
+    assert local_fs.exists("copy.txt") is True
+
+
+def test__given_growing_file__when_collecting_twice__should_not_copy_it() -> None:
+    remote_fs = MemoryFilesystemFake(files=["result.txt"])
+    local_fs = MemoryFilesystemFake()
+    sut = make_sut(remote_fs, local_fs, [CopyInstruction("result.txt", "copy.txt")])
+
+    sut.collect_stable_files(Mock())
+    remote_fs.write_file_stub("result.txt", "more content")
+    sut.collect_stable_files(Mock())
+
+    assert local_fs.exists("copy.txt") is False
+
+
+def test__given_glob__when_collecting__should_copy_only_unchanged_files() -> None:
+    remote_fs = MemoryFilesystemFake(files=["results/done.txt", "results/busy.txt"])
+    local_fs = MemoryFilesystemFake()
+    sut = make_sut(remote_fs, local_fs, [CopyInstruction("results/*.txt", "out")])
+
+    sut.collect_stable_files(Mock())
+    remote_fs.write_file_stub("results/busy.txt", "more content")
+    sut.collect_stable_files(Mock())
+
+    assert local_fs.exists("out/done.txt") is True
+    assert local_fs.exists("out/busy.txt") is False
+
+
+def test__given_collected_file__when_getting_final_delta__should_skip_it() -> None:
+    remote_fs = MemoryFilesystemFake(files=["result.txt", "late.txt"])
+    local_fs = MemoryFilesystemFake()
+    instructions = [
+        CopyInstruction("result.txt", "copy.txt"),
+        CopyInstruction("late.txt", "late-copy.txt"),
+    ]
+    sut = make_sut(remote_fs, local_fs, instructions)
+    sut.collect_stable_files(Mock())
+    remote_fs.write_file_stub("late.txt", "more content")
+    sut.collect_stable_files(Mock())
+
+    delta = sut.final_delta()
+
+    assert delta == [CopyInstruction("late.txt", "late-copy.txt")]
+
+
+def test__given_file_changed_after_collecting__final_delta_should_overwrite_it() -> (
+    None
+):
+    remote_fs = MemoryFilesystemFake(files=["result.txt"])
+    local_fs = MemoryFilesystemFake()
+    sut = make_sut(remote_fs, local_fs, [CopyInstruction("result.txt", "copy.txt")])
+    sut.collect_stable_files(Mock())
+    sut.collect_stable_files(Mock())
+    remote_fs.write_file_stub("result.txt", "more content")
+
+    delta = sut.final_delta()
+
+    assert delta == [CopyInstruction("result.txt", "copy.txt", overwrite=True)]
+
+
+def test__given_missing_file__when_getting_final_delta__should_keep_instruction() -> (
+    None
+):
+    instruction = CopyInstruction("missing/*.txt", "out")
+    sut = make_sut(MemoryFilesystemFake(), MemoryFilesystemFake(), [instruction])
+    sut.collect_stable_files(Mock())
+
+    delta = sut.final_delta()
+
+    assert delta == [instruction]
+
+
+def test__given_collected_file_existing_locally__should_not_report_success() -> None:
+    remote_fs = MemoryFilesystemFake(files=["result.txt"])
+    local_fs = MemoryFilesystemFake(files=["copy.txt"])
+    instruction = CopyInstruction("result.txt", "copy.txt")
+    sut = make_sut(remote_fs, local_fs, [instruction])
+    ui = Mock()
+
+    sut.collect_stable_files(ui)
+    sut.collect_stable_files(ui)
+
+    ui.info.assert_not_called()
+    assert sut.final_delta() == [instruction]
+
+
+def test__when_started_and_stopped__should_collect_in_background() -> None:
+    remote_fs = MemoryFilesystemFake(files=["result.txt"])
+    local_fs = MemoryFilesystemFake()
+    sut = make_sut(remote_fs, local_fs, [CopyInstruction("result.txt", "copy.txt")])
+
+    sut.start(Mock())
+    wait_until(lambda: local_fs.exists("copy.txt"))
+    sut.stop()
+
+    assert sut.final_delta() == []
+
+
+def test__when_stopped__should_close_source_filesystem() -> None:
+    remote_fs = MemoryFilesystemFake()
+    sut = make_sut(remote_fs, MemoryFilesystemFake(), [])
+
+    sut.stop()
+
+    assert remote_fs.closed is True
+
+
+def test__given_other_filesystem__final_delta_should_compare_files_there() -> None:
+    remote_fs = MemoryFilesystemFake(files=["result.txt"])
+    instruction = CopyInstruction("result.txt", "copy.txt")
+    sut = make_sut(remote_fs, MemoryFilesystemFake(), [instruction])
+    sut.collect_stable_files(Mock())
+    sut.collect_stable_files(Mock())
+    other_fs = MemoryFilesystemFake()
+    other_fs.create_file_stub("result.txt", "changed")
+
+    delta = sut.final_delta(other_fs)
+
+    assert delta == [instruction._replace(overwrite=True)]
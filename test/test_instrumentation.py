@@ -0,0 +1,84 @@
+from test.testdoubles.executor import CommandExecutorStub
+from test.testdoubles.filesystem import MemoryFilesystemFake
+from typing import List
+from unittest.mock import MagicMock
+
+from hpcrocket.core.instrumentation import InstrumentedExecutor, InstrumentedFilesystem
+from hpcrocket.core.runreport import RunReport
+
+
+def test__when_executing_commands__should_count_commands_by_program() -> None:
+    report = RunReport()
+    sut = InstrumentedExecutor(CommandExecutorStub(), report)
+
+    sut.exec_command("sbatch job.sh").wait_until_exit()
+    sut.exec_command("sacct -j 1234").wait_until_exit()
+    sut.exec_command("sacct -j 1234").wait_until_exit()
+
+    actual = report.to_dict()
+    assert actual["counters"] == {
+        "executor.commands.sacct": 2,
+        "executor.commands.sbatch": 1,
+    }
+    assert actual["timings"]["executor.exec_command"]["calls"] == 3
+    assert actual["timings"]["executor.wait_until_exit"]["calls"] == 3
+
+
+def test__when_command_exited__should_record_exec_round_trip_with_latency() -> None:
+    report = RunReport()
+    sut = InstrumentedExecutor(CommandExecutorStub(), report)
+
+    command = sut.exec_command("sacct -j 1234")
+    command.wait_until_exit()
+    command.wait_until_exit()
+
+    assert report.round_trips() == {"exec": 1}
+    assert report.to_dict()["round_trips"]["exec"]["latency"]["calls"] == 1
+
+
+def test__when_copying_between_instrumented_filesystems__should_count_files_and_bytes() -> (
+    None
+):
+    report = RunReport()
+    local_fs = MemoryFilesystemFake()
+    local_fs.create_file_stub("file.txt", "content")
+    remote_fs = MemoryFilesystemFake()
+    sut = InstrumentedFilesystem(local_fs, report, "local")
+    progress: List[int] = []
+
+    sut.copy(
+        "file.txt",
+        "copy.txt",
+        filesystem=InstrumentedFilesystem(remote_fs, report, "remote"),
+        progress=progress.append,
+    )
+
+    actual = report.to_dict()
+    assert remote_fs.exists("copy.txt")
+    assert progress == [len("content")]
+    assert actual["counters"] == {
+        "bytes_transferred": len("content"),
+        "files_copied": 1,
+    }
+    assert actual["timings"]["local.copy"]["calls"] == 1
+
+
+def test__when_walking__should_record_single_timing_for_whole_walk() -> None:
+    report = RunReport()
+    local_fs = MemoryFilesystemFake(["dir/a.txt", "dir/b.txt"])
+    sut = InstrumentedFilesystem(local_fs, report, "local")
+
+    entries = list(sut.walk("dir"))
+
+    assert len(entries) == 2
+    assert report.to_dict()["timings"]["local.walk"]["calls"] == 1
+
+
+def test__when_batching__should_batch_wrapped_filesystem() -> None:
+    wrapped = MagicMock()
+    sut = InstrumentedFilesystem(wrapped, RunReport(), "remote")
+
+    with sut.batch():
+        pass
+
+    wrapped.batch.assert_called_once()
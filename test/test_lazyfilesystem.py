@@ -0,0 +1,138 @@
+from contextlib import contextmanager
+from test.testdoubles.filesystem import MemoryFilesystemFake
+from typing import Iterator, List
+
+from hpcrocket.core.lazyfilesystem import LazyFilesystem
+
+
+class FilesystemSpy(MemoryFilesystemFake):
+    def __init__(self) -> None:
+        super().__init__(files=["myfile.txt"])
+        self.batches_entered = 0
+        self.batches_exited = 0
+        self.closed = False
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        self.batches_entered += 1
+        try:
+            yield
+        finally:
+            self.batches_exited += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class CreateSpy:
+    def __init__(self) -> None:
+        self.created: List[FilesystemSpy] = []
+
+    def __call__(self) -> FilesystemSpy:
+        filesystem = FilesystemSpy()
+        self.created.append(filesystem)
+        return filesystem
+
+
+def test__when_not_used__should_not_create_filesystem() -> None:
+    create = CreateSpy()
+
+    sut = LazyFilesystem(create)
+
+    assert create.created == []
+    assert sut.is_open is False
+
+
+def test__when_used__should_create_filesystem_once() -> None:
+    create = CreateSpy()
+    sut = LazyFilesystem(create)
+
+    assert sut.exists("myfile.txt") is True
+    assert sut.exists("other.txt") is False
+
+    assert len(create.created) == 1
+    assert sut.is_open is True
+
+
+def test__given_empty_paths__when_running_bulk_operations__should_not_create_filesystem() -> (
+    None
+):
+    create = CreateSpy()
+    sut = LazyFilesystem(create)
+
+    assert sut.delete_many([]) == []
+    assert sut.stat_many([]) == []
+    assert sut.exists_many([]) == []
+
+    assert create.created == []
+
+
+def test__given_unused_batch__when_ending__should_not_create_filesystem() -> None:
+    create = CreateSpy()
+    sut = LazyFilesystem(create)
+
+    with sut.batch():
+        pass
+
+    assert create.created == []
+
+
+def test__given_filesystem_created_within_batch__should_apply_batch_to_filesystem() -> (
+    None
+):
+    create = CreateSpy()
+    sut = LazyFilesystem(create)
+
+    with sut.batch():
+        with sut.batch():
+            sut.exists("myfile.txt")
+
+        filesystem = create.created[0]
+        assert filesystem.batches_entered == 1
+        assert filesystem.batches_exited == 0
+
+    assert filesystem.batches_exited == 1
+
+
+def test__when_closing__should_close_created_filesystem_and_create_new_one_on_next_use() -> (
+    None
+):
+    create = CreateSpy()
+    sut = LazyFilesystem(create)
+    sut.exists("myfile.txt")
+
+    sut.close()
+
+    assert create.created[0].closed is True
+    assert sut.is_open is False
+
+    sut.exists("myfile.txt")
+    assert len(create.created) == 2
+
+
+def test__given_unused_filesystem__when_closing__should_not_create_filesystem() -> None:
+    create = CreateSpy()
+    sut = LazyFilesystem(create)
+
+    sut.close()
+
+    assert create.created == []
+
+
+def test__when_unwrapping__should_return_created_filesystem() -> None:
+    create = CreateSpy()
+    sut = LazyFilesystem(create)
+
+    actual = sut.unwrap()
+
+    assert actual is create.created[0]
+
+
+def test__when_copying_to_lazy_filesystem__should_copy_to_created_filesystem() -> None:
+    source = MemoryFilesystemFake(files=["myfile.txt"])
+    create = CreateSpy()
+    target = LazyFilesystem(create)
+
+    LazyFilesystem(lambda: source).copy("myfile.txt", "mycopy.txt", filesystem=target)
+
+    assert create.created[0].exists("mycopy.txt") is True
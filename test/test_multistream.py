@@ -0,0 +1,81 @@
+import os
+from pathlib import Path
+from typing import BinaryIO, List
+
+from hpcrocket.ssh.multistream import (
+    MIN_RANGE_SIZE,
+    ByteRange,
+    sha256_digest,
+    split_ranges,
+    write_ranges,
+)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def test__given_small_file__should_not_split() -> None:
+    ranges = split_ranges(MIN_RANGE_SIZE + 1, streams=4, alignment=CHUNK_SIZE)
+
+    assert ranges == [ByteRange(0, MIN_RANGE_SIZE + 1)]
+
+
+def test__given_empty_file__should_return_single_empty_range() -> None:
+    assert split_ranges(0, streams=4, alignment=CHUNK_SIZE) == [ByteRange(0, 0)]
+
+
+def test__given_large_file__should_split_into_aligned_ranges() -> None:
+    size = 4 * MIN_RANGE_SIZE + 123
+
+    ranges = split_ranges(size, streams=4, alignment=CHUNK_SIZE)
+
+    assert len(ranges) == 4
+    assert sum(byte_range.length for byte_range in ranges) == size
+    assert all(byte_range.offset % CHUNK_SIZE == 0 for byte_range in ranges)
+    assert all(
+        current.offset + current.length == following.offset
+        for current, following in zip(ranges, ranges[1:])
+    )
+
+
+def test__when_writing_ranges__should_reassemble_file_in_place(
+    tmp_path: Path,
+) -> None:
+    content = os.urandom(10_000)
+    target = tmp_path / "target.bin"
+    target.write_bytes(b"")
+    ranges = [ByteRange(0, 4096), ByteRange(4096, 4096), ByteRange(8192, 1808)]
+    reported: List[int] = []
+
+    def open_remote() -> BinaryIO:
+        return open(target, "r+b")
+
+    write_ranges(memoryview(content), ranges, open_remote, 1000, reported.append)
+
+    assert target.read_bytes() == content
+    assert sum(reported) == len(content)
+
+
+def test__sha256_digest_should_match_hashlib() -> None:
+    assert (
+        sha256_digest(memoryview(b"abc"))
+        == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+    )
+
+
+def test__given_throttle__should_call_it_before_every_chunk(tmp_path: Path) -> None:
+    target = tmp_path / "target.bin"
+    target.write_bytes(b"")
+    throttled: List[int] = []
+
+    def open_remote() -> BinaryIO:
+        return open(target, "r+b")
+
+    write_ranges(
+        memoryview(b"x" * 2500),
+        [ByteRange(0, 2500)],
+        open_remote,
+        1000,
+        throttle=throttled.append,
+    )
+
+    assert throttled == [1000, 1000, 500]
@@ -0,0 +1,144 @@
+from pathlib import Path
+from test.testdoubles.filesystem import MemoryFilesystemFake
+from test.testdoubles.sftpserver import SFTPServerStub, make_sshfs
+from typing import List, Optional
+from unittest.mock import Mock, call, patch
+
+from hpcrocket.core.filesystem import FileInfo
+from hpcrocket.core.outputtail import OutputTail
+from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
+
+
+def make_sut(
+    remote_fs: MemoryFilesystemFake,
+    paths: List[str],
+    max_chunk: int = 1024,
+) -> OutputTail:
+    return OutputTail(remote_fs, paths, 0, lambda: "1234", max_chunk)
+
+
+def started(sut: OutputTail) -> OutputTail:
+    sut.start(Mock())
+    sut.stop()
+    return sut
+
+
+def test__given_new_lines__when_reading__should_forward_each_line() -> None:
+    remote_fs = MemoryFilesystemFake()
+    remote_fs.create_file_stub("job.out", "first\nsecond\n")
+    sut = started(make_sut(remote_fs, ["job.out"]))
+    ui = Mock()
+    remote_fs.write_file_stub("job.out", "first\nsecond\nthird\n")
+
+    sut.read_new_output(ui)
+
+    assert ui.output.mock_calls == [call("job.out", "third")]
+
+
+def test__given_incomplete_line__when_reading__should_wait_for_line_break() -> None:
+    remote_fs = MemoryFilesystemFake()
+    sut = started(make_sut(remote_fs, ["job.out"]))
+    ui = Mock()
+
+    remote_fs.create_file_stub("job.out", "progress: 50")
+    sut.read_new_output(ui)
+    remote_fs.write_file_stub("job.out", "progress: 50%\n")
+    sut.read_new_output(ui)
+
+    assert ui.output.mock_calls == [call("job.out", "progress: 50%")]
+
+
+def test__given_job_id_placeholder__when_started__should_read_file_of_job() -> None:
+    remote_fs = MemoryFilesystemFake()
+    sut = started(make_sut(remote_fs, ["slurm-%j.out"]))
+    ui = Mock()
+
+    remote_fs.create_file_stub("slurm-1234.out", "hello\n")
+    sut.read_new_output(ui)
+
+    assert ui.output.mock_calls == [call("slurm-1234.out", "hello")]
+
+
+def test__given_output_larger_than_chunk__when_reading__should_skip_to_last_chunk() -> (
+    None
+):
+    remote_fs = MemoryFilesystemFake()
+    sut = started(make_sut(remote_fs, ["job.out"], max_chunk=8))
+    ui = Mock()
+
+    remote_fs.create_file_stub("job.out", "0123456789\nlast\n")
+    sut.read_new_output(ui)
+
+    assert ui.output.mock_calls == [
+        call("job.out", "[... skipped 8.0 B]"),
+        call("job.out", "89"),
+        call("job.out", "last"),
+    ]
+
+
+def test__given_truncated_file__when_reading__should_start_from_beginning() -> None:
+    remote_fs = MemoryFilesystemFake()
+    remote_fs.create_file_stub("job.out", "old output\n")
+    sut = started(make_sut(remote_fs, ["job.out"]))
+    ui = Mock()
+
+    remote_fs.write_file_stub("job.out", "new\n")
+    sut.read_new_output(ui)
+
+    assert ui.output.mock_calls == [call("job.out", "new")]
+
+
+def test__given_missing_file__when_reading__should_not_forward_anything() -> None:
+    sut = started(make_sut(MemoryFilesystemFake(), ["job.out"]))
+    ui = Mock()
+
+    sut.read_new_output(ui)
+
+    ui.output.assert_not_called()
+    ui.error.assert_not_called()
+
+
+def test__when_stopped__should_forward_remaining_output() -> None:
+    remote_fs = MemoryFilesystemFake()
+    remote_fs.create_file_stub("job.out", "line\nno line break")
+    sut = make_sut(remote_fs, ["job.out"])
+    ui = Mock()
+
+    sut.start(ui)
+    sut.stop()
+
+    assert ui.output.mock_calls == [
+        call("job.out", "line"),
+        call("job.out", "no line break"),
+    ]
+
+
+def test__when_stopping__should_close_filesystem() -> None:
+    remote_fs = MemoryFilesystemFake()
+
+    started(make_sut(remote_fs, ["job.out"]))
+
+    assert remote_fs.closed is True
+
+
+def test__given_ssh_filesystem__when_polling__should_only_transfer_new_output(
+    tmp_path: Path,
+) -> None:
+    sftp = SFTPServerStub(files=True)
+    sftp.content[:] = b"output\n" * 10000
+    sshfs = make_sshfs(sftp, str(tmp_path / "settings.json"))
+    remote_fs = PyFilesystemBased(sshfs)
+
+    def stat_many(paths: List[str]) -> List[Optional[FileInfo]]:
+        return [FileInfo(path, False, len(sftp.content)) for path in paths]
+
+    with patch.object(remote_fs, "stat_many", side_effect=stat_many):
+        sut = started(OutputTail(remote_fs, ["job.out"], 0, lambda: "1234"))
+        for line in (b"first\n", b"second\n"):
+            transferred = sftp.bytes_read
+            sftp.content.extend(line)
+            sut.read_new_output(Mock())
+
+            assert sftp.bytes_read - transferred == len(line)
+
+    sshfs._internal_fs._client.open_sftp.assert_not_called()  # type: ignore
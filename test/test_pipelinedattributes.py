@@ -0,0 +1,60 @@
+from test.testdoubles.sftpserver import SFTPServerStub, make_pipelined_file
+
+import pytest
+from hpcrocket.ssh.pipelinedattributes import set_attributes_pipelined
+from hpcrocket.ssh.sftpfilesystem import SFTPFilesystem
+from paramiko import SFTPAttributes
+from paramiko.sftp import CMD_CLOSE, CMD_FSETSTAT, CMD_WRITE
+
+
+def mode_attributes() -> SFTPAttributes:
+    attributes = SFTPAttributes()
+    attributes.st_mode = 0o755
+    return attributes
+
+
+def test__when_setting_attributes__should_not_wait_for_response() -> None:
+    sftp = SFTPServerStub()
+    remote_file = make_pipelined_file(sftp)
+    remote_file.write(b"data")
+
+    set_attributes_pipelined(remote_file, mode_attributes())
+
+    assert sftp.requests == [CMD_WRITE, CMD_FSETSTAT]
+    assert len(sftp.responses) == 2
+    remote_file.close()
+
+
+def test__given_setting_attributes_fails__when_closing_file__should_raise() -> None:
+    sftp = SFTPServerStub(failing=(CMD_FSETSTAT,))
+    remote_file = make_pipelined_file(sftp)
+    remote_file.write(b"data")
+    set_attributes_pipelined(remote_file, mode_attributes())
+
+    with pytest.raises(PermissionError):
+        remote_file.close()
+
+    # Closes the file once all errors were reported
+    remote_file.close()
+
+
+def test__given_setting_attributes_fails__when_writing_on__should_raise() -> None:
+    sftp = SFTPServerStub(failing=(CMD_FSETSTAT,))
+    remote_file = make_pipelined_file(sftp)
+    set_attributes_pipelined(remote_file, mode_attributes())
+
+    with pytest.raises(PermissionError):
+        # Pipelined files wait for the responses of their outstanding requests after every hundred writes
+        for _ in range(101):
+            remote_file.write(b"data")
+
+    assert CMD_CLOSE not in sftp.requests
+
+
+def test__given_setting_mode_fails__when_uploading_file__should_raise() -> None:
+    sftp = SFTPServerStub(failing=(CMD_FSETSTAT,))
+    sut = SFTPFilesystem(sftp, "/home/user", "/home/user")
+
+    with pytest.raises(PermissionError):
+        with sut.openwrite("file.txt", mode=0o755) as remote_file:
+            remote_file.write(b"data")
@@ -0,0 +1,117 @@
+import io
+from test.testdoubles.sftpserver import SFTPServerStub, make_pipelined_file
+
+import pytest
+from hpcrocket.ssh.pipelinedtransfers import read_pipelined, write_pipelined
+from paramiko import SFTPFile
+from paramiko.sftp import CMD_READ, CMD_WRITE
+
+DATA = bytes(range(256)) * 1024
+
+
+def test__when_writing__should_send_requests_of_largest_size() -> None:
+    sftp = SFTPServerStub()
+    remote_file = make_pipelined_file(sftp)
+
+    write_pipelined(remote_file, DATA, depth=64)
+    remote_file.close()
+
+    assert sftp.requests.count(CMD_WRITE) == len(DATA) // SFTPFile.MAX_REQUEST_SIZE
+    assert sftp.content == DATA
+
+
+def test__when_writing_twice__should_append_at_file_position() -> None:
+    sftp = SFTPServerStub()
+    remote_file = make_pipelined_file(sftp)
+
+    write_pipelined(remote_file, DATA[:1000], depth=64)
+    write_pipelined(remote_file, memoryview(DATA)[1000:], depth=64)
+    remote_file.close()
+
+    assert sftp.content == DATA
+
+
+def test__when_writing__should_keep_at_most_depth_requests_in_flight() -> None:
+    sftp = SFTPServerStub()
+    remote_file = make_pipelined_file(sftp)
+
+    write_pipelined(remote_file, DATA, depth=3)
+
+    assert sftp.max_outstanding == 3
+    remote_file.close()
+
+
+def test__given_write_fails__when_waiting_for_responses__should_raise() -> None:
+    sftp = SFTPServerStub(failing=(CMD_WRITE,))
+    remote_file = make_pipelined_file(sftp)
+
+    with pytest.raises(PermissionError):
+        write_pipelined(remote_file, DATA, depth=1)
+
+    assert sftp.requests == [CMD_WRITE]
+    remote_file.close()
+
+
+def test__given_write_fails__when_closing_file__should_raise() -> None:
+    sftp = SFTPServerStub(failing=(CMD_WRITE,))
+    remote_file = make_pipelined_file(sftp)
+    write_pipelined(remote_file, DATA[:1000], depth=3)
+
+    with pytest.raises(PermissionError):
+        remote_file.close()
+
+    # Closes the file once all errors were reported
+    remote_file.close()
+
+
+def make_readable_file(sftp: SFTPServerStub) -> SFTPFile:
+    sftp.content[:] = DATA
+    return SFTPFile(sftp, b"handle", "rb")
+
+
+def test__when_reading__should_copy_part_from_file_position() -> None:
+    sftp = SFTPServerStub()
+    remote_file = make_readable_file(sftp)
+    remote_file.seek(1000)
+    file = io.BytesIO()
+
+    read_pipelined(remote_file, file, 100_000, depth=4)
+
+    assert file.getvalue() == DATA[1000:101_000]
+    assert remote_file.tell() == 101_000
+    assert sftp.requests.count(CMD_READ) == -(-100_000 // SFTPFile.MAX_REQUEST_SIZE)
+
+
+def test__when_reading__should_keep_depth_requests_in_flight() -> None:
+    sftp = SFTPServerStub()
+    remote_file = make_readable_file(sftp)
+
+    read_pipelined(remote_file, io.BytesIO(), len(DATA), depth=3)
+
+    assert sftp.max_outstanding == 3
+
+
+def test__given_server_returns_less_data__when_reading__should_read_the_rest() -> None:
+    sftp = SFTPServerStub(max_read_size=10_000)
+    remote_file = make_readable_file(sftp)
+    file = io.BytesIO()
+
+    read_pipelined(remote_file, file, len(DATA), depth=4)
+
+    assert file.getvalue() == DATA
+
+
+def test__given_file_is_shorter__when_reading__should_raise_eof_error() -> None:
+    sftp = SFTPServerStub()
+    remote_file = make_readable_file(sftp)
+
+    with pytest.raises(EOFError):
+        read_pipelined(remote_file, io.BytesIO(), len(DATA) + 1, depth=4)
+
+
+def test__given_read_fails__when_reading__should_raise() -> None:
+    sftp = SFTPServerStub(failing=(CMD_READ,))
+    remote_file = make_readable_file(sftp)
+
+    with pytest.raises(PermissionError):
+        read_pipelined(remote_file, io.BytesIO(), len(DATA), depth=4)
@@ -0,0 +1,83 @@
+import pstats
+import threading
+from pathlib import Path
+
+import pytest
+from hpcrocket.core.profiling import (
+    DeterministicProfiler,
+    SamplingProfiler,
+    make_profiler,
+)
+
+
+def profiled_function() -> int:
+    return sum(range(10))
+
+
+def test__given_profiled_stages__when_writing__should_write_combined_and_stage_files(
+    tmp_path: Path,
+) -> None:
+    sut = DeterministicProfiler()
+    with sut.profile("LaunchStage"):
+        profiled_function()
+
+    with sut.profile("WatchStage"):
+        pass
+
+    sut.write(str(tmp_path / "profile.pstats"))
+
+    functions = pstats.Stats(str(tmp_path / "profile.LaunchStage.pstats")).stats  # type: ignore[attr-defined]
+    assert any(name == "profiled_function" for _, _, name in functions)
+    assert (tmp_path / "profile.WatchStage.pstats").exists()
+    assert (tmp_path / "profile.pstats").exists()
+
+
+def test__given_no_profiled_stage__when_writing__should_not_write_files(
+    tmp_path: Path,
+) -> None:
+    sut = DeterministicProfiler()
+
+    sut.write(str(tmp_path / "profile.pstats"))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test__when_sampling__should_write_collapsed_stacks_of_other_threads(
+    tmp_path: Path,
+) -> None:
+    release = threading.Event()
+
+    def waiting_function() -> None:
+        release.wait()
+
+    thread = threading.Thread(target=waiting_function, name="waiter")
+    thread.start()
+    sut = SamplingProfiler()
+    try:
+        sut.sample("WatchStage")
+    finally:
+        release.set()
+        thread.join()
+
+    sut.write(str(tmp_path / "profile.txt"))
+
+    lines = (tmp_path / "profile.txt").read_text().splitlines()
+    waiter = [line for line in lines if line.startswith("WatchStage;waiter;")]
+    assert len(waiter) == 1
+    assert "waiting_function (test_profiling.py:" in waiter[0]
+    assert waiter[0].endswith(" 1")
+
+
+def test__given_sampling_profiler__when_stage_finishes__should_stop_sampling() -> None:
+    sut = SamplingProfiler(interval=0.001)
+    threads_before = threading.active_count()
+
+    with sut.profile("LaunchStage"):
+        assert threading.active_count() == threads_before + 1
+
+    assert threading.active_count() == threads_before
+
+
+def test__given_unknown_mode__when_making_profiler__should_raise_value_error() -> None:
+    with pytest.raises(ValueError):
+        make_profiler("unknown")
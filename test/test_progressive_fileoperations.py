@@ -1,12 +1,17 @@
 from test.testdoubles.filesystem import MemoryFilesystemFake
 from typing import List, Optional, Generator, Tuple, Type
+from unittest.mock import patch
 
 from hpcrocket.core.progressive_file_operations import (
     CopyInstruction,
     CopyResult,
+    RemoteCopyInstruction,
+    execute_transfer_plan,
     progressive_clean,
     progressive_copy,
+    progressive_remote_copy,
 )
+from hpcrocket.core.transferplan import PlannedCopy, TransferPlan
 from hpcrocket.core.filesystem import Filesystem
 
 
@@ -58,7 +63,7 @@ def test__given_files_to_copy__when_preparing__should_copy_files() -> None:
     assert result == ["filecopy.txt", "evenfunnier.gif"]
 
 
-def test__given_files_to_copy_with_non_existing_file__when_preparing__yields_copied_files_and_error() -> None:
+def test__given_files_to_copy_with_non_existing_file__when_preparing__yields_error_before_copying() -> None:
     source_fs_spy = new_filesystem(["file.txt"])
     target_fs = new_filesystem()
 
@@ -71,7 +76,8 @@ def test__given_files_to_copy_with_non_existing_file__when_preparing__yields_cop
         progressive_copy(source_fs_spy, target_fs, copy_instructions)
     )
 
-    assert files == ["filecopy.txt"]
+    assert files == []
+    assert target_fs.exists("filecopy.txt") is False
     assert_error_types_equal(errors, [FileNotFoundError])
 
 
@@ -140,6 +146,77 @@ def test__given_files_to_copy__when_copying_without_abort_on_error__copies_remai
     assert_error_types_equal(errors, [FileExistsError])
 
 
+def test__given_transfer_plan__when_executing__copies_only_planned_files() -> None:
+    source_fs = new_filesystem(["file.txt", "other.txt"])
+    target_fs = new_filesystem()
+    plan = TransferPlan([PlannedCopy("file.txt", "dir/copy.txt", 0)])
+
+    files = copied_files(execute_transfer_plan(source_fs, target_fs, plan))
+
+    assert files == ["dir/copy.txt"]
+    assert target_fs.exists("dir/copy.txt")
+    assert target_fs.exists("other.txt") is False
+
+
+def test__given_existing_target__when_executing__should_not_try_to_copy_it() -> None:
+    source_fs = new_filesystem(["file.txt", "other.txt"])
+    target_fs = new_filesystem(["copy.txt"])
+    plan = TransferPlan(
+        [PlannedCopy("file.txt", "copy.txt", 0), PlannedCopy("other.txt", "new.txt", 0)]
+    )
+
+    with patch.object(source_fs, "copy", wraps=source_fs.copy) as copy:
+        files, errors = copied_files_and_errors(
+            execute_transfer_plan(source_fs, target_fs, plan, abort_on_error=False)
+        )
+
+    assert files == ["new.txt"]
+    assert_error_types_equal(errors, [FileExistsError])
+    assert [call.args[0] for call in copy.call_args_list] == ["other.txt"]
+
+
+def test__given_plan_with_missing_sources__when_executing__aborts_before_copying() -> None:
+    source_fs = new_filesystem(["file.txt"])
+    target_fs = new_filesystem()
+    plan = TransferPlan([PlannedCopy("file.txt", "copy.txt", 0)], ["missing.txt"])
+
+    files, errors = copied_files_and_errors(
+        execute_transfer_plan(source_fs, target_fs, plan)
+    )
+
+    assert files == []
+    assert_error_types_equal(errors, [FileNotFoundError])
+
+
+def test__given_remote_copies__when_copying__copies_on_same_filesystem() -> None:
+    filesystem = new_filesystem(["reference.fa", "existing.fa"])
+    instructions = [
+        RemoteCopyInstruction("reference.fa", "job/reference.fa"),
+        RemoteCopyInstruction("reference.fa", "existing.fa"),
+        RemoteCopyInstruction("reference.fa", "other.fa"),
+    ]
+
+    files, errors = copied_files_and_errors(
+        progressive_remote_copy(filesystem, instructions)
+    )
+
+    assert files == ["job/reference.fa"]
+    assert filesystem.exists("job/reference.fa")
+    assert filesystem.exists("other.fa") is False
+    assert_error_types_equal(errors, [FileExistsError])
+
+
+def test__given_remote_symlink__when_filesystem_cannot_link__returns_error() -> None:
+    filesystem = new_filesystem(["reference.fa"])
+    instructions = [RemoteCopyInstruction("reference.fa", "link.fa", symlink=True)]
+
+    _, errors = copied_files_and_errors(
+        progressive_remote_copy(filesystem, instructions)
+    )
+
+    assert_error_types_equal(errors, [OSError])
+
+
 def test__given_files_to_clean__when_cleaning__should_delete_files() -> None:
     target_fs_spy = new_filesystem(["file.txt", "funny.gif"])
 
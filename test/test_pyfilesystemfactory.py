@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from hpcrocket.core.launchoptions import LaunchOptions
+from hpcrocket.pyfilesystem.factory import PyFilesystemFactory
+from hpcrocket.ssh.connectiondata import ConnectionData
+
+CONNECTION = ConnectionData(hostname="cluster.example.com", username="user")
+TRANSFER_CONNECTION = ConnectionData(hostname="dtn.example.com", username="user")
+
+
+def test__given_native_backend__when_creating_ssh_fs__should_create_sftp_fs() -> None:
+    options = LaunchOptions(sbatch="job.sh", connection=CONNECTION, backend="native")
+    sut = PyFilesystemFactory(options)
+
+    with patch("hpcrocket.pyfilesystem.factory.sshfilesystem") as sshfilesystem, patch(
+        "hpcrocket.pyfilesystem.factory.sftpfilesystem"
+    ) as sftpfilesystem:
+        filesystem = sut.create_ssh_filesystem()
+
+    sshfilesystem.assert_not_called()
+    sftpfilesystem.assert_called_once_with(CONNECTION, [], round_trips=None)
+    assert filesystem is sftpfilesystem.return_value
+
+
+def test__given_native_backend_and_transfer_host__should_connect_to_transfer_host() -> None:
+    options = LaunchOptions(
+        sbatch="job.sh",
+        connection=CONNECTION,
+        transfer_connection=TRANSFER_CONNECTION,
+        backend="native",
+    )
+    sut = PyFilesystemFactory(options)
+
+    with patch("hpcrocket.pyfilesystem.factory.sftpfilesystem") as sftpfilesystem:
+        sut.create_ssh_filesystem()
+
+    sftpfilesystem.assert_called_once_with(TRANSFER_CONNECTION, [], round_trips=None)
+
+
+def test__given_default_backend__when_creating_ssh_fs__should_create_pyfilesystem() -> None:
+    options = LaunchOptions(sbatch="job.sh", connection=CONNECTION)
+    sut = PyFilesystemFactory(options)
+
+    with patch("hpcrocket.pyfilesystem.factory.sshfilesystem") as sshfilesystem, patch(
+        "hpcrocket.pyfilesystem.factory.sftpfilesystem"
+    ) as sftpfilesystem:
+        sut.create_ssh_filesystem()
+
+    sftpfilesystem.assert_not_called()
+    sshfilesystem.assert_called_once()
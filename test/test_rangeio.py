@@ -0,0 +1,39 @@
+import io
+
+import pytest
+
+from hpcrocket.core.rangeio import open_range
+
+
+def test__when_opening_whole_file__should_return_file_unchanged() -> None:
+    file = io.BytesIO(b"content")
+
+    assert open_range(file) is file
+
+
+def test__when_range_exceeds_file__should_read_until_end_of_file() -> None:
+    file = open_range(io.BytesIO(b"0123456789"), offset=8, length=10)
+
+    assert file.read() == b"89"
+
+
+def test__when_seeking_from_end__should_seek_relative_to_end_of_range() -> None:
+    file = open_range(io.BytesIO(b"0123456789"), offset=2, length=5)
+
+    file.seek(-2, io.SEEK_END)
+
+    assert file.read() == b"56"
+
+
+def test__when_closing_range__should_close_underlying_file() -> None:
+    underlying = io.BytesIO(b"0123456789")
+    file = open_range(underlying, offset=2)
+
+    file.close()
+
+    assert underlying.closed
+
+
+def test__when_range_is_negative__should_raise_value_error() -> None:
+    with pytest.raises(ValueError):
+        open_range(io.BytesIO(b"content"), offset=-1)
@@ -0,0 +1,59 @@
+import struct
+from typing import Any, List, Tuple, cast
+
+from hpcrocket.core.runreport import RunReport
+from hpcrocket.ssh.roundtrips import RoundTripRecorder
+from paramiko import SFTPClient
+from paramiko.sftp import CMD_ATTRS, CMD_LSTAT, CMD_OPENDIR, CMD_STAT, CMD_WRITE
+
+
+class SFTPClientStub:
+    def __init__(self) -> None:
+        self.request_number = 0
+        self.responses: List[Tuple[int, bytes]] = []
+
+    def _async_request(self, fileobj: Any, t: int, *args: Any) -> int:
+        number = self.request_number
+        self.request_number += 1
+        self.responses.append((CMD_ATTRS, struct.pack(">I", number)))
+        return number
+
+    def _read_packet(self) -> Tuple[int, bytes]:
+        return self.responses.pop(0)
+
+
+def make_sut() -> Tuple[SFTPClientStub, RunReport]:
+    report = RunReport()
+    client = SFTPClientStub()
+    RoundTripRecorder(report).attach(cast(SFTPClient, client))
+    return client, report
+
+
+def test__when_sending_requests__should_count_round_trips_by_operation() -> None:
+    client, report = make_sut()
+
+    client._async_request(None, CMD_STAT, "a")
+    client._async_request(None, CMD_LSTAT, "b")
+    client._async_request(None, CMD_WRITE, b"handle", 0, b"data")
+    client._async_request(None, CMD_OPENDIR, "dir")
+
+    assert report.round_trips() == {"listdir": 1, "stat": 2, "write": 1}
+
+
+def test__when_response_arrives__should_record_latency_of_request() -> None:
+    client, report = make_sut()
+
+    client._async_request(None, CMD_STAT, "a")
+    client._async_request(None, CMD_STAT, "b")
+    client._read_packet()
+
+    assert report.to_dict()["round_trips"]["stat"]["latency"]["calls"] == 1
+
+
+def test__when_reading_response__should_return_packet_unchanged() -> None:
+    client, _ = make_sut()
+    client._async_request(None, CMD_STAT, "a")
+
+    actual = client._read_packet()
+
+    assert actual == (CMD_ATTRS, struct.pack(">I", 0))
@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+from hpcrocket.core.runreport import RunReport
+
+
+class ClockStub:
+    def __init__(self, times: List[float]) -> None:
+        self._times = iter(times)
+
+    def __call__(self) -> float:
+        return next(self._times)
+
+
+def test__given_measured_blocks__when_converting__should_sum_calls_and_seconds() -> (
+    None
+):
+    sut = RunReport(ClockStub([0.0, 1.0, 1.5, 2.0, 4.0, 5.0]))
+
+    with sut.measure("remote.stat"):
+        pass
+
+    with sut.measure("remote.stat"):
+        pass
+
+    assert sut.to_dict()["timings"] == {
+        "remote.stat": {"calls": 2, "seconds": 2.5, "max_seconds": 2.0}
+    }
+
+
+def test__given_failing_block__when_measuring__should_still_record_timing() -> None:
+    sut = RunReport(ClockStub([0.0, 1.0, 3.0, 4.0]))
+
+    with pytest.raises(RuntimeError):
+        with sut.measure("executor.connect"):
+            raise RuntimeError()
+
+    assert sut.to_dict()["timings"]["executor.connect"]["seconds"] == 2.0
+
+
+def test__given_counters_values_and_stages__when_converting__should_contain_all() -> (
+    None
+):
+    sut = RunReport(ClockStub([0.0, 10.0]))
+
+    sut.count("files_copied")
+    sut.count("bytes_transferred", 512)
+    sut.count("bytes_transferred", 512)
+    sut.set("job.id", "1234")
+    sut.stage_finished("LaunchStage", 2.0, True)
+
+    assert sut.to_dict() == {
+        "total_seconds": 10.0,
+        "stages": [{"stage": "LaunchStage", "seconds": 2.0, "success": True}],
+        "timings": {},
+        "counters": {"bytes_transferred": 1024, "files_copied": 1},
+        "values": {"job.id": "1234"},
+        "round_trips": {},
+    }
+
+
+def test__when_writing__should_write_report_as_json(tmp_path: Path) -> None:
+    path = tmp_path / "report.json"
+    sut = RunReport()
+    sut.count("files_copied")
+
+    sut.write(str(path))
+
+    assert json.loads(path.read_text())["counters"] == {"files_copied": 1}
+
+
+def test__given_round_trips__when_converting__should_count_and_bucket_latencies() -> (
+    None
+):
+    sut = RunReport()
+
+    sut.count_round_trip("stat")
+    sut.count_round_trip("stat")
+    sut.add_latency("stat", 0.0005)
+    sut.add_latency("stat", 0.003)
+
+    assert sut.round_trips() == {"stat": 2}
+    assert sut.to_dict()["round_trips"]["stat"]["histogram"] == {
+        "<=1ms": 1,
+        "<=5ms": 1,
+    }
+
+
+def test__given_round_trips__when_summarizing__should_list_each_operation() -> None:
+    sut = RunReport()
+    sut.count_round_trip("exec")
+    sut.count_round_trip("stat")
+    sut.add_latency("stat", 0.002)
+
+    actual = sut.summary()
+
+    assert actual[0] == "Round trips: 2"
+    assert actual[1].split() == ["exec", "1"]
+    assert actual[2].split()[:2] == ["stat", "1"]
+    assert actual[2].endswith("<=2ms: 1")
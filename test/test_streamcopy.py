@@ -0,0 +1,130 @@
+import io
+import os
+import sys
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+from fs.memoryfs import MemoryFS
+
+from hpcrocket.core.streamcopy import copy_between
+from hpcrocket.pyfilesystem.localfilesystem import LocalFilesystem
+from hpcrocket.pyfilesystem.pyfilesystembased import PyFilesystemBased
+from test.testdoubles.filesystem import DummyFilesystem
+
+
+def make_filesystem() -> PyFilesystemBased:
+    return PyFilesystemBased(MemoryFS())
+
+
+def test__when_copying_file__should_stream_content_to_target() -> None:
+    source, target = make_filesystem(), make_filesystem()
+    source.internal_fs.writetext("file.txt", "content")
+
+    copy_between(source, "file.txt", target, "other/copy.txt")
+
+    assert target.internal_fs.readtext("other/copy.txt") == "content"
+
+
+def test__when_copying_file_to_dir__should_keep_file_name() -> None:
+    source, target = make_filesystem(), make_filesystem()
+    source.internal_fs.writetext("file.txt", "content")
+    target.internal_fs.makedir("out")
+
+    copy_between(source, "file.txt", target, "out")
+
+    assert target.internal_fs.readtext("out/file.txt") == "content"
+
+
+def test__when_copying_dir__should_copy_nested_files() -> None:
+    source, target = make_filesystem(), make_filesystem()
+    source.internal_fs.makedirs("dir/sub")
+    source.internal_fs.writetext("dir/a.txt", "a")
+    source.internal_fs.writetext("dir/sub/b.txt", "b")
+
+    copy_between(source, "dir", target, "copy")
+
+    assert target.internal_fs.readtext("copy/a.txt") == "a"
+    assert target.internal_fs.readtext("copy/sub/b.txt") == "b"
+
+
+def test__when_copying_glob__should_copy_matches_relative_to_pattern() -> None:
+    source, target = make_filesystem(), make_filesystem()
+    source.internal_fs.makedirs("dir/sub")
+    source.internal_fs.writetext("dir/sub/a.txt", "a")
+    source.internal_fs.writetext("dir/sub/b.gif", "b")
+
+    copy_between(source, "dir/sub/*.txt", target, "out")
+
+    assert target.internal_fs.listdir("out") == ["a.txt"]
+
+
+def test__given_existing_target__should_raise_file_exists_error() -> None:
+    source, target = make_filesystem(), make_filesystem()
+    source.internal_fs.writetext("file.txt", "new")
+    target.internal_fs.writetext("file.txt", "old")
+
+    with pytest.raises(FileExistsError):
+        copy_between(source, "file.txt", target, "file.txt")
+
+    assert target.internal_fs.readtext("file.txt") == "old"
+
+
+def test__given_target_without_streams__should_raise_before_opening_source() -> None:
+    source = make_filesystem()
+    source.internal_fs.writetext("file.txt", "content")
+
+    with patch.object(source, "openbin") as openbin:
+        with pytest.raises(RuntimeError):
+            copy_between(source, "file.txt", DummyFilesystem(), "copy.txt")
+
+    openbin.assert_not_called()
+
+
+def test__given_filesystem_without_streams__when_opening__should_raise_unsupported() -> None:
+    sut = DummyFilesystem()
+
+    assert sut.supports_streams() is False
+    with pytest.raises(io.UnsupportedOperation):
+        sut.openbin("file.txt")
+
+    with pytest.raises(io.UnsupportedOperation):
+        sut.openwrite("file.txt")
+
+
+def test__given_progress_and_mode__should_report_bytes_and_look_up_mode() -> None:
+    source, target = make_filesystem(), make_filesystem()
+    source.internal_fs.writetext("file.txt", "content")
+    transferred: List[int] = []
+    looked_up: List[str] = []
+
+    def mode_of(path: str) -> None:
+        looked_up.append(path)
+
+    copy_between(
+        source,
+        "file.txt",
+        target,
+        "copy.txt",
+        progress=transferred.append,
+        mode_of=mode_of,
+    )
+
+    assert sum(transferred) == len("content")
+    assert looked_up == ["file.txt"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+def test__given_local_files__should_copy_inside_kernel(tmp_path: Path) -> None:
+    local = LocalFilesystem(str(tmp_path), str(tmp_path))
+    content = os.urandom(3 * 1024 * 1024)
+    (tmp_path / "file.bin").write_bytes(content)
+    transferred: List[int] = []
+
+    with patch("hpcrocket.core.streamcopy._copy_stream") as copy_stream:
+        copy_between(local, "file.bin", local, "copy.bin", progress=transferred.append)
+
+    copy_stream.assert_not_called()
+    assert (tmp_path / "copy.bin").read_bytes() == content
+    assert sum(transferred) == len(content)
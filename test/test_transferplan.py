@@ -0,0 +1,83 @@
+import json
+from test.testdoubles.filesystem import MemoryFilesystemFake
+
+from hpcrocket.core.progressive_file_operations import CopyInstruction
+from hpcrocket.core.transferplan import PlannedCopy, TransferPlan, plan_transfer
+
+
+def make_filesystem() -> MemoryFilesystemFake:
+    filesystem = MemoryFilesystemFake()
+    filesystem.create_file_stub("small.txt", "1")
+    filesystem.create_file_stub("large.txt", "12345")
+    filesystem.create_file_stub("dir/medium.txt", "123")
+    return filesystem
+
+
+def test__given_files_of_different_sizes__plan_should_order_largest_first() -> None:
+    instructions = [
+        CopyInstruction("small.txt", "small.txt"),
+        CopyInstruction("dir/*.txt", "out"),
+        CopyInstruction("large.txt", "large.txt"),
+    ]
+
+    sut = plan_transfer(make_filesystem(), instructions)
+
+    assert sut.copies == [
+        PlannedCopy("large.txt", "large.txt", 5),
+        PlannedCopy("dir/medium.txt", "out/medium.txt", 3),
+        PlannedCopy("small.txt", "small.txt", 1),
+    ]
+    assert sut.total_bytes == 9
+
+
+def test__given_duplicate_instructions__plan_should_copy_once() -> None:
+    instructions = [
+        CopyInstruction("small.txt", "copy.txt"),
+        CopyInstruction("./small.txt", "copy.txt", overwrite=True),
+        CopyInstruction("small.txt", "other.txt"),
+    ]
+
+    sut = plan_transfer(make_filesystem(), instructions)
+
+    assert sut.copies == [
+        PlannedCopy("small.txt", "copy.txt", 1, overwrite=True),
+        PlannedCopy("small.txt", "other.txt", 1),
+    ]
+
+
+def test__given_glob_overlapping_explicit_file__plan_should_copy_once() -> None:
+    instructions = [
+        CopyInstruction("dir/medium.txt", "out/medium.txt"),
+        CopyInstruction("dir/*.txt", "out"),
+    ]
+
+    sut = plan_transfer(make_filesystem(), instructions)
+
+    assert sut.copies == [PlannedCopy("dir/medium.txt", "out/medium.txt", 3)]
+
+
+def test__given_missing_sources__plan_should_contain_errors() -> None:
+    instructions = [
+        CopyInstruction("missing.txt", "copy.txt"),
+        CopyInstruction("missing/*.txt", "out"),
+        CopyInstruction("small.txt", "small.txt"),
+    ]
+
+    sut = plan_transfer(make_filesystem(), instructions)
+
+    assert sut.copies == [PlannedCopy("small.txt", "small.txt", 1)]
+    assert len(sut.errors) == 2
+    assert all(isinstance(error, FileNotFoundError) for error in sut.errors)
+
+
+def test__given_plan__when_serializing_to_json__should_restore_equal_plan() -> None:
+    instructions = [
+        CopyInstruction("dir/*.txt", "out", overwrite=True, preserve_mode=False),
+        CopyInstruction("missing.txt", "copy.txt"),
+    ]
+    sut = plan_transfer(make_filesystem(), instructions)
+
+    restored = TransferPlan.from_dict(json.loads(json.dumps(sut.to_dict())))
+
+    assert restored == sut
+    assert restored.missing == ["missing.txt"]
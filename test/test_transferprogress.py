@@ -0,0 +1,57 @@
+from test.testdoubles.filesystem import MemoryFilesystemFake
+from typing import List
+
+from hpcrocket.core.progressive_file_operations import CopyInstruction, progressive_copy
+from hpcrocket.core.transferprogress import ProgressTracker, TransferProgress
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test__when_bytes_are_transferred__should_report_throughput_and_eta() -> None:
+    clock = FakeClock()
+    reported: List[TransferProgress] = []
+    sut = ProgressTracker(reported.append, files_total=1, bytes_total=1000, clock=clock)
+
+    clock.now = 2.0
+    sut.transferred(200)
+
+    assert reported == [TransferProgress(0, 1, 200, 1000, 100.0, 8.0)]
+
+
+def test__given_stalled_transfer__throughput_should_drop_after_window() -> None:
+    clock = FakeClock()
+    sut = ProgressTracker(lambda _: None, files_total=1, bytes_total=1000, clock=clock)
+    clock.now = 1.0
+    sut.transferred(500)
+
+    clock.now = 60.0
+    sut.transferred(0)
+    clock.now = 61.0
+    sut.transferred(0)
+
+    assert sut.progress().throughput == 0.0
+    assert sut.progress().eta is None
+
+
+def test__when_copying_progressively__should_report_every_file_and_byte() -> None:
+    source = MemoryFilesystemFake()
+    source.create_file_stub("a.txt", "12345")
+    source.create_file_stub("b.txt", "123")
+    instructions = [CopyInstruction("*.txt", "out")]
+    reported: List[TransferProgress] = []
+    tracker = ProgressTracker(reported.append, files_total=2, bytes_total=8)
+
+    list(
+        progressive_copy(source, MemoryFilesystemFake(), instructions, progress=tracker)
+    )
+
+    last = reported[-1]
+    assert (last.files_done, last.files_total) == (2, 2)
+    assert (last.bytes_done, last.bytes_total) == (8, 8)
+    assert last.finished
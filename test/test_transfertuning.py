@@ -0,0 +1,113 @@
+import os
+from pathlib import Path
+from typing import Callable
+
+from hpcrocket.ssh.transfertuning import (
+    HillClimbingTuner,
+    TransferSettings,
+    TransferSettingsStore,
+    TransferTuning,
+)
+
+
+def tune(tuner: HillClimbingTuner, throughput: Callable[[int], float]) -> int:
+    while not tuner.settled:
+        tuner.record(int(throughput(tuner.value)), 1.0)
+
+    return tuner.value
+
+
+def test__given_throughput_peaking_above_start__tuner_should_settle_at_peak() -> None:
+    sut = HillClimbingTuner(1, 1, 1024)
+
+    best = tune(sut, lambda value: 1000 - abs(value - 16) * 50)
+
+    assert best == 16
+
+
+def test__given_throughput_peaking_below_start__tuner_should_settle_at_peak() -> None:
+    sut = HillClimbingTuner(64, 1, 1024)
+
+    best = tune(sut, lambda value: 1000 - abs(value - 8) * 10)
+
+    assert best == 8
+
+
+def test__given_ever_growing_throughput__tuner_should_stop_at_maximum() -> None:
+    sut = HillClimbingTuner(1, 1, 64)
+
+    best = tune(sut, lambda value: value * 100)
+
+    assert best == 64
+
+
+def test__given_stored_settings__when_loading__should_return_them(
+    tmp_path: Path,
+) -> None:
+    sut = TransferSettingsStore(str(tmp_path / "settings.json"))
+    sut.save("user@host:22", TransferSettings(write_depth=128, prefetch_depth=32))
+
+    loaded = sut.load("user@host:22")
+
+    assert loaded == TransferSettings(write_depth=128, prefetch_depth=32)
+    assert sut.load("user@other:22") is None
+
+
+def test__given_corrupt_settings_file__when_loading__should_return_none(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "settings.json"
+    path.write_text("{ not json")
+    sut = TransferSettingsStore(str(path))
+
+    assert sut.load("user@host:22") is None
+
+
+def test__when_upload_tuning_settles__should_store_best_write_depth(
+    tmp_path: Path,
+) -> None:
+    store = TransferSettingsStore(str(tmp_path / "settings.json"))
+    sut = TransferTuning("user@host:22", store)
+
+    while sut.tuning_uploads:
+        sut.record_upload(1024 * 1024, 1.0)
+
+    stored = store.load("user@host:22")
+    assert stored is not None
+    assert stored.write_depth == sut.write_depth
+
+
+def test__when_download_tuning_settles__should_store_best_prefetch_depth(
+    tmp_path: Path,
+) -> None:
+    store = TransferSettingsStore(str(tmp_path / "settings.json"))
+    sut = TransferTuning("user@host:22", store)
+
+    while sut.tuning_downloads:
+        sut.record_download(1024 * 1024, 1.0)
+
+    stored = store.load("user@host:22")
+    assert stored is not None
+    assert stored.prefetch_depth == sut.prefetch_depth
+    assert sut.tuning_uploads
+
+
+def test__given_settings_of_older_version__when_loading__should_return_none(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "settings.json"
+    path.write_text('{"user@host:22": {"chunk_size": 65536, "prefetch_depth": 32}}')
+    sut = TransferSettingsStore(str(path))
+
+    assert sut.load("user@host:22") is None
+
+
+def test__given_stored_settings__tuning_should_start_with_them(
+    tmp_path: Path,
+) -> None:
+    store = TransferSettingsStore(os.path.join(str(tmp_path), "settings.json"))
+    store.save("user@host:22", TransferSettings(write_depth=256))
+
+    sut = TransferTuning("user@host:22", store)
+
+    assert sut.write_depth == 256
@@ -0,0 +1,54 @@
+from typing import List
+
+from hpcrocket.core.transferprogress import TransferProgress
+from hpcrocket.ui import LineProgressRenderer, format_progress
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def progress(files_done: int, files_total: int = 2) -> TransferProgress:
+    return TransferProgress(files_done, files_total, 1024, 3 * 1024**2, 512.0, 6142.0)
+
+
+def test__when_formatting_progress__should_show_files_bytes_throughput_and_eta() -> (
+    None
+):
+    line = format_progress(progress(1))
+
+    assert line == "1/2 files, 1.0 KiB/3.0 MiB, 512.0 B/s, ETA 1:42:22"
+
+
+def test__given_line_renderer__when_updates_arrive_quickly__prints_once_per_interval() -> (
+    None
+):
+    lines: List[str] = []
+    clock = FakeClock()
+    sut = LineProgressRenderer(lines.append, interval=10.0, clock=clock)
+
+    sut(progress(0))
+    clock.now = 5.0
+    sut(progress(0))
+    clock.now = 10.0
+    sut(progress(1))
+
+    assert len(lines) == 2
+
+
+def test__given_line_renderer__when_transfer_finishes__always_prints_last_line() -> (
+    None
+):
+    lines: List[str] = []
+    clock = FakeClock()
+    sut = LineProgressRenderer(lines.append, interval=10.0, clock=clock)
+
+    sut(progress(1))
+    clock.now = 1.0
+    sut(progress(2))
+
+    assert lines[-1] == format_progress(progress(2))
@@ -1,3 +1,4 @@
+import subprocess
 from dataclasses import dataclass, field
 from test.slurmoutput import (
     DEFAULT_JOB_ID,
@@ -5,7 +6,7 @@ from test.slurmoutput import (
     get_running_lines,
     get_success_lines,
 )
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from hpcrocket.core.executor import CommandExecutor, RunningCommand
 
@@ -40,6 +41,32 @@ class CommandExecutorStub(CommandExecutor):
         pass
 
 
+class LocalShellExecutor(CommandExecutor):
+    """
+    Runs commands in a local shell, standing in for the shell on the remote machine
+    """
+
+    def __init__(self, env: Optional[Dict[str, str]] = None) -> None:
+        self.command_log: List[str] = []
+        self._env = env
+
+    def exec_command(self, cmd: str) -> RunningCommand:
+        self.command_log.append(cmd)
+        process = subprocess.run(
+            cmd, shell=True, capture_output=True, text=True, env=self._env
+        )
+        command = RunningCommandStub(process.returncode)
+        command.stdout_lines = process.stdout.splitlines(keepends=True)
+        command.stderr_lines = process.stderr.splitlines(keepends=True)
+        return command
+
+    def connect(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
 class LoggingCommandExecutorSpy(CommandExecutor):
     @dataclass
     class Command:
@@ -5,10 +5,27 @@ import os.path
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import PurePath
-from typing import Any, Dict, Generator, List, Optional, Tuple, Union, cast
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 from unittest.mock import DEFAULT, Mock, patch
 
-from hpcrocket.core.filesystem import Filesystem, FilesystemFactory
+from hpcrocket.core.filesystem import (
+    FileInfo,
+    Filesystem,
+    FilesystemFactory,
+    ProgressCallback,
+)
+from hpcrocket.core.rangeio import open_range
 
 
 class DummyFilesystemFactory(FilesystemFactory):
@@ -32,12 +49,17 @@ class DummyFilesystem(Filesystem):
         target: str,
         overwrite: bool = False,
         filesystem: Optional["Filesystem"] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
     ) -> None:
         pass
 
     def delete(self, path: str) -> None:
         pass
 
+    def stat(self, path: str) -> FileInfo:
+        raise FileNotFoundError(path)
+
     def openread(self, path: str) -> TextIOWrapper:
         return TextIOWrapper(io.BytesIO())
 
@@ -50,11 +72,13 @@ class MemoryFilesystemFactoryStub(FilesystemFactory):
     ) -> None:
         self.local_filesystem = local_fs or MemoryFilesystemFake()
         self.ssh_filesystem = ssh_fs or MemoryFilesystemFake()
+        self.ssh_filesystems_created = 0
 
     def create_local_filesystem(self) -> "Filesystem":
         return self.local_filesystem
 
     def create_ssh_filesystem(self) -> "Filesystem":
+        self.ssh_filesystems_created += 1
         return self.ssh_filesystem
 
     def create_local_files(self, *files: str) -> None:
@@ -74,6 +98,7 @@ class MemoryFilesystemFactoryStub(FilesystemFactory):
 class FileStub:
     path: str
     content: str = ""
+    modified: float = 0.0
 
     def is_dir(self) -> bool:
         return False
@@ -114,6 +139,7 @@ class MemoryFilesystemFake(Filesystem):
 
         self._current_dir = PurePath(dir)
         self._home = PurePath(home)
+        self.closed = False
 
         for file in files:
             self.create_file_stub(file, "")
@@ -126,6 +152,14 @@ class MemoryFilesystemFake(Filesystem):
 
         self._filesystem.append(FileStub(path, content))
 
+    def write_file_stub(self, path: str, content: str) -> None:
+        file = self._find_matching_item(path)
+        if file is None:
+            self.create_file_stub(path, content)
+            return
+
+        cast(FileStub, file).content = content
+
     def create_dir_stub(self, path: str) -> None:
         path = self._clean_join(path)
         parent, _ = os.path.split(path)
@@ -146,6 +180,10 @@ class MemoryFilesystemFake(Filesystem):
         file = next(filter(lambda f: PurePath(f.path).match(path), self._filesystem))
         return cast(FileStub, file).content
 
+    def close(self) -> None:
+        # The files stay accessible, so tests can inspect them after a stage closed the filesystem
+        self.closed = True
+
     def glob(self, pattern: str) -> List[str]:
         pattern = self._expandhome(pattern, self)
 
@@ -174,6 +212,8 @@ class MemoryFilesystemFake(Filesystem):
         target: str,
         overwrite: bool = False,
         filesystem: Optional["Filesystem"] = None,
+        preserve_mode: bool = True,
+        progress: Optional[ProgressCallback] = None,
     ) -> None:
         assert filesystem is None or isinstance(
             filesystem, (MemoryFilesystemFake, Mock)
@@ -181,6 +221,16 @@ class MemoryFilesystemFake(Filesystem):
         other = cast(MemoryFilesystemFake, filesystem) or self
         self._raise_if_target_file_exists(other, target, overwrite)
         self._perform_copy(other, source, target, overwrite)
+        if progress is not None:
+            progress(self._size_of_matching_files(source))
+
+    def _size_of_matching_files(self, path: str) -> int:
+        path = self._expandhome(path, self)
+        return sum(
+            len(item.content.encode())
+            for item in self._get_matching_items(path)
+            if isinstance(item, FileStub)
+        )
 
     def delete(self, path: str) -> None:
         items = self._get_matching_items(path)
@@ -191,6 +241,34 @@ class MemoryFilesystemFake(Filesystem):
         for item in items:
             self._filesystem.remove(item)
 
+    def stat(self, path: str) -> FileInfo:
+        item = self._find_matching_item(path)
+        if item is None:
+            raise FileNotFoundError(path)
+
+        if item.is_dir():
+            return FileInfo(path, True, 0)
+
+        file = cast(FileStub, item)
+        return FileInfo(path, False, len(file.content.encode()), file.modified)
+
+    def stat_many(self, paths: List[str]) -> List[Optional[FileInfo]]:
+        return [self.stat(path) if self.exists(path) else None for path in paths]
+
+    def walk(self, root: str) -> Iterator[FileInfo]:
+        if not self.exists(root):
+            raise FileNotFoundError(root)
+
+        full_root = self._clean_join(self._expandhome(root, self))
+        below = [
+            item
+            for item in self._filesystem
+            if item.path.startswith(full_root.rstrip(os.path.sep) + os.path.sep)
+        ]
+        for item in sorted(below, key=lambda item: item.path.count(os.path.sep)):
+            relative = os.path.relpath(item.path, full_root)
+            yield self.stat(os.path.join(root, relative))
+
     def openread(self, path: str) -> TextIOWrapper:
         file = self._find_matching_item(path)
         if file is None or file.is_dir():
@@ -202,6 +280,14 @@ class MemoryFilesystemFake(Filesystem):
         content_as_bytes.seek(0, 0)
         return TextIOWrapper(content_as_bytes)
 
+    def openbin(self, path: str, offset: int = 0, length: Optional[int] = None) -> BinaryIO:
+        file = self._find_matching_item(path)
+        if file is None or file.is_dir():
+            raise FileNotFoundError(path)
+
+        content = io.BytesIO(cast(FileStub, file).content.encode())
+        return open_range(content, offset, length)
+
     def _perform_copy(
         self, other: "MemoryFilesystemFake", source: str, target: str, overwrite: bool
     ) -> None:
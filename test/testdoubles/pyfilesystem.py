@@ -1,8 +1,13 @@
-from typing import Callable, Optional, Text
+from typing import Callable, Collection, Iterator, List, Optional, Text
 
 import fs.base
 import fs.subfs
+from fs.base import FS
+from fs.info import Info
 from fs.memoryfs import MemoryFS
+from fs.wrapfs import WrapFS
+
+from hpcrocket.pyfilesystem.pyfilesystembased import UPLOAD_OPTIONS_META_NAMESPACE
 
 
 class ArbitraryArgsMemoryFS(MemoryFS):
@@ -22,3 +27,64 @@ class OnlySubFSMemoryFS(ArbitraryArgsMemoryFS):
         ] = None,
     ) -> fs.subfs.SubFS["OnlySubFSMemoryFS"]:
         return super().opendir(path, factory=fs.subfs.SubFS)
+
+
+class MetadataCallCountingFS(WrapFS[FS]):
+    """
+    Counts the metadata requests that reach the wrapped filesystem.
+    On a remote filesystem every one of them is a round trip.
+    Also records the directories created through makedir.
+    """
+
+    def __init__(self, wrap_fs: FS) -> None:
+        super().__init__(wrap_fs)
+        self.metadata_calls = 0
+        self.created_dirs: List[Text] = []
+
+    def makedir(self, path: Text, permissions=None, recreate: bool = False):
+        self.created_dirs.append(path)
+        return super().makedir(path, permissions=permissions, recreate=recreate)
+
+    def getinfo(self, path: Text, namespaces: Optional[Collection[Text]] = None) -> Info:
+        self.metadata_calls += 1
+        return super().getinfo(path, namespaces=namespaces)
+
+    def scandir(self, path: Text, namespaces=None, page=None) -> Iterator[Info]:
+        self.metadata_calls += 1
+        return super().scandir(path, namespaces=namespaces, page=page)
+
+    def listdir(self, path: Text) -> List[Text]:
+        self.metadata_calls += 1
+        return super().listdir(path)
+
+    def exists(self, path: Text) -> bool:
+        self.metadata_calls += 1
+        return super().exists(path)
+
+    def isdir(self, path: Text) -> bool:
+        self.metadata_calls += 1
+        return super().isdir(path)
+
+    def isfile(self, path: Text) -> bool:
+        self.metadata_calls += 1
+        return super().isfile(path)
+
+
+class UploadOptionsRecordingMemoryFS(MemoryFS):
+    """
+    Announces support for hpc-rocket's upload options and records the options of every upload
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.upload_options: List[dict] = []
+
+    def getmeta(self, namespace: Text = "standard"):
+        if namespace == UPLOAD_OPTIONS_META_NAMESPACE:
+            return {"preserve_mode": True}
+
+        return super().getmeta(namespace)
+
+    def upload(self, path: Text, file, chunk_size=None, **options) -> None:
+        self.upload_options.append(options)
+        super().upload(path, file, chunk_size=chunk_size)
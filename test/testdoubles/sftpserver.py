@@ -0,0 +1,148 @@
+import stat
+import sys
+import threading
+from typing import Any, List, Optional, Tuple
+from unittest.mock import Mock, patch
+
+from hpcrocket.ssh.chmodsshfs import PermissionChangingSSHFSDecorator
+from hpcrocket.ssh.transfertuning import TransferSettingsStore
+from paramiko import SFTPAttributes, SFTPClient, SFTPFile
+from paramiko.message import Message
+from paramiko.sftp import (
+    CMD_ATTRS,
+    CMD_DATA,
+    CMD_HANDLE,
+    CMD_OPEN,
+    CMD_READ,
+    CMD_STAT,
+    CMD_STATUS,
+    CMD_WRITE,
+    SFTP_EOF,
+    SFTP_OK,
+    SFTP_PERMISSION_DENIED,
+    BaseSFTP,
+)
+
+
+def _status(response: Message, code: int) -> int:
+    response.add_int(code)
+    response.add_string("")
+    response.add_string("")
+    return CMD_STATUS
+
+
+class SFTPServerStub(SFTPClient):
+    """
+    An SFTP client that answers its requests itself, in order. Every path can be opened.
+    Paths are directories, or files of the size of `content` if `files` is set.
+    Requests of the types in `failing` are answered with an error status, all others succeed.
+    The data of all writes ends up in `content` and all reads are answered from it, regardless of the file.
+    Reads return at most `max_read_size` bytes. Their offsets are recorded in `read_offsets`,
+    the number of bytes they returned in `bytes_read`.
+    """
+
+    def __init__(
+        self,
+        failing: Tuple[int, ...] = (),
+        max_read_size: Optional[int] = None,
+        files: bool = False,
+    ) -> None:
+        # Skips the version handshake of the client
+        BaseSFTP.__init__(self)
+        self.sock = Mock()
+        self._lock = threading.Lock()
+        self._expecting = {}
+        self._cwd = None
+        self.request_number = 1
+        self.failing = failing
+        self.requests: List[int] = []
+        self.max_outstanding = 0
+        self.content = bytearray()
+        self.max_read_size = max_read_size
+        self.files = files
+        self.read_offsets: List[int] = []
+        self.bytes_read = 0
+        self.responses: List[Tuple[int, bytes]] = []
+        # Prefetching files send their requests from a thread of their own
+        self._responded = threading.Condition()
+
+    def _send_packet(self, t: int, packet: Any) -> None:
+        request = Message(packet.asbytes())
+        number = request.get_int()
+        self.requests.append(t)
+        self.max_outstanding = max(self.max_outstanding, len(self._expecting))
+        response = Message()
+        response.add_int(number)
+        with self._responded:
+            self.responses.append(
+                (self._answer(t, request, response), response.asbytes())
+            )
+            self._responded.notify_all()
+
+    def _answer(self, t: int, request: Message, response: Message) -> int:
+        if t in self.failing:
+            return _status(response, SFTP_PERMISSION_DENIED)
+
+        if t == CMD_STAT:
+            attributes = SFTPAttributes()
+            attributes.st_mode = stat.S_IFDIR | 0o755
+            if self.files:
+                attributes.st_mode = stat.S_IFREG | 0o644
+                attributes.st_size = len(self.content)
+
+            attributes._pack(response)
+            return CMD_ATTRS
+
+        if t == CMD_OPEN:
+            response.add_string(b"handle")
+            return CMD_HANDLE
+
+        if t == CMD_WRITE:
+            request.get_binary()
+            self._write(request.get_int64(), request.get_binary())
+        elif t == CMD_READ:
+            request.get_binary()
+            offset = request.get_int64()
+            self.read_offsets.append(offset)
+            size = min(request.get_int(), self.max_read_size or sys.maxsize)
+            if offset < len(self.content):
+                data = bytes(self.content[offset : offset + size])
+                self.bytes_read += len(data)
+                response.add_string(data)
+                return CMD_DATA
+
+            return _status(response, SFTP_EOF)
+
+        return _status(response, SFTP_OK)
+
+    def _write(self, offset: int, data: bytes) -> None:
+        end = offset + len(data)
+        self.content.extend(bytes(max(0, end - len(self.content))))
+        self.content[offset:end] = data
+
+    def _read_packet(self) -> Tuple[int, bytes]:
+        with self._responded:
+            self._responded.wait_for(lambda: self.responses, timeout=5)
+            return self.responses.pop(0)
+
+
+def make_pipelined_file(sftp: SFTPServerStub) -> SFTPFile:
+    remote_file = SFTPFile(sftp, b"handle", "wb", bufsize=0)
+    remote_file.set_pipelined(True)
+    return remote_file
+
+
+def make_sshfs(
+    sftp: SFTPServerStub, settings_path: str
+) -> PermissionChangingSSHFSDecorator:
+    """
+    Creates an SSH filesystem whose file transfers go through the stub, all other operations go to a mock
+    """
+    internal_fs = Mock(_sftp=sftp, _lock=threading.RLock())
+    internal_fs.validatepath.side_effect = lambda path: path
+    with patch("hpcrocket.ssh.chmodsshfs.sshfs.SSHFS", return_value=internal_fs):
+        return PermissionChangingSSHFSDecorator(
+            host="host",
+            user="user",
+            settings_store=TransferSettingsStore(settings_path),
+        )
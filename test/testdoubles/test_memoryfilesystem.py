@@ -1,6 +1,6 @@
-from typing import cast
+from typing import Iterator, List, Optional, cast
 import unittest
-from hpcrocket.core.filesystem import Filesystem
+from hpcrocket.core.filesystem import FileInfo, Filesystem
 
 from test.test_filesystem_abc import FilesystemTest
 from test.testdoubles.filesystem import MemoryFilesystemFake
@@ -50,3 +50,31 @@ class TestMemoryFilesystem(FilesystemTest, unittest.TestCase):
         self.create_file(sut, path)
 
         assert sut.exists(search_path) is False
+
+
+class MemoryFilesystemWithDefaultMetadata(MemoryFilesystemFake):
+    """
+    Looks up metadata like a Filesystem that only implements the abstract methods
+    """
+
+    def stat(self, path: str) -> FileInfo:
+        return Filesystem.stat(self, path)
+
+    def stat_many(self, paths: List[str]) -> List[Optional[FileInfo]]:
+        return Filesystem.stat_many(self, paths)
+
+    def walk(self, root: str) -> Iterator[FileInfo]:
+        return Filesystem.walk(self, root)
+
+
+class TestFilesystemDefaultMetadata(TestMemoryFilesystem):
+    def create_filesystem(self, dir: str = "/") -> Filesystem:
+        return MemoryFilesystemWithDefaultMetadata(dir=dir, home=self.home_dir_abs())
+
+    def test__when_walking_dir__yields_entries_of_subdirs_once(self) -> None:
+        sut = self.create_filesystem()
+        self.create_file(sut, "dir/sub/deeper/nested.txt")
+
+        actual = [info.path for info in sut.walk("dir")]
+
+        assert actual == ["dir/sub", "dir/sub/deeper", "dir/sub/deeper/nested.txt"]
@@ -2,6 +2,7 @@ import sys
 from typing import TextIO
 
 from hpcrocket.core.slurmbatchjob import SlurmJobStatus
+from hpcrocket.core.transferprogress import TransferProgress
 from hpcrocket.ui import UI
 
 
@@ -33,3 +34,9 @@ class PrintLoggingUI(UI):
 
     def update(self, job: SlurmJobStatus) -> None:
         print(job, file=self._file)
+
+    def progress(self, progress: TransferProgress) -> None:
+        print(progress, file=self._file)
+
+    def output(self, source: str, line: str) -> None:
+        print(f"{source}: {line}", file=self._file)
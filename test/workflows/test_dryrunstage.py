@@ -0,0 +1,39 @@
+from test.testdoubles.filesystem import MemoryFilesystemFactoryStub
+from unittest.mock import Mock, call
+
+from hpcrocket.core.progressive_file_operations import CopyInstruction
+from hpcrocket.core.workflows.stages import DryRunStage
+from hpcrocket.ui import UI
+
+
+def test__given_copy_instructions__should_print_plan_without_copying() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.local_filesystem.create_file_stub("small.txt", "1")
+    factory.local_filesystem.create_file_stub("large.txt", "12345")
+    instructions = [
+        CopyInstruction("small.txt", "small.txt"),
+        CopyInstruction("large.txt", "large.txt"),
+    ]
+    ui = Mock(spec=UI)
+
+    sut = DryRunStage(factory, instructions)
+    actual = sut(ui)
+
+    assert actual is True
+    assert ui.info.call_args_list == [
+        call("     5.0 B  large.txt -> large.txt"),
+        call("     1.0 B  small.txt -> small.txt"),
+        call("2 files, 6.0 B in total"),
+    ]
+    assert not factory.ssh_filesystem.exists("large.txt")
+
+
+def test__given_missing_file__should_log_error_and_return_false() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    ui = Mock(spec=UI)
+
+    sut = DryRunStage(factory, [CopyInstruction("missing.txt", "copy.txt")])
+    actual = sut(ui)
+
+    assert actual is False
+    ui.error.assert_called_once()
@@ -8,6 +8,7 @@ from test.testdoubles.filesystem import (
 from unittest.mock import Mock
 
 from hpcrocket.core.progressive_file_operations import CopyInstruction
+from hpcrocket.core.workflows.journal import Checkpoint
 from hpcrocket.core.workflows.stages import FinalizeStage
 
 
@@ -86,3 +87,76 @@ def test__given_collect_instructions_with_glob__when_file_exists_locally__still_
     run_finalize_stage(factory, files_to_collect, [])
 
     assert local_fs.exists("existing.txt") is True
+
+
+def test__given_incremental_collector__when_running__should_only_collect_delta() -> None:
+    ssh_fs = MemoryFilesystemFake(files=["done.txt", "late.txt"])
+    factory = MemoryFilesystemFactoryStub(ssh_fs=ssh_fs)
+    sut = FinalizeStage(
+        factory,
+        [CopyInstruction("done.txt", "done.txt"), CopyInstruction("late.txt", "late.txt")],
+        [],
+    )
+    collector = sut.incremental_collector(0)
+    collector.collect_stable_files(Mock())
+    collector.collect_stable_files(Mock())
+    factory.local_filesystem.delete("done.txt")
+
+    sut(Mock())
+
+    local_fs = factory.local_filesystem
+    assert local_fs.exists("done.txt") is False
+    assert local_fs.exists("late.txt") is True
+
+
+def test__given_stopped_incremental_collector__should_close_its_connection_first() -> None:
+    ssh_fs = MemoryFilesystemFake(files=["result.txt"])
+    factory = MemoryFilesystemFactoryStub(ssh_fs=ssh_fs)
+    sut = FinalizeStage(factory, [CopyInstruction("result.txt", "result.txt")], [])
+    collector = sut.incremental_collector(0)
+    collector.collect_stable_files(Mock())
+
+    collector.stop()
+
+    assert ssh_fs.closed is True
+    assert factory.ssh_filesystems_created == 1
+
+    ssh_fs.closed = False
+    sut(Mock())
+
+    assert factory.ssh_filesystems_created == 2
+    assert ssh_fs.closed is True
+
+
+def test__given_checkpoint_with_collected_files__when_running__should_only_clean() -> None:
+    ssh_fs = MemoryFilesystemFake(files=["myfile.txt"])
+    factory = MemoryFilesystemFactoryStub(ssh_fs=ssh_fs)
+    sut = FinalizeStage(
+        factory,
+        [CopyInstruction("myfile.txt", "collected.txt")],
+        ["myfile.txt"],
+        Checkpoint({"collected": True}),
+    )
+
+    sut(Mock())
+
+    assert factory.local_filesystem.exists("collected.txt") is False
+    assert ssh_fs.exists("myfile.txt") is False
+
+
+def test__given_no_collect_or_clean_instructions__when_running__should_not_connect_to_remote_filesystem() -> None:
+    factory = MemoryFilesystemFactoryStub()
+
+    run_finalize_stage(factory, [], [])
+
+    assert factory.ssh_filesystems_created == 0
+
+
+def test__given_clean_instruction__when_running__should_close_remote_filesystem_afterwards() -> None:
+    ssh_fs = MemoryFilesystemFake(files=["myfile.txt"])
+    factory = MemoryFilesystemFactoryStub(ssh_fs=ssh_fs)
+
+    run_finalize_stage(factory, [], ["myfile.txt"])
+
+    assert factory.ssh_filesystems_created == 1
+    assert ssh_fs.closed is True
@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from hpcrocket.core.workflows.journal import WorkflowJournal
+
+
+def test__when_recording_progress__should_save_it_to_state_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.json")
+    sut = WorkflowJournal(path)
+
+    sut.checkpoint("launch").record(jobid="1234")
+    sut.finish_stage("LaunchStage")
+
+    loaded = WorkflowJournal.load(path)
+    assert loaded.checkpoint("launch").get("jobid") == "1234"
+    assert loaded.finished_stages == ["LaunchStage"]
+
+
+def test__when_saving__should_not_leave_temporary_files(tmp_path: Path) -> None:
+    sut = WorkflowJournal(str(tmp_path / "state.json"))
+
+    sut.save()
+    sut.save()
+
+    assert [path.name for path in tmp_path.iterdir()] == ["state.json"]
+
+
+def test__given_other_stage_finished_at_position__when_checking__should_raise_value_error() -> (
+    None
+):
+    sut = WorkflowJournal()
+    sut.finish_stage("PrepareStage")
+
+    with pytest.raises(ValueError):
+        sut.is_finished(0, "LaunchStage")
+
+
+def test__given_file_of_unknown_version__when_loading__should_raise_value_error(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"version": 99}))
+
+    with pytest.raises(ValueError):
+        WorkflowJournal.load(str(path))
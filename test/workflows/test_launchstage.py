@@ -9,6 +9,7 @@ import pytest
 from hpcrocket.core.executor import CommandExecutor
 from hpcrocket.core.launchoptions import LaunchOptions
 from hpcrocket.core.slurmcontroller import SlurmController
+from hpcrocket.core.workflows.journal import Checkpoint
 from hpcrocket.core.workflows.stages import LaunchStage, NoJobLaunchedError
 from hpcrocket.ui import UI
 from hpcrocket.watcher.jobwatcher import JobWatcherFactory
@@ -73,3 +74,24 @@ def test__when_canceling_before_running__should_raise_no_job_launched_error() ->
 
     with pytest.raises(NoJobLaunchedError):
         sut.cancel(Mock())
+
+
+def test__when_running__should_record_job_id_in_checkpoint() -> None:
+    checkpoint = Checkpoint()
+    sut = LaunchStage(SlurmController(SlurmJobExecutorSpy()), "job.sh", checkpoint)
+
+    sut(Mock(spec=UI))
+
+    assert checkpoint.get("jobid") == DEFAULT_JOB_ID
+
+
+def test__given_checkpoint_with_job_id__when_running__should_not_submit_another_job(
+    executor_spy: SlurmJobExecutorSpy,
+) -> None:
+    checkpoint = Checkpoint({"jobid": "4321"})
+    sut = LaunchStage(SlurmController(executor_spy), "job.sh", checkpoint)
+
+    sut(Mock(spec=UI))
+
+    assert executor_spy.command_log == []
+    assert sut.get_batch_job().jobid == "4321"
@@ -6,7 +6,11 @@ from test.testdoubles.filesystem import (
 )
 from unittest.mock import Mock
 
-from hpcrocket.core.progressive_file_operations import CopyInstruction
+from hpcrocket.core.progressive_file_operations import (
+    CopyInstruction,
+    RemoteCopyInstruction,
+)
+from hpcrocket.core.workflows.journal import Checkpoint
 from hpcrocket.core.workflows.stages import PrepareStage
 from hpcrocket.ui import UI
 
@@ -47,11 +51,12 @@ def test__given_copy_instructions__when_running__should_copy_files_to_remote_wit
 def test__given_copy_instructions__when_file_exists_error_during_copy__should_rollback_copied_files() -> None:
     copy_instructions = [
         CopyInstruction("myfile.txt", "mycopy.txt"),
-        CopyInstruction("myfile.txt", "mycopy.txt"),
+        CopyInstruction("myfile.txt", "existing.txt"),
     ]
 
     factory = MemoryFilesystemFactoryStub()
     factory.create_local_files("myfile.txt")
+    factory.create_remote_files("existing.txt")
 
     run_prepare_stage(factory, copy_instructions)
 
@@ -79,3 +84,151 @@ def test__given_copy_instructions__when_error_during_copy__should_return_false()
     actual = run_prepare_stage(factory, copy_instructions)
 
     assert actual == False
+
+
+def test__given_copy_instructions__when_running__should_report_progress_to_ui() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.local_filesystem.create_file_stub("myfile.txt", content="the content")
+    ui = Mock(spec=UI)
+    sut = PrepareStage(factory, [CopyInstruction("myfile.txt", "mycopy.txt")])
+
+    sut(ui)
+
+    last_progress = ui.progress.call_args[0][0]
+    assert last_progress.files_done == 1
+    assert last_progress.bytes_done == len("the content")
+
+
+def test__given_remote_copy_instructions__when_running__should_copy_on_remote() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.create_remote_files("reference.fa")
+    sut = PrepareStage(
+        factory, [], [RemoteCopyInstruction("reference.fa", "job/reference.fa")]
+    )
+
+    actual = sut(Mock(spec=UI))
+
+    assert actual is True
+    assert factory.ssh_filesystem.exists("job/reference.fa")
+    assert factory.local_filesystem.exists("job/reference.fa") is False
+
+
+def test__given_failing_remote_copy__when_running__should_rollback_copies() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.create_local_files("myfile.txt")
+    factory.create_remote_files("reference.fa", "existing.fa")
+    sut = PrepareStage(
+        factory,
+        [CopyInstruction("myfile.txt", "mycopy.txt")],
+        [RemoteCopyInstruction("reference.fa", "existing.fa")],
+    )
+
+    actual = sut(Mock(spec=UI))
+
+    assert actual is False
+    assert factory.ssh_filesystem.exists("mycopy.txt") is False
+
+
+def test__given_checkpoint_of_interrupted_run__when_running__should_only_copy_remaining_files() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.local_filesystem.create_file_stub("done.txt", content="new content")
+    factory.local_filesystem.create_file_stub("partial.txt", content="complete")
+    factory.ssh_filesystem.create_file_stub("done.txt", content="old content")
+    factory.ssh_filesystem.create_file_stub("partial.txt", content="compl")
+    checkpoint = Checkpoint(
+        {
+            "planned_files": ["done.txt", "partial.txt"],
+            "new_files": ["done.txt", "partial.txt"],
+            "copied_files": ["done.txt"],
+        }
+    )
+    sut = PrepareStage(
+        factory,
+        [CopyInstruction("done.txt", "done.txt"), CopyInstruction("partial.txt", "partial.txt")],
+        checkpoint=checkpoint,
+    )
+
+    actual = sut(Mock(spec=UI))
+
+    remotefs = factory.ssh_filesystem
+    assert actual is True
+    assert remotefs.get_content_of_file_stub("done.txt") == "old content"
+    assert remotefs.get_content_of_file_stub("partial.txt") == "complete"
+    assert checkpoint.get("copied_files") == ["done.txt", "partial.txt"]
+
+
+def test__given_checkpoint_of_interrupted_run__when_running__should_not_overwrite_files_that_existed_before() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.create_local_files("new.txt", "existing.txt")
+    factory.ssh_filesystem.create_file_stub("existing.txt", content="not ours")
+    checkpoint = Checkpoint(
+        {
+            "planned_files": ["new.txt", "existing.txt"],
+            "new_files": ["new.txt"],
+            "copied_files": [],
+        }
+    )
+    sut = PrepareStage(
+        factory,
+        [CopyInstruction("new.txt", "new.txt"), CopyInstruction("existing.txt", "existing.txt")],
+        checkpoint=checkpoint,
+    )
+
+    actual = sut(Mock(spec=UI))
+
+    assert actual is False
+    assert factory.ssh_filesystem.get_content_of_file_stub("existing.txt") == "not ours"
+
+
+def test__when_running__should_record_destinations_that_do_not_exist_yet_as_new() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.create_local_files("new.txt", "replaced.txt")
+    factory.create_remote_files("replaced.txt", "reference.fa")
+    checkpoint = Checkpoint()
+    sut = PrepareStage(
+        factory,
+        [CopyInstruction("new.txt", "new.txt"), CopyInstruction("replaced.txt", "replaced.txt", True)],
+        [RemoteCopyInstruction("reference.fa", "copy.fa")],
+        checkpoint=checkpoint,
+    )
+
+    sut(Mock(spec=UI))
+
+    assert checkpoint.get("planned_files") == ["new.txt", "replaced.txt", "copy.fa"]
+    assert checkpoint.get("new_files") == ["new.txt", "copy.fa"]
+
+
+def test__given_failing_copy__when_rolling_back__should_reset_checkpoint() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.create_local_files("myfile.txt")
+    factory.create_remote_files("existing.txt")
+    checkpoint = Checkpoint()
+    sut = PrepareStage(
+        factory,
+        [CopyInstruction("myfile.txt", "mycopy.txt"), CopyInstruction("myfile.txt", "existing.txt")],
+        checkpoint=checkpoint,
+    )
+
+    sut(Mock(spec=UI))
+
+    assert checkpoint.get("copied_files") == []
+    assert checkpoint.get("planned_files") == []
+    assert checkpoint.get("new_files") == []
+
+
+def test__given_no_copy_instructions__when_running__should_not_connect_to_remote_filesystem() -> None:
+    factory = MemoryFilesystemFactoryStub()
+
+    run_prepare_stage(factory, [])
+
+    assert factory.ssh_filesystems_created == 0
+
+
+def test__given_copy_instructions__when_running__should_close_remote_filesystem_afterwards() -> None:
+    factory = MemoryFilesystemFactoryStub()
+    factory.create_local_files("myfile.txt")
+
+    run_prepare_stage(factory, [CopyInstruction("myfile.txt", "mycopy.txt")])
+
+    assert factory.ssh_filesystems_created == 1
+    assert factory.ssh_filesystem.closed is True
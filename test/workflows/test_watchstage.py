@@ -12,6 +12,7 @@ from typing import List, Optional
 from unittest.mock import Mock, call
 
 import pytest
+from hpcrocket.core.runreport import RunReport
 from hpcrocket.core.slurmbatchjob import SlurmBatchJob
 from hpcrocket.core.slurmcontroller import SlurmController
 from hpcrocket.core.workflows.stages import WatchStage
@@ -182,3 +183,48 @@ def test__when_canceling_before_running__should_raise_not_watching_error():
 
     with pytest.raises(NotWatchingError):
         sut.cancel(Mock(spec=UI))
+
+
+class BackgroundTaskSpy:
+    def __init__(self) -> None:
+        self.log: List[str] = []
+
+    def start(self, ui: UI) -> None:
+        self.log.append("start")
+
+    def stop(self) -> None:
+        self.log.append("stop")
+
+
+def test__given_background_task__when_running__should_start_and_stop_it():
+    task = BackgroundTaskSpy()
+    provider = make_job_provider(SlurmJobExecutorSpy())
+    sut = WatchStage(provider, launch_options().poll_interval, background_tasks=[task])
+
+    sut(Mock(spec=UI))
+
+    assert task.log == ["start", "stop"]
+
+
+def test__given_background_task__when_canceling__should_stop_it():
+    task = BackgroundTaskSpy()
+    provider = make_job_provider(SlurmJobExecutorSpy())
+    sut = WatchStage(provider, launch_options().poll_interval, background_tasks=[task])
+    sut(Mock(spec=UI))
+
+    sut.cancel(Mock(spec=UI))
+
+    assert task.log[-1] == "stop"
+
+
+def test__given_report__when_job_completes__should_record_job_id_and_state():
+    report = RunReport()
+    provider = make_job_provider(LongRunningSlurmJobExecutorSpy())
+    sut = WatchStage(provider, launch_options().poll_interval, report=report)
+
+    sut(Mock(spec=UI))
+
+    values = report.to_dict()["values"]
+    assert values["job.id"] == DEFAULT_JOB_ID
+    assert values["job.state"] == completed_slurm_job().state
+    assert {"job.queue_seconds", "job.run_seconds"} <= set(values)
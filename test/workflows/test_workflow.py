@@ -1,7 +1,11 @@
-from typing import Callable, List, Optional
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
 from unittest.mock import Mock
 
 import pytest
+from hpcrocket.core.profiling import Profiler
+from hpcrocket.core.runreport import RunReport
+from hpcrocket.core.workflows.journal import WorkflowJournal
 from hpcrocket.core.workflows.workflow import Stage, Workflow, WorkflowNotStartedError
 from hpcrocket.ui import UI
 
@@ -136,5 +140,69 @@ def test__given_a_failing_stage_that_is_allowed_to_fail__when_running__executes_
     assert second_stage.was_run is True
 
 
+def test__given_report__when_running__should_record_each_stage() -> None:
+    report = RunReport()
+    sut = Workflow([StageSpy(), FailingStage()], report=report)
+
+    sut.run(ui_dummy())
+
+    stages = report.to_dict()["stages"]
+    assert [(stage["stage"], stage["success"]) for stage in stages] == [
+        ("StageSpy", True),
+        ("FailingStage", False),
+    ]
+
+
+def test__given_profiler__when_running__should_profile_each_stage() -> None:
+    profiled: List[str] = []
+
+    class ProfilerSpy(Profiler):
+        @contextmanager
+        def profile(self, stage: str) -> Iterator[None]:
+            profiled.append(stage)
+            yield
+
+        def write(self, path: str) -> None:
+            pass
+
+    sut = make_sut([StageSpy(), FailingStage()])
+
+    sut.run(ui_dummy(), ProfilerSpy())
+
+    assert profiled == ["StageSpy", "FailingStage"]
+
+
 def cancel_workflow(sut: Workflow) -> Callable[[], None]:
     return lambda: sut.cancel(ui_dummy())
+
+
+def test__given_journal__when_running__should_record_finished_stages() -> None:
+    journal = WorkflowJournal()
+    sut = Workflow([StageSpy(), FailingStage()], journal)
+
+    sut.run(ui_dummy())
+
+    assert journal.finished_stages == ["StageSpy"]
+
+
+def test__given_journal_with_finished_stage__when_running__should_skip_it() -> None:
+    journal = WorkflowJournal()
+    journal.finish_stage("StageSpy")
+    first_stage, second_stage = StageSpy(), StageSpy()
+    sut = Workflow([first_stage, second_stage], journal)
+
+    sut.run(ui_dummy())
+
+    assert first_stage.was_run is False
+    assert second_stage.was_run is True
+
+
+def test__given_canceled_stage__when_running__should_not_record_it_as_finished() -> None:
+    journal = WorkflowJournal()
+    stage = StageSpy()
+    sut = Workflow([stage], journal)
+    stage.run_callback = cancel_workflow(sut)
+
+    sut.run(ui_dummy())
+
+    assert journal.finished_stages == []